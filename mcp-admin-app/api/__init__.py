@@ -7,7 +7,7 @@ REST API endpoints and integration layer.
 
 from .rest_api import create_app, APIRouter
 from .auth import AuthenticationManager, APIKeyManager
-from .middleware import SecurityMiddleware, LoggingMiddleware
+from .middleware import SecurityMiddleware, LoggingMiddleware, CacheMiddleware
 
 __all__ = [
     'create_app',
@@ -15,5 +15,6 @@ __all__ = [
     'AuthenticationManager',
     'APIKeyManager',
     'SecurityMiddleware',
-    'LoggingMiddleware'
+    'LoggingMiddleware',
+    'CacheMiddleware'
 ]
\ No newline at end of file
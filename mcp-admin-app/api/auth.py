@@ -9,7 +9,7 @@ import jwt
 import secrets
 import hashlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import logging
 
 from models.base import generate_id
@@ -5,14 +5,21 @@ Middleware for MCP Admin API
 Security, logging, and other middleware components.
 """
 
+import hashlib
 import time
 import logging
-from typing import Callable, Dict, Any
+from typing import Callable, Dict, Any, Iterable, Optional
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 import json
 
+from .rate_limit import RateLimitResult, create_rate_limiter
+from .response_cache import (
+    CachedResponse, build_cache_key, compute_etag, create_cache_backend,
+    etag_matches, invalidation_tags, resource_tags
+)
+
 
 class SecurityMiddleware(BaseHTTPMiddleware):
     """Security middleware for API protection."""
@@ -33,20 +40,21 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             "Referrer-Policy": "strict-origin-when-cross-origin"
         }
         
-        # Rate limiting (simple in-memory implementation)
-        self.rate_limit_storage = {}
-        self.rate_limit_window = 60  # 1 minute
-        self.rate_limit_max_requests = 100  # per window
+        # Rate limiting (GCRA, O(1) state per client key)
+        self.rate_limiter = create_rate_limiter(self.config)
+        self.user_resolver: Optional[Callable[[str], Optional[str]]] = self.config.get("user_resolver")
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request through security middleware."""
         start_time = time.time()
         
         # Rate limiting
-        if not self._check_rate_limit(request):
+        rate_limit = self._check_rate_limit(request)
+        if not rate_limit.allowed:
             return JSONResponse(
                 status_code=429,
-                content={"error": "Rate limit exceeded", "message": "Too many requests"}
+                content={"error": "Rate limit exceeded", "message": "Too many requests"},
+                headers=rate_limit.headers()
             )
         
         # IP filtering (if configured)
@@ -64,6 +72,9 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             for header, value in self.security_headers.items():
                 response.headers[header] = value
             
+            for header, value in rate_limit.headers().items():
+                response.headers[header] = value
+            
             # Add custom headers
             response.headers["X-Response-Time"] = str(time.time() - start_time)
             response.headers["X-API-Version"] = "1.0.0"
@@ -77,32 +88,31 @@ class SecurityMiddleware(BaseHTTPMiddleware):
                 content={"error": "Internal server error", "message": "Request processing failed"}
             )
     
-    def _check_rate_limit(self, request: Request) -> bool:
-        """Check rate limiting for client."""
-        client_ip = self._get_client_ip(request)
-        current_time = time.time()
-        
-        # Clean old entries
-        self._cleanup_rate_limit_storage(current_time)
-        
-        # Check current requests
-        if client_ip not in self.rate_limit_storage:
-            self.rate_limit_storage[client_ip] = []
-        
-        client_requests = self.rate_limit_storage[client_ip]
+    def _check_rate_limit(self, request: Request) -> RateLimitResult:
+        """Check rate limits for the client's IP, API key and user."""
+        try:
+            return self.rate_limiter.check(self._rate_limit_identities(request))
+        except Exception as e:
+            # A broken shared backend must not take the API down with it
+            self.logger.error(f"Rate limit check failed: {e}")
+            return RateLimitResult(allowed=True, limit=0, remaining=0, reset_after=0.0)
+    
+    def _rate_limit_identities(self, request: Request) -> Dict[str, Optional[str]]:
+        """Keys the request is limited under; credentials are stored hashed."""
+        identities = {"ip": self._get_client_ip(request)}
         
-        # Count requests in current window
-        window_start = current_time - self.rate_limit_window
-        recent_requests = [req_time for req_time in client_requests if req_time > window_start]
+        api_key = request.headers.get("X-API-Key")
+        if api_key:
+            identities["api_key"] = hashlib.sha256(api_key.encode()).hexdigest()[:32]
         
-        if len(recent_requests) >= self.rate_limit_max_requests:
-            return False
-        
-        # Add current request
-        recent_requests.append(current_time)
-        self.rate_limit_storage[client_ip] = recent_requests
+        authorization = request.headers.get("Authorization", "")
+        if authorization.lower().startswith("bearer ") and self.user_resolver:
+            try:
+                identities["user"] = self.user_resolver(authorization[7:].strip())
+            except Exception as e:
+                self.logger.debug(f"Could not resolve user for rate limiting: {e}")
         
-        return True
+        return identities
     
     def _check_ip_whitelist(self, request: Request) -> bool:
         """Check IP whitelist if configured."""
@@ -125,20 +135,6 @@ class SecurityMiddleware(BaseHTTPMiddleware):
             return real_ip
         
         return request.client.host if request.client else "unknown"
-    
-    def _cleanup_rate_limit_storage(self, current_time: float):
-        """Clean up old rate limit entries."""
-        cutoff_time = current_time - self.rate_limit_window * 2
-        
-        for client_ip in list(self.rate_limit_storage.keys()):
-            self.rate_limit_storage[client_ip] = [
-                req_time for req_time in self.rate_limit_storage[client_ip]
-                if req_time > cutoff_time
-            ]
-            
-            # Remove empty entries
-            if not self.rate_limit_storage[client_ip]:
-                del self.rate_limit_storage[client_ip]
 
 
 class LoggingMiddleware(BaseHTTPMiddleware):
@@ -257,7 +253,18 @@ class LoggingMiddleware(BaseHTTPMiddleware):
 
 
 class CacheMiddleware(BaseHTTPMiddleware):
-    """Caching middleware for API responses."""
+    """Caching middleware for API responses.
+    
+    Cache keys include the caller's credentials and content-negotiation
+    headers, so one user's response is never served to another. Cached GETs
+    carry an ETag and conditional requests are answered with 304. Successful
+    mutations invalidate the cached entries tagged with the resource path and
+    its collection; handlers can add tags with the ``X-Cache-Tags`` and
+    ``X-Cache-Invalidate`` response headers (comma separated).
+    """
+    
+    TAGS_HEADER = "X-Cache-Tags"
+    INVALIDATE_HEADER = "X-Cache-Invalidate"
     
     def __init__(self, app, config: Dict[str, Any] = None):
         """Initialize cache middleware."""
@@ -265,37 +272,85 @@ class CacheMiddleware(BaseHTTPMiddleware):
         self.config = config or {}
         self.logger = logging.getLogger(__name__)
         
-        # Simple in-memory cache (would use Redis in production)
-        self.cache = {}
+        # Bounded in-process LRU, or a SQLite file shared by all workers
+        self.cache = create_cache_backend(self.config)
         self.cache_ttl = self.config.get("cache_ttl", 300)  # 5 minutes default
         self.cacheable_methods = {"GET"}
+        self.mutating_methods = {"POST", "PUT", "PATCH", "DELETE"}
         self.cacheable_paths = self.config.get("cacheable_paths", ["/api/v1/prompts"])
+        self.max_body_bytes = self.config.get("cache_max_body_bytes", 1024 * 1024)
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request through cache middleware."""
+        if request.method in self.mutating_methods:
+            return await self._handle_mutation(request, call_next)
+        
         # Check if request is cacheable
         if not self._is_cacheable(request):
             return await call_next(request)
         
         # Generate cache key
         cache_key = self._generate_cache_key(request)
+        if_none_match = request.headers.get("if-none-match")
         
-        # Check cache
-        cached_response = self._get_cached_response(cache_key)
-        if cached_response:
-            self.logger.debug(f"Cache hit for key: {cache_key}")
-            return cached_response
+        # Check cache (unless the client asked to revalidate)
+        if "no-cache" not in request.headers.get("cache-control", ""):
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.logger.debug(f"Cache hit for key: {cache_key}")
+                if etag_matches(if_none_match, cached.etag):
+                    return self._not_modified(cached.etag)
+                return self._build_response(cached, "HIT")
         
         # Process request
         response = await call_next(request)
+        if response.status_code != 200:
+            return response
+        
+        body = await self._read_body(response)
+        etag = compute_etag(body)
+        extra_tags = self._pop_tag_header(response, self.TAGS_HEADER)
+        headers = self._storable_headers(response)
+        
+        entry = CachedResponse(
+            body=body,
+            status_code=response.status_code,
+            headers=headers,
+            media_type=response.media_type,
+            etag=etag,
+            expires_at=time.time() + self.cache_ttl,
+            tags=resource_tags(request.url.path) | extra_tags
+        )
         
         # Cache successful responses
-        if response.status_code == 200:
-            self._cache_response(cache_key, response)
+        if len(body) <= self.max_body_bytes and "no-store" not in response.headers.get("cache-control", ""):
+            self.cache.set(cache_key, entry)
             self.logger.debug(f"Cached response for key: {cache_key}")
         
+        if etag_matches(if_none_match, etag):
+            return self._not_modified(etag)
+        return self._build_response(entry, "MISS")
+    
+    async def _handle_mutation(self, request: Request, call_next: Callable) -> Response:
+        """Run a mutation and invalidate affected cache entries on success."""
+        response = await call_next(request)
+        
+        extra_tags = self._pop_tag_header(response, self.INVALIDATE_HEADER)
+        if 200 <= response.status_code < 300:
+            removed = self.invalidate_tags(invalidation_tags(request.url.path) | extra_tags)
+            if removed:
+                self.logger.debug(f"Invalidated {removed} cached responses for {request.url.path}")
+        
         return response
     
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Invalidate cached responses by tag (for use by services as well)."""
+        return self.cache.invalidate_tags(tags)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit-rate statistics."""
+        return self.cache.stats()
+    
     def _is_cacheable(self, request: Request) -> bool:
         """Check if request is cacheable."""
         if request.method not in self.cacheable_methods:
@@ -310,70 +365,54 @@ class CacheMiddleware(BaseHTTPMiddleware):
     
     def _generate_cache_key(self, request: Request) -> str:
         """Generate cache key for request."""
-        import hashlib
-        
-        key_parts = [
+        return build_cache_key(
             request.method,
             request.url.path,
-            str(sorted(request.query_params.items()))
-        ]
-        
-        key_string = "|".join(key_parts)
-        return hashlib.md5(key_string.encode()).hexdigest()
-    
-    def _get_cached_response(self, cache_key: str) -> Optional[Response]:
-        """Get cached response if available and not expired."""
-        if cache_key not in self.cache:
-            return None
-        
-        cached_data = self.cache[cache_key]
-        
-        # Check expiration
-        if time.time() > cached_data["expires_at"]:
-            del self.cache[cache_key]
-            return None
-        
-        # Return cached response
-        return Response(
-            content=cached_data["content"],
-            status_code=cached_data["status_code"],
-            headers=cached_data["headers"],
-            media_type=cached_data["media_type"]
+            request.query_params.multi_items(),
+            request.headers
         )
     
-    def _cache_response(self, cache_key: str, response: Response):
-        """Cache response data."""
-        try:
-            # Store response data
-            self.cache[cache_key] = {
-                "content": response.body,
-                "status_code": response.status_code,
-                "headers": dict(response.headers),
-                "media_type": response.media_type,
-                "expires_at": time.time() + self.cache_ttl,
-                "cached_at": time.time()
-            }
-            
-            # Clean up old cache entries periodically
-            self._cleanup_cache()
-        
-        except Exception as e:
-            self.logger.error(f"Error caching response: {e}")
+    async def _read_body(self, response: Response) -> bytes:
+        """Collect the body of a (possibly streaming) downstream response."""
+        body = getattr(response, "body", None)
+        if body is not None:
+            return body
+        
+        chunks = []
+        async for chunk in response.body_iterator:
+            chunks.append(chunk if isinstance(chunk, bytes) else chunk.encode())
+        return b"".join(chunks)
+    
+    def _storable_headers(self, response: Response) -> Dict[str, str]:
+        """Headers worth replaying from cache (length and ETag are recomputed)."""
+        skip = {"content-length", "etag", "x-cache", "x-request-id", "x-response-time"}
+        return {key: value for key, value in response.headers.items() if key.lower() not in skip}
+    
+    def _pop_tag_header(self, response: Response, header: str) -> set:
+        """Read and strip an internal tag header from a handler's response."""
+        value = response.headers.get(header)
+        if not value:
+            return set()
+        del response.headers[header]
+        return {tag.strip() for tag in value.split(",") if tag.strip()}
+    
+    def _build_response(self, entry: CachedResponse, cache_status: str) -> Response:
+        """Create the response sent to the client from a cache entry."""
+        response = Response(
+            content=entry.body,
+            status_code=entry.status_code,
+            headers=entry.headers,
+            media_type=entry.media_type
+        )
+        response.headers["ETag"] = entry.etag
+        response.headers["X-Cache"] = cache_status
+        response.headers["Cache-Control"] = f"private, max-age={self.cache_ttl}"
+        response.headers["Vary"] = "Authorization, X-API-Key, Accept, Accept-Encoding, Accept-Language"
+        return response
     
-    def _cleanup_cache(self):
-        """Clean up expired cache entries."""
-        current_time = time.time()
-        expired_keys = [
-            key for key, data in self.cache.items()
-            if current_time > data["expires_at"]
-        ]
-        
-        for key in expired_keys:
-            del self.cache[key]
-        
-        # Log cache statistics
-        if len(expired_keys) > 0:
-            self.logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
+    def _not_modified(self, etag: str) -> Response:
+        """304 response for a matching conditional request."""
+        return Response(status_code=304, headers={"ETag": etag, "X-Cache": "REVALIDATED"})
 
 
 class MetricsMiddleware(BaseHTTPMiddleware):
@@ -0,0 +1,312 @@
+"""
+Rate Limiting for MCP Admin API
+===============================
+
+GCRA (generic cell rate algorithm) rate limiter. Each key stores a single
+"theoretical arrival time" (TAT), so state is O(1) per client regardless of
+traffic. Keys whose TAT has passed are equivalent to fresh keys and are
+evicted lazily. The in-memory backend serves a single worker; the SQLite
+backend lets several workers share limits.
+"""
+
+import heapq
+import logging
+import math
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """``limit`` requests per ``window_seconds``, allowing bursts up to ``limit``."""
+
+    limit: int
+    window_seconds: float
+
+    @property
+    def emission_interval(self) -> float:
+        """Seconds of capacity each request consumes."""
+        return self.window_seconds / self.limit
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a rate-limit check, used to build response headers."""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float
+    retry_after: float = 0.0
+    scope: Optional[str] = None
+
+    def headers(self) -> Dict[str, str]:
+        """``X-RateLimit-*`` headers (plus ``Retry-After`` when rejected)."""
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if self.scope:
+            headers["X-RateLimit-Scope"] = self.scope
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+def gcra_step(tat: Optional[float], now: float,
+              rule: RateLimitRule) -> Tuple[bool, float, RateLimitResult]:
+    """Apply one request to a key's TAT.
+
+    Returns ``(allowed, new_tat, result)``. When the request is rejected
+    ``new_tat`` equals the stored TAT so the caller can leave state untouched.
+    """
+    interval = rule.emission_interval
+    base = max(tat if tat is not None else now, now)
+    new_tat = base + interval
+    allow_at = new_tat - rule.window_seconds
+
+    if now < allow_at:
+        current = base
+        return False, current, RateLimitResult(
+            allowed=False,
+            limit=rule.limit,
+            remaining=0,
+            reset_after=current - now,
+            retry_after=allow_at - now
+        )
+
+    remaining = int((now + rule.window_seconds - new_tat) / interval + 1e-9)
+    return True, new_tat, RateLimitResult(
+        allowed=True,
+        limit=rule.limit,
+        remaining=max(0, remaining),
+        reset_after=new_tat - now
+    )
+
+
+class MemoryRateLimitBackend:
+    """Per-process TAT store.
+
+    Keys are indexed by expiry in a heap of ``(tat, key)``; each call pops a
+    few expired keys from its top, so cleanup cost is amortized O(log n)
+    rather than a scan of all keys. ``max_keys`` bounds memory under floods
+    of unique clients: once every tracked key is still live, requests that
+    need a new key are rejected rather than evicting another client's state.
+    """
+
+    evictions_per_call = 8
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._tats: Dict[str, float] = {}
+        # Superseded entries stay in the heap and are skipped when popped
+        self._expiry: List[Tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self.rejected_when_full = 0
+
+    def acquire(self, checks: Sequence[Tuple[str, RateLimitRule]],
+                now: float) -> List[RateLimitResult]:
+        """Charge every key, or none of them if any key is over its limit."""
+        with self._lock:
+            self._evict_expired(now, self.evictions_per_call)
+
+            results = []
+            updates = []
+            for key, rule in checks:
+                allowed, new_tat, result = gcra_step(self._tats.get(key), now, rule)
+                results.append(result)
+                updates.append((key, new_tat))
+
+            if not all(result.allowed for result in results):
+                return results
+
+            new_keys = [index for index, (key, _) in enumerate(updates) if key not in self._tats]
+            if new_keys and len(self._tats) + len(new_keys) > self.max_keys:
+                self._evict_expired(now)
+                if len(self._tats) + len(new_keys) > self.max_keys:
+                    return self._reject_new_keys(checks, results, new_keys, now)
+
+            for key, new_tat in updates:
+                self._tats[key] = new_tat
+                heapq.heappush(self._expiry, (new_tat, key))
+            if len(self._expiry) > 2 * len(self._tats) + 64:
+                self._expiry = [(tat, key) for key, tat in self._tats.items()]
+                heapq.heapify(self._expiry)
+            return results
+
+    def _reject_new_keys(self, checks: Sequence[Tuple[str, RateLimitRule]],
+                         results: List[RateLimitResult], new_keys: List[int],
+                         now: float) -> List[RateLimitResult]:
+        """Refuse a request whose new keys do not fit; nothing is charged."""
+        self.rejected_when_full += 1
+        retry_after = max(0.0, self._expiry[0][0] - now) if self._expiry else 0.0
+        for index in new_keys:
+            results[index] = RateLimitResult(
+                allowed=False,
+                limit=checks[index][1].limit,
+                remaining=0,
+                reset_after=retry_after,
+                retry_after=retry_after
+            )
+        return results
+
+    def _evict_expired(self, now: float, limit: Optional[int] = None):
+        """Drop expired keys (at most ``limit`` heap entries) in expiry order."""
+        popped = 0
+        while self._expiry and self._expiry[0][0] <= now:
+            if limit is not None and popped >= limit:
+                return
+            tat, key = heapq.heappop(self._expiry)
+            if self._tats.get(key) == tat:
+                del self._tats[key]
+            popped += 1
+
+    def key_count(self) -> int:
+        """Number of keys currently tracked."""
+        return len(self._tats)
+
+
+class SQLiteRateLimitBackend:
+    """TAT store shared by several worker processes through one SQLite file.
+
+    Each check runs in a ``BEGIN IMMEDIATE`` transaction so concurrent workers
+    serialize on the write lock. Expired rows are deleted every
+    ``cleanup_interval`` checks through the ``tat`` index.
+    """
+
+    cleanup_interval = 256
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.logger = logging.getLogger(__name__)
+        self._local = threading.local()
+        self._calls = 0
+        self._initialize()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection reused across requests."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _initialize(self):
+        """Create the rate limit table."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                limit_key TEXT PRIMARY KEY,
+                tat REAL NOT NULL
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_rate_limits_tat ON rate_limits(tat);
+        """)
+
+    def acquire(self, checks: Sequence[Tuple[str, RateLimitRule]],
+                now: float) -> List[RateLimitResult]:
+        """Charge every key, or none of them if any key is over its limit."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            results = []
+            updates = []
+            for key, rule in checks:
+                row = conn.execute(
+                    "SELECT tat FROM rate_limits WHERE limit_key = ?", (key,)
+                ).fetchone()
+                allowed, new_tat, result = gcra_step(row[0] if row else None, now, rule)
+                results.append(result)
+                updates.append((key, new_tat))
+
+            if all(result.allowed for result in results):
+                conn.executemany(
+                    "INSERT INTO rate_limits (limit_key, tat) VALUES (?, ?) "
+                    "ON CONFLICT(limit_key) DO UPDATE SET tat = excluded.tat",
+                    updates
+                )
+
+            self._calls += 1
+            if self._calls % self.cleanup_interval == 0:
+                conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,))
+            conn.execute("COMMIT")
+            return results
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def key_count(self) -> int:
+        """Number of keys currently stored."""
+        return self._connect().execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+
+class RateLimiter:
+    """Applies per-scope GCRA rules (e.g. ``ip``, ``api_key``, ``user``)."""
+
+    def __init__(self, rules: Dict[str, RateLimitRule],
+                 backend: Union[MemoryRateLimitBackend, SQLiteRateLimitBackend, None] = None):
+        self.rules = rules
+        self.backend = backend or MemoryRateLimitBackend()
+
+    def check(self, identities: Dict[str, Optional[str]],
+              now: Optional[float] = None) -> RateLimitResult:
+        """Check the caller against every scope it has an identity for.
+
+        A request is charged against all scopes only if all of them allow it.
+        The returned result is the rejecting scope, or otherwise the scope with
+        the fewest remaining requests.
+        """
+        checks = [
+            (f"{scope}:{identity}", self.rules[scope], scope)
+            for scope, identity in identities.items()
+            if identity and scope in self.rules
+        ]
+        if not checks:
+            return RateLimitResult(allowed=True, limit=0, remaining=0, reset_after=0.0)
+
+        results = self.backend.acquire(
+            [(key, rule) for key, rule, _ in checks],
+            now if now is not None else time.time()
+        )
+        for result, (_, _, scope) in zip(results, checks):
+            result.scope = scope
+
+        rejected = [result for result in results if not result.allowed]
+        if rejected:
+            return max(rejected, key=lambda result: result.retry_after)
+        return min(results, key=lambda result: result.remaining)
+
+
+def create_rate_limiter(config: Dict) -> RateLimiter:
+    """Build the limiter described by the security middleware config.
+
+    ``rate_limits`` maps a scope to ``{"limit": n, "window_seconds": s}``;
+    ``rate_limit_backend`` is ``"memory"`` (default) or ``"sqlite"``.
+    """
+    default_rules = {
+        "ip": {"limit": 100, "window_seconds": 60},
+        "api_key": {"limit": 600, "window_seconds": 60},
+        "user": {"limit": 300, "window_seconds": 60},
+    }
+    rules = {
+        scope: RateLimitRule(int(rule["limit"]), float(rule["window_seconds"]))
+        for scope, rule in config.get("rate_limits", default_rules).items()
+    }
+
+    backend_name = config.get("rate_limit_backend", "memory")
+    if backend_name == "sqlite":
+        default_path = Path.home() / ".kiro" / "mcp-admin" / "data" / "rate_limits.db"
+        backend = SQLiteRateLimitBackend(config.get("rate_limit_db_path", default_path))
+    elif backend_name == "memory":
+        backend = MemoryRateLimitBackend(max_keys=config.get("rate_limit_max_keys", 100000))
+    else:
+        raise ValueError(f"Unknown rate limit backend: {backend_name}")
+
+    return RateLimiter(rules, backend)
@@ -0,0 +1,365 @@
+"""
+Response Cache for MCP Admin API
+================================
+
+Storage backends and key/tag helpers used by ``CacheMiddleware``.
+
+Entries are keyed by request method, path, query, the authenticated principal
+and content-negotiation headers, carry a strong ETag, and are tagged so that
+mutations can invalidate every cached view of a resource. The in-memory
+backend is a bounded LRU; the SQLite backend lets several uvicorn workers
+share one cache.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+
+# Request headers that change the representation and must be part of the key
+VARY_HEADERS = ("accept", "accept-encoding", "accept-language")
+
+# Request headers that identify the caller
+PRINCIPAL_HEADERS = ("authorization", "x-api-key")
+
+
+@dataclass
+class CachedResponse:
+    """A stored response body with its metadata."""
+    body: bytes
+    status_code: int
+    headers: Dict[str, str]
+    media_type: Optional[str]
+    etag: str
+    expires_at: float
+    tags: Set[str] = field(default_factory=set)
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Check whether the entry's TTL has elapsed."""
+        return (now if now is not None else time.time()) >= self.expires_at
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag derived from the response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def strip_weak(value: str) -> str:
+        value = value.strip()
+        return value[2:] if value.startswith("W/") else value
+
+    target = strip_weak(etag)
+    return any(strip_weak(candidate) == target for candidate in if_none_match.split(","))
+
+
+def principal_fingerprint(headers: Dict[str, str]) -> str:
+    """Stable, non-reversible identifier for the caller's credentials."""
+    parts = [f"{name}={headers.get(name, '')}" for name in PRINCIPAL_HEADERS]
+    if not any(headers.get(name) for name in PRINCIPAL_HEADERS):
+        return "anonymous"
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:32]
+
+
+def build_cache_key(method: str, path: str, query_items: Iterable[Tuple[str, str]],
+                    headers: Dict[str, str]) -> str:
+    """Build the cache key for a request.
+
+    ``headers`` must use lower-case names (as Starlette's ``Headers`` does).
+    """
+    key_parts = [
+        method.upper(),
+        path,
+        json.dumps(sorted(query_items)),
+        principal_fingerprint(headers),
+    ]
+    key_parts.extend(f"{name}={headers.get(name, '')}" for name in VARY_HEADERS)
+    return hashlib.sha256("\n".join(key_parts).encode()).hexdigest()
+
+
+def resource_tags(path: str) -> Set[str]:
+    """Tags a cached GET is stored under: the resource path itself."""
+    return {path.rstrip("/") or "/"}
+
+
+def invalidation_tags(path: str) -> Set[str]:
+    """Tags a mutation on ``path`` invalidates: the resource and its collection."""
+    normalized = path.rstrip("/") or "/"
+    tags = {normalized}
+    parent = normalized.rsplit("/", 1)[0]
+    if parent:
+        tags.add(parent)
+    return tags
+
+
+class MemoryCacheBackend:
+    """Per-process bounded LRU with lazy O(1) expiry and a tag index."""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return a live entry and mark it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.is_expired():
+                self._remove_locked(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: str, entry: CachedResponse):
+        """Store an entry, evicting the least recently used if full."""
+        with self._lock:
+            if key in self._entries:
+                self._remove_locked(key)
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                oldest_key = next(iter(self._entries))
+                self._remove_locked(oldest_key)
+                self.evictions += 1
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of ``tags``."""
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tag_index.get(tag, ())):
+                    if key in self._entries:
+                        self._remove_locked(key)
+                        removed += 1
+        return removed
+
+    def clear(self):
+        """Drop everything."""
+        with self._lock:
+            self._entries.clear()
+            self._tag_index.clear()
+
+    def _remove_locked(self, key: str):
+        """Remove an entry and its tag references (caller holds the lock)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def stats(self) -> Dict[str, float]:
+        """Size and hit-rate statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions
+            }
+
+
+class SQLiteCacheBackend:
+    """Cache shared by several worker processes through one SQLite file.
+
+    WAL mode lets readers in other workers proceed while one worker writes.
+    The table is trimmed back to ``max_entries`` every ``trim_interval``
+    writes, oldest ``last_access`` first via its index.
+    """
+
+    trim_interval = 64
+
+    def __init__(self, db_path: Path, max_entries: int = 5000):
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.logger = logging.getLogger(__name__)
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._initialize()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection reused across requests."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _initialize(self):
+        """Create the cache tables."""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS response_cache (
+                cache_key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                status_code INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                media_type TEXT,
+                etag TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_response_cache_last_access
+                ON response_cache(last_access);
+            CREATE TABLE IF NOT EXISTS response_cache_tags (
+                tag TEXT NOT NULL,
+                cache_key TEXT NOT NULL,
+                PRIMARY KEY (tag, cache_key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_response_cache_tags_key
+                ON response_cache_tags(cache_key);
+        """)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """Return a live entry and refresh its access time."""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT body, status_code, headers, media_type, etag, expires_at "
+            "FROM response_cache WHERE cache_key = ?", (key,)
+        ).fetchone()
+
+        now = time.time()
+        if row is None or row[5] <= now:
+            if row is not None:
+                self._delete_keys(conn, [key])
+            self.misses += 1
+            return None
+
+        conn.execute("UPDATE response_cache SET last_access = ? WHERE cache_key = ?", (now, key))
+        self.hits += 1
+        return CachedResponse(
+            body=row[0],
+            status_code=row[1],
+            headers=json.loads(row[2]),
+            media_type=row[3],
+            etag=row[4],
+            expires_at=row[5]
+        )
+
+    def set(self, key: str, entry: CachedResponse):
+        """Store an entry and trim the table to ``max_entries``."""
+        conn = self._connect()
+        now = time.time()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache "
+                "(cache_key, body, status_code, headers, media_type, etag, expires_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, entry.body, entry.status_code, json.dumps(entry.headers),
+                 entry.media_type, entry.etag, entry.expires_at, now)
+            )
+            conn.execute("DELETE FROM response_cache_tags WHERE cache_key = ?", (key,))
+            conn.executemany(
+                "INSERT OR IGNORE INTO response_cache_tags (tag, cache_key) VALUES (?, ?)",
+                [(tag, key) for tag in entry.tags]
+            )
+
+            self._writes += 1
+            if self._writes % self.trim_interval == 0:
+                self._trim(conn)
+            conn.execute("COMMIT")
+        except Exception as e:
+            conn.execute("ROLLBACK")
+            self.logger.error(f"Failed to store cached response: {e}")
+
+    def _trim(self, conn: sqlite3.Connection):
+        """Evict least recently used entries beyond ``max_entries``."""
+        overflow = conn.execute("SELECT COUNT(*) FROM response_cache").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            stale = [r[0] for r in conn.execute(
+                "SELECT cache_key FROM response_cache ORDER BY last_access LIMIT ?", (overflow,)
+            )]
+            self._delete_keys(conn, stale)
+
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of ``tags`` (visible to all workers)."""
+        tags = list(tags)
+        if not tags:
+            return 0
+        conn = self._connect()
+        placeholders = ",".join("?" * len(tags))
+        keys = [r[0] for r in conn.execute(
+            f"SELECT DISTINCT cache_key FROM response_cache_tags WHERE tag IN ({placeholders})", tags
+        )]
+        if keys:
+            conn.execute("BEGIN IMMEDIATE")
+            self._delete_keys(conn, keys)
+            conn.execute("COMMIT")
+        return len(keys)
+
+    def _delete_keys(self, conn: sqlite3.Connection, keys: List[str]):
+        """Delete entries and their tag rows."""
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            conn.execute(f"DELETE FROM response_cache WHERE cache_key IN ({placeholders})", chunk)
+            conn.execute(f"DELETE FROM response_cache_tags WHERE cache_key IN ({placeholders})", chunk)
+
+    def clear(self):
+        """Drop everything."""
+        conn = self._connect()
+        conn.execute("DELETE FROM response_cache")
+        conn.execute("DELETE FROM response_cache_tags")
+
+    def stats(self) -> Dict[str, float]:
+        """Size and per-process hit-rate statistics."""
+        size = self._connect().execute("SELECT COUNT(*) FROM response_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "backend": "sqlite",
+            "size": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+def create_cache_backend(config: Dict) -> Union[MemoryCacheBackend, SQLiteCacheBackend]:
+    """Build the backend selected by the middleware config."""
+    backend = config.get("cache_backend", "memory")
+    max_entries = config.get("cache_max_entries", 1000)
+
+    if backend == "sqlite":
+        default_path = Path.home() / ".kiro" / "mcp-admin" / "data" / "api_cache.db"
+        return SQLiteCacheBackend(config.get("cache_db_path", default_path), max_entries=max_entries)
+    if backend == "memory":
+        return MemoryCacheBackend(max_entries=max_entries)
+    raise ValueError(f"Unknown cache backend: {backend}")
@@ -15,7 +15,7 @@ from pydantic import BaseModel, Field
 import uvicorn
 
 from .auth import AuthenticationManager
-from .middleware import SecurityMiddleware, LoggingMiddleware
+from .middleware import SecurityMiddleware, LoggingMiddleware, CacheMiddleware
 
 
 # Pydantic models for API requests/responses
@@ -138,14 +138,26 @@ def create_app(config: Dict[str, Any] = None) -> FastAPI:
         allow_headers=["*"],
     )
     
-    # Add custom middleware
-    app.add_middleware(SecurityMiddleware)
-    app.add_middleware(LoggingMiddleware)
+    # Add custom middleware (added first = innermost, so the cache sits
+    # behind rate limiting and request logging)
+    cache_config = dict(config.get("cache", {}))
+    cache_config.setdefault("cacheable_paths", ["/api/v1/prompts", "/api/v1/analytics"])
+    app.add_middleware(CacheMiddleware, config=cache_config)
     
     # Initialize authentication
     auth_manager = AuthenticationManager()
     security = HTTPBearer()
     
+    def resolve_rate_limit_user(token: str) -> Optional[str]:
+        """Map a bearer token to the user it is rate limited as."""
+        user = auth_manager.validate_token(token)
+        return user.user_id if user else None
+    
+    security_config = dict(config.get("security", {}))
+    security_config.setdefault("user_resolver", resolve_rate_limit_user)
+    app.add_middleware(SecurityMiddleware, config=security_config)
+    app.add_middleware(LoggingMiddleware)
+    
     async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
         """Get current authenticated user."""
         user = auth_manager.validate_token(credentials.credentials)
@@ -389,10 +401,13 @@ def create_app(config: Dict[str, Any] = None) -> FastAPI:
     # Analytics endpoints
     @app.get("/api/v1/analytics/summary", tags=["Analytics"])
     async def get_analytics_summary(
+        response: Response,
         current_user = Depends(get_current_user)
     ):
         """Get analytics summary."""
         try:
+            # Summary counts depend on prompts; drop the cached copy when they change
+            response.headers[CacheMiddleware.TAGS_HEADER] = "/api/v1/prompts"
             return APIResponse(
                 success=True,
                 message="Analytics summary retrieved",
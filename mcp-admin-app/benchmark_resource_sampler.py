@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark the resource sampler's CPU overhead with many server processes.
+
+Spawns idle child processes standing in for MCP servers, samples them
+repeatedly and reports the sampler's CPU time as a share of the sampling
+interval. Exits non-zero if the overhead reaches 1%.
+
+Usage: python benchmark_resource_sampler.py [server_count] [interval_seconds]
+"""
+
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+app_dir = Path(__file__).parent
+sys.path.insert(0, str(app_dir))
+
+from data.database import DatabaseManager
+from services.resource_sampler import ResourceSampler
+
+
+def spawn_idle_processes(count):
+    sleep = shutil.which("sleep")
+    command = [sleep, "600"] if sleep else [sys.executable, "-c", "import time; time.sleep(600)"]
+    return [subprocess.Popen(command, stdin=subprocess.DEVNULL) for _ in range(count)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    processes = spawn_idle_processes(count)
+    temp_dir = tempfile.mkdtemp()
+    try:
+        db_manager = DatabaseManager(Path(temp_dir) / "bench.db")
+        db_manager.initialize(initialize_vector_db=False)
+        sessions = {
+            f"server-{i}": SimpleNamespace(pid=process.pid, request_count=0, latency_total=0.0)
+            for i, process in enumerate(processes)
+        }
+        sampler = ResourceSampler(lambda: sessions, db_manager, interval=interval)
+        if not sampler.reader.available:
+            print("Neither /proc nor psutil is available; nothing to measure")
+            return 0
+
+        timings = []
+        for round_number in range(50):
+            for session in sessions.values():
+                session.request_count += 3
+                session.latency_total += 0.006
+            started = time.thread_time()
+            sampler.sample_once()
+            timings.append(time.thread_time() - started)
+
+        started = time.perf_counter()
+        rows = sampler.flush()
+        flush_ms = (time.perf_counter() - started) * 1000
+
+        per_sample = statistics.median(timings)
+        overhead = per_sample / interval * 100
+        print(f"Sampling {count} server processes every {interval:g}s "
+              f"({'proc' if sampler.reader.use_proc else 'psutil'} reader)")
+        print(f"  CPU per sample   median {per_sample * 1000:.2f} ms, max {max(timings) * 1000:.2f} ms")
+        print(f"  overhead         {overhead:.3f}% of one core")
+        print(f"  flush            {rows} rows in {flush_ms:.1f} ms")
+        return 0 if overhead < 1.0 else 1
+    finally:
+        for process in processes:
+            process.kill()
+            process.wait()
+        shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
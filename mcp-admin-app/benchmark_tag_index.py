@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark related-tool lookups through the tag similarity index against
+the full registry scan.
+
+Usage: python benchmark_tag_index.py [tool_count]
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+app_dir = Path(__file__).parent
+sys.path.insert(0, str(app_dir))
+
+from benchmark_tool_classifier import synthetic_schemas
+from services.tag_index import TagSimilarityIndex
+from services.tool_discovery import ToolDiscoveryEngine
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    engine = ToolDiscoveryEngine()
+    registry = sorted((
+        SimpleNamespace(id=f"tool-{i}", name=schema["function"]["name"], category=None,
+                        metadata=SimpleNamespace(tags=engine._generate_tags(schema)))
+        for i, schema in enumerate(synthetic_schemas(count))
+    ), key=lambda tool: tool.name)
+
+    index = TagSimilarityIndex()
+    started = time.perf_counter()
+    index.rebuild((tool.id, tool.name, tool.metadata.tags) for tool in registry)
+    print(f"Indexed {count} tools in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    queries = random.Random(5).sample(registry, 200)
+    timings, mismatches = [], 0
+    for tool in queries:
+        started = time.perf_counter()
+        related = index.related(tool.id)
+        timings.append((time.perf_counter() - started) * 1000)
+        expected = engine.get_related_tools(tool.name, tool.metadata.tags, registry)
+        if [(r["name"], r["similarity"]) for r in related] != [(r["name"], r["similarity"]) for r in expected]:
+            mismatches += 1
+
+    started = time.perf_counter()
+    for tool in queries[:20]:
+        engine.get_related_tools(tool.name, tool.metadata.tags, registry)
+    scan_ms = (time.perf_counter() - started) * 1000 / 20
+
+    timings.sort()
+    print(f"  index lookup   median {statistics.median(timings):.2f} ms, "
+          f"p95 {timings[int(len(timings) * 0.95)]:.2f} ms")
+    print(f"  full scan      mean {scan_ms:.1f} ms")
+    print(f"  mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled tool classifier against per-pattern regex scans
+over synthetic tool schemas.
+
+Usage: python benchmark_tool_classifier.py [tool_count]
+"""
+
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+app_dir = Path(__file__).parent
+sys.path.insert(0, str(app_dir))
+
+from models.tool import SecurityLevel, ToolCategory
+from services.tool_classifier import schema_fingerprint
+from services.tool_discovery import ToolDiscoveryEngine
+
+
+VOCABULARY = (
+    "file read write copy directory path csv json search query web url http api google "
+    "code analyze parse python javascript syntax data transform sql database filter sort "
+    "rest graphql webhook endpoint oauth token system service daemon monitor status shell "
+    "execute email send notify slack chat sms calendar schedule task note document template "
+    "security encrypt hash password certificate scan audit metric log event performance "
+    "delete admin kernel config modify launch network fetch list view display validate "
+    "calculate the a of for to with from into using given returns each all new"
+).split()
+
+
+def synthetic_schemas(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    schemas = []
+    for i in range(count):
+        name = "_".join(rng.choice(VOCABULARY) for _ in range(rng.randint(1, 3))) + f"_{i}"
+        description = " ".join(rng.choice(VOCABULARY) for _ in range(rng.randint(4, 24)))
+        schemas.append({
+            "type": "function",
+            "function": {
+                "name": name,
+                "description": description,
+                "parameters": {"type": "object", "properties": {"input": {"type": "string"}}}
+            }
+        })
+    return schemas
+
+
+def legacy_classify(engine: ToolDiscoveryEngine, schema):
+    """The per-pattern ``re.findall`` / ``re.search`` evaluation."""
+    function_info = schema["function"]
+    text = f"{function_info['name']} {function_info['description']}".lower()
+
+    scores = {}
+    for category, patterns in engine.category_patterns.items():
+        scores[category] = sum(len(re.findall(p, text)) * (1.0 / len(patterns)) for p in patterns)
+    if max(scores.values()) == 0:
+        category, confidence = ToolCategory.GENERAL, 0.0
+    else:
+        category = max(scores, key=scores.get)
+        confidence = min(scores[category], 1.0)
+
+    security_level = SecurityLevel.MEDIUM
+    for level, patterns in engine.security_patterns.items():
+        if any(re.search(p, text) for p in patterns):
+            security_level = level
+            break
+    return category, confidence, security_level
+
+
+def timed(label, fn):
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+    print(f"  {label:<36} {elapsed * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    engine = ToolDiscoveryEngine()
+    engine.classifier.cache_size = count
+    schemas = synthetic_schemas(count)
+    fingerprints = [schema_fingerprint(schema) for schema in schemas]
+
+    print(f"Classifying {count} synthetic tools")
+    legacy = timed("per-pattern regex", lambda: [legacy_classify(engine, s) for s in schemas])
+    timed("compiled classifier", lambda: [
+        engine.classifier.classify_text(f"{s['function']['name']} {s['function']['description']}".lower())
+        for s in schemas
+    ])
+    compiled = timed("batch, cold memo", lambda: engine.classify_batch(list(zip(schemas, fingerprints))))
+    timed("batch, warm memo", lambda: engine.classify_batch(list(zip(schemas, fingerprints))))
+
+    mismatches = sum(
+        1 for old, new in zip(legacy, compiled)
+        if old != (new.category, new.confidence, new.security_level)
+    )
+    print(f"  mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -10,9 +10,11 @@ Features a modern, Substack-inspired design system.
 import tkinter as tk
 from tkinter import ttk, messagebox
 import logging
-from typing import Dict, Optional
+import time
+from typing import Callable, Dict, Optional
 
 from .config import ConfigurationManager
+from .startup_profile import StartupProfiler
 from data.database import DatabaseManager
 from services.server_manager import ServerManager
 from services.tool_manager import AdvancedToolManager
@@ -22,18 +24,6 @@ from services.audit_service import AuditService
 from services.llm_manager import LLMManager
 from services.monitoring_service import MonitoringService
 
-from ui.modern_servers_page import ModernServersPage
-from ui.tools_page import ToolsPage
-from ui.prompts_page import PromptsPage
-from ui.modern_prompt_management_page import ModernPromptManagementPage
-from ui.security_page import SecurityPage
-from ui.security_dashboard_page import SecurityDashboardPage
-from ui.audit_page import AuditPage
-from ui.llm_page import LLMPage
-from ui.monitoring_page import MonitoringPage
-from ui.collaboration_page import CollaborationPage
-from ui.analytics_dashboard_page import AnalyticsDashboardPage
-from ui.evaluation_testing_page import EvaluationTestingPage
 from ui.service_bridge import UIServiceBridge
 from ui.state_manager import initialize_state_manager
 from ui.accessibility_utils import setup_accessibility
@@ -43,7 +33,9 @@ from ui.design_system import DesignSystem
 class MCPAdminApp(tk.Tk):
     """Enhanced MCP Administration Application."""
     
-    def __init__(self):
+    INITIAL_PAGE = "prompt_management"
+    
+    def __init__(self, profiler: Optional[StartupProfiler] = None):
         super().__init__()
         self.logger = logging.getLogger(__name__)
         
@@ -51,41 +43,60 @@ class MCPAdminApp(tk.Tk):
         self.config_manager = ConfigurationManager()
         self.db_manager = DatabaseManager(self.config_manager.database_path)
         
+        app_settings = self.config_manager.get_app_settings()
+        self.profiler = profiler or StartupProfiler(import_budget_ms=app_settings.import_time_budget_ms)
+        
         # Initialize UI infrastructure
-        self.state_manager = initialize_state_manager()
-        self.service_bridge = UIServiceBridge(self.config_manager, self.db_manager)
+        with self.profiler.phase("ui_infrastructure"):
+            self.state_manager = initialize_state_manager()
+            self.service_bridge = UIServiceBridge(self.config_manager, self.db_manager,
+                                                  profiler=self.profiler)
         
         # Initialize services
-        self._initialize_services()
+        with self.profiler.phase("core_services"):
+            self._initialize_services()
         
         # Setup UI
-        self._setup_ui()
-        
-        # Setup accessibility
-        self.accessibility = setup_accessibility(self)
+        with self.profiler.phase("main_window"):
+            self._setup_ui()
+            
+            # Setup accessibility
+            self.accessibility = setup_accessibility(self)
         
         # Initialize pages
-        self._initialize_pages()
+        with self.profiler.phase("initial_page"):
+            self._initialize_pages()
         
         # Start monitoring
         self._start_monitoring()
         
+        # Warm deferred services once the first frame has painted
+        self.after_idle(self._on_first_paint)
+        
         self.logger.info("MCP Admin Application initialized")
     
     def _initialize_services(self):
         """Initialize all application services."""
         try:
-            # Initialize database
-            self.db_manager.initialize()
+            # Initialize database; the vector store is warmed after first paint
+            self._timed_init("database", lambda: self.db_manager.initialize(initialize_vector_db=False))
             
             # Initialize core services
-            self.server_manager = ServerManager(self.config_manager, self.db_manager)
-            self.tool_manager = AdvancedToolManager(self.db_manager)
-            self.prompt_manager = PromptManager(self.config_manager, self.db_manager)
-            self.security_service = SecurityService(self.db_manager)
-            self.audit_service = AuditService(self.db_manager)
-            self.llm_manager = LLMManager(self.config_manager, self.db_manager)
-            self.monitoring_service = MonitoringService(self.db_manager, self.server_manager)
+            self.server_manager = self._timed_init(
+                "server_manager", lambda: ServerManager(self.config_manager, self.db_manager))
+            self.audit_service = self._timed_init(
+                "audit_service", lambda: AuditService(self.db_manager))
+            self.tool_manager = self._timed_init(
+                "tool_manager", lambda: AdvancedToolManager(
+                    self.db_manager, self.server_manager, self.audit_service))
+            self.prompt_manager = self._timed_init(
+                "prompt_manager", lambda: PromptManager(self.config_manager, self.db_manager))
+            self.security_service = self._timed_init(
+                "security_service", lambda: SecurityService(self.db_manager))
+            self.llm_manager = self._timed_init(
+                "llm_manager", lambda: LLMManager(self.config_manager, self.db_manager))
+            self.monitoring_service = self._timed_init(
+                "monitoring_service", lambda: MonitoringService(self.db_manager, self.server_manager))
             
             self.logger.info("All services initialized successfully")
             
@@ -94,6 +105,13 @@ class MCPAdminApp(tk.Tk):
             messagebox.showerror("Initialization Error", f"Failed to initialize application services: {e}")
             raise
     
+    def _timed_init(self, name: str, factory: Callable):
+        """Run a service constructor and record its init time in the startup profile."""
+        start = time.perf_counter()
+        result = factory()
+        self.profiler.record_service(name, time.perf_counter() - start)
+        return result
+    
     def _setup_ui(self):
         """Setup the main application UI with modern design."""
         self.title("MCP Admin")
@@ -237,116 +255,152 @@ class MCPAdminApp(tk.Tk):
         self.db_status_label.pack()
     
     def _initialize_pages(self):
-        """Initialize all application pages."""
-        try:
-            print("DEBUG: Starting page initialization...")
-            
-            # Create page instances
-            try:
-                print("DEBUG: Creating modern servers page...")
-                self.pages["servers"] = ModernServersPage(self.content, self.server_manager, self.monitoring_service)
-                print("DEBUG: Modern servers page created successfully")
-            except Exception as e:
-                print(f"DEBUG: Failed to create modern servers page: {e}")
-            
-            try:
-                print("DEBUG: Creating tools page...")
-                self.pages["tools"] = ToolsPage(self.content, self.tool_manager, self.server_manager)
-                print("DEBUG: Tools page created successfully")
-            except Exception as e:
-                print(f"DEBUG: Failed to create tools page: {e}")
-            
-            try:
-                print("DEBUG: Creating prompts page...")
-                self.pages["prompts"] = PromptsPage(self.content, self.prompt_manager, self.tool_manager)
-                print("DEBUG: Prompts page created successfully")
-            except Exception as e:
-                print(f"DEBUG: Failed to create prompts page: {e}")
-            
+        """Register page factories and build only the initial page.
+        
+        Page modules are imported inside their factories, so a page costs
+        nothing until it is first shown or pre-built after first paint.
+        """
+        def servers_page():
+            from ui.modern_servers_page import ModernServersPage
+            return ModernServersPage(self.content, self.server_manager, self.monitoring_service)
+        
+        def tools_page():
+            from ui.tools_page import ToolsPage
+            return ToolsPage(self.content, self.tool_manager, self.server_manager)
+        
+        def prompts_page():
+            from ui.prompts_page import PromptsPage
+            return PromptsPage(self.content, self.prompt_manager, self.tool_manager)
+        
+        def prompt_management_page():
+            from ui.modern_prompt_management_page import ModernPromptManagementPage
             # Advanced prompt management with all services
-            try:
-                print("DEBUG: Creating modern prompt management page...")
-                prompt_services = {
-                    'template_service': self.prompt_manager,
-                    'security_service': self.security_service,
-                    'collaboration_service': None,  # Placeholder for collaboration service
-                    'analytics_service': None,      # Placeholder for analytics service
-                    'evaluation_service': None      # Placeholder for evaluation service
-                }
-                self.pages["prompt_management"] = ModernPromptManagementPage(self.content, prompt_services)
-                print("DEBUG: Modern prompt management page created successfully")
-            except Exception as e:
-                print(f"DEBUG: Failed to create modern prompt management page: {e}")
-            
-            # New integrated pages
-            try:
-                print("DEBUG: Creating security dashboard page...")
-                security_services = {
-                    'security_scanner': self.security_service,
-                    'config_manager': self.config_manager,
-                    'db_manager': self.db_manager
-                }
-                self.pages["security_dashboard"] = SecurityDashboardPage(self.content, security_services)
-                print("DEBUG: Security dashboard page created successfully")
-            except Exception as e:
-                print(f"DEBUG: Failed to create security dashboard page: {e}")
-            
-            try:
-                print("DEBUG: Creating analytics page...")
-                self.pages["analytics"] = AnalyticsDashboardPage(self.content, self.config_manager, self.db_manager)
-                print("DEBUG: Analytics page created successfully")
-            except Exception as e:
-                print(f"DEBUG: Failed to create analytics page: {e}")
-            
-            try:
-                print("DEBUG: Creating evaluation page...")
-                self.pages["evaluation"] = EvaluationTestingPage(self.content, self.config_manager, self.db_manager)
-                print("DEBUG: Evaluation page created successfully")
-            except Exception as e:
-                print(f"DEBUG: Failed to create evaluation page: {e}")
-            
-            # Existing pages
-            try:
-                print("DEBUG: Creating LLM page...")
-                self.pages["llm"] = LLMPage(self.content, self.llm_manager)
-                print("DEBUG: LLM page created successfully")
-            except Exception as e:
-                print(f"DEBUG: Failed to create LLM page: {e}")
-            
-            try:
-                print("DEBUG: Creating security page...")
-                self.pages["security"] = SecurityPage(self.content, self.security_service)
-                print("DEBUG: Security page created successfully")
-            except Exception as e:
-                print(f"DEBUG: Failed to create security page: {e}")
-            
-            try:
-                print("DEBUG: Creating audit page...")
-                self.pages["audit"] = AuditPage(self.content, self.audit_service)
-                print("DEBUG: Audit page created successfully")
-            except Exception as e:
-                print(f"DEBUG: Failed to create audit page: {e}")
-            
-            try:
-                print("DEBUG: Creating monitoring page...")
-                self.pages["monitoring"] = MonitoringPage(self.content, self.monitoring_service, self.server_manager)
-                print("DEBUG: Monitoring page created successfully")
-            except Exception as e:
-                print(f"DEBUG: Failed to create monitoring page: {e}")
-            
-            print(f"DEBUG: Successfully created pages: {list(self.pages.keys())}")
-            
-            # Show initial page
-            print("DEBUG: Showing initial page: prompt_management")
-            self.show_page("prompt_management")
-            
-            self.logger.info("All pages initialized successfully")
-            
+            prompt_services = {
+                'template_service': self.prompt_manager,
+                'security_service': self.security_service,
+                'collaboration_service': None,  # Placeholder for collaboration service
+                'analytics_service': None,      # Placeholder for analytics service
+                'evaluation_service': None      # Placeholder for evaluation service
+            }
+            return ModernPromptManagementPage(self.content, prompt_services)
+        
+        def security_dashboard_page():
+            from ui.security_dashboard_page import SecurityDashboardPage
+            security_services = {
+                'security_scanner': self.security_service,
+                'config_manager': self.config_manager,
+                'db_manager': self.db_manager
+            }
+            return SecurityDashboardPage(self.content, security_services)
+        
+        def analytics_page():
+            from ui.analytics_dashboard_page import AnalyticsDashboardPage
+            return AnalyticsDashboardPage(self.content, self.config_manager, self.db_manager)
+        
+        def evaluation_page():
+            from ui.evaluation_testing_page import EvaluationTestingPage
+            return EvaluationTestingPage(self.content, self.config_manager, self.db_manager)
+        
+        def llm_page():
+            from ui.llm_page import LLMPage
+            return LLMPage(self.content, self.llm_manager)
+        
+        def security_page():
+            from ui.security_page import SecurityPage
+            return SecurityPage(self.content, self.security_service)
+        
+        def audit_page():
+            from ui.audit_page import AuditPage
+            return AuditPage(self.content, self.audit_service)
+        
+        def monitoring_page():
+            from ui.monitoring_page import MonitoringPage
+            return MonitoringPage(self.content, self.monitoring_service, self.server_manager)
+        
+        self.page_factories: Dict[str, Callable[[], tk.Frame]] = {
+            "servers": servers_page,
+            "tools": tools_page,
+            "prompts": prompts_page,
+            "prompt_management": prompt_management_page,
+            "security_dashboard": security_dashboard_page,
+            "analytics": analytics_page,
+            "evaluation": evaluation_page,
+            "llm": llm_page,
+            "security": security_page,
+            "audit": audit_page,
+            "monitoring": monitoring_page,
+        }
+        
+        try:
+            self.show_page(self.INITIAL_PAGE)
+            self.logger.info("Initial page initialized; remaining pages are built on demand")
         except Exception as e:
-            print(f"DEBUG: Failed to initialize pages: {e}")
             self.logger.error(f"Failed to initialize pages: {e}")
             messagebox.showerror("UI Error", f"Failed to initialize user interface: {e}")
     
+    def _get_page(self, page_key: str) -> Optional[tk.Frame]:
+        """Return a page, constructing it on first request."""
+        if page_key in self.pages:
+            return self.pages[page_key]
+        
+        factory = self.page_factories.get(page_key)
+        if factory is None:
+            return None
+        
+        start = time.perf_counter()
+        try:
+            self.pages[page_key] = factory()
+        except Exception as e:
+            self.logger.error(f"Failed to create {page_key} page: {e}")
+            return None
+        self.profiler.record_service(f"page:{page_key}", time.perf_counter() - start)
+        
+        return self.pages[page_key]
+    
+    def _on_first_paint(self):
+        """Record first paint, then warm deferred work in the background."""
+        self.profiler.mark("first_paint")
+        self.profiler.stop_import_timing()
+        self.profiler.check_import_budget()
+        self._write_startup_profile()
+        
+        def warm_vector_db():
+            vector_db = self.db_manager.prompt_db.vector_db
+            if vector_db.is_available:
+                vector_db.warm_up()
+            return vector_db
+        
+        self.service_bridge.services.register("vector_db", warm_vector_db)
+        self.service_bridge.warm_up_services(
+            on_complete=lambda: self.after(0, self._on_services_warm)
+        )
+        
+        # Pre-build remaining pages one per idle tick to keep the UI responsive
+        self._pending_pages = [key for key in self.page_factories if key not in self.pages]
+        self.after(250, self._prebuild_next_page)
+    
+    def _prebuild_next_page(self):
+        """Construct one not-yet-shown page while the UI is idle."""
+        pending = getattr(self, '_pending_pages', [])
+        while pending and pending[0] in self.pages:
+            pending.pop(0)
+        if not pending:
+            return
+        
+        self._get_page(pending.pop(0))
+        self.after(50, self._prebuild_next_page)
+    
+    def _on_services_warm(self):
+        """Called on the Tk thread once background warm-up has finished."""
+        self.profiler.mark("services_warm")
+        self._write_startup_profile()
+    
+    def _write_startup_profile(self):
+        """Write the startup profile report next to the application logs."""
+        if not self.config_manager.get_app_settings().startup_profile_enabled:
+            return
+        self.profiler.write_report(self.config_manager.logs_dir / "startup-profile.json")
+    
     def show_page(self, page_key: str):
         """Display the selected page and hide others."""
         try:
@@ -359,8 +413,8 @@ class MCPAdminApp(tk.Tk):
                 print(f"DEBUG: Hiding current page: {self.current_page}")
                 self.pages[self.current_page].pack_forget()
             
-            # Show selected page
-            if page_key in self.pages:
+            # Show selected page, building it on first visit
+            if self._get_page(page_key) is not None:
                 print(f"DEBUG: Showing page: {page_key}")
                 self.pages[page_key].pack(fill="both", expand=True)
                 self.current_page = page_key
@@ -459,7 +513,15 @@ class MCPAdminApp(tk.Tk):
             # Stop monitoring services
             if hasattr(self, 'monitoring_service'):
                 self.monitoring_service.stop_monitoring()
-            
+
+            # Stop background operation workers
+            if hasattr(self, 'service_bridge'):
+                self.service_bridge.shutdown()
+
+            # Close MCP server sessions
+            if hasattr(self, 'server_manager'):
+                self.server_manager.shutdown()
+
             # Close database connections
             # (Connections are closed automatically with context managers)
             
@@ -22,6 +22,8 @@ class AppSettings:
     backup_retention_days: int = 30
     security_alert_threshold: int = 5
     notification_enabled: bool = True
+    import_time_budget_ms: int = 1500
+    startup_profile_enabled: bool = True
 
 
 @dataclass
@@ -51,6 +53,7 @@ class ConfigurationManager:
         self.templates_dir = Path.home() / ".kiro" / "mcp-admin" / "templates"
         self.vector_dir = Path.home() / ".kiro" / "mcp-admin" / "vector"
         self.prompts_dir = Path.home() / ".kiro" / "mcp-admin" / "prompts"
+        self.logs_dir = Path.home() / ".kiro" / "mcp-admin" / "logs"
         
         self._app_settings: Optional[AppSettings] = None
         self._advanced_prompt_settings: Optional[AdvancedPromptSettings] = None
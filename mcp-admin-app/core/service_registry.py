@@ -0,0 +1,102 @@
+"""
+Lazy Service Registry for MCP Admin Application
+===============================================
+
+Holds service factories and constructs each service on first use, so heavy
+services stay off the startup path. Services can also be warmed in a
+background thread once the main window has painted.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class LazyServiceRegistry:
+    """Registry of named services built on first access."""
+
+    def __init__(self, profiler=None):
+        self.logger = logging.getLogger(__name__)
+        self.profiler = profiler
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.init_timings: Dict[str, float] = {}
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """Register a factory; replaces any existing (unbuilt) registration."""
+        with self._lock:
+            self._factories[name] = factory
+            self._build_locks.setdefault(name, threading.Lock())
+            self._instances.pop(name, None)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Return the service, building it if needed. Unknown names give ``default``."""
+        if name not in self._factories:
+            return default
+        return self[name]
+
+    def __getitem__(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        if name not in self._factories:
+            raise KeyError(name)
+
+        with self._build_locks[name]:
+            if name not in self._instances:
+                start = time.perf_counter()
+                self._instances[name] = self._factories[name]()
+                elapsed = time.perf_counter() - start
+
+                self.init_timings[name] = elapsed * 1000.0
+                if self.profiler is not None:
+                    self.profiler.record_service(name, elapsed)
+                self.logger.debug(f"Service '{name}' initialized in {elapsed * 1000.0:.1f} ms")
+
+        return self._instances[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def names(self) -> List[str]:
+        """Names of all registered services."""
+        return list(self._factories.keys())
+
+    def is_built(self, name: str) -> bool:
+        """Whether a service has already been constructed."""
+        return name in self._instances
+
+    def built_services(self) -> Dict[str, Any]:
+        """Snapshot of services constructed so far."""
+        return dict(self._instances)
+
+    def warm_up(self, names: Optional[Iterable[str]] = None,
+                on_complete: Optional[Callable[[], None]] = None) -> threading.Thread:
+        """Construct services in a background thread.
+
+        Failures are logged and leave the service unbuilt so that the next
+        direct access retries and surfaces the error to the caller.
+        """
+        to_warm = list(names) if names is not None else self.names()
+
+        def run():
+            for name in to_warm:
+                if self.is_built(name):
+                    continue
+                try:
+                    self[name]
+                except Exception as e:
+                    self.logger.error(f"Background warm-up of service '{name}' failed: {e}")
+            if on_complete:
+                try:
+                    on_complete()
+                except Exception as e:
+                    self.logger.error(f"Warm-up completion callback failed: {e}")
+
+        thread = threading.Thread(target=run, name="service-warmup", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,207 @@
+"""
+Startup Profiling for MCP Admin Application
+===========================================
+
+Import-time and initialization timing collected during application launch.
+Produces a report comparable to ``python -X importtime`` plus per-phase and
+per-service initialization timings, and checks imports against a budget.
+"""
+
+import importlib.abc
+import json
+import logging
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path finder that times module execution while installed.
+
+    Each record holds self and cumulative time in microseconds and the import
+    nesting depth, mirroring the columns of ``-X importtime``.
+    """
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def install(self):
+        """Put the timer at the front of ``sys.meta_path``."""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        """Remove the timer from ``sys.meta_path``."""
+        try:
+            sys.meta_path.remove(self)
+        except ValueError:
+            pass
+
+    def find_spec(self, fullname, path, target=None):
+        """Resolve the spec with the remaining finders and time its loader."""
+        if getattr(self._local, "resolving", False):
+            return None
+
+        self._local.resolving = True
+        try:
+            spec = None
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+        finally:
+            self._local.resolving = False
+
+        # Built-in and frozen importers are shared classes; leave them alone
+        loader = spec.loader if spec is not None else None
+        if loader is None or isinstance(loader, type) or not hasattr(loader, "exec_module"):
+            return spec
+
+        original_exec = loader.exec_module
+
+        def timed_exec_module(module, _original=original_exec, _name=fullname):
+            self._exec_timed(_name, _original, module)
+
+        loader.exec_module = timed_exec_module
+        return spec
+
+    def _exec_timed(self, name: str, exec_module, module):
+        """Run ``exec_module`` and record self/cumulative timings."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        depth = len(stack)
+        stack.append(0.0)  # accumulated child time
+        start = time.perf_counter()
+        try:
+            exec_module(module)
+        finally:
+            cumulative = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += cumulative
+            with self._lock:
+                self.records.append({
+                    "module": name,
+                    "self_us": int((cumulative - children) * 1_000_000),
+                    "cumulative_us": int(cumulative * 1_000_000),
+                    "depth": depth
+                })
+
+    def total_ms(self) -> float:
+        """Total time spent in top-level imports."""
+        return sum(r["cumulative_us"] for r in self.records if r["depth"] == 0) / 1000.0
+
+    def slowest(self, limit: int = 20, key: str = "cumulative_us") -> List[Dict[str, Any]]:
+        """Slowest imports ordered by ``key``."""
+        return sorted(self.records, key=lambda r: r[key], reverse=True)[:limit]
+
+    def format_table(self) -> List[str]:
+        """Render records in the ``-X importtime`` text layout."""
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for record in self.records:
+            lines.append(
+                f"import time: {record['self_us']:>9} | {record['cumulative_us']:>10} | "
+                f"{'  ' * record['depth']}{record['module']}"
+            )
+        return lines
+
+
+class StartupProfiler:
+    """Collects launch timings and writes the startup profile report."""
+
+    def __init__(self, import_budget_ms: float = 1500.0):
+        self.logger = logging.getLogger(__name__)
+        self.import_budget_ms = import_budget_ms
+        self.import_timer = ImportTimer()
+        self.started_at = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.service_timings: Dict[str, float] = {}
+        self.marks: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def start_import_timing(self):
+        """Begin recording import timings."""
+        self.import_timer.install()
+
+    def stop_import_timing(self):
+        """Stop recording import timings."""
+        self.import_timer.uninstall()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a named startup phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases[name] = (time.perf_counter() - start) * 1000.0
+
+    def record_service(self, name: str, seconds: float):
+        """Record how long a service took to construct."""
+        with self._lock:
+            self.service_timings[name] = seconds * 1000.0
+
+    def mark(self, name: str):
+        """Record elapsed time since launch for a milestone (e.g. first paint)."""
+        with self._lock:
+            self.marks[name] = (time.perf_counter() - self.started_at) * 1000.0
+
+    def check_import_budget(self) -> bool:
+        """Log a warning when imports exceed the budget. Returns True if within budget."""
+        total = self.import_timer.total_ms()
+        if total <= self.import_budget_ms:
+            return True
+
+        offenders = ", ".join(
+            f"{r['module']} ({r['cumulative_us'] / 1000.0:.1f} ms)"
+            for r in self.import_timer.slowest(5)
+        )
+        self.logger.warning(
+            f"Startup imports took {total:.1f} ms, over the {self.import_budget_ms:.0f} ms budget. "
+            f"Slowest: {offenders}"
+        )
+        return False
+
+    def build_report(self) -> Dict[str, Any]:
+        """Assemble the startup profile."""
+        with self._lock:
+            import_total = self.import_timer.total_ms()
+            return {
+                "generated_at": datetime.now().isoformat(),
+                "marks_ms": dict(self.marks),
+                "phases_ms": dict(self.phases),
+                "service_init_ms": dict(sorted(self.service_timings.items(),
+                                               key=lambda item: item[1], reverse=True)),
+                "imports": {
+                    "total_ms": import_total,
+                    "budget_ms": self.import_budget_ms,
+                    "within_budget": import_total <= self.import_budget_ms,
+                    "module_count": len(self.import_timer.records),
+                    "slowest_cumulative": self.import_timer.slowest(25, "cumulative_us"),
+                    "slowest_self": self.import_timer.slowest(25, "self_us"),
+                    "importtime": self.import_timer.format_table()
+                }
+            }
+
+    def write_report(self, path: Path) -> Optional[Path]:
+        """Write the startup profile as JSON."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.build_report(), f, indent=2)
+            self.logger.info(f"Startup profile written to {path}")
+            return path
+        except Exception as e:
+            self.logger.error(f"Failed to write startup profile: {e}")
+            return None
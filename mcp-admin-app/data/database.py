@@ -22,8 +22,12 @@ class DatabaseManager:
         self._connection: Optional[sqlite3.Connection] = None
         self.prompt_db = PromptDatabaseManager(db_path)
     
-    def initialize(self):
-        """Initialize database schema and apply migrations."""
+    def initialize(self, initialize_vector_db: bool = True):
+        """Initialize database schema and apply migrations.
+        
+        Pass ``initialize_vector_db=False`` to defer the vector store (and its
+        embedding model) until it is first used.
+        """
         try:
             with self.get_connection() as conn:
                 self._create_tables(conn)
@@ -33,7 +37,7 @@ class DatabaseManager:
             self.migrate_to_latest()
             
             # Initialize advanced prompt management schema
-            self.prompt_db.initialize_prompt_schema()
+            self.prompt_db.initialize_prompt_schema(initialize_vector_db=initialize_vector_db)
             self.prompt_db.create_default_project()
             self.prompt_db.create_default_tags()
             
@@ -440,10 +444,22 @@ class DatabaseManager:
         conn.commit()
     
     def vacuum(self):
-        """Optimize database by running VACUUM."""
+        """Optimize database by running VACUUM.
+        
+        VACUUM may renumber the implicit rowids that external-content FTS5
+        indexes (such as audit_events_fts) are keyed on, so those indexes are
+        rebuilt afterwards.
+        """
         try:
             with self.get_connection() as conn:
                 conn.execute("VACUUM")
+                fts_tables = [row[0] for row in conn.execute("""
+                    SELECT name FROM sqlite_master
+                    WHERE type = 'table' AND sql LIKE 'CREATE VIRTUAL TABLE%USING fts5%content=%'
+                """)]
+                for table in fts_tables:
+                    conn.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+                conn.commit()
             self.logger.info("Database vacuum completed")
         except Exception as e:
             self.logger.error(f"Failed to vacuum database: {e}")
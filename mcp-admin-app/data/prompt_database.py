@@ -20,7 +20,7 @@ class PromptDatabaseManager:
     def __init__(self, db_path: Path):
         self.db_path = db_path
         self.logger = logging.getLogger(__name__)
-        self.current_schema_version = 4  # Latest schema version
+        self.current_schema_version = 5  # Latest schema version
         
         # Initialize vector database manager
         data_dir = db_path.parent
@@ -43,8 +43,12 @@ class PromptDatabaseManager:
             if conn:
                 conn.close()
     
-    def initialize_prompt_schema(self):
-        """Initialize advanced prompt management schema."""
+    def initialize_prompt_schema(self, initialize_vector_db: bool = True):
+        """Initialize advanced prompt management schema.
+        
+        With ``initialize_vector_db=False`` the vector store is left to come up
+        on first use (or via ``vector_db.warm_up()``) instead of during startup.
+        """
         try:
             with self.get_connection() as conn:
                 self._create_prompt_tables(conn)
@@ -54,7 +58,9 @@ class PromptDatabaseManager:
             self.migrate_prompt_schema()
             
             # Initialize vector database
-            if self.vector_db.is_available:
+            if not initialize_vector_db:
+                self.logger.debug("Vector database initialization deferred")
+            elif self.vector_db.is_available:
                 self.vector_db.initialize()
                 self.logger.info("Vector database initialized for semantic search")
             else:
@@ -159,9 +165,30 @@ class PromptDatabaseManager:
                 average_cost REAL DEFAULT 0.0,
                 average_response_time REAL DEFAULT 0.0,
                 last_updated DATETIME NOT NULL,
+                -- Running aggregates maintained per execution (see PerformanceTracker)
+                success_count INTEGER,
+                total_tokens INTEGER,
+                total_cost REAL,
+                tokens_mean REAL,
+                score_m2 REAL,
+                tokens_m2 REAL,
+                cost_m2 REAL,
+                response_time_m2 REAL,
+                latency_sketch TEXT,
                 FOREIGN KEY (version_id) REFERENCES prompt_versions(version_id) ON DELETE CASCADE
             )
         """)
+        self._ensure_columns(conn, "prompt_performance_metrics", {
+            "success_count": "INTEGER",
+            "total_tokens": "INTEGER",
+            "total_cost": "REAL",
+            "tokens_mean": "REAL",
+            "score_m2": "REAL",
+            "tokens_m2": "REAL",
+            "cost_m2": "REAL",
+            "response_time_m2": "REAL",
+            "latency_sketch": "TEXT"
+        })
         
         # Prompt branches for version control
         conn.execute("""
@@ -314,6 +341,13 @@ class PromptDatabaseManager:
         
         conn.commit()
     
+    def _ensure_columns(self, conn: sqlite3.Connection, table: str, columns: Dict[str, str]):
+        """Add columns missing from a table created by an older schema."""
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for name, column_type in columns.items():
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+    
     def _create_prompt_indexes(self, conn: sqlite3.Connection):
         """Create indexes for advanced prompt management tables."""
         
@@ -458,6 +492,11 @@ class PromptDatabaseManager:
             (4, "Add comprehensive analytics and performance tracking", """
                 -- Analytics tables already included in main schema
                 SELECT 1
+            """),
+            (5, "Add running performance aggregates and latency sketch", """
+                -- Columns are added by _create_prompt_tables, and older rows
+                -- are rebuilt from prompt_executions on their next update
+                SELECT 1
             """)
         ]
         
@@ -7,22 +7,19 @@ ChromaDB integration for semantic search capabilities using embeddings.
 
 import logging
 import hashlib
+import importlib.util
 import json
+import threading
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
-try:
-    import chromadb
-    from chromadb.config import Settings
-    from sentence_transformers import SentenceTransformer
-    import numpy as np
-    VECTOR_DEPENDENCIES_AVAILABLE = True
-except ImportError:
-    VECTOR_DEPENDENCIES_AVAILABLE = False
-    chromadb = None
-    SentenceTransformer = None
-    np = None
+# Only probe for the heavy dependencies here; chromadb, sentence-transformers
+# and numpy are imported on first use so they stay off the startup path.
+VECTOR_DEPENDENCIES_AVAILABLE = all(
+    importlib.util.find_spec(module) is not None
+    for module in ("chromadb", "sentence_transformers", "numpy")
+)
 
 
 class VectorDatabaseManager:
@@ -37,6 +34,7 @@ class VectorDatabaseManager:
         self._client = None
         self._embedding_model = None
         self._collection = None
+        self._init_lock = threading.Lock()
         
         # Check if dependencies are available
         if not VECTOR_DEPENDENCIES_AVAILABLE:
@@ -50,13 +48,19 @@ class VectorDatabaseManager:
         """Check if vector database functionality is available."""
         return VECTOR_DEPENDENCIES_AVAILABLE
     
-    def initialize(self):
-        """Initialize vector database and embedding model."""
+    def initialize(self, load_model: bool = False):
+        """Initialize the vector database client and collection.
+        
+        The embedding model is loaded on first use unless ``load_model`` is set.
+        """
         if not self.is_available:
             self.logger.warning("Vector database not available - skipping initialization")
             return
         
         try:
+            import chromadb
+            from chromadb.config import Settings
+            
             # Create data directory
             self.vector_db_path.mkdir(parents=True, exist_ok=True)
             
@@ -69,8 +73,8 @@ class VectorDatabaseManager:
                 )
             )
             
-            # Initialize embedding model
-            self._embedding_model = SentenceTransformer(self.embedding_model_name)
+            if load_model:
+                self._get_embedding_model()
             
             # Get or create collection
             self._collection = self._client.get_or_create_collection(
@@ -84,14 +88,44 @@ class VectorDatabaseManager:
             self.logger.error(f"Failed to initialize vector database: {e}")
             raise
     
+    def _ensure_initialized(self) -> bool:
+        """Bring up the client and collection on first use."""
+        if not self.is_available:
+            return False
+        if self._collection is not None:
+            return True
+        
+        with self._init_lock:
+            if self._collection is None:
+                try:
+                    self.initialize()
+                except Exception:
+                    return False
+        return self._collection is not None
+    
+    def _get_embedding_model(self):
+        """Load the sentence-transformers model on first use."""
+        if self._embedding_model is None:
+            with self._init_lock:
+                if self._embedding_model is None:
+                    from sentence_transformers import SentenceTransformer
+                    self._embedding_model = SentenceTransformer(self.embedding_model_name)
+                    self.logger.info(f"Loaded embedding model: {self.embedding_model_name}")
+        return self._embedding_model
+    
+    def warm_up(self):
+        """Initialize the collection and load the embedding model ahead of use."""
+        if self._ensure_initialized():
+            self._get_embedding_model()
+    
     def generate_embedding(self, text: str) -> Optional[List[float]]:
         """Generate embedding for text."""
-        if not self.is_available or not self._embedding_model:
+        if not self.is_available:
             return None
         
         try:
             # Generate embedding
-            embedding = self._embedding_model.encode(text, convert_to_tensor=False)
+            embedding = self._get_embedding_model().encode(text, convert_to_tensor=False)
             return embedding.tolist()
         except Exception as e:
             self.logger.error(f"Failed to generate embedding: {e}")
@@ -99,7 +133,7 @@ class VectorDatabaseManager:
     
     def add_prompt_embedding(self, prompt_id: str, content: str, metadata: Dict[str, Any] = None) -> bool:
         """Add or update prompt embedding in vector database."""
-        if not self.is_available or not self._collection:
+        if not self._ensure_initialized():
             return False
         
         try:
@@ -138,7 +172,7 @@ class VectorDatabaseManager:
     
     def remove_prompt_embedding(self, prompt_id: str) -> bool:
         """Remove prompt embedding from vector database."""
-        if not self.is_available or not self._collection:
+        if not self._ensure_initialized():
             return False
         
         try:
@@ -156,7 +190,7 @@ class VectorDatabaseManager:
         filters: Dict[str, Any] = None
     ) -> List[Dict[str, Any]]:
         """Search for similar prompts using semantic similarity."""
-        if not self.is_available or not self._collection:
+        if not self._ensure_initialized():
             return []
         
         try:
@@ -199,7 +233,7 @@ class VectorDatabaseManager:
     
     def get_prompt_embedding_info(self, prompt_id: str) -> Optional[Dict[str, Any]]:
         """Get embedding information for a specific prompt."""
-        if not self.is_available or not self._collection:
+        if not self._ensure_initialized():
             return None
         
         try:
@@ -224,10 +258,11 @@ class VectorDatabaseManager:
     
     def cluster_prompts(self, prompt_ids: List[str] = None, n_clusters: int = 5) -> Dict[str, Any]:
         """Cluster prompts based on semantic similarity."""
-        if not self.is_available or not self._collection:
+        if not self._ensure_initialized():
             return {"clusters": [], "error": "Vector database not available"}
         
         try:
+            import numpy as np
             from sklearn.cluster import KMeans
             
             # Get embeddings
@@ -273,7 +308,7 @@ class VectorDatabaseManager:
     
     def find_duplicate_prompts(self, similarity_threshold: float = 0.95) -> List[Dict[str, Any]]:
         """Find potentially duplicate prompts based on high similarity."""
-        if not self.is_available or not self._collection:
+        if not self._ensure_initialized():
             return []
         
         try:
@@ -322,7 +357,7 @@ class VectorDatabaseManager:
     
     def get_collection_stats(self) -> Dict[str, Any]:
         """Get statistics about the vector database collection."""
-        if not self.is_available or not self._collection:
+        if not self._ensure_initialized():
             return {"available": False, "error": "Vector database not available"}
         
         try:
@@ -349,7 +384,7 @@ class VectorDatabaseManager:
     
     def reset_collection(self) -> bool:
         """Reset the vector database collection (delete all embeddings)."""
-        if not self.is_available or not self._client:
+        if not self._ensure_initialized():
             return False
         
         try:
@@ -372,7 +407,7 @@ class VectorDatabaseManager:
     
     def batch_add_embeddings(self, prompts: List[Dict[str, Any]]) -> int:
         """Add multiple prompt embeddings in batch."""
-        if not self.is_available or not self._collection:
+        if not self._ensure_initialized():
             return 0
         
         try:
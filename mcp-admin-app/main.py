@@ -16,6 +16,12 @@ from pathlib import Path
 app_dir = Path(__file__).parent
 sys.path.insert(0, str(app_dir))
 
+from core.startup_profile import StartupProfiler
+
+# Start timing imports before the application modules are loaded
+startup_profiler = StartupProfiler()
+startup_profiler.start_import_timing()
+
 from core.app import MCPAdminApp
 from core.config import ConfigurationManager
 from core.logging_config import setup_logging
@@ -32,9 +38,10 @@ def main():
         # Initialize configuration
         config_manager = ConfigurationManager()
         config_manager.initialize()
+        startup_profiler.import_budget_ms = config_manager.get_app_settings().import_time_budget_ms
         
         # Create and run the application
-        app = MCPAdminApp()
+        app = MCPAdminApp(profiler=startup_profiler)
         app.mainloop()
         
     except Exception as e:
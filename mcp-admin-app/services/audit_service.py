@@ -5,6 +5,7 @@ Audit Service - Placeholder
 Placeholder implementation for audit trail management.
 """
 
+import json
 import logging
 from typing import List, Dict, Optional, Any
 
@@ -25,7 +26,31 @@ class AuditService:
     
     def log_event(self, event: AuditEvent):
         """Log an audit event."""
-        pass
+        try:
+            with self.db_manager.get_connection() as conn:
+                conn.execute("""
+                    INSERT INTO audit_events (
+                        id, timestamp, user_id, action, resource_type, resource_id,
+                        old_value, new_value, checksum, session_id
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    event.id,
+                    event.timestamp.isoformat(),
+                    event.user,
+                    event.action,
+                    event.resource_type,
+                    event.resource_id,
+                    json.dumps(event.old_value) if event.old_value is not None else None,
+                    json.dumps(event.new_value) if event.new_value is not None else None,
+                    event.checksum,
+                    event.session_id
+                ))
+                conn.commit()
+            
+            self.logger.info(f"Logged audit event: {event.action} on {event.resource_type} {event.resource_id}")
+            
+        except Exception as e:
+            self.logger.error(f"Error logging audit event: {e}")
     
     def log_action(self, user_id: str, action: str, resource_type: str, 
                    resource_id: str, details: dict = None):
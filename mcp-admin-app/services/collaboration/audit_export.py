@@ -0,0 +1,365 @@
+"""
+Streaming Audit Export
+======================
+
+Writes audit events for a compliance window straight from a database cursor
+to a file or file-like sink, chunk by chunk, as CSV or JSON Lines with
+optional gzip compression. Every export ends with a footer holding a running
+hash over the event checksums, so it can be verified offline in one pass
+with ``verify_export``.
+"""
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, TextIO, Union
+
+from models.collaboration import AuditEvent, AuditEventType
+from .audit_query import EVENT_COLUMNS, AuditQueryEngine
+from .audit_writer import compute_event_checksum
+
+
+EXPORT_FORMATS = ("csv", "jsonl")
+LEGACY_FORMATS = ("csv", "json")
+FOOTER_MARKER = "#footer"
+
+CSV_HEADER = [
+    "Event ID", "Event Type", "User ID", "Resource Type", "Resource ID",
+    "Action", "Timestamp", "IP Address", "User Agent", "Session ID",
+    "Details", "Old Values", "New Values", "Checksum", "Chain Seq", "Previous Checksum"
+]
+
+# Shape of ``AuditTrailService.export_audit_trail`` (format version 1.0)
+LEGACY_CSV_HEADER = CSV_HEADER[:14]
+
+JSONL_FIELDS = [
+    "id", "event_type", "user_id", "resource_type", "resource_id", "action",
+    "timestamp", "ip_address", "user_agent", "session_id"
+]
+
+Sink = Union[str, Path, TextIO, BinaryIO]
+
+
+class ChainHasher:
+    """Running SHA-256 over event checksums in export order."""
+
+    def __init__(self):
+        self._hash = hashlib.sha256()
+        self.count = 0
+
+    def update(self, checksum: str):
+        self._hash.update(checksum.encode("utf-8"))
+        self.count += 1
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+@contextmanager
+def _open_text(target: Sink, mode: str, compressed: bool) -> Iterator[TextIO]:
+    """Text stream over a path or file-like object, gzip-wrapped if requested.
+
+    Paths are opened and closed here; caller-supplied streams are left open.
+    """
+    if isinstance(target, (str, Path)):
+        with open(target, mode + "b") as raw:
+            with _open_text(raw, mode, compressed) as stream:
+                yield stream
+        return
+
+    if isinstance(target, io.TextIOBase):
+        if compressed:
+            raise ValueError("Compressed audit exports need a binary sink")
+        yield target
+        return
+
+    binary = gzip.GzipFile(fileobj=target, mode=mode + "b") if compressed else target
+    stream = io.TextIOWrapper(binary, encoding="utf-8", newline="")
+    try:
+        yield stream
+    finally:
+        if mode == "w":
+            stream.flush()
+        stream.detach()
+        if compressed:
+            binary.close()
+
+
+class AuditExporter:
+    """Streams audit events in chain order without materializing them."""
+
+    def __init__(self, db_manager, query_engine: AuditQueryEngine):
+        self.db_manager = db_manager
+        self.query_engine = query_engine
+        self.logger = logging.getLogger(__name__)
+
+    def export(self, sink: Sink, format_type: str = "csv", compress: bool = False,
+               chunk_size: int = 1000,
+               progress_callback: Optional[Callable[[int, int], None]] = None,
+               **filters) -> Dict[str, Any]:
+        """Write matching events to ``sink`` and return the export footer.
+
+        ``progress_callback(exported, total)`` is called after every chunk.
+        """
+        format_type = format_type.lower()
+        if format_type not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format_type}")
+
+        where, params = self.query_engine.build_filter_clause(**filters)
+        hasher = ChainHasher()
+        first_seq = last_seq = None
+        anchor_checksum = last_checksum = None
+
+        with self.db_manager.get_connection() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM audit_events WHERE 1=1{where}", params).fetchone()[0]
+            lookup = conn.cursor()
+            rows = conn.execute(f"""
+                SELECT {EVENT_COLUMNS}, chain_seq
+                FROM audit_events
+                WHERE 1=1{where}
+                ORDER BY chain_seq
+            """, params)
+
+            with _open_text(sink, "w", compress) as out:
+                write_row = self._csv_row_writer(out) if format_type == "csv" else self._jsonl_row_writer(out)
+                if format_type == "jsonl":
+                    out.write(json.dumps({"_header": {
+                        "format_version": "2.0",
+                        "export_date": datetime.now().isoformat(),
+                        "total_events": total
+                    }}) + "\n")
+
+                previous_seq = None
+                while True:
+                    chunk = rows.fetchmany(chunk_size)
+                    if not chunk:
+                        break
+                    for row in chunk:
+                        seq = row[14]
+                        if previous_seq is None or seq != previous_seq + 1:
+                            # Selection skipped part of the chain; anchor on the predecessor
+                            last_checksum = self._checksum_before(lookup, seq)
+                        if first_seq is None:
+                            first_seq, anchor_checksum = seq, last_checksum
+
+                        write_row(row, last_checksum or "")
+                        hasher.update(row[13])
+                        last_checksum, last_seq, previous_seq = row[13], seq, seq
+
+                    if progress_callback:
+                        progress_callback(hasher.count, total)
+
+                footer = {
+                    "event_count": hasher.count,
+                    "first_chain_seq": first_seq,
+                    "last_chain_seq": last_seq,
+                    "anchor_checksum": anchor_checksum or "",
+                    "last_checksum": last_checksum if hasher.count else "",
+                    "chain_hash": hasher.hexdigest(),
+                    "chain_hash_algorithm": "sha256(concat(checksum))",
+                    "generated_at": datetime.now().isoformat()
+                }
+                if format_type == "csv":
+                    csv.writer(out).writerow([FOOTER_MARKER, json.dumps(footer, sort_keys=True)])
+                else:
+                    out.write(json.dumps({"_footer": footer}, sort_keys=True) + "\n")
+
+        self.logger.info(f"Exported {hasher.count} audit events as {format_type}")
+        return footer
+
+    def export_legacy(self, out: TextIO, format_type: str = "csv", chunk_size: int = 1000,
+                      **filters) -> int:
+        """Write matching events to ``out`` in the original export shape.
+
+        Newest events first, as plain CSV (no chain columns or footer) or a
+        single JSON document with ``export_metadata`` and ``events``, streamed
+        row by row. Returns the number of events written.
+        """
+        format_type = format_type.lower()
+        if format_type not in LEGACY_FORMATS:
+            raise ValueError(f"Unsupported export format: {format_type}")
+
+        where, params = self.query_engine.build_filter_clause(**filters)
+        count = 0
+        with self.db_manager.get_connection() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM audit_events WHERE 1=1{where}", params).fetchone()[0]
+            rows = conn.execute(f"""
+                SELECT {EVENT_COLUMNS}
+                FROM audit_events
+                WHERE 1=1{where}
+                ORDER BY timestamp DESC, id DESC
+            """, params)
+
+            if format_type == "csv":
+                writer = csv.writer(out)
+                writer.writerow(LEGACY_CSV_HEADER)
+            else:
+                metadata = json.dumps({"export_metadata": {
+                    "export_date": datetime.now().isoformat(),
+                    "total_events": total,
+                    "format_version": "1.0"
+                }}, indent=2)
+                out.write(metadata[:-2] + ",\n  \"events\": [")
+
+            while True:
+                chunk = rows.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                for row in chunk:
+                    if format_type == "csv":
+                        writer.writerow([
+                            row[0], row[1], row[2], row[3], row[4], row[5], row[12],
+                            row[7] or "", row[8] or "", row[9] or "",
+                            row[6] if row[6] and row[6] != "{}" else "",
+                            row[10] or "", row[11] or "", row[13]
+                        ])
+                    else:
+                        record = json.dumps(self._legacy_record(row), indent=2, default=str)
+                        out.write(("," if count else "") + "\n    " + record.replace("\n", "\n    "))
+                    count += 1
+
+            if format_type == "json":
+                out.write("\n  ]\n}" if count else "]\n}")
+
+        self.logger.info(f"Exported {count} audit events as {format_type}")
+        return count
+
+    @staticmethod
+    def _legacy_record(row) -> Dict[str, Any]:
+        """``AuditEvent.to_dict()`` for a stored row."""
+        return {
+            "id": row[0], "event_type": row[1], "user_id": row[2],
+            "resource_type": row[3], "resource_id": row[4], "action": row[5],
+            "details": json.loads(row[6]) if row[6] else {},
+            "ip_address": row[7], "user_agent": row[8], "session_id": row[9],
+            "old_values": json.loads(row[10]) if row[10] else None,
+            "new_values": json.loads(row[11]) if row[11] else None,
+            "timestamp": row[12], "checksum": row[13]
+        }
+
+    def _checksum_before(self, cursor, chain_seq: int) -> str:
+        cursor.execute("""
+            SELECT checksum FROM audit_events
+            WHERE chain_seq < ?
+            ORDER BY chain_seq DESC
+            LIMIT 1
+        """, (chain_seq,))
+        row = cursor.fetchone()
+        return row[0] if row else ""
+
+    def _csv_row_writer(self, out: TextIO) -> Callable:
+        writer = csv.writer(out)
+        writer.writerow(CSV_HEADER)
+
+        def write(row, previous_checksum: str):
+            writer.writerow([
+                row[0], row[1], row[2], row[3], row[4], row[5], row[12],
+                row[7] or "", row[8] or "", row[9] or "",
+                row[6] or "", row[10] or "", row[11] or "",
+                row[13], row[14], previous_checksum
+            ])
+        return write
+
+    def _jsonl_row_writer(self, out: TextIO) -> Callable:
+        def write(row, previous_checksum: str):
+            record = dict(zip(JSONL_FIELDS, (row[0], row[1], row[2], row[3], row[4], row[5],
+                                             row[12], row[7], row[8], row[9])))
+            record["checksum"] = row[13]
+            record["chain_seq"] = row[14]
+            record["previous_checksum"] = previous_checksum
+            # JSON columns are copied through as stored rather than decoded
+            out.write(
+                json.dumps(record)[:-1]
+                + f', "details": {row[6] or "{}"}'
+                + f', "old_values": {row[10] or "null"}'
+                + f', "new_values": {row[11] or "null"}}}\n'
+            )
+        return write
+
+
+def _iter_export_records(stream: TextIO, format_type: str) -> Iterator[Dict[str, Any]]:
+    """Yield event records, then a final ``{"_footer": ...}`` record if present."""
+    if format_type == "csv":
+        reader = csv.reader(stream)
+        next(reader, None)
+        for row in reader:
+            if row and row[0] == FOOTER_MARKER:
+                yield {"_footer": json.loads(row[1])}
+                continue
+            yield {
+                "id": row[0], "event_type": row[1], "user_id": row[2],
+                "resource_type": row[3], "resource_id": row[4], "action": row[5],
+                "timestamp": row[6], "details": json.loads(row[10]) if row[10] else {},
+                "checksum": row[13], "chain_seq": int(row[14]), "previous_checksum": row[15]
+            }
+    else:
+        for line in stream:
+            if line.strip():
+                record = json.loads(line)
+                if "_header" not in record:
+                    yield record
+
+
+def verify_export(source: Sink, format_type: str = "csv", compressed: bool = False) -> Dict[str, Any]:
+    """Verify an export in a single streaming pass.
+
+    Recomputes every event checksum from its fields and predecessor, checks
+    that consecutive chain entries link up, and compares the running chain
+    hash and event count with the footer.
+    """
+    format_type = format_type.lower()
+    if format_type not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {format_type}")
+
+    hasher = ChainHasher()
+    invalid_events: List[Dict[str, Any]] = []
+    footer = None
+    previous = None
+
+    with _open_text(source, "r", compressed) as stream:
+        for record in _iter_export_records(stream, format_type):
+            if "_footer" in record:
+                footer = record["_footer"]
+                continue
+
+            event = AuditEvent(
+                id=record["id"],
+                event_type=AuditEventType(record["event_type"]),
+                user_id=record["user_id"],
+                resource_type=record["resource_type"],
+                resource_id=record["resource_id"],
+                action=record["action"],
+                details=record.get("details") or {},
+                timestamp=datetime.fromisoformat(record["timestamp"])
+            )
+            expected = compute_event_checksum(event, record["previous_checksum"])
+            linked = (previous is None or record["chain_seq"] != previous["chain_seq"] + 1
+                      or record["previous_checksum"] == previous["checksum"])
+
+            if expected != record["checksum"] or not linked:
+                invalid_events.append({
+                    "event_id": record["id"],
+                    "chain_seq": record["chain_seq"],
+                    "reason": "Checksum mismatch" if expected != record["checksum"] else "Broken chain link"
+                })
+
+            hasher.update(record["checksum"])
+            previous = record
+
+    footer_matches = (footer is not None
+                      and footer.get("chain_hash") == hasher.hexdigest()
+                      and footer.get("event_count") == hasher.count)
+    return {
+        "valid": footer_matches and not invalid_events,
+        "event_count": hasher.count,
+        "chain_hash": hasher.hexdigest(),
+        "footer_present": footer is not None,
+        "footer_matches": footer_matches,
+        "invalid_events": invalid_events
+    }
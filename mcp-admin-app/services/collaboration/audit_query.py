@@ -0,0 +1,271 @@
+"""
+Audit Query Engine
+==================
+
+Indexed queries over the audit trail. Listing uses keyset pagination on
+(timestamp, id) with an opaque continuation token, text search uses an FTS5
+index over action, resource type/id, details and old/new values, and JSON
+columns are only decoded when the caller reads them.
+"""
+
+import base64
+import json
+import logging
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from models.collaboration import AuditEvent, AuditEventType
+
+
+EVENT_COLUMNS = """id, event_type, user_id, resource_type, resource_id, action,
+                   details, ip_address, user_agent, session_id, old_values,
+                   new_values, timestamp, checksum"""
+
+# Columns searchable through the FTS index, keyed by the names callers pass
+FTS_COLUMNS = {
+    "action": "action",
+    "resource_type": "resource_type",
+    "resource_id": "resource_id",
+    "details": "details",
+    "values": "old_values new_values",
+    "old_values": "old_values",
+    "new_values": "new_values",
+}
+
+
+def _decode_json(raw: Optional[str], default: Any) -> Any:
+    return json.loads(raw) if raw else default
+
+
+class LazyAuditEvent(AuditEvent):
+    """AuditEvent built from a row whose JSON columns decode on first access."""
+
+    def __init__(self, row: Tuple):
+        self.id = row[0]
+        self.event_type = AuditEventType(row[1])
+        self.user_id = row[2]
+        self.resource_type = row[3]
+        self.resource_id = row[4]
+        self.action = row[5]
+        self._raw = {"details": row[6], "old_values": row[10], "new_values": row[11]}
+        self._decoded: Dict[str, Any] = {}
+        self.ip_address = row[7]
+        self.user_agent = row[8]
+        self.session_id = row[9]
+        self.timestamp = datetime.fromisoformat(row[12])
+        self.checksum = row[13]
+
+    def _json_field(self, name: str, default: Any) -> Any:
+        if name not in self._decoded:
+            self._decoded[name] = _decode_json(self._raw.get(name), default)
+        return self._decoded[name]
+
+    def _set_json_field(self, name: str, value: Any):
+        if "_decoded" not in self.__dict__:
+            self._raw, self._decoded = {}, {}
+        self._decoded[name] = value
+
+    details = property(lambda self: self._json_field("details", {}),
+                       lambda self, value: self._set_json_field("details", value))
+    old_values = property(lambda self: self._json_field("old_values", None),
+                          lambda self, value: self._set_json_field("old_values", value))
+    new_values = property(lambda self: self._json_field("new_values", None),
+                          lambda self, value: self._set_json_field("new_values", value))
+
+
+@dataclass
+class AuditEventPage:
+    """One page of audit events plus the token for the next page."""
+    events: List[AuditEvent] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+
+def encode_cursor(timestamp: str, event_id: str) -> str:
+    """Opaque continuation token for the position after an event."""
+    payload = json.dumps([timestamp, event_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    """Inverse of ``encode_cursor``; raises ValueError for malformed tokens."""
+    try:
+        timestamp, event_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return str(timestamp), str(event_id)
+    except Exception as e:
+        raise ValueError(f"Invalid audit cursor: {cursor!r}") from e
+
+
+def build_fts_query(text: str, fields: Optional[List[str]] = None) -> Optional[str]:
+    """Turn free text into an FTS5 prefix query, optionally limited to fields."""
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return None
+    query = " AND ".join(f'"{term}"*' for term in terms)
+
+    if fields:
+        columns = " ".join(FTS_COLUMNS[name] for name in fields if name in FTS_COLUMNS)
+        if not columns:
+            return None
+        query = f"{{{columns}}} : ({query})"
+    return query
+
+
+class AuditQueryEngine:
+    """Runs filtered, paginated and full-text queries against audit_events."""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.logger = logging.getLogger(__name__)
+        self.fts_available = False
+
+    def ensure_schema(self, cursor: sqlite3.Cursor):
+        """Create query indexes and the FTS index (with sync triggers)."""
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_events_ts_id ON audit_events(timestamp, id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_events_user_ts ON audit_events(user_id, timestamp)")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_audit_events_resource_ts
+            ON audit_events(resource_type, resource_id, timestamp)
+        """)
+        # Superseded by the composite indexes above
+        cursor.execute("DROP INDEX IF EXISTS idx_audit_events_timestamp")
+        cursor.execute("DROP INDEX IF EXISTS idx_audit_events_user")
+        cursor.execute("DROP INDEX IF EXISTS idx_audit_events_resource")
+
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'audit_events_fts'")
+        existed = cursor.fetchone() is not None
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS audit_events_fts USING fts5(
+                    action, resource_type, resource_id, details, old_values, new_values,
+                    content='audit_events', content_rowid='rowid'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            self.logger.warning(f"FTS5 unavailable, audit search falls back to LIKE: {e}")
+            self.fts_available = False
+            return
+
+        cursor.executescript("""
+            CREATE TRIGGER IF NOT EXISTS audit_events_fts_insert AFTER INSERT ON audit_events BEGIN
+                INSERT INTO audit_events_fts (rowid, action, resource_type, resource_id, details, old_values, new_values)
+                VALUES (new.rowid, new.action, new.resource_type, new.resource_id, new.details, new.old_values, new.new_values);
+            END;
+            CREATE TRIGGER IF NOT EXISTS audit_events_fts_delete AFTER DELETE ON audit_events BEGIN
+                INSERT INTO audit_events_fts (audit_events_fts, rowid, action, resource_type, resource_id, details, old_values, new_values)
+                VALUES ('delete', old.rowid, old.action, old.resource_type, old.resource_id, old.details, old.old_values, old.new_values);
+            END;
+            CREATE TRIGGER IF NOT EXISTS audit_events_fts_update AFTER UPDATE ON audit_events BEGIN
+                INSERT INTO audit_events_fts (audit_events_fts, rowid, action, resource_type, resource_id, details, old_values, new_values)
+                VALUES ('delete', old.rowid, old.action, old.resource_type, old.resource_id, old.details, old.old_values, old.new_values);
+                INSERT INTO audit_events_fts (rowid, action, resource_type, resource_id, details, old_values, new_values)
+                VALUES (new.rowid, new.action, new.resource_type, new.resource_id, new.details, new.old_values, new.new_values);
+            END;
+        """)
+        if not existed:
+            # Index events written before the FTS table existed
+            cursor.execute("INSERT INTO audit_events_fts (audit_events_fts) VALUES ('rebuild')")
+        self.fts_available = True
+
+    def build_filter_clause(self, start_date: datetime = None, end_date: datetime = None,
+                            user_id: str = None, resource_type: str = None, resource_id: str = None,
+                            event_type: AuditEventType = None, prefix: str = "") -> Tuple[str, List[Any]]:
+        """WHERE fragments for the standard filters."""
+        clauses = []
+        params: List[Any] = []
+        for column, value in (
+            ("timestamp >= ?", start_date.isoformat() if start_date else None),
+            ("timestamp <= ?", end_date.isoformat() if end_date else None),
+            ("user_id = ?", user_id),
+            ("resource_type = ?", resource_type),
+            ("resource_id = ?", resource_id),
+            ("event_type = ?", event_type.value if event_type else None),
+        ):
+            if value is not None:
+                clauses.append(prefix + column)
+                params.append(value)
+        return "".join(f" AND {clause}" for clause in clauses), params
+
+    def _page(self, sql: str, params: List[Any], cursor: Optional[str], page_size: int,
+              prefix: str = "") -> AuditEventPage:
+        """Apply keyset pagination (newest first) and fetch one page."""
+        if cursor:
+            timestamp, event_id = decode_cursor(cursor)
+            sql += f" AND ({prefix}timestamp, {prefix}id) < (?, ?)"
+            params = params + [timestamp, event_id]
+        sql += f" ORDER BY {prefix}timestamp DESC, {prefix}id DESC LIMIT ?"
+        params = params + [page_size + 1]
+
+        with self.db_manager.get_connection() as conn:
+            rows = conn.execute(sql, params).fetchall()
+
+        events = [LazyAuditEvent(row) for row in rows[:page_size]]
+        next_cursor = None
+        if len(rows) > page_size:
+            last = rows[page_size - 1]
+            next_cursor = encode_cursor(last[12], last[0])
+        return AuditEventPage(events=events, next_cursor=next_cursor)
+
+    def query(self, page_size: int = 100, cursor: Optional[str] = None, **filters) -> AuditEventPage:
+        """One page of events matching the filters, newest first."""
+        where, params = self.build_filter_clause(**filters)
+        sql = f"SELECT {EVENT_COLUMNS} FROM audit_events WHERE 1=1{where}"
+        return self._page(sql, params, cursor, page_size)
+
+    def iter_events(self, limit: Optional[int] = None, page_size: int = 500,
+                    **filters) -> Iterator[AuditEvent]:
+        """Iterate matching events newest first, page by page."""
+        cursor = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = page_size if remaining is None else min(page_size, remaining)
+            page = self.query(page_size=size, cursor=cursor, **filters)
+            yield from page.events
+            if remaining is not None:
+                remaining -= len(page.events)
+            if not page.has_more:
+                return
+            cursor = page.next_cursor
+
+    def search(self, text: str, fields: Optional[List[str]] = None, page_size: int = 100,
+               cursor: Optional[str] = None, **filters) -> AuditEventPage:
+        """One page of events whose text fields match ``text``, newest first.
+
+        With FTS5, terms match whole tokens or token prefixes; without it the
+        search falls back to substring matching.
+        """
+        fields = fields or ["action", "details", "resource_id"]
+        where, params = self.build_filter_clause(prefix="e.", **filters)
+
+        if self.fts_available:
+            match = build_fts_query(text, fields)
+            if match is None:
+                return AuditEventPage()
+            columns = ", ".join(f"e.{column.strip()}" for column in EVENT_COLUMNS.split(","))
+            sql = f"""
+                SELECT {columns}
+                FROM audit_events_fts f
+                JOIN audit_events e ON e.rowid = f.rowid
+                WHERE audit_events_fts MATCH ?{where}
+            """
+            return self._page(sql, [match] + params, cursor, page_size, prefix="e.")
+
+        conditions = []
+        like_params = []
+        for name in fields:
+            for column in FTS_COLUMNS.get(name, "").split():
+                conditions.append(f"e.{column} LIKE ?")
+                like_params.append(f"%{text}%")
+        if not conditions:
+            return AuditEventPage()
+        sql = f"""
+            SELECT {EVENT_COLUMNS} FROM audit_events e
+            WHERE ({' OR '.join(conditions)}){where}
+        """
+        return self._page(sql, like_params + params, cursor, page_size, prefix="e.")
@@ -8,14 +8,17 @@ Service for comprehensive audit logging with tamper-evident records and complian
 import hashlib
 import sqlite3
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Union
+from typing import Callable, Dict, List, Optional, Any, Union
 import logging
 import json
-import csv
 import io
+from concurrent.futures import Future
 
 from models.collaboration import AuditEvent, AuditEventType
 from data.database import DatabaseManager
+from .audit_query import AuditEventPage, AuditQueryEngine, EVENT_COLUMNS, LazyAuditEvent
+from .audit_export import AuditExporter, verify_export
+from .audit_writer import AuditWriter, compute_event_checksum
 
 
 class AuditTrailService:
@@ -25,8 +28,12 @@ class AuditTrailService:
         """Initialize the audit trail service."""
         self.db_manager = db_manager
         self.logger = logging.getLogger(__name__)
+        self._query_engine = AuditQueryEngine(db_manager)
+        self._exporter = AuditExporter(db_manager, self._query_engine)
         self._init_database()
-        self._previous_checksum = self._get_last_checksum()
+        
+        # All inserts go through one writer thread, which owns the hash chain
+        self._writer = AuditWriter(self._connect_writer, self._calculate_checksum)
     
     def _init_database(self):
         """Initialize database tables for audit trail."""
@@ -49,9 +56,11 @@ class AuditTrailService:
                     old_values TEXT,
                     new_values TEXT,
                     timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    checksum TEXT NOT NULL
+                    checksum TEXT NOT NULL,
+                    chain_seq INTEGER
                 )
             """)
+            self._ensure_chain_sequence(cursor)
             
             # Audit trail integrity table
             cursor.execute("""
@@ -65,35 +74,45 @@ class AuditTrailService:
                 )
             """)
             
-            # Create indexes
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_events_timestamp ON audit_events(timestamp)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_events_user ON audit_events(user_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_events_resource ON audit_events(resource_type, resource_id)")
+            # Create indexes (query indexes and the FTS index are owned by the query engine)
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_events_type ON audit_events(event_type)")
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_audit_events_chain ON audit_events(chain_seq)")
+            self._query_engine.ensure_schema(cursor)
             
             conn.commit()
     
+    def _ensure_chain_sequence(self, cursor: sqlite3.Cursor):
+        """Add the chain_seq column to older tables and number existing events.
+        
+        Events written before chain_seq existed were chained in
+        (timestamp, id) order, which is the order verification used.
+        """
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(audit_events)")}
+        if "chain_seq" not in columns:
+            cursor.execute("ALTER TABLE audit_events ADD COLUMN chain_seq INTEGER")
+        
+        cursor.execute("SELECT COUNT(*) FROM audit_events WHERE chain_seq IS NULL")
+        if cursor.fetchone()[0] == 0:
+            return
+        
+        cursor.execute("SELECT COALESCE(MAX(chain_seq), 0) FROM audit_events")
+        offset = cursor.fetchone()[0]
+        cursor.execute("""
+            SELECT id FROM audit_events WHERE chain_seq IS NULL ORDER BY timestamp, id
+        """)
+        cursor.executemany(
+            "UPDATE audit_events SET chain_seq = ? WHERE id = ?",
+            [(offset + i, row[0]) for i, row in enumerate(cursor.fetchall(), start=1)]
+        )
+    
+    def _connect_writer(self) -> sqlite3.Connection:
+        """Dedicated connection for the writer thread."""
+        return sqlite3.connect(str(self.db_manager.db_path), timeout=30.0)
+    
     def _calculate_checksum(self, event: AuditEvent, previous_checksum: str = "") -> str:
         """Calculate tamper-evident checksum for an audit event."""
         try:
-            # Create a string representation of the event for hashing
-            event_data = {
-                "id": event.id,
-                "event_type": event.event_type.value,
-                "user_id": event.user_id,
-                "resource_type": event.resource_type,
-                "resource_id": event.resource_id,
-                "action": event.action,
-                "details": event.details,
-                "timestamp": event.timestamp.isoformat(),
-                "previous_checksum": previous_checksum
-            }
-            
-            # Convert to JSON string for consistent hashing
-            event_json = json.dumps(event_data, sort_keys=True)
-            
-            # Calculate SHA-256 hash
-            return hashlib.sha256(event_json.encode('utf-8')).hexdigest()
+            return compute_event_checksum(event, previous_checksum)
             
         except Exception as e:
             self.logger.error(f"Error calculating checksum: {e}")
@@ -106,7 +125,7 @@ class AuditTrailService:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT checksum FROM audit_events 
-                    ORDER BY timestamp DESC, id DESC 
+                    ORDER BY chain_seq DESC 
                     LIMIT 1
                 """)
                 
@@ -121,48 +140,16 @@ class AuditTrailService:
                   resource_id: str, action: str, details: Dict[str, Any] = None,
                   ip_address: str = None, user_agent: str = None, session_id: str = None,
                   old_values: Dict[str, Any] = None, new_values: Dict[str, Any] = None) -> AuditEvent:
-        """Log an audit event with tamper-evident checksum."""
+        """Log an audit event with tamper-evident checksum.
+        
+        Blocks until the event is committed. Bulk callers that do not need
+        to wait per event should use ``log_event_async``.
+        """
         try:
-            # Create audit event
-            event = AuditEvent(
-                event_type=event_type,
-                user_id=user_id,
-                resource_type=resource_type,
-                resource_id=resource_id,
-                action=action,
-                details=details or {},
-                ip_address=ip_address,
-                user_agent=user_agent,
-                session_id=session_id,
-                old_values=old_values,
-                new_values=new_values
-            )
-            
-            # Calculate checksum
-            event.checksum = self._calculate_checksum(event, self._previous_checksum)
-            
-            # Save to database
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO audit_events (
-                        id, event_type, user_id, resource_type, resource_id, action,
-                        details, ip_address, user_agent, session_id, old_values,
-                        new_values, timestamp, checksum
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    event.id, event.event_type.value, event.user_id,
-                    event.resource_type, event.resource_id, event.action,
-                    json.dumps(event.details), event.ip_address, event.user_agent,
-                    event.session_id,
-                    json.dumps(event.old_values) if event.old_values else None,
-                    json.dumps(event.new_values) if event.new_values else None,
-                    event.timestamp.isoformat(), event.checksum
-                ))
-                conn.commit()
-            
-            # Update previous checksum for next event
-            self._previous_checksum = event.checksum
+            event = self.log_event_async(
+                event_type, user_id, resource_type, resource_id, action, details,
+                ip_address, user_agent, session_id, old_values, new_values
+            ).result()
             
             self.logger.debug(f"Logged audit event: {event_type.value} by {user_id}")
             return event
@@ -171,131 +158,151 @@ class AuditTrailService:
             self.logger.error(f"Error logging audit event: {e}")
             raise
     
+    def log_event_async(self, event_type: AuditEventType, user_id: str, resource_type: str,
+                        resource_id: str, action: str, details: Dict[str, Any] = None,
+                        ip_address: str = None, user_agent: str = None, session_id: str = None,
+                        old_values: Dict[str, Any] = None,
+                        new_values: Dict[str, Any] = None) -> Future:
+        """Queue an audit event for the group-commit writer.
+        
+        Returns a future that resolves to the ``AuditEvent`` (with its
+        checksum) once the event is durable.
+        """
+        event = AuditEvent(
+            event_type=event_type,
+            user_id=user_id,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            action=action,
+            details=details or {},
+            ip_address=ip_address,
+            user_agent=user_agent,
+            session_id=session_id,
+            old_values=old_values,
+            new_values=new_values
+        )
+        return self._writer.submit(event)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for all queued audit events to be committed."""
+        return self._writer.flush(timeout)
+    
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Commit queued audit events and release the writer."""
+        return self._writer.close(timeout)
+    
+    def get_writer_stats(self) -> Dict[str, Any]:
+        """Group-commit throughput statistics."""
+        return self._writer.get_stats()
+    
+    def _checksum_before(self, cursor: sqlite3.Cursor, chain_seq: int) -> str:
+        """Checksum of the event preceding ``chain_seq`` in the chain."""
+        cursor.execute("""
+            SELECT checksum FROM audit_events
+            WHERE chain_seq < ?
+            ORDER BY chain_seq DESC
+            LIMIT 1
+        """, (chain_seq,))
+        row = cursor.fetchone()
+        return row[0] if row else ""
+    
     def get_events(self, start_date: datetime = None, end_date: datetime = None,
                    user_id: str = None, resource_type: str = None, resource_id: str = None,
                    event_type: AuditEventType = None, limit: int = 1000) -> List[AuditEvent]:
-        """Get audit events with optional filters."""
+        """Get audit events with optional filters, newest first.
+        
+        ``limit=None`` returns every match; large windows should prefer
+        ``get_events_page``.
+        """
+        self.flush()
         try:
+            return list(self._query_engine.iter_events(
+                limit=limit, start_date=start_date, end_date=end_date, user_id=user_id,
+                resource_type=resource_type, resource_id=resource_id, event_type=event_type
+            ))
+                
+        except Exception as e:
+            self.logger.error(f"Error getting audit events: {e}")
+            return []
+    
+    def get_events_page(self, page_size: int = 100, cursor: Optional[str] = None,
+                        start_date: datetime = None, end_date: datetime = None,
+                        user_id: str = None, resource_type: str = None, resource_id: str = None,
+                        event_type: AuditEventType = None) -> AuditEventPage:
+        """Get one page of events; pass ``next_cursor`` back to continue.
+        
+        Raises ValueError for a malformed cursor.
+        """
+        self.flush()
+        return self._query_engine.query(
+            page_size=page_size, cursor=cursor, start_date=start_date, end_date=end_date,
+            user_id=user_id, resource_type=resource_type, resource_id=resource_id,
+            event_type=event_type
+        )
+    
+    def verify_integrity(self, start_date: datetime = None, end_date: datetime = None) -> Dict[str, Any]:
+        """Verify the integrity of the audit trail."""
+        try:
+            self.flush()
             with self.db_manager.get_connection() as conn:
                 cursor = conn.cursor()
                 
-                query = """
-                    SELECT id, event_type, user_id, resource_type, resource_id, action,
-                           details, ip_address, user_agent, session_id, old_values,
-                           new_values, timestamp, checksum
+                query = f"""
+                    SELECT {EVENT_COLUMNS}, chain_seq
                     FROM audit_events
                     WHERE 1=1
                 """
                 params = []
-                
                 if start_date:
                     query += " AND timestamp >= ?"
                     params.append(start_date.isoformat())
-                
                 if end_date:
                     query += " AND timestamp <= ?"
                     params.append(end_date.isoformat())
-                
-                if user_id:
-                    query += " AND user_id = ?"
-                    params.append(user_id)
-                
-                if resource_type:
-                    query += " AND resource_type = ?"
-                    params.append(resource_type)
-                
-                if resource_id:
-                    query += " AND resource_id = ?"
-                    params.append(resource_id)
-                
-                if event_type:
-                    query += " AND event_type = ?"
-                    params.append(event_type.value)
-                
-                query += " ORDER BY timestamp DESC, id DESC"
-                
-                if limit:
-                    query += " LIMIT ?"
-                    params.append(limit)
+                query += " ORDER BY chain_seq"
                 
                 cursor.execute(query, params)
+                rows = cursor.fetchall()
                 
-                events = []
-                for row in cursor.fetchall():
-                    event = AuditEvent(
-                        id=row[0],
-                        event_type=AuditEventType(row[1]),
-                        user_id=row[2],
-                        resource_type=row[3],
-                        resource_id=row[4],
-                        action=row[5],
-                        details=json.loads(row[6]) if row[6] else {},
-                        ip_address=row[7],
-                        user_agent=row[8],
-                        session_id=row[9],
-                        old_values=json.loads(row[10]) if row[10] else None,
-                        new_values=json.loads(row[11]) if row[11] else None,
-                        timestamp=datetime.fromisoformat(row[12]),
-                        checksum=row[13]
-                    )
-                    events.append(event)
+                if not rows:
+                    return {
+                        "valid": True,
+                        "total_events": 0,
+                        "verified_events": 0,
+                        "invalid_events": [],
+                        "message": "No events to verify"
+                    }
                 
-                return events
+                events = []
+                invalid_events = []
+                previous_checksum = ""
+                previous_seq = None
                 
-        except Exception as e:
-            self.logger.error(f"Error getting audit events: {e}")
-            return []
-    
-    def verify_integrity(self, start_date: datetime = None, end_date: datetime = None) -> Dict[str, Any]:
-        """Verify the integrity of the audit trail."""
-        try:
-            events = self.get_events(start_date=start_date, end_date=end_date, limit=None)
-            
-            if not events:
-                return {
-                    "valid": True,
-                    "total_events": 0,
-                    "verified_events": 0,
-                    "invalid_events": [],
-                    "message": "No events to verify"
-                }
-            
-            # Sort events by timestamp for verification
-            events.sort(key=lambda x: (x.timestamp, x.id))
-            
-            invalid_events = []
-            previous_checksum = ""
-            
-            # Get the checksum before the first event in our range
-            if events and start_date:
-                with self.db_manager.get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute("""
-                        SELECT checksum FROM audit_events 
-                        WHERE timestamp < ? 
-                        ORDER BY timestamp DESC, id DESC 
-                        LIMIT 1
-                    """, (start_date.isoformat(),))
+                # Events are verified in chain order; whenever the selection skips
+                # part of the chain, the predecessor's checksum is looked up
+                for row in rows:
+                    event = LazyAuditEvent(row)
+                    seq = row[14]
+                    events.append(event)
                     
-                    row = cursor.fetchone()
-                    if row:
-                        previous_checksum = row[0]
-            
-            for event in events:
-                # Calculate expected checksum
-                expected_checksum = self._calculate_checksum(event, previous_checksum)
-                
-                # Compare with stored checksum
-                if event.checksum != expected_checksum:
-                    invalid_events.append({
-                        "event_id": event.id,
-                        "timestamp": event.timestamp.isoformat(),
-                        "expected_checksum": expected_checksum,
-                        "actual_checksum": event.checksum,
-                        "reason": "Checksum mismatch"
-                    })
-                
-                previous_checksum = event.checksum
+                    if previous_seq is None or seq != previous_seq + 1:
+                        previous_checksum = self._checksum_before(cursor, seq)
+                    
+                    # Calculate expected checksum
+                    expected_checksum = self._calculate_checksum(event, previous_checksum)
+                    
+                    # Compare with stored checksum
+                    if event.checksum != expected_checksum:
+                        invalid_events.append({
+                            "event_id": event.id,
+                            "timestamp": event.timestamp.isoformat(),
+                            "expected_checksum": expected_checksum,
+                            "actual_checksum": event.checksum,
+                            "reason": "Checksum mismatch"
+                        })
+                    
+                    previous_checksum = event.checksum
+                    previous_seq = seq
             
             result = {
                 "valid": len(invalid_events) == 0,
@@ -325,72 +332,48 @@ class AuditTrailService:
     def export_audit_trail(self, format_type: str = "csv", start_date: datetime = None,
                           end_date: datetime = None, user_id: str = None,
                           resource_type: str = None) -> Union[str, bytes]:
-        """Export audit trail for compliance reporting."""
+        """Export audit trail for compliance reporting.
+        
+        Returns the whole export as a string in the original CSV/JSON shape;
+        use ``export_audit_trail_to`` for large windows and verifiable exports.
+        """
+        self.flush()
         try:
-            events = self.get_events(
-                start_date=start_date,
-                end_date=end_date,
-                user_id=user_id,
-                resource_type=resource_type,
-                limit=None
-            )
-            
-            if format_type.lower() == "csv":
-                return self._export_csv(events)
-            elif format_type.lower() == "json":
-                return self._export_json(events)
-            else:
-                raise ValueError(f"Unsupported export format: {format_type}")
+            output = io.StringIO()
+            self._exporter.export_legacy(output, format_type, start_date=start_date, end_date=end_date,
+                                         user_id=user_id, resource_type=resource_type)
+            return output.getvalue()
                 
         except Exception as e:
             self.logger.error(f"Error exporting audit trail: {e}")
             raise
     
-    def _export_csv(self, events: List[AuditEvent]) -> str:
-        """Export events to CSV format."""
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        writer.writerow([
-            "Event ID", "Event Type", "User ID", "Resource Type", "Resource ID",
-            "Action", "Timestamp", "IP Address", "User Agent", "Session ID",
-            "Details", "Old Values", "New Values", "Checksum"
-        ])
+    def export_audit_trail_to(self, sink, format_type: str = "csv", compress: bool = False,
+                              start_date: datetime = None, end_date: datetime = None,
+                              user_id: str = None, resource_type: str = None,
+                              chunk_size: int = 1000,
+                              progress_callback: Callable[[int, int], None] = None) -> Dict[str, Any]:
+        """Stream the audit trail to a path or file-like sink.
         
-        # Write events
-        for event in events:
-            writer.writerow([
-                event.id,
-                event.event_type.value,
-                event.user_id,
-                event.resource_type,
-                event.resource_id,
-                event.action,
-                event.timestamp.isoformat(),
-                event.ip_address or "",
-                event.user_agent or "",
-                event.session_id or "",
-                json.dumps(event.details) if event.details else "",
-                json.dumps(event.old_values) if event.old_values else "",
-                json.dumps(event.new_values) if event.new_values else "",
-                event.checksum
-            ])
-        
-        return output.getvalue()
+        ``format_type`` is "csv" or "jsonl"; ``compress`` gzips the output
+        (file-like sinks must then be binary). Events are written in chain
+        order followed by a footer with a running chain hash, which is also
+        returned. ``progress_callback(exported, total)`` runs per chunk.
+        """
+        self.flush()
+        try:
+            return self._exporter.export(
+                sink, format_type, compress=compress, chunk_size=chunk_size,
+                progress_callback=progress_callback, start_date=start_date,
+                end_date=end_date, user_id=user_id, resource_type=resource_type
+            )
+        except Exception as e:
+            self.logger.error(f"Error exporting audit trail: {e}")
+            raise
     
-    def _export_json(self, events: List[AuditEvent]) -> str:
-        """Export events to JSON format."""
-        export_data = {
-            "export_metadata": {
-                "export_date": datetime.now().isoformat(),
-                "total_events": len(events),
-                "format_version": "1.0"
-            },
-            "events": [event.to_dict() for event in events]
-        }
-        
-        return json.dumps(export_data, indent=2, default=str)
+    def verify_export(self, source, format_type: str = "csv", compressed: bool = False) -> Dict[str, Any]:
+        """Verify an export written by ``export_audit_trail_to`` in one pass."""
+        return verify_export(source, format_type, compressed)
     
     def get_audit_summary(self, start_date: datetime = None, end_date: datetime = None) -> Dict[str, Any]:
         """Get audit trail summary statistics."""
@@ -516,64 +499,23 @@ class AuditTrailService:
                 "error": str(e)
             }
     
-    def search_events(self, query: str, search_fields: List[str] = None) -> List[AuditEvent]:
+    def search_events(self, query: str, search_fields: List[str] = None,
+                      limit: int = 100) -> List[AuditEvent]:
         """Search audit events by text query."""
         try:
-            if not search_fields:
-                search_fields = ["action", "details", "resource_id"]
-            
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Build search query
-                search_conditions = []
-                params = []
-                
-                for field in search_fields:
-                    if field in ["action", "resource_id", "resource_type"]:
-                        search_conditions.append(f"{field} LIKE ?")
-                        params.append(f"%{query}%")
-                    elif field == "details":
-                        search_conditions.append("details LIKE ?")
-                        params.append(f"%{query}%")
-                
-                if not search_conditions:
-                    return []
-                
-                query_sql = f"""
-                    SELECT id, event_type, user_id, resource_type, resource_id, action,
-                           details, ip_address, user_agent, session_id, old_values,
-                           new_values, timestamp, checksum
-                    FROM audit_events
-                    WHERE ({' OR '.join(search_conditions)})
-                    ORDER BY timestamp DESC
-                    LIMIT 100
-                """
-                
-                cursor.execute(query_sql, params)
-                
-                events = []
-                for row in cursor.fetchall():
-                    event = AuditEvent(
-                        id=row[0],
-                        event_type=AuditEventType(row[1]),
-                        user_id=row[2],
-                        resource_type=row[3],
-                        resource_id=row[4],
-                        action=row[5],
-                        details=json.loads(row[6]) if row[6] else {},
-                        ip_address=row[7],
-                        user_agent=row[8],
-                        session_id=row[9],
-                        old_values=json.loads(row[10]) if row[10] else None,
-                        new_values=json.loads(row[11]) if row[11] else None,
-                        timestamp=datetime.fromisoformat(row[12]),
-                        checksum=row[13]
-                    )
-                    events.append(event)
-                
-                return events
+            return self.search_events_page(query, search_fields, page_size=limit).events
                 
         except Exception as e:
             self.logger.error(f"Error searching audit events: {e}")
-            return []
\ No newline at end of file
+            return []
+    
+    def search_events_page(self, query: str, search_fields: List[str] = None,
+                           page_size: int = 100, cursor: Optional[str] = None,
+                           **filters) -> AuditEventPage:
+        """Full-text search returning one page and a continuation cursor.
+        
+        ``filters`` accepts the same keyword filters as ``get_events_page``.
+        """
+        self.flush()
+        return self._query_engine.search(query, search_fields, page_size=page_size,
+                                         cursor=cursor, **filters)
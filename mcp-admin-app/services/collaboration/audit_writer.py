@@ -0,0 +1,302 @@
+"""
+Audit Event Writer
+==================
+
+Single writer thread for the audit trail. Events from any thread are queued
+here; the writer assigns chain order and checksums and commits them in
+groups, so the tamper-evident chain has exactly one owner and bulk
+operations cost one commit per batch instead of one per event.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from models.collaboration import AuditEvent
+
+
+_FLUSH = object()
+
+# Writers with events that may still be queued; flushed once at exit
+_open_writers: "weakref.WeakSet[AuditWriter]" = weakref.WeakSet()
+
+
+def _flush_open_writers(timeout: float = 5.0):
+    for writer in list(_open_writers):
+        writer.flush(timeout)
+
+
+atexit.register(_flush_open_writers)
+
+
+def compute_event_checksum(event: AuditEvent, previous_checksum: str = "") -> str:
+    """Tamper-evident checksum of an event chained to its predecessor."""
+    event_data = {
+        "id": event.id,
+        "event_type": event.event_type.value,
+        "user_id": event.user_id,
+        "resource_type": event.resource_type,
+        "resource_id": event.resource_id,
+        "action": event.action,
+        "details": event.details,
+        "timestamp": event.timestamp.isoformat(),
+        "previous_checksum": previous_checksum
+    }
+
+    # Sorted-key JSON keeps the hash input stable
+    event_json = json.dumps(event_data, sort_keys=True)
+    return hashlib.sha256(event_json.encode('utf-8')).hexdigest()
+
+
+class AuditWriter:
+    """Group-commit writer owning the audit hash chain.
+
+    A batch is committed as soon as the writer is free. When more than one
+    event is waiting (i.e. under load) it waits up to ``max_batch_delay``
+    seconds to fill the batch to ``max_batch_size`` before committing. The
+    thread starts on first use and exits after ``idle_timeout`` seconds
+    without events, closing its connection.
+
+    Each batch re-reads the chain head under ``BEGIN IMMEDIATE``, so writers
+    in other services or processes sharing the database extend one chain.
+    """
+
+    INSERT_SQL = """
+        INSERT INTO audit_events (
+            id, event_type, user_id, resource_type, resource_id, action,
+            details, ip_address, user_agent, session_id, old_values,
+            new_values, timestamp, checksum, chain_seq
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection],
+                 checksum_fn: Callable[[AuditEvent, str], str],
+                 max_batch_size: int = 256, max_batch_delay: float = 0.01,
+                 idle_timeout: float = 5.0):
+        self.logger = logging.getLogger(__name__)
+        self._connect = connect
+        self._checksum_fn = checksum_fn
+        self.max_batch_size = max_batch_size
+        self.max_batch_delay = max_batch_delay
+        self.idle_timeout = idle_timeout
+
+        self._queue: "queue.Queue[Tuple[Any, Future]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._head_checksum = ""
+        self._head_seq = 0
+
+        self.events_written = 0
+        self.batches_committed = 0
+
+        # Events queued without waiting must still land before interpreter exit
+        _open_writers.add(self)
+
+    def submit(self, event: AuditEvent) -> Future:
+        """Queue an event; the future resolves to the event once committed."""
+        future: Future = Future()
+        self._enqueue(event, future)
+        return future
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every event submitted before this call is committed."""
+        with self._lock:
+            if self._thread is None and self._queue.empty():
+                return True
+        future: Future = Future()
+        self._enqueue(_FLUSH, future)
+        try:
+            future.result(timeout)
+            return True
+        except Exception:
+            return False
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Flush queued events and drop this writer from the exit hook."""
+        flushed = self.flush(timeout)
+        _open_writers.discard(self)
+        return flushed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Throughput counters for monitoring."""
+        return {
+            "events_written": self.events_written,
+            "batches_committed": self.batches_committed,
+            "average_batch_size": (self.events_written / self.batches_committed
+                                   if self.batches_committed else 0.0),
+            "pending": self._queue.qsize(),
+            "chain_seq": self._head_seq
+        }
+
+    def _enqueue(self, item: Any, future: Future):
+        with self._lock:
+            self._queue.put((item, future))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """Writer loop: collect a batch, commit it, repeat until idle."""
+        conn = None
+        batch: List[Tuple[Any, Future]] = []
+        try:
+            conn = self._connect()
+            while True:
+                try:
+                    first = self._queue.get(timeout=self.idle_timeout)
+                except queue.Empty:
+                    with self._lock:
+                        if self._queue.empty():
+                            self._thread = None
+                            return
+                    continue
+
+                batch = self._collect_batch(first)
+                self._write_batch(conn, batch)
+                batch = []
+        except Exception as e:
+            self.logger.error(f"Audit writer stopped: {e}")
+            self._fail_pending(e, batch)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _collect_batch(self, first: Tuple[Any, Future]) -> List[Tuple[Any, Future]]:
+        """Drain waiting events, lingering briefly only when under load."""
+        batch = [first]
+        deadline = None
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+
+            if len(batch) == 1:
+                break
+            if deadline is None:
+                deadline = time.monotonic() + self.max_batch_delay
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _load_chain_head(self, conn: sqlite3.Connection):
+        """Read the last checksum and sequence number from the database."""
+        row = conn.execute("""
+            SELECT checksum, chain_seq FROM audit_events
+            WHERE chain_seq IS NOT NULL
+            ORDER BY chain_seq DESC
+            LIMIT 1
+        """).fetchone()
+        self._head_checksum, self._head_seq = (row[0], row[1]) if row else ("", 0)
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[Tuple[Any, Future]]):
+        """Chain and commit a batch; on failure retry events one at a time."""
+        events = [(event, future) for event, future in batch if event is not _FLUSH]
+
+        if events and not self._commit(conn, events):
+            # Isolate the failing events so the rest of the batch still lands
+            for item in events:
+                if not item[1].done():
+                    self._commit(conn, [item])
+
+        for item, future in batch:
+            if item is _FLUSH:
+                future.set_result(True)
+
+    def _commit(self, conn: sqlite3.Connection, events: List[Tuple[AuditEvent, Future]]) -> bool:
+        """Insert events in chain order in one transaction.
+
+        The head is read inside the write transaction rather than taken from
+        the cache, since another writer may have extended the chain since.
+        """
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._load_chain_head(conn)
+        except Exception as e:
+            return self._abort(conn, events, e)
+
+        previous, seq = self._head_checksum, self._head_seq
+        rows, chained = [], []
+        for event, future in events:
+            try:
+                event.checksum = self._checksum_fn(event, previous)
+                row = self._event_row(event, seq + 1)
+            except Exception as e:
+                # An event that cannot be serialized fails alone and stays out of the chain
+                event.checksum = None
+                self.logger.error(f"Error preparing audit event {event.id}: {e}")
+                future.set_exception(e)
+                continue
+            seq += 1
+            previous = event.checksum
+            rows.append(row)
+            chained.append((event, future))
+
+        if not chained:
+            conn.rollback()
+            return True
+
+        try:
+            conn.executemany(self.INSERT_SQL, rows)
+            conn.commit()
+        except Exception as e:
+            return self._abort(conn, chained, e)
+
+        self._head_checksum, self._head_seq = previous, seq
+        self.events_written += len(chained)
+        self.batches_committed += 1
+        for event, future in chained:
+            future.set_result(event)
+        return True
+
+    def _abort(self, conn: sqlite3.Connection, events: List[Tuple[AuditEvent, Future]],
+               error: Exception) -> bool:
+        """Roll back a failed batch; a single event fails its future."""
+        conn.rollback()
+        for event, future in events:
+            event.checksum = None
+            if len(events) == 1:
+                future.set_exception(error)
+        if len(events) == 1:
+            self.logger.error(f"Error writing audit event {events[0][0].id}: {error}")
+        return False
+
+    def _event_row(self, event: AuditEvent, seq: int) -> Tuple:
+        return (
+            event.id, event.event_type.value, event.user_id,
+            event.resource_type, event.resource_id, event.action,
+            json.dumps(event.details), event.ip_address, event.user_agent,
+            event.session_id,
+            json.dumps(event.old_values) if event.old_values else None,
+            json.dumps(event.new_values) if event.new_values else None,
+            event.timestamp.isoformat(), event.checksum, seq
+        )
+
+    def _fail_pending(self, error: Exception, batch: List[Tuple[Any, Future]] = ()):
+        """Fail the in-flight batch and queued futures after the writer could not continue."""
+        for item, future in batch:
+            if not future.done():
+                future.set_exception(error)
+        with self._lock:
+            self._thread = None
+            while True:
+                try:
+                    item, future = self._queue.get_nowait()
+                except queue.Empty:
+                    return
+                if not future.done():
+                    future.set_exception(error)
@@ -0,0 +1,188 @@
+"""
+Authorization Cache
+===================
+
+In-memory authorization state for the user management service. Each user's
+role and explicit grants are compiled into a ``UserPermissionSet`` loaded in
+a single query, so permission checks are dictionary lookups until the entry
+is invalidated or its TTL lapses. Validated session tokens are cached the
+same way, bounded by both a TTL and the session's own expiry.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from models.collaboration import PermissionType, User, UserRole
+
+
+ROLE_PERMISSIONS = {
+    UserRole.VIEWER: frozenset([PermissionType.READ]),
+    UserRole.EDITOR: frozenset([PermissionType.READ, PermissionType.WRITE]),
+    UserRole.REVIEWER: frozenset([PermissionType.READ, PermissionType.WRITE, PermissionType.APPROVE]),
+    UserRole.ADMIN: frozenset(PermissionType),
+}
+
+
+@dataclass
+class UserPermissionSet:
+    """A user's role and explicit grants, compiled for lookups.
+
+    ``grants`` maps ``(resource_type, resource_id, permission_value)`` to the
+    grant's expiry (None for permanent grants).
+    """
+    user_id: str
+    role: UserRole
+    is_active: bool
+    grants: Dict[Tuple[str, str, str], Optional[datetime]] = field(default_factory=dict)
+
+    def allows(self, resource_type: str, resource_id: str,
+               permission_type: PermissionType, now: Optional[datetime] = None) -> bool:
+        """Whether the role or an unexpired grant covers the permission."""
+        if not self.is_active:
+            return False
+        if permission_type in ROLE_PERMISSIONS.get(self.role, ()):
+            return True
+
+        key = (resource_type, resource_id, permission_type.value)
+        if key not in self.grants:
+            return False
+        expires_at = self.grants[key]
+        return expires_at is None or expires_at > (now or datetime.now())
+
+
+@dataclass
+class _SessionEntry:
+    user: User
+    session_expires: Optional[datetime]
+    cached_until: float
+
+
+class AuthorizationCache:
+    """TTL- and size-bounded caches of permission sets and sessions.
+
+    Entries are evicted least recently used first once ``max_entries`` is
+    reached. ``ttl_seconds`` bounds how long changes made outside this
+    process (which cannot call the invalidation hooks) stay invisible.
+    """
+
+    def __init__(self, ttl_seconds: float = 300.0, session_ttl_seconds: float = 60.0,
+                 max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.session_ttl_seconds = session_ttl_seconds
+        self.max_entries = max_entries
+        self._permissions: "OrderedDict[str, Tuple[UserPermissionSet, float]]" = OrderedDict()
+        self._sessions: "OrderedDict[str, _SessionEntry]" = OrderedDict()
+        self._session_tokens: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+
+        self.hits = 0
+        self.misses = 0
+
+    # Permission sets
+
+    def get_permissions(self, user_id: str) -> Optional[UserPermissionSet]:
+        """Cached permission set, or None on a miss or after the TTL."""
+        with self._lock:
+            entry = self._permissions.get(user_id)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._permissions[user_id]
+                self.misses += 1
+                return None
+            self._permissions.move_to_end(user_id)
+            self.hits += 1
+            return entry[0]
+
+    @property
+    def generation(self) -> int:
+        """Read before loading a permission set and pass to ``put_permissions``."""
+        return self._generation
+
+    def put_permissions(self, permission_set: UserPermissionSet, generation: int):
+        """Cache a loaded set unless an invalidation happened since ``generation``."""
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._permissions[permission_set.user_id] = (
+                permission_set, time.monotonic() + self.ttl_seconds
+            )
+            self._permissions.move_to_end(permission_set.user_id)
+            while len(self._permissions) > self.max_entries:
+                self._permissions.popitem(last=False)
+
+    # Sessions
+
+    def get_session(self, session_token: str) -> Optional[User]:
+        """Cached session user while both the TTL and the session are valid."""
+        with self._lock:
+            entry = self._sessions.get(session_token)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.cached_until <= time.monotonic() or (
+                    entry.session_expires and entry.session_expires < datetime.now()):
+                self._drop_session(session_token)
+                self.misses += 1
+                return None
+            self._sessions.move_to_end(session_token)
+            self.hits += 1
+            return entry.user
+
+    def put_session(self, session_token: str, user: User, session_expires: Optional[datetime]):
+        with self._lock:
+            self._sessions[session_token] = _SessionEntry(
+                user, session_expires, time.monotonic() + self.session_ttl_seconds
+            )
+            self._sessions.move_to_end(session_token)
+            self._session_tokens.setdefault(user.id, set()).add(session_token)
+            while len(self._sessions) > self.max_entries:
+                self._drop_session(next(iter(self._sessions)))
+
+    def _drop_session(self, session_token: str):
+        entry = self._sessions.pop(session_token, None)
+        if entry is not None:
+            tokens = self._session_tokens.get(entry.user.id)
+            if tokens is not None:
+                tokens.discard(session_token)
+                if not tokens:
+                    del self._session_tokens[entry.user.id]
+
+    # Invalidation
+
+    def invalidate_user(self, user_id: str):
+        """Forget a user's permission set and cached sessions."""
+        with self._lock:
+            self._generation += 1
+            self._permissions.pop(user_id, None)
+            for token in list(self._session_tokens.get(user_id, ())):
+                self._drop_session(token)
+
+    def invalidate_permissions(self, user_id: str):
+        """Forget only a user's permission set."""
+        with self._lock:
+            self._generation += 1
+            self._permissions.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._permissions.clear()
+            self._sessions.clear()
+            self._session_tokens.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and entry counts."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "cached_permission_sets": len(self._permissions),
+            "cached_sessions": len(self._sessions),
+        }
+
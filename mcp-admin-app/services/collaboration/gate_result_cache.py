@@ -0,0 +1,170 @@
+"""
+Gate Result Cache
+=================
+
+Persistent memo of quality gate evaluations. A result is keyed on the gate
+definition version, a hash of the prompt content and a snapshot of only
+the prompt fields the gate's criteria (and auto-pass conditions) read, so
+the same prompt version evaluated by approvals, the collaboration page and
+CI is scored once. Editing a gate changes its version, which makes stale
+results unreachable; ``invalidate_gate`` also deletes them.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from models.collaboration import QualityGate
+
+
+# Prompt fields read by each criterion evaluator
+CRITERION_INPUTS = {
+    "security_scan": ("content",),
+    "pii_detection": ("content",),
+    "bias_detection": ("evaluation_results",),
+    "hallucination_rate": ("evaluation_results",),
+    "coherence_score": ("evaluation_results",),
+    "factual_accuracy": ("evaluation_results",),
+    "response_time": ("evaluation_results",),
+    "token_efficiency": ("evaluation_results",),
+    "cost_per_request": ("evaluation_results",),
+    "success_rate": ("evaluation_results",),
+    "test_coverage": ("test_cases", "evaluation_results"),
+    "documentation": ("description", "usage_examples", "parameters", "expected_outputs"),
+    "approval_status": ("approval_status",),
+}
+
+# Prompt fields read by the auto-pass check
+AUTO_PASS_INPUTS = ("author_role", "change_score")
+
+
+def _digest(value: Any) -> str:
+    payload = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def gate_version(gate: QualityGate) -> str:
+    """Fingerprint of everything that affects a gate's verdict."""
+    return _digest([
+        gate.criteria, gate.required_score, gate.auto_pass_conditions,
+        gate.is_active, gate.updated_at.isoformat()
+    ])
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256((content or "").encode("utf-8")).hexdigest()
+
+
+def relevant_inputs(gate: QualityGate) -> Iterable[str]:
+    """Sorted non-content prompt fields the gate's evaluation depends on."""
+    fields = set()
+    for criterion in gate.criteria:
+        fields.update(CRITERION_INPUTS.get(criterion.get("type", "unknown"), ()))
+    if gate.auto_pass_conditions:
+        fields.update(AUTO_PASS_INPUTS)
+    fields.discard("content")
+    return sorted(fields)
+
+
+def metric_snapshot(gate: QualityGate, prompt_data: Dict[str, Any]) -> str:
+    """Hash of the prompt fields (other than content) the gate reads."""
+    return _digest({name: prompt_data.get(name) for name in relevant_inputs(gate)})
+
+
+class GateResultCache:
+    """SQLite-backed store of full gate evaluation results."""
+
+    def __init__(self, db_manager):
+        self.db_manager = db_manager
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def ensure_schema(self, conn):
+        cursor = conn.cursor()
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS quality_gate_results (
+                cache_key TEXT PRIMARY KEY,
+                gate_id TEXT NOT NULL,
+                gate_version TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                result TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_quality_gate_results_gate
+            ON quality_gate_results (gate_id, gate_version)
+        """)
+
+    @staticmethod
+    def make_key(gate: QualityGate, version: str, prompt_data: Dict[str, Any]) -> Dict[str, str]:
+        """Cache key parts for evaluating ``prompt_data`` against ``gate``."""
+        digest = content_hash(prompt_data.get("content", ""))
+        snapshot = metric_snapshot(gate, prompt_data)
+        return {
+            "cache_key": hashlib.sha256(
+                f"{gate.id}:{version}:{digest}:{snapshot}".encode("utf-8")
+            ).hexdigest(),
+            "gate_version": version,
+            "content_hash": digest,
+        }
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self.db_manager.get_connection() as conn:
+                row = conn.execute(
+                    "SELECT result FROM quality_gate_results WHERE cache_key = ?", (cache_key,)
+                ).fetchone()
+        except Exception as e:
+            self.logger.error(f"Error reading cached gate result: {e}")
+            row = None
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, gate_id: str, key: Dict[str, str], result: Dict[str, Any]):
+        try:
+            with self.db_manager.get_connection() as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO quality_gate_results (
+                        cache_key, gate_id, gate_version, content_hash, result, created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?)
+                """, (
+                    key["cache_key"], gate_id, key["gate_version"], key["content_hash"],
+                    json.dumps(result, default=str), datetime.now().isoformat()
+                ))
+                conn.commit()
+        except Exception as e:
+            self.logger.error(f"Error caching gate result: {e}")
+
+    def invalidate_gate(self, gate_id: str):
+        """Delete every cached result for a gate."""
+        with self.db_manager.get_connection() as conn:
+            conn.execute("DELETE FROM quality_gate_results WHERE gate_id = ?", (gate_id,))
+            conn.commit()
+
+    def clear(self):
+        with self.db_manager.get_connection() as conn:
+            conn.execute("DELETE FROM quality_gate_results")
+            conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and the number of stored results."""
+        with self.db_manager.get_connection() as conn:
+            stored = conn.execute("SELECT COUNT(*) FROM quality_gate_results").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "stored_results": stored,
+        }
@@ -0,0 +1,182 @@
+"""
+Password Hashing
+================
+
+Key derivation for user passwords, run off the calling thread.
+
+Hashes are stored as ``scheme$params$hex`` strings next to the per-user
+salt. Bare hex hashes are the original 100,000-iteration PBKDF2-SHA256
+format and are still verified; any hash not produced by the current scheme
+is reported by ``needs_rehash`` so it can be upgraded at the next login.
+
+``KDFPool`` runs derivations on a small thread pool (hashlib releases the
+GIL while deriving) with a bounded backlog: when every worker is busy and
+the queue is full, new requests are rejected at once with
+``AuthenticationOverloadedError`` instead of piling up behind a login storm.
+"""
+
+import hashlib
+import logging
+import secrets
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from services.prompt.metric_aggregates import QuantileSketch, RunningStat
+
+
+LEGACY_PBKDF2_ITERATIONS = 100000
+
+
+class AuthenticationOverloadedError(RuntimeError):
+    """Raised when the key-derivation backlog is full."""
+
+
+class PasswordHasher:
+    """Encodes, verifies and upgrades password hashes.
+
+    ``scheme`` is ``"scrypt"`` (memory-hard, default) or ``"pbkdf2_sha256"``.
+    """
+
+    def __init__(self, scheme: str = "scrypt", scrypt_n: int = 2 ** 14, scrypt_r: int = 8,
+                 scrypt_p: int = 1, pbkdf2_iterations: int = 600000):
+        if scheme not in ("scrypt", "pbkdf2_sha256"):
+            raise ValueError(f"Unsupported password hash scheme: {scheme}")
+        self.scheme = scheme
+        self.scrypt_params = (scrypt_n, scrypt_r, scrypt_p)
+        self.pbkdf2_iterations = pbkdf2_iterations
+
+    def hash(self, password: str, salt: Optional[str] = None) -> Tuple[str, str]:
+        """Return ``(encoded_hash, salt)`` using the current scheme."""
+        if salt is None:
+            salt = secrets.token_hex(32)
+        if self.scheme == "scrypt":
+            n, r, p = self.scrypt_params
+            digest = self._scrypt(password, salt, n, r, p)
+            return f"scrypt${n}${r}${p}${digest}", salt
+        digest = self._pbkdf2(password, salt, self.pbkdf2_iterations)
+        return f"pbkdf2_sha256${self.pbkdf2_iterations}${digest}", salt
+
+    def verify(self, password: str, encoded: str, salt: str) -> bool:
+        """Check a password against any supported encoding."""
+        parts = encoded.split("$")
+        if len(parts) == 1:
+            computed = self._pbkdf2(password, salt, LEGACY_PBKDF2_ITERATIONS)
+            expected = encoded
+        elif parts[0] == "pbkdf2_sha256" and len(parts) == 3:
+            computed = self._pbkdf2(password, salt, int(parts[1]))
+            expected = parts[2]
+        elif parts[0] == "scrypt" and len(parts) == 5:
+            computed = self._scrypt(password, salt, int(parts[1]), int(parts[2]), int(parts[3]))
+            expected = parts[4]
+        else:
+            return False
+        return secrets.compare_digest(computed, expected)
+
+    def needs_rehash(self, encoded: str) -> bool:
+        """Whether ``encoded`` was produced by a different scheme or parameters."""
+        parts = encoded.split("$")
+        if self.scheme == "scrypt":
+            return parts[0] != "scrypt" or tuple(map(int, parts[1:4])) != self.scrypt_params
+        return parts[0] != "pbkdf2_sha256" or int(parts[1]) != self.pbkdf2_iterations
+
+    def _pbkdf2(self, password: str, salt: str, iterations: int) -> str:
+        return hashlib.pbkdf2_hmac(
+            'sha256', password.encode('utf-8'), salt.encode('utf-8'), iterations
+        ).hex()
+
+    def _scrypt(self, password: str, salt: str, n: int, r: int, p: int) -> str:
+        return hashlib.scrypt(
+            password.encode('utf-8'), salt=salt.encode('utf-8'),
+            n=n, r=r, p=p, maxmem=256 * n * r * p, dklen=32
+        ).hex()
+
+
+class KDFPool:
+    """Bounded worker pool for key derivation with login latency metrics.
+
+    At most ``max_workers`` derivations run at once and ``max_queue`` more
+    may wait; anything beyond that is shed.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue: int = 32):
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="kdf")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+
+        self.in_flight = 0
+        self.shed_count = 0
+        self.completed = 0
+        self._latency = RunningStat()
+        self._latency_sketch = QuantileSketch()
+        self._queue_wait = RunningStat()
+
+    def submit(self, fn: Callable[..., Any], *args) -> Future:
+        """Run ``fn(*args)`` on the pool, or raise if the backlog is full."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.shed_count += 1
+            raise AuthenticationOverloadedError("Too many concurrent authentication requests")
+
+        with self._lock:
+            self.in_flight += 1
+        submitted = time.perf_counter()
+
+        def run():
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self.in_flight -= 1
+                    self.completed += 1
+                    self._queue_wait.add((started - submitted) * 1000)
+                    self._latency.add((finished - submitted) * 1000)
+                    self._latency_sketch.add((finished - submitted) * 1000)
+                self._slots.release()
+
+        try:
+            return self._executor.submit(run)
+        except Exception:
+            with self._lock:
+                self.in_flight -= 1
+            self._slots.release()
+            raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, shedding and latency (milliseconds) figures."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self.in_flight,
+                "queued": max(0, self.in_flight - self.max_workers),
+                "completed": self.completed,
+                "shed": self.shed_count,
+                "latency_ms_mean": self._latency.mean,
+                "latency_ms_p50": self._latency_sketch.quantile(0.5),
+                "latency_ms_p95": self._latency_sketch.quantile(0.95),
+                "latency_ms_p99": self._latency_sketch.quantile(0.99),
+                "queue_wait_ms_mean": self._queue_wait.mean,
+            }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+_default_pool: Optional[KDFPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_kdf_pool() -> KDFPool:
+    """Process-wide pool shared by services that do not supply their own."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = KDFPool()
+        return _default_pool
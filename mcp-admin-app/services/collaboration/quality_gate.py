@@ -5,23 +5,60 @@ Quality Gate Service for MCP Admin Application
 Service for managing quality gates and prompt certification.
 """
 
+import re
 import sqlite3
+import threading
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import logging
 import json
 
 from models.collaboration import QualityGate
 from data.database import DatabaseManager
+from services.collaboration.gate_result_cache import GateResultCache, gate_version
+
+
+# Criteria that scan the prompt content; evaluated after the cheap ones so
+# they can be skipped once the gate outcome is already decided
+EXPENSIVE_CRITERIA = ("security_scan", "pii_detection")
+
+SECURITY_PATTERNS = [
+    "system(",
+    "exec(",
+    "eval(",
+    "import os",
+    "subprocess",
+    "shell=True",
+    "password",
+    "secret",
+    "api_key"
+]
+
+PII_PATTERNS = [
+    (re.compile(r'\b\d{3}-\d{2}-\d{4}\b'), "SSN"),
+    (re.compile(r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b'), "Credit Card"),
+    (re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'), "Email"),
+    (re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b'), "Phone Number")
+]
 
 
 class QualityGateService:
     """Service for quality gates and prompt certification."""
     
-    def __init__(self, db_manager: DatabaseManager):
-        """Initialize the quality gate service."""
+    def __init__(self, db_manager: DatabaseManager, gate_cache_ttl: float = 60.0):
+        """Initialize the quality gate service.
+        
+        Gate definitions are cached in memory for ``gate_cache_ttl`` seconds
+        (edits made through this service invalidate them immediately) and
+        full evaluation results are memoized in ``quality_gate_results``.
+        """
         self.db_manager = db_manager
         self.logger = logging.getLogger(__name__)
+        self.gate_cache_ttl = gate_cache_ttl
+        self._gate_cache: Dict[str, Tuple[QualityGate, str, float]] = {}
+        self._gate_cache_lock = threading.Lock()
+        self.result_cache = GateResultCache(db_manager)
         self._init_database()
         self._init_default_gates()
     
@@ -46,6 +83,8 @@ class QualityGateService:
                 )
             """)
             
+            self.result_cache.ensure_schema(conn)
+            
             conn.commit()
     
     def _init_default_gates(self):
@@ -160,6 +199,26 @@ class QualityGateService:
     
     def get_gate(self, gate_id: str) -> Optional[QualityGate]:
         """Get a quality gate by ID."""
+        cached = self._get_gate_with_version(gate_id)
+        return cached[0] if cached else None
+    
+    def _get_gate_with_version(self, gate_id: str) -> Optional[Tuple[QualityGate, str]]:
+        """Gate and its definition version, served from memory while fresh."""
+        with self._gate_cache_lock:
+            entry = self._gate_cache.get(gate_id)
+            if entry is not None and entry[2] > time.monotonic():
+                return entry[0], entry[1]
+        
+        gate = self._load_gate(gate_id)
+        if gate is None:
+            return None
+        version = gate_version(gate)
+        with self._gate_cache_lock:
+            self._gate_cache[gate_id] = (gate, version, time.monotonic() + self.gate_cache_ttl)
+        return gate, version
+    
+    def _load_gate(self, gate_id: str) -> Optional[QualityGate]:
+        """Read a quality gate from the database."""
         try:
             with self.db_manager.get_connection() as conn:
                 cursor = conn.cursor()
@@ -191,6 +250,64 @@ class QualityGateService:
             self.logger.error(f"Error getting quality gate {gate_id}: {e}")
             return None
     
+    def update_gate(self, gate_id: str, **changes) -> Optional[QualityGate]:
+        """Update gate fields and drop everything cached for the gate.
+        
+        Accepts ``name``, ``description``, ``criteria``, ``required_score``,
+        ``auto_pass_conditions`` and ``is_active``.
+        """
+        allowed = {"name", "description", "criteria", "required_score",
+                   "auto_pass_conditions", "is_active"}
+        unknown = set(changes) - allowed
+        if unknown:
+            raise ValueError(f"Unknown quality gate fields: {sorted(unknown)}")
+        
+        try:
+            gate = self._load_gate(gate_id)
+            if not gate:
+                return None
+            
+            for name, value in changes.items():
+                setattr(gate, name, value)
+            gate.updated_at = datetime.now()
+            
+            with self.db_manager.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("""
+                    UPDATE quality_gates
+                    SET name = ?, description = ?, criteria = ?, required_score = ?,
+                        auto_pass_conditions = ?, updated_at = ?, is_active = ?
+                    WHERE id = ?
+                """, (
+                    gate.name, gate.description, json.dumps(gate.criteria),
+                    gate.required_score, json.dumps(gate.auto_pass_conditions),
+                    gate.updated_at.isoformat(), gate.is_active, gate_id
+                ))
+                conn.commit()
+            
+            self.invalidate_gate(gate_id)
+            self.logger.info(f"Updated quality gate: {gate.name} ({gate_id})")
+            return gate
+            
+        except Exception as e:
+            self.logger.error(f"Error updating quality gate {gate_id}: {e}")
+            raise
+    
+    def invalidate_gate(self, gate_id: Optional[str] = None):
+        """Forget cached definitions and results for one gate, or all gates."""
+        with self._gate_cache_lock:
+            if gate_id is None:
+                self._gate_cache.clear()
+            else:
+                self._gate_cache.pop(gate_id, None)
+        try:
+            if gate_id is None:
+                self.result_cache.clear()
+            else:
+                self.result_cache.invalidate_gate(gate_id)
+        except Exception as e:
+            self.logger.error(f"Error invalidating cached gate results: {e}")
+    
     def list_gates(self, active_only: bool = True) -> List[QualityGate]:
         """List all quality gates."""
         try:
@@ -231,12 +348,30 @@ class QualityGateService:
             self.logger.error(f"Error listing quality gates: {e}")
             return []
     
-    def evaluate_prompt(self, gate_id: str, prompt_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Evaluate a prompt against a quality gate."""
+    def evaluate_prompt(self, gate_id: str, prompt_data: Dict[str, Any],
+                        use_cache: bool = True, short_circuit: bool = False) -> Dict[str, Any]:
+        """Evaluate a prompt against a quality gate.
+        
+        Full results are memoized by gate version, content hash and the
+        prompt fields the gate reads; hits carry ``"cached": True``. With
+        ``short_circuit`` the content-scanning criteria are skipped once the
+        verdict can no longer change. Such results mark the skipped criteria,
+        set ``"short_circuited": True``, report the score bound that decided
+        the verdict as ``overall_score`` and are not cached.
+        """
         try:
-            gate = self.get_gate(gate_id)
-            if not gate:
+            cached_gate = self._get_gate_with_version(gate_id)
+            if not cached_gate:
                 raise ValueError(f"Quality gate {gate_id} not found")
+            gate, version = cached_gate
+            
+            key = None
+            if use_cache:
+                key = self.result_cache.make_key(gate, version, prompt_data)
+                cached = self.result_cache.get(key["cache_key"])
+                if cached is not None:
+                    cached["cached"] = True
+                    return cached
             
             results = {
                 "gate_id": gate_id,
@@ -247,19 +382,61 @@ class QualityGateService:
                 "evaluated_at": datetime.now().isoformat()
             }
             
-            total_weight = 0.0
-            weighted_score = 0.0
+            weights = [criterion.get("weight", 1.0) for criterion in gate.criteria]
+            total_weight = sum(weights)
+            criteria_results: List[Optional[Dict[str, Any]]] = [None] * len(gate.criteria)
+            
+            # Cheap criteria first, content scans last
+            order = sorted(range(len(gate.criteria)),
+                           key=lambda i: gate.criteria[i].get("type") in EXPENSIVE_CRITERIA)
             
-            for criterion in gate.criteria:
-                criterion_result = self._evaluate_criterion(criterion, prompt_data)
-                results["criteria_results"].append(criterion_result)
+            weighted_score = 0.0
+            remaining_weight = total_weight
+            auto_passed = None
+            decided = None
+            for position, index in enumerate(order):
+                criterion_result = self._evaluate_criterion(gate.criteria[index], prompt_data)
+                criteria_results[index] = criterion_result
+                weighted_score += criterion_result["score"] * weights[index]
+                remaining_weight -= weights[index]
                 
-                weight = criterion.get("weight", 1.0)
-                total_weight += weight
-                weighted_score += criterion_result["score"] * weight
+                if (not short_circuit or total_weight <= 0 or position == len(order) - 1
+                        or gate.criteria[order[position + 1]].get("type") not in EXPENSIVE_CRITERIA):
+                    continue
+                # Content scans score in [0, 1], so the final score is bounded
+                # by the remaining weight scoring all zeros or all ones
+                lower = weighted_score / total_weight
+                upper = (weighted_score + remaining_weight) / total_weight
+                if lower >= gate.required_score:
+                    decided = (True, lower)
+                elif upper < gate.required_score:
+                    if auto_passed is None:
+                        auto_passed = bool(gate.auto_pass_conditions) and \
+                            self._check_auto_pass(gate.auto_pass_conditions, prompt_data)
+                    if not auto_passed:
+                        decided = (False, upper)
+                if decided:
+                    break
+            
+            if decided:
+                results["passed"], results["overall_score"] = decided
+                results["short_circuited"] = True
+                results["criteria_results"] = [
+                    result if result is not None else {
+                        "type": criterion.get("type", "unknown"),
+                        "threshold": criterion.get("threshold", 0.5),
+                        "skipped": True
+                    }
+                    for criterion, result in zip(gate.criteria, criteria_results)
+                ]
+                return results
             
-            # Calculate overall score
+            results["criteria_results"] = criteria_results
+            
+            # Calculate overall score (summed in gate order)
             if total_weight > 0:
+                weighted_score = sum(result["score"] * weight
+                                     for result, weight in zip(criteria_results, weights))
                 results["overall_score"] = weighted_score / total_weight
             
             # Check if passed
@@ -271,6 +448,9 @@ class QualityGateService:
                 if results["passed"]:
                     results["auto_passed"] = True
             
+            if key is not None:
+                self.result_cache.put(gate_id, key, results)
+            
             return results
             
         except Exception as e:
@@ -282,6 +462,10 @@ class QualityGateService:
                 "evaluated_at": datetime.now().isoformat()
             }
     
+    def passes_gate(self, gate_id: str, prompt_data: Dict[str, Any]) -> bool:
+        """Verdict only, skipping criteria that cannot change it."""
+        return bool(self.evaluate_prompt(gate_id, prompt_data, short_circuit=True).get("passed"))
+    
     def _evaluate_criterion(self, criterion: Dict[str, Any], prompt_data: Dict[str, Any]) -> Dict[str, Any]:
         """Evaluate a single criterion."""
         try:
@@ -354,22 +538,11 @@ class QualityGateService:
         
         security_issues = 0
         details = {"issues": []}
+        lowered = content.lower()
         
         # Check for potential security issues
-        security_patterns = [
-            "system(",
-            "exec(",
-            "eval(",
-            "import os",
-            "subprocess",
-            "shell=True",
-            "password",
-            "secret",
-            "api_key"
-        ]
-        
-        for pattern in security_patterns:
-            if pattern.lower() in content.lower():
+        for pattern in SECURITY_PATTERNS:
+            if pattern.lower() in lowered:
                 security_issues += 1
                 details["issues"].append(f"Potential security issue: {pattern}")
         
@@ -390,17 +563,8 @@ class QualityGateService:
         details = {"issues": []}
         
         # Check for potential PII patterns
-        import re
-        
-        pii_patterns = [
-            (r'\b\d{3}-\d{2}-\d{4}\b', "SSN"),
-            (r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4}[-\s]?\d{4}\b', "Credit Card"),
-            (r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', "Email"),
-            (r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', "Phone Number")
-        ]
-        
-        for pattern, pii_type in pii_patterns:
-            matches = re.findall(pattern, content)
+        for pattern, pii_type in PII_PATTERNS:
+            matches = pattern.findall(content)
             if matches:
                 pii_issues += len(matches)
                 details["issues"].append(f"Potential {pii_type}: {len(matches)} instances")
@@ -5,24 +5,38 @@ User Management Service for MCP Admin Application
 Service for managing users, authentication, and role-based access control.
 """
 
-import hashlib
+import asyncio
 import secrets
 import sqlite3
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 import logging
 
 from models.collaboration import User, UserRole, Permission, PermissionType, Workspace
 from data.database import DatabaseManager
+from .authorization_cache import AuthorizationCache, UserPermissionSet
+from .password_hashing import (
+    AuthenticationOverloadedError, KDFPool, PasswordHasher, get_default_kdf_pool
+)
 
 
 class UserManagementService:
     """Service for user management and authentication."""
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager,
+                 authorization_cache: Optional[AuthorizationCache] = None,
+                 password_hasher: Optional[PasswordHasher] = None,
+                 kdf_pool: Optional[KDFPool] = None, kdf_timeout: float = 30.0):
         """Initialize the user management service."""
         self.db_manager = db_manager
         self.logger = logging.getLogger(__name__)
+        self.authorization_cache = authorization_cache or AuthorizationCache()
+        self.password_hasher = password_hasher or PasswordHasher()
+        self.kdf_pool = kdf_pool or get_default_kdf_pool()
+        self.kdf_timeout = kdf_timeout
+        self.login_stats = {"succeeded": 0, "failed": 0, "rehashed": 0, "shed": 0}
+        self._stats_lock = threading.Lock()
         self._init_database()
     
     def _init_database(self):
@@ -109,23 +123,20 @@ class UserManagementService:
             conn.commit()
     
     def _hash_password(self, password: str, salt: str = None) -> Tuple[str, str]:
-        """Hash a password with salt."""
-        if salt is None:
-            salt = secrets.token_hex(32)
-        
-        password_hash = hashlib.pbkdf2_hmac(
-            'sha256',
-            password.encode('utf-8'),
-            salt.encode('utf-8'),
-            100000  # iterations
-        )
-        
-        return password_hash.hex(), salt
+        """Hash a password with salt on the key-derivation pool."""
+        return self.kdf_pool.submit(self.password_hasher.hash, password, salt).result(self.kdf_timeout)
     
-    def _verify_password(self, password: str, password_hash: str, salt: str) -> bool:
-        """Verify a password against its hash."""
-        computed_hash, _ = self._hash_password(password, salt)
-        return secrets.compare_digest(computed_hash, password_hash)
+    def _check_password(self, password: str, password_hash: str,
+                        salt: str) -> Tuple[bool, Optional[Tuple[str, str]]]:
+        """Verify a password and, if its hash is outdated, derive a new one.
+        
+        Runs on a pool worker; returns ``(valid, (new_hash, new_salt) or None)``.
+        """
+        if not self.password_hasher.verify(password, password_hash, salt):
+            return False, None
+        if self.password_hasher.needs_rehash(password_hash):
+            return True, self.password_hasher.hash(password)
+        return True, None
     
     def create_user(self, username: str, email: str, full_name: str, 
                    password: str, role: UserRole = UserRole.VIEWER,
@@ -179,52 +190,125 @@ class UserManagementService:
             raise
     
     def authenticate_user(self, username: str, password: str) -> Optional[User]:
-        """Authenticate a user with username and password."""
+        """Authenticate a user with username and password.
+        
+        Key derivation runs on the bounded pool; raises
+        AuthenticationOverloadedError when its backlog is full.
+        """
+        try:
+            row = self._load_credentials(username)
+            if not row:
+                self._record_login(False)
+                return None
+            
+            result = self.kdf_pool.submit(self._check_password, password, row[4], row[5])
+            return self._complete_login(row, result.result(self.kdf_timeout))
+        
+        except AuthenticationOverloadedError:
+            self._count_login("shed")
+            raise
+        except Exception as e:
+            self.logger.error(f"Error authenticating user {username}: {e}")
+            return None
+    
+    async def authenticate_user_async(self, username: str, password: str) -> Optional[User]:
+        """Event-loop friendly ``authenticate_user``: awaits key derivation
+        instead of blocking on it."""
+        try:
+            row = self._load_credentials(username)
+            if not row:
+                self._record_login(False)
+                return None
+            
+            result = self.kdf_pool.submit(self._check_password, password, row[4], row[5])
+            return self._complete_login(row, await asyncio.wait_for(
+                asyncio.wrap_future(result), self.kdf_timeout
+            ))
+        
+        except AuthenticationOverloadedError:
+            self._count_login("shed")
+            raise
+        except Exception as e:
+            self.logger.error(f"Error authenticating user {username}: {e}")
+            return None
+    
+    def _load_credentials(self, username: str) -> Optional[tuple]:
+        """Fetch the active user row used for authentication."""
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, username, email, full_name, password_hash, salt,
+                       role, is_active, is_verified, last_login, created_at,
+                       updated_at, created_by, preferences
+                FROM users 
+                WHERE username = ? AND is_active = 1
+            """, (username,))
+            return cursor.fetchone()
+    
+    def _complete_login(self, row, result: Tuple[bool, Optional[Tuple[str, str]]]) -> Optional[User]:
+        """Build the user after verification, storing an upgraded hash if any."""
+        valid, upgraded = result
+        self._record_login(valid)
+        if not valid:
+            return None
+        
+        password_hash, salt = upgraded or (row[4], row[5])
+        if upgraded:
+            self._store_password_hash(row[0], password_hash, salt)
+        
+        # Create user object
+        user = User(
+            id=row[0],
+            username=row[1],
+            email=row[2],
+            full_name=row[3],
+            password_hash=password_hash,
+            salt=salt,
+            role=UserRole(row[6]),
+            is_active=bool(row[7]),
+            is_verified=bool(row[8]),
+            last_login=datetime.fromisoformat(row[9]) if row[9] else None,
+            created_at=datetime.fromisoformat(row[10]),
+            updated_at=datetime.fromisoformat(row[11]),
+            created_by=row[12],
+            preferences=eval(row[13]) if row[13] else {}
+        )
+        
+        # Update last login
+        self._update_last_login(user.id)
+        
+        return user
+    
+    def _store_password_hash(self, user_id: str, password_hash: str, salt: str):
+        """Replace a user's password hash after a transparent rehash."""
         try:
             with self.db_manager.get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
-                    SELECT id, username, email, full_name, password_hash, salt,
-                           role, is_active, is_verified, last_login, created_at,
-                           updated_at, created_by, preferences
-                    FROM users 
-                    WHERE username = ? AND is_active = 1
-                """, (username,))
-                
-                row = cursor.fetchone()
-                if not row:
-                    return None
-                
-                # Verify password
-                if not self._verify_password(password, row[4], row[5]):
-                    return None
-                
-                # Create user object
-                user = User(
-                    id=row[0],
-                    username=row[1],
-                    email=row[2],
-                    full_name=row[3],
-                    password_hash=row[4],
-                    salt=row[5],
-                    role=UserRole(row[6]),
-                    is_active=bool(row[7]),
-                    is_verified=bool(row[8]),
-                    last_login=datetime.fromisoformat(row[9]) if row[9] else None,
-                    created_at=datetime.fromisoformat(row[10]),
-                    updated_at=datetime.fromisoformat(row[11]),
-                    created_by=row[12],
-                    preferences=eval(row[13]) if row[13] else {}
-                )
-                
-                # Update last login
-                self._update_last_login(user.id)
-                
-                return user
-                
+                    UPDATE users 
+                    SET password_hash = ?, salt = ?
+                    WHERE id = ?
+                """, (password_hash, salt, user_id))
+                conn.commit()
+            self._count_login("rehashed")
+            self.logger.info(f"Upgraded password hash for user {user_id}")
         except Exception as e:
-            self.logger.error(f"Error authenticating user {username}: {e}")
-            return None
+            self.logger.error(f"Error upgrading password hash for user {user_id}: {e}")
+    
+    def _record_login(self, succeeded: bool):
+        self._count_login("succeeded" if succeeded else "failed")
+    
+    def _count_login(self, outcome: str):
+        # Logins complete on request threads and event loops concurrently
+        with self._stats_lock:
+            self.login_stats[outcome] += 1
+    
+    def get_login_metrics(self) -> Dict[str, any]:
+        """Login outcome counters plus key-derivation pool latency and load."""
+        with self._stats_lock:
+            metrics = dict(self.login_stats)
+        metrics["kdf"] = self.kdf_pool.get_stats()
+        return metrics
     
     def _update_last_login(self, user_id: str):
         """Update user's last login timestamp."""
@@ -255,6 +339,8 @@ class UserManagementService:
                 """, (session_token, expires_at.isoformat(), user_id))
                 conn.commit()
             
+            # The previous token stops being valid
+            self.authorization_cache.invalidate_user(user_id)
             return session_token
             
         except Exception as e:
@@ -263,6 +349,10 @@ class UserManagementService:
     
     def validate_session(self, session_token: str) -> Optional[User]:
         """Validate a session token and return the user."""
+        cached_user = self.authorization_cache.get_session(session_token)
+        if cached_user is not None:
+            return cached_user
+        
         try:
             with self.db_manager.get_connection() as conn:
                 cursor = conn.cursor()
@@ -278,11 +368,12 @@ class UserManagementService:
                     return None
                 
                 # Check if session is expired
-                if row[7] and datetime.fromisoformat(row[7]) < datetime.now():
+                session_expires = datetime.fromisoformat(row[7]) if row[7] else None
+                if session_expires and session_expires < datetime.now():
                     self._invalidate_session(row[0])
                     return None
                 
-                return User(
+                user = User(
                     id=row[0],
                     username=row[1],
                     email=row[2],
@@ -291,6 +382,8 @@ class UserManagementService:
                     is_active=bool(row[5]),
                     is_verified=bool(row[6])
                 )
+                self.authorization_cache.put_session(session_token, user, session_expires)
+                return user
                 
         except Exception as e:
             self.logger.error(f"Error validating session: {e}")
@@ -307,6 +400,7 @@ class UserManagementService:
                     WHERE id = ?
                 """, (user_id,))
                 conn.commit()
+            self.authorization_cache.invalidate_user(user_id)
         except Exception as e:
             self.logger.error(f"Error invalidating session for user {user_id}: {e}")
     
@@ -384,7 +478,12 @@ class UserManagementService:
                 """, values)
                 conn.commit()
                 
-                return cursor.rowcount > 0
+                success = cursor.rowcount > 0
+            
+            if success:
+                # Role and active flag feed cached permissions and sessions
+                self.authorization_cache.invalidate_user(user_id)
+            return success
                 
         except Exception as e:
             self.logger.error(f"Error updating user {user_id}: {e}")
@@ -453,55 +552,108 @@ class UserManagementService:
                 conn.commit()
                 
                 success = cursor.rowcount > 0
-                if success:
-                    self.logger.info(f"Deleted user: {user_id}")
-                
-                return success
+            
+            if success:
+                self.authorization_cache.invalidate_user(user_id)
+                self.logger.info(f"Deleted user: {user_id}")
+            return success
                 
         except Exception as e:
             self.logger.error(f"Error deleting user {user_id}: {e}")
             return False
     
+    def _get_permission_set(self, user_id: str) -> Optional[UserPermissionSet]:
+        """Compiled permissions for a user, loaded once and then cached."""
+        permission_set = self.authorization_cache.get_permissions(user_id)
+        if permission_set is not None:
+            return permission_set
+        
+        generation = self.authorization_cache.generation
+        
+        # User row and unexpired grants in a single query
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT u.role, u.is_active, p.resource_type, p.resource_id,
+                       p.permission_type, p.expires_at
+                FROM users u
+                LEFT JOIN permissions p
+                    ON p.user_id = u.id AND (p.expires_at IS NULL OR p.expires_at > ?)
+                WHERE u.id = ?
+            """, (datetime.now().isoformat(), user_id))
+            rows = cursor.fetchall()
+        
+        if not rows:
+            return None
+        
+        permission_set = UserPermissionSet(
+            user_id=user_id,
+            role=UserRole(rows[0][0]),
+            is_active=bool(rows[0][1])
+        )
+        for _, _, resource_type, resource_id, permission_value, expires_at in rows:
+            if resource_type is None:
+                continue
+            key = (resource_type, resource_id, permission_value)
+            expires = datetime.fromisoformat(expires_at) if expires_at else None
+            # Duplicate grants collapse to the longest-lasting; None never expires
+            if key in permission_set.grants:
+                current = permission_set.grants[key]
+                if current is None or (expires is not None and expires <= current):
+                    continue
+            permission_set.grants[key] = expires
+        
+        self.authorization_cache.put_permissions(permission_set, generation)
+        return permission_set
+    
     def check_permission(self, user_id: str, resource_type: str, 
                         resource_id: str, permission_type: PermissionType) -> bool:
         """Check if a user has a specific permission."""
         try:
-            # Get user role first
-            user = self.get_user(user_id)
-            if not user or not user.is_active:
+            permission_set = self._get_permission_set(user_id)
+            if permission_set is None:
                 return False
             
-            # Admin users have all permissions
-            if user.role == UserRole.ADMIN:
-                return True
-            
-            # Check role-based permissions
-            role_permissions = {
-                UserRole.VIEWER: [PermissionType.READ],
-                UserRole.EDITOR: [PermissionType.READ, PermissionType.WRITE],
-                UserRole.REVIEWER: [PermissionType.READ, PermissionType.WRITE, PermissionType.APPROVE],
-                UserRole.ADMIN: [PermissionType.READ, PermissionType.WRITE, PermissionType.DELETE, PermissionType.APPROVE, PermissionType.ADMIN]
-            }
-            
-            if permission_type in role_permissions.get(user.role, []):
-                return True
-            
-            # Check explicit permissions
-            with self.db_manager.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT COUNT(*) FROM permissions 
-                    WHERE user_id = ? AND resource_type = ? AND resource_id = ?
-                    AND permission_type = ? AND (expires_at IS NULL OR expires_at > ?)
-                """, (user_id, resource_type, resource_id, permission_type.value, 
-                     datetime.now().isoformat()))
-                
-                return cursor.fetchone()[0] > 0
+            return permission_set.allows(resource_type, resource_id, permission_type)
                 
         except Exception as e:
             self.logger.error(f"Error checking permission for user {user_id}: {e}")
             return False
     
+    def check_permissions(self, user_id: str, resources: Iterable[Tuple[str, str]],
+                          permission_type: PermissionType) -> Dict[Tuple[str, str], bool]:
+        """Check one permission for many ``(resource_type, resource_id)`` pairs.
+        
+        Answers a whole page of resources from a single permission-set load.
+        """
+        resources = list(resources)
+        try:
+            permission_set = self._get_permission_set(user_id)
+            if permission_set is None:
+                return {resource: False for resource in resources}
+            
+            now = datetime.now()
+            return {
+                (resource_type, resource_id): permission_set.allows(
+                    resource_type, resource_id, permission_type, now
+                )
+                for resource_type, resource_id in resources
+            }
+                
+        except Exception as e:
+            self.logger.error(f"Error checking permissions for user {user_id}: {e}")
+            return {resource: False for resource in resources}
+    
+    def invalidate_authorization(self, user_id: str = None):
+        """Drop cached permissions and sessions for one user, or for everyone.
+        
+        For changes made outside this service, e.g. direct database edits.
+        """
+        if user_id is None:
+            self.authorization_cache.clear()
+        else:
+            self.authorization_cache.invalidate_user(user_id)
+    
     def grant_permission(self, user_id: str, resource_type: str, resource_id: str,
                         permission_type: PermissionType, granted_by: str,
                         expires_at: datetime = None) -> bool:
@@ -531,6 +683,7 @@ class UserManagementService:
                 ))
                 conn.commit()
             
+            self.authorization_cache.invalidate_permissions(user_id)
             self.logger.info(f"Granted {permission_type.value} permission to user {user_id} for {resource_type}:{resource_id}")
             return True
             
@@ -553,6 +706,7 @@ class UserManagementService:
                 
                 success = cursor.rowcount > 0
                 if success:
+                    self.authorization_cache.invalidate_permissions(user_id)
                     self.logger.info(f"Revoked {permission_type.value} permission from user {user_id} for {resource_type}:{resource_id}")
                 
                 return success
@@ -5,14 +5,16 @@ Human Rating Interface and Storage
 System for collecting and managing human evaluations of prompt responses.
 """
 
+import json
 import logging
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Callable
 from enum import Enum
 
 from .scoring_engine import EvaluationScore, EvaluationResult, ScoringRubric, ScoringCriterion, EvaluatorType
 from .llm_provider_abstraction import LLMResponse
+from .rating_store import RatingStore, score_from_dict
 from models.base import generate_id
 
 
@@ -185,7 +187,7 @@ class HumanRating:
             response_id=data.get("response_id", ""),
             rater_id=data.get("rater_id", ""),
             rubric_id=data.get("rubric_id", ""),
-            scores=[EvaluationScore(**score_data) for score_data in data.get("scores", [])],
+            scores=[score_from_dict(score_data) for score_data in data.get("scores", [])],
             overall_score=data.get("overall_score", 0.0),
             confidence=data.get("confidence", 1.0),
             comments=data.get("comments", ""),
@@ -202,83 +204,44 @@ class HumanRatingInterface:
         self.logger = logging.getLogger(__name__)
         self.config_manager = config_manager
         self.db_manager = db_manager
-        self.raters: Dict[str, HumanRater] = {}
-        self.tasks: Dict[str, RatingTask] = {}
-        self.ratings: Dict[str, HumanRating] = {}
+        self.store = RatingStore(db_manager)
         
-        # Load existing data
-        self._load_raters()
-        self._load_tasks()
-        self._load_ratings()
-    
-    def _load_raters(self):
-        """Load human raters from configuration."""
-        try:
-            raters_config = self.config_manager.get("human_raters", {})
-            for rater_id, rater_data in raters_config.items():
-                rater = HumanRater.from_dict(rater_data)
-                self.raters[rater_id] = rater
-            
-            self.logger.info(f"Loaded {len(self.raters)} human raters")
-        except Exception as e:
-            self.logger.error(f"Failed to load raters: {e}")
-    
-    def _load_tasks(self):
-        """Load rating tasks from storage."""
-        try:
-            tasks_config = self.config_manager.get("rating_tasks", {})
-            for task_id, task_data in tasks_config.items():
-                task = RatingTask.from_dict(task_data)
-                self.tasks[task_id] = task
-            
-            self.logger.info(f"Loaded {len(self.tasks)} rating tasks")
-        except Exception as e:
-            self.logger.error(f"Failed to load tasks: {e}")
-    
-    def _load_ratings(self):
-        """Load human ratings from storage."""
+        # One-time import of data kept in configuration by earlier versions
         try:
-            ratings_config = self.config_manager.get("human_ratings", {})
-            for rating_id, rating_data in ratings_config.items():
-                rating = HumanRating.from_dict(rating_data)
-                self.ratings[rating_id] = rating
-            
-            self.logger.info(f"Loaded {len(self.ratings)} human ratings")
+            self.store.migrate_from_config(config_manager)
         except Exception as e:
-            self.logger.error(f"Failed to load ratings: {e}")
+            self.logger.error(f"Failed to migrate human rating data: {e}")
     
     def add_rater(self, rater: HumanRater) -> bool:
         """Add a new human rater."""
         try:
-            self.raters[rater.id] = rater
-            self._save_rater(rater)
+            self.store.upsert_rater(rater)
             self.logger.info(f"Added rater: {rater.name}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to add rater: {e}")
             return False
     
-    def _save_rater(self, rater: HumanRater):
-        """Save rater to configuration."""
-        raters_config = self.config_manager.get("human_raters", {})
-        raters_config[rater.id] = rater.to_dict()
-        self.config_manager.set("human_raters", raters_config)
-    
     def update_rater(self, rater: HumanRater) -> bool:
         """Update an existing rater."""
-        if rater.id in self.raters:
-            self.raters[rater.id] = rater
-            self._save_rater(rater)
+        try:
+            if not self.store.rater_exists(rater.id):
+                return False
+            self.store.upsert_rater(rater)
             self.logger.info(f"Updated rater: {rater.name}")
             return True
-        return False
+        except Exception as e:
+            self.logger.error(f"Failed to update rater: {e}")
+            return False
+    
+    def get_rater(self, rater_id: str) -> Optional[HumanRater]:
+        """Get a rater by ID."""
+        return self.store.get_rater(rater_id)
     
     def get_available_raters(self, expertise_area: str = None) -> List[HumanRater]:
         """Get list of available raters, optionally filtered by expertise."""
-        available_raters = [
-            rater for rater in self.raters.values() 
-            if rater.is_active
-        ]
+        # Sorted by reliability score and availability
+        available_raters = self.store.list_active_raters()
         
         if expertise_area:
             available_raters = [
@@ -286,9 +249,6 @@ class HumanRatingInterface:
                 if expertise_area in rater.expertise_areas
             ]
         
-        # Sort by reliability score and availability
-        available_raters.sort(key=lambda r: (-r.reliability_score, r.rating_count))
-        
         return available_raters
     
     def create_rating_task(self, 
@@ -303,28 +263,23 @@ class HumanRatingInterface:
         try:
             # Auto-assign rater if not specified
             if not rater_id:
-                available_raters = self.get_available_raters()
+                available_raters = self.store.list_active_raters(limit=1)
                 if not available_raters:
                     self.logger.warning("No available raters for task assignment")
                     return None
                 rater_id = available_raters[0].id
             
-            # Calculate due date
-            due_date = datetime.now()
-            due_date = due_date.replace(hour=due_date.hour + due_hours)
-            
             task = RatingTask(
                 response_id=response_id,
                 rubric_id=rubric_id,
                 rater_id=rater_id,
                 priority=priority,
-                due_date=due_date,
+                due_date=datetime.now() + timedelta(hours=due_hours),
                 context=context or {},
                 instructions=instructions
             )
             
-            self.tasks[task.id] = task
-            self._save_task(task)
+            self.store.upsert_task(task)
             
             self.logger.info(f"Created rating task {task.id} for rater {rater_id}")
             return task
@@ -333,54 +288,38 @@ class HumanRatingInterface:
             self.logger.error(f"Failed to create rating task: {e}")
             return None
     
-    def _save_task(self, task: RatingTask):
-        """Save task to configuration."""
-        tasks_config = self.config_manager.get("rating_tasks", {})
-        tasks_config[task.id] = task.to_dict()
-        self.config_manager.set("rating_tasks", tasks_config)
+    def get_task(self, task_id: str) -> Optional[RatingTask]:
+        """Get a rating task by ID."""
+        return self.store.get_task(task_id)
     
-    def get_tasks_for_rater(self, rater_id: str, status: RatingStatus = None) -> List[RatingTask]:
-        """Get tasks assigned to a specific rater."""
-        tasks = [
-            task for task in self.tasks.values()
-            if task.rater_id == rater_id
-        ]
-        
-        if status:
-            tasks = [task for task in tasks if task.status == status]
-        
-        # Sort by priority and due date
-        priority_order = {
-            RatingPriority.URGENT: 0,
-            RatingPriority.HIGH: 1,
-            RatingPriority.NORMAL: 2,
-            RatingPriority.LOW: 3
-        }
-        
-        tasks.sort(key=lambda t: (
-            priority_order.get(t.priority, 2),
-            t.due_date or datetime.max
-        ))
+    def get_tasks_for_rater(self, rater_id: str, status: RatingStatus = None,
+                            limit: Optional[int] = None, offset: int = 0) -> List[RatingTask]:
+        """Get tasks assigned to a specific rater, by priority and due date.
         
-        return tasks
+        ``limit``/``offset`` page through the rater's queue.
+        """
+        try:
+            return self.store.list_tasks_for_rater(
+                rater_id, status.value if status else None, limit=limit, offset=offset
+            )
+        except Exception as e:
+            self.logger.error(f"Failed to get tasks for rater {rater_id}: {e}")
+            return []
     
     def start_rating_task(self, task_id: str, rater_id: str) -> bool:
         """Mark a rating task as started."""
-        if task_id in self.tasks:
-            task = self.tasks[task_id]
-            if task.rater_id == rater_id and task.status == RatingStatus.PENDING:
-                task.status = RatingStatus.IN_PROGRESS
-                task.started_at = datetime.now()
-                self._save_task(task)
-                
-                # Update rater last active
-                if rater_id in self.raters:
-                    self.raters[rater_id].last_active = datetime.now()
-                    self._save_rater(self.raters[rater_id])
-                
+        try:
+            started = self.store.transition_task(
+                task_id, rater_id, [RatingStatus.PENDING.value],
+                {"status": RatingStatus.IN_PROGRESS.value, "started_at": datetime.now().isoformat()},
+                touch_rater=True
+            )
+            if started:
                 self.logger.info(f"Started rating task {task_id}")
-                return True
-        return False
+            return started
+        except Exception as e:
+            self.logger.error(f"Failed to start rating task: {e}")
+            return False
     
     def submit_rating(self, 
                      task_id: str,
@@ -392,10 +331,10 @@ class HumanRatingInterface:
                      rating_time_minutes: int = 0) -> Optional[HumanRating]:
         """Submit a human rating for a task."""
         try:
-            if task_id not in self.tasks:
+            task = self.store.get_task(task_id)
+            if task is None:
                 raise ValueError(f"Task not found: {task_id}")
             
-            task = self.tasks[task_id]
             if task.rater_id != rater_id:
                 raise ValueError("Task not assigned to this rater")
             
@@ -419,18 +358,9 @@ class HumanRatingInterface:
             if not self._validate_rating_scores(rating):
                 raise ValueError("Invalid rating scores")
             
-            # Save rating
-            self.ratings[rating.id] = rating
-            self._save_rating(rating)
-            
-            # Update task status
-            task.status = RatingStatus.COMPLETED
-            task.completed_at = datetime.now()
-            task.actual_time_minutes = rating_time_minutes
-            self._save_task(task)
-            
-            # Update rater statistics
-            self._update_rater_statistics(rater_id, rating_time_minutes)
+            # Save rating, complete the task and update rater statistics together
+            if not self.store.submit_rating(rating, datetime.now()):
+                raise ValueError(f"Task no longer in progress: {task_id}")
             
             self.logger.info(f"Submitted rating {rating.id} for task {task_id}")
             return rating
@@ -460,155 +390,113 @@ class HumanRatingInterface:
         except Exception:
             return False
     
-    def _save_rating(self, rating: HumanRating):
-        """Save rating to configuration."""
-        ratings_config = self.config_manager.get("human_ratings", {})
-        ratings_config[rating.id] = rating.to_dict()
-        self.config_manager.set("human_ratings", ratings_config)
-    
-    def _update_rater_statistics(self, rater_id: str, rating_time_minutes: int):
-        """Update rater statistics after completing a rating."""
-        if rater_id in self.raters:
-            rater = self.raters[rater_id]
-            
-            # Update rating count
-            rater.rating_count += 1
-            
-            # Update average rating time
-            if rater.average_rating_time == 0:
-                rater.average_rating_time = rating_time_minutes
-            else:
-                rater.average_rating_time = (
-                    (rater.average_rating_time * (rater.rating_count - 1) + rating_time_minutes) 
-                    / rater.rating_count
-                )
-            
-            # Update last active
-            rater.last_active = datetime.now()
-            
-            self._save_rater(rater)
-    
     def skip_rating_task(self, task_id: str, rater_id: str, reason: str = "") -> bool:
         """Skip a rating task."""
-        if task_id in self.tasks:
-            task = self.tasks[task_id]
-            if task.rater_id == rater_id:
-                task.status = RatingStatus.SKIPPED
-                task.completed_at = datetime.now()
-                task.metadata["skip_reason"] = reason
-                self._save_task(task)
-                
+        try:
+            task = self.store.get_task(task_id)
+            if task is None or task.rater_id != rater_id:
+                return False
+            
+            task.metadata["skip_reason"] = reason
+            skipped = self.store.transition_task(
+                task_id, rater_id, [],
+                {"status": RatingStatus.SKIPPED.value,
+                 "completed_at": datetime.now().isoformat(),
+                 "metadata": json.dumps(task.metadata)}
+            )
+            if skipped:
                 self.logger.info(f"Skipped rating task {task_id}: {reason}")
-                return True
-        return False
+            return skipped
+        except Exception as e:
+            self.logger.error(f"Failed to skip rating task: {e}")
+            return False
     
-    def get_ratings_for_response(self, response_id: str) -> List[HumanRating]:
-        """Get all human ratings for a specific response."""
-        return [
-            rating for rating in self.ratings.values()
-            if rating.response_id == response_id
-        ]
+    def get_ratings_for_response(self, response_id: str, limit: Optional[int] = None,
+                                 offset: int = 0) -> List[HumanRating]:
+        """Get human ratings for a specific response in submission order."""
+        try:
+            return self.store.list_ratings(response_id=response_id, limit=limit, offset=offset)
+        except Exception as e:
+            self.logger.error(f"Failed to get ratings for response {response_id}: {e}")
+            return []
     
     def get_rater_statistics(self, rater_id: str) -> Dict[str, Any]:
         """Get statistics for a specific rater."""
-        if rater_id not in self.raters:
+        rater = self.store.get_rater(rater_id)
+        if rater is None:
             return {}
         
-        rater = self.raters[rater_id]
-        
         # Count tasks by status
-        rater_tasks = [task for task in self.tasks.values() if task.rater_id == rater_id]
-        task_counts = {}
-        for status in RatingStatus:
-            task_counts[status.value] = len([t for t in rater_tasks if t.status == status])
+        stored_counts = self.store.task_counts_for_rater(rater_id)
+        task_counts = {status.value: stored_counts.get(status.value, 0) for status in RatingStatus}
         
-        # Get recent ratings
-        rater_ratings = [r for r in self.ratings.values() if r.rater_id == rater_id]
-        recent_ratings = sorted(rater_ratings, key=lambda r: r.submitted_at, reverse=True)[:10]
+        # Totals are maintained on submit, so only the recent page is read
+        total_ratings, score_total = self.store.rater_totals(rater_id)
+        recent_ratings = self.store.list_ratings(rater_id=rater_id, newest_first=True, limit=10)
         
         return {
             "rater": rater.to_dict(),
             "task_counts": task_counts,
-            "total_ratings": len(rater_ratings),
+            "total_ratings": total_ratings,
             "recent_ratings": [r.to_dict() for r in recent_ratings],
-            "average_score": sum(r.overall_score for r in rater_ratings) / len(rater_ratings) if rater_ratings else 0.0
+            "average_score": score_total / total_ratings if total_ratings else 0.0
         }
     
     def get_rating_quality_metrics(self) -> Dict[str, Any]:
         """Get overall quality metrics for human ratings."""
-        if not self.ratings:
+        aggregates = self.store.quality_aggregates()
+        if not aggregates["total_ratings"]:
             return {"total_ratings": 0}
         
-        ratings = list(self.ratings.values())
-        
-        # Calculate inter-rater reliability (simplified)
-        response_ratings = {}
-        for rating in ratings:
-            if rating.response_id not in response_ratings:
-                response_ratings[rating.response_id] = []
-            response_ratings[rating.response_id].append(rating.overall_score)
-        
-        # Find responses with multiple ratings
-        multi_rated = {k: v for k, v in response_ratings.items() if len(v) > 1}
-        
-        agreement_scores = []
-        for scores in multi_rated.values():
-            if len(scores) >= 2:
-                # Calculate standard deviation as a measure of disagreement
-                mean_score = sum(scores) / len(scores)
-                variance = sum((s - mean_score) ** 2 for s in scores) / len(scores)
-                agreement_scores.append(1.0 / (1.0 + variance))  # Higher agreement = lower variance
-        
+        # Calculate inter-rater reliability (simplified): higher agreement = lower variance
+        variances = aggregates["multi_rated_variances"]
+        agreement_scores = [1.0 / (1.0 + variance) for variance in variances]
         avg_agreement = sum(agreement_scores) / len(agreement_scores) if agreement_scores else 0.0
         
         return {
-            "total_ratings": len(ratings),
-            "unique_responses_rated": len(response_ratings),
-            "multi_rated_responses": len(multi_rated),
+            "total_ratings": aggregates["total_ratings"],
+            "unique_responses_rated": aggregates["unique_responses"],
+            "multi_rated_responses": len(variances),
             "average_inter_rater_agreement": avg_agreement,
-            "average_overall_score": sum(r.overall_score for r in ratings) / len(ratings),
-            "average_confidence": sum(r.confidence for r in ratings) / len(ratings),
-            "average_rating_time": sum(r.rating_time_minutes for r in ratings) / len(ratings)
+            "average_overall_score": aggregates["average_overall_score"],
+            "average_confidence": aggregates["average_confidence"],
+            "average_rating_time": aggregates["average_rating_time"]
         }
     
     def reassign_task(self, task_id: str, new_rater_id: str) -> bool:
-        """Reassign a task to a different rater."""
-        if task_id in self.tasks and new_rater_id in self.raters:
-            task = self.tasks[task_id]
-            if task.status == RatingStatus.PENDING:
-                old_rater_id = task.rater_id
-                task.rater_id = new_rater_id
-                task.assigned_at = datetime.now()
-                self._save_task(task)
-                
-                self.logger.info(f"Reassigned task {task_id} from {old_rater_id} to {new_rater_id}")
-                return True
-        return False
+        """Reassign a pending task to a different rater."""
+        try:
+            task = self.store.get_task(task_id)
+            if task is None or not self.store.rater_exists(new_rater_id):
+                return False
+            
+            reassigned = self.store.transition_task(
+                task_id, None, [RatingStatus.PENDING.value],
+                {"rater_id": new_rater_id, "assigned_at": datetime.now().isoformat()}
+            )
+            if reassigned:
+                self.logger.info(f"Reassigned task {task_id} from {task.rater_id} to {new_rater_id}")
+            return reassigned
+        except Exception as e:
+            self.logger.error(f"Failed to reassign task: {e}")
+            return False
     
     def get_pending_tasks_summary(self) -> Dict[str, Any]:
         """Get summary of pending rating tasks."""
-        pending_tasks = [task for task in self.tasks.values() if task.status == RatingStatus.PENDING]
+        summary = self.store.pending_summary(datetime.now())
         
         # Group by priority
-        priority_counts = {}
-        for priority in RatingPriority:
-            priority_counts[priority.value] = len([t for t in pending_tasks if t.priority == priority])
-        
-        # Group by rater
-        rater_counts = {}
-        for task in pending_tasks:
-            rater_counts[task.rater_id] = rater_counts.get(task.rater_id, 0) + 1
-        
-        # Overdue tasks
-        now = datetime.now()
-        overdue_tasks = [t for t in pending_tasks if t.due_date and t.due_date < now]
+        priority_counts = {
+            priority.value: summary["by_priority"].get(priority.value, 0)
+            for priority in RatingPriority
+        }
         
         return {
-            "total_pending": len(pending_tasks),
+            "total_pending": summary["total"],
             "priority_breakdown": priority_counts,
-            "rater_workload": rater_counts,
-            "overdue_count": len(overdue_tasks),
-            "average_estimated_time": sum(t.estimated_time_minutes for t in pending_tasks) / len(pending_tasks) if pending_tasks else 0
+            "rater_workload": summary["by_rater"],
+            "overdue_count": summary["overdue"],
+            "average_estimated_time": summary["average_estimated_time"]
         }
 
 
@@ -0,0 +1,473 @@
+"""
+Human Rating Store
+==================
+
+SQLite persistence for human raters, rating tasks and submitted ratings.
+Records are written one row at a time, queries are served from indexes on
+rater, status, priority and response, and per-rater rating totals are kept
+on the rater row so statistics never rescan the ratings table.
+"""
+
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from .scoring_engine import EvaluationScore, EvaluatorType
+
+
+PRIORITY_RANK = {"urgent": 0, "high": 1, "normal": 2, "low": 3}
+
+# Legacy config keys the store migrates from
+LEGACY_CONFIG_KEYS = ("human_raters", "rating_tasks", "human_ratings")
+
+RATER_COLUMNS = """id, name, email, expertise_areas, rating_count, average_rating_time,
+                   reliability_score, is_active, created_at, last_active, preferences"""
+
+TASK_COLUMNS = """id, response_id, rubric_id, rater_id, status, priority, assigned_at,
+                  due_date, started_at, completed_at, estimated_time_minutes,
+                  actual_time_minutes, context, instructions, metadata"""
+TASK_INSERT = f"""INSERT OR {{conflict}} INTO rating_tasks ({TASK_COLUMNS}, priority_rank)
+                  VALUES ({', '.join('?' * 16)})"""
+
+RATING_COLUMNS = """id, task_id, response_id, rater_id, rubric_id, scores, overall_score,
+                    confidence, comments, rating_time_minutes, submitted_at, quality_flags"""
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _parse(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value else None
+
+
+def _paging(limit: Optional[int], offset: int) -> Tuple[str, List[int]]:
+    if limit is None:
+        return (" LIMIT -1 OFFSET ?", [offset]) if offset else ("", [])
+    return " LIMIT ? OFFSET ?", [limit, offset]
+
+
+def score_from_dict(data: Dict[str, Any]) -> EvaluationScore:
+    """Rebuild an EvaluationScore from its ``to_dict`` form."""
+    return EvaluationScore(
+        criterion_id=data.get("criterion_id", ""),
+        score=data.get("score", 0.0),
+        confidence=data.get("confidence", 1.0),
+        explanation=data.get("explanation", ""),
+        evaluator_id=data.get("evaluator_id", ""),
+        evaluator_type=EvaluatorType(data.get("evaluator_type", EvaluatorType.HUMAN.value)),
+        timestamp=_parse(data.get("timestamp")) or datetime.now(),
+        metadata=data.get("metadata", {})
+    )
+
+
+class RatingStore:
+    """Indexed storage for raters, rating tasks and human ratings."""
+
+    def __init__(self, db_manager):
+        self.logger = logging.getLogger(__name__)
+        self.db_manager = db_manager
+        self.ensure_schema()
+
+    def ensure_schema(self):
+        """Create rating tables and indexes."""
+        with self.db_manager.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS human_raters (
+                    id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    email TEXT,
+                    expertise_areas TEXT,
+                    rating_count INTEGER DEFAULT 0,
+                    average_rating_time REAL DEFAULT 0.0,
+                    reliability_score REAL DEFAULT 1.0,
+                    is_active INTEGER DEFAULT 1,
+                    created_at TEXT NOT NULL,
+                    last_active TEXT,
+                    preferences TEXT,
+                    ratings_submitted INTEGER DEFAULT 0,
+                    overall_score_total REAL DEFAULT 0.0
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS rating_tasks (
+                    id TEXT PRIMARY KEY,
+                    response_id TEXT NOT NULL,
+                    rubric_id TEXT,
+                    rater_id TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    priority_rank INTEGER NOT NULL,
+                    assigned_at TEXT NOT NULL,
+                    due_date TEXT,
+                    started_at TEXT,
+                    completed_at TEXT,
+                    estimated_time_minutes INTEGER DEFAULT 10,
+                    actual_time_minutes INTEGER,
+                    context TEXT,
+                    instructions TEXT,
+                    metadata TEXT
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS human_ratings (
+                    id TEXT PRIMARY KEY,
+                    task_id TEXT,
+                    response_id TEXT NOT NULL,
+                    rater_id TEXT NOT NULL,
+                    rubric_id TEXT,
+                    scores TEXT,
+                    overall_score REAL DEFAULT 0.0,
+                    confidence REAL DEFAULT 1.0,
+                    comments TEXT,
+                    rating_time_minutes INTEGER DEFAULT 0,
+                    submitted_at TEXT NOT NULL,
+                    quality_flags TEXT
+                )
+            """)
+
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_human_raters_available
+                ON human_raters(is_active, reliability_score DESC, rating_count)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_rating_tasks_rater
+                ON rating_tasks(rater_id, status, priority_rank, due_date)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_rating_tasks_status
+                ON rating_tasks(status, priority_rank)
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_rating_tasks_response ON rating_tasks(response_id)")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_human_ratings_response
+                ON human_ratings(response_id, submitted_at)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_human_ratings_rater
+                ON human_ratings(rater_id, submitted_at)
+            """)
+            conn.commit()
+
+    # Row conversion
+
+    def _rater_params(self, rater) -> Tuple:
+        return (
+            rater.id, rater.name, rater.email, json.dumps(rater.expertise_areas),
+            rater.rating_count, rater.average_rating_time, rater.reliability_score,
+            1 if rater.is_active else 0, rater.created_at.isoformat(),
+            _iso(rater.last_active), json.dumps(rater.preferences)
+        )
+
+    def _task_params(self, task) -> Tuple:
+        return (
+            task.id, task.response_id, task.rubric_id, task.rater_id,
+            task.status.value, task.priority.value, task.assigned_at.isoformat(),
+            _iso(task.due_date), _iso(task.started_at), _iso(task.completed_at),
+            task.estimated_time_minutes, task.actual_time_minutes, json.dumps(task.context),
+            task.instructions, json.dumps(task.metadata), PRIORITY_RANK.get(task.priority.value, 2)
+        )
+
+    def _rating_params(self, rating) -> Tuple:
+        return (
+            rating.id, rating.task_id, rating.response_id, rating.rater_id, rating.rubric_id,
+            json.dumps([score.to_dict() for score in rating.scores]), rating.overall_score,
+            rating.confidence, rating.comments, rating.rating_time_minutes,
+            rating.submitted_at.isoformat(), json.dumps(rating.quality_flags)
+        )
+
+    def _row_to_rater(self, row):
+        from .human_rating import HumanRater
+        return HumanRater(
+            id=row[0], name=row[1], email=row[2] or "",
+            expertise_areas=json.loads(row[3]) if row[3] else [],
+            rating_count=row[4], average_rating_time=row[5], reliability_score=row[6],
+            is_active=bool(row[7]), created_at=datetime.fromisoformat(row[8]),
+            last_active=_parse(row[9]), preferences=json.loads(row[10]) if row[10] else {}
+        )
+
+    def _row_to_task(self, row):
+        from .human_rating import RatingPriority, RatingStatus, RatingTask
+        return RatingTask(
+            id=row[0], response_id=row[1], rubric_id=row[2] or "", rater_id=row[3],
+            status=RatingStatus(row[4]), priority=RatingPriority(row[5]),
+            assigned_at=datetime.fromisoformat(row[6]), due_date=_parse(row[7]),
+            started_at=_parse(row[8]), completed_at=_parse(row[9]),
+            estimated_time_minutes=row[10], actual_time_minutes=row[11],
+            context=json.loads(row[12]) if row[12] else {}, instructions=row[13] or "",
+            metadata=json.loads(row[14]) if row[14] else {}
+        )
+
+    def _row_to_rating(self, row):
+        from .human_rating import HumanRating
+        return HumanRating(
+            id=row[0], task_id=row[1] or "", response_id=row[2], rater_id=row[3],
+            rubric_id=row[4] or "",
+            scores=[score_from_dict(data) for data in json.loads(row[5] or "[]")],
+            overall_score=row[6], confidence=row[7], comments=row[8] or "",
+            rating_time_minutes=row[9], submitted_at=datetime.fromisoformat(row[10]),
+            quality_flags=json.loads(row[11]) if row[11] else []
+        )
+
+    # Raters
+
+    def upsert_rater(self, rater):
+        """Insert or update a rater profile, keeping its rating totals."""
+        with self.db_manager.get_connection() as conn:
+            conn.execute(f"""
+                INSERT INTO human_raters ({RATER_COLUMNS})
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    name = excluded.name, email = excluded.email,
+                    expertise_areas = excluded.expertise_areas,
+                    rating_count = excluded.rating_count,
+                    average_rating_time = excluded.average_rating_time,
+                    reliability_score = excluded.reliability_score,
+                    is_active = excluded.is_active, last_active = excluded.last_active,
+                    preferences = excluded.preferences
+            """, self._rater_params(rater))
+            conn.commit()
+
+    def get_rater(self, rater_id: str):
+        with self.db_manager.get_connection() as conn:
+            row = conn.execute(
+                f"SELECT {RATER_COLUMNS} FROM human_raters WHERE id = ?", (rater_id,)
+            ).fetchone()
+        return self._row_to_rater(row) if row else None
+
+    def rater_exists(self, rater_id: str) -> bool:
+        with self.db_manager.get_connection() as conn:
+            return conn.execute("SELECT 1 FROM human_raters WHERE id = ?", (rater_id,)).fetchone() is not None
+
+    def list_active_raters(self, limit: Optional[int] = None, offset: int = 0) -> List[Any]:
+        """Active raters, most reliable and least loaded first."""
+        paging, params = _paging(limit, offset)
+        with self.db_manager.get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT {RATER_COLUMNS} FROM human_raters
+                WHERE is_active = 1
+                ORDER BY reliability_score DESC, rating_count ASC{paging}
+            """, params).fetchall()
+        return [self._row_to_rater(row) for row in rows]
+
+    def touch_rater(self, conn, rater_id: str, when: datetime):
+        conn.execute("UPDATE human_raters SET last_active = ? WHERE id = ?", (when.isoformat(), rater_id))
+
+    def rater_totals(self, rater_id: str) -> Tuple[int, float]:
+        """``(ratings_submitted, overall_score_total)`` for a rater."""
+        with self.db_manager.get_connection() as conn:
+            row = conn.execute("""
+                SELECT ratings_submitted, overall_score_total FROM human_raters WHERE id = ?
+            """, (rater_id,)).fetchone()
+        return (row[0], row[1]) if row else (0, 0.0)
+
+    # Tasks
+
+    def upsert_task(self, task, conn=None):
+        """Write a single task row."""
+        sql = TASK_INSERT.format(conflict="REPLACE")
+        params = self._task_params(task)
+        if conn is not None:
+            conn.execute(sql, params)
+            return
+        with self.db_manager.get_connection() as conn:
+            conn.execute(sql, params)
+            conn.commit()
+
+    def get_task(self, task_id: str):
+        with self.db_manager.get_connection() as conn:
+            row = conn.execute(f"SELECT {TASK_COLUMNS} FROM rating_tasks WHERE id = ?", (task_id,)).fetchone()
+        return self._row_to_task(row) if row else None
+
+    def list_tasks_for_rater(self, rater_id: str, status: Optional[str] = None,
+                             limit: Optional[int] = None, offset: int = 0) -> List[Any]:
+        """A rater's tasks by priority, then due date (undated last)."""
+        sql = f"SELECT {TASK_COLUMNS} FROM rating_tasks WHERE rater_id = ?"
+        params: List[Any] = [rater_id]
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        paging, paging_params = _paging(limit, offset)
+        sql += f" ORDER BY priority_rank, due_date IS NULL, due_date, id{paging}"
+        with self.db_manager.get_connection() as conn:
+            rows = conn.execute(sql, params + paging_params).fetchall()
+        return [self._row_to_task(row) for row in rows]
+
+    def task_counts_for_rater(self, rater_id: str) -> Dict[str, int]:
+        with self.db_manager.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT status, COUNT(*) FROM rating_tasks WHERE rater_id = ? GROUP BY status
+            """, (rater_id,)).fetchall()
+        return {row[0]: row[1] for row in rows}
+
+    def transition_task(self, task_id: str, rater_id: Optional[str], from_statuses: List[str],
+                        updates: Dict[str, Any], touch_rater: bool = False) -> bool:
+        """Conditionally update a task; False if it was not in ``from_statuses``."""
+        assignments = ", ".join(f"{column} = ?" for column in updates)
+        sql = f"UPDATE rating_tasks SET {assignments} WHERE id = ?"
+        params = list(updates.values()) + [task_id]
+        if rater_id is not None:
+            sql += " AND rater_id = ?"
+            params.append(rater_id)
+        if from_statuses:
+            sql += f" AND status IN ({', '.join('?' * len(from_statuses))})"
+            params.extend(from_statuses)
+
+        with self.db_manager.get_connection() as conn:
+            changed = conn.execute(sql, params).rowcount == 1
+            if changed and touch_rater and rater_id:
+                self.touch_rater(conn, rater_id, datetime.now())
+            conn.commit()
+        return changed
+
+    def pending_summary(self, now: datetime) -> Dict[str, Any]:
+        """Pending-task breakdown computed with aggregate queries."""
+        with self.db_manager.get_connection() as conn:
+            totals = conn.execute("""
+                SELECT COUNT(*), AVG(estimated_time_minutes),
+                       SUM(CASE WHEN due_date IS NOT NULL AND due_date < ? THEN 1 ELSE 0 END)
+                FROM rating_tasks WHERE status = 'pending'
+            """, (now.isoformat(),)).fetchone()
+            by_priority = conn.execute("""
+                SELECT priority, COUNT(*) FROM rating_tasks
+                WHERE status = 'pending' GROUP BY priority
+            """).fetchall()
+            by_rater = conn.execute("""
+                SELECT rater_id, COUNT(*) FROM rating_tasks
+                WHERE status = 'pending' GROUP BY rater_id
+            """).fetchall()
+        return {
+            "total": totals[0] or 0,
+            "average_estimated_time": totals[1] or 0,
+            "overdue": totals[2] or 0,
+            "by_priority": {row[0]: row[1] for row in by_priority},
+            "by_rater": {row[0]: row[1] for row in by_rater},
+        }
+
+    # Ratings
+
+    def submit_rating(self, rating, completed_at: datetime) -> bool:
+        """Record a rating, complete its task and fold it into rater totals.
+
+        Runs as one transaction; returns False (writing nothing) if the task
+        is no longer in progress for this rater.
+        """
+        with self.db_manager.get_connection() as conn:
+            completed = conn.execute("""
+                UPDATE rating_tasks SET status = 'completed', completed_at = ?, actual_time_minutes = ?
+                WHERE id = ? AND rater_id = ? AND status = 'in_progress'
+            """, (completed_at.isoformat(), rating.rating_time_minutes,
+                  rating.task_id, rating.rater_id)).rowcount == 1
+            if not completed:
+                conn.rollback()
+                return False
+
+            conn.execute(
+                f"INSERT INTO human_ratings ({RATING_COLUMNS}) VALUES ({', '.join('?' * 12)})",
+                self._rating_params(rating)
+            )
+            conn.execute("""
+                UPDATE human_raters SET
+                    average_rating_time = (average_rating_time * rating_count + ?) / (rating_count + 1),
+                    rating_count = rating_count + 1,
+                    ratings_submitted = ratings_submitted + 1,
+                    overall_score_total = overall_score_total + ?,
+                    last_active = ?
+                WHERE id = ?
+            """, (rating.rating_time_minutes, rating.overall_score,
+                  completed_at.isoformat(), rating.rater_id))
+            conn.commit()
+        return True
+
+    def list_ratings(self, response_id: Optional[str] = None, rater_id: Optional[str] = None,
+                     newest_first: bool = False, limit: Optional[int] = None,
+                     offset: int = 0) -> List[Any]:
+        """Ratings for a response or rater in submission order."""
+        clauses, params = [], []
+        if response_id is not None:
+            clauses.append("response_id = ?")
+            params.append(response_id)
+        if rater_id is not None:
+            clauses.append("rater_id = ?")
+            params.append(rater_id)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "DESC" if newest_first else "ASC"
+        paging, paging_params = _paging(limit, offset)
+        with self.db_manager.get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT {RATING_COLUMNS} FROM human_ratings{where}
+                ORDER BY submitted_at {order}, id {order}{paging}
+            """, params + paging_params).fetchall()
+        return [self._row_to_rating(row) for row in rows]
+
+    def quality_aggregates(self) -> Dict[str, Any]:
+        """Overall and per-response aggregates for rating quality metrics."""
+        with self.db_manager.get_connection() as conn:
+            totals = conn.execute("""
+                SELECT COUNT(*), AVG(overall_score), AVG(confidence), AVG(rating_time_minutes),
+                       COUNT(DISTINCT response_id)
+                FROM human_ratings
+            """).fetchone()
+            # Population variance per multiply-rated response from sums
+            variances = conn.execute("""
+                SELECT SUM(overall_score * overall_score) / COUNT(*)
+                       - (SUM(overall_score) / COUNT(*)) * (SUM(overall_score) / COUNT(*))
+                FROM human_ratings
+                GROUP BY response_id
+                HAVING COUNT(*) > 1
+            """).fetchall()
+        return {
+            "total_ratings": totals[0],
+            "average_overall_score": totals[1] or 0.0,
+            "average_confidence": totals[2] or 0.0,
+            "average_rating_time": totals[3] or 0.0,
+            "unique_responses": totals[4],
+            "multi_rated_variances": [max(0.0, row[0]) for row in variances],
+        }
+
+    # Migration
+
+    def migrate_from_config(self, config_manager) -> Dict[str, int]:
+        """Import raters, tasks and ratings from the legacy config blobs.
+
+        Existing rows win, so the import is idempotent. Rater totals are
+        rebuilt from the imported ratings and the config entries are cleared
+        once the rows are committed.
+        """
+        blobs = {key: config_manager.get(key, {}) or {} for key in LEGACY_CONFIG_KEYS}
+        if not any(blobs.values()):
+            return {}
+
+        from .human_rating import HumanRater, HumanRating, RatingTask
+        raters = [HumanRater.from_dict(data) for data in blobs["human_raters"].values()]
+        tasks = [RatingTask.from_dict(data) for data in blobs["rating_tasks"].values()]
+        ratings = [HumanRating.from_dict(data) for data in blobs["human_ratings"].values()]
+
+        with self.db_manager.get_connection() as conn:
+            conn.executemany(
+                f"INSERT OR IGNORE INTO human_raters ({RATER_COLUMNS}) VALUES ({', '.join('?' * 11)})",
+                [self._rater_params(rater) for rater in raters]
+            )
+            conn.executemany(TASK_INSERT.format(conflict="IGNORE"),
+                             [self._task_params(task) for task in tasks])
+            conn.executemany(
+                f"INSERT OR IGNORE INTO human_ratings ({RATING_COLUMNS}) VALUES ({', '.join('?' * 12)})",
+                [self._rating_params(rating) for rating in ratings]
+            )
+            conn.execute("""
+                UPDATE human_raters SET
+                    ratings_submitted = (SELECT COUNT(*) FROM human_ratings r WHERE r.rater_id = human_raters.id),
+                    overall_score_total = (SELECT COALESCE(SUM(overall_score), 0.0)
+                                           FROM human_ratings r WHERE r.rater_id = human_raters.id)
+            """)
+            conn.commit()
+
+        for key in LEGACY_CONFIG_KEYS:
+            if blobs[key]:
+                config_manager.set(key, {})
+
+        counts = {"raters": len(raters), "tasks": len(tasks), "ratings": len(ratings)}
+        self.logger.info(f"Migrated human rating data from config: {counts}")
+        return counts
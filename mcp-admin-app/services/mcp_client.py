@@ -0,0 +1,352 @@
+"""
+MCP Stdio Client
+================
+
+JSON-RPC 2.0 sessions with MCP servers over their stdin/stdout.
+
+Each ``MCPSession`` owns one server process. Requests are multiplexed by
+id, so any number may be in flight and responses can arrive in any order.
+The session is ready once the ``initialize`` handshake completes, rather
+than after a fixed delay. stdout is read continuously and stderr is drained
+into a bounded ring buffer, so a chatty server never blocks on a full pipe.
+
+All sessions run on one background event loop (``MCPClientLoop``); the
+synchronous ``ServerManager`` API drives them with ``MCPClientLoop.run``.
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Awaitable, Deque, Dict, List, Optional
+
+
+PROTOCOL_VERSION = "2024-11-05"
+CLIENT_INFO = {"name": "mcp-admin-app", "version": "1.0.0"}
+
+# Largest single JSON-RPC message accepted from a server
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+# JSON-RPC error codes
+METHOD_NOT_FOUND = -32601
+
+
+class MCPClientError(Exception):
+    """Base class for MCP client failures."""
+
+
+class MCPConnectionError(MCPClientError):
+    """The server process could not be started or has gone away."""
+
+
+class MCPTimeoutError(MCPClientError):
+    """A request did not get a response in time."""
+
+
+class MCPRequestError(MCPClientError):
+    """The server answered a request with a JSON-RPC error."""
+
+    def __init__(self, code: int, message: str, data: Any = None):
+        super().__init__(f"{message} (code {code})")
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+class MCPSession:
+    """A JSON-RPC session with one MCP server process.
+
+    Must be used from the event loop that runs it; see ``MCPClientLoop``.
+    """
+
+    def __init__(self, command: str, args: List[str] = None, env: Dict[str, str] = None,
+                 log_lines: int = 1000, name: str = ""):
+        self.command = command
+        self.args = list(args or [])
+        self.env = env
+        self.name = name or command
+        self.logger = logging.getLogger(__name__)
+
+        self.logs: Deque[str] = deque(maxlen=log_lines)
+        self.server_info: Dict[str, Any] = {}
+        self.capabilities: Dict[str, Any] = {}
+        self.protocol_version: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+        # Cumulative request counters, read by the resource sampler
+        self.request_count = 0
+        self.error_count = 0
+        self.latency_total = 0.0
+
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 1
+        self._tasks: List[asyncio.Task] = []
+        self._closed = False
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process else None
+
+    @property
+    def returncode(self) -> Optional[int]:
+        return self._process.returncode if self._process else None
+
+    @property
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.returncode is None and not self._closed
+
+    async def start(self, timeout: float = 10.0):
+        """Launch the server and complete the ``initialize`` handshake."""
+        env = {**os.environ, **self.env} if self.env else None
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                self.command, *self.args,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+                limit=MAX_MESSAGE_BYTES
+            )
+        except OSError as e:
+            raise MCPConnectionError(f"Failed to launch {self.command}: {e}") from e
+
+        self.started_at = datetime.now()
+        self._tasks = [
+            asyncio.ensure_future(self._read_stdout()),
+            asyncio.ensure_future(self._drain_stderr()),
+        ]
+
+        try:
+            result = await self.request("initialize", {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": CLIENT_INFO,
+            }, timeout=timeout)
+        except Exception:
+            await self.close()
+            raise
+
+        self.protocol_version = result.get("protocolVersion")
+        self.server_info = result.get("serverInfo", {})
+        self.capabilities = result.get("capabilities", {})
+        await self.notify("notifications/initialized")
+
+    async def request(self, method: str, params: Optional[Dict[str, Any]] = None,
+                      timeout: Optional[float] = 30.0) -> Any:
+        """Send a request and wait for its result."""
+        if not self.is_alive:
+            raise MCPConnectionError(f"Server {self.name} is not running")
+
+        request_id = self._next_id
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+
+        message = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        started = time.perf_counter()
+        try:
+            await self._send(message)
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.error_count += 1
+            raise MCPTimeoutError(f"{method} timed out after {timeout}s on {self.name}") from None
+        except Exception:
+            self.error_count += 1
+            raise
+        finally:
+            self._pending.pop(request_id, None)
+            self.request_count += 1
+            self.latency_total += time.perf_counter() - started
+
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None):
+        """Send a notification (no response expected)."""
+        message = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._send(message)
+
+    async def list_tools(self, timeout: Optional[float] = 30.0) -> List[Dict[str, Any]]:
+        """All tools the server exposes, following pagination cursors."""
+        tools = []
+        params: Dict[str, Any] = {}
+        while True:
+            result = await self.request("tools/list", params or None, timeout=timeout)
+            tools.extend(result.get("tools", []))
+            cursor = result.get("nextCursor")
+            if not cursor:
+                return tools
+            params = {"cursor": cursor}
+
+    async def close(self, timeout: float = 5.0):
+        """Close stdin, then terminate or kill the process if it lingers."""
+        if self._process is None:
+            return
+        self._closed = True
+        process = self._process
+
+        if process.stdin and not process.stdin.is_closing():
+            process.stdin.close()
+        if process.returncode is None:
+            try:
+                await asyncio.wait_for(process.wait(), timeout)
+            except asyncio.TimeoutError:
+                try:
+                    process.terminate()
+                    await asyncio.wait_for(process.wait(), timeout)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+                except ProcessLookupError:
+                    pass
+
+        # Let the readers reach EOF so buffered stderr lands in the log
+        try:
+            await asyncio.wait_for(asyncio.gather(*self._tasks, return_exceptions=True), timeout)
+        except asyncio.TimeoutError:
+            for task in self._tasks:
+                task.cancel()
+        self._fail_pending(MCPConnectionError(f"Session with {self.name} closed"))
+
+    def get_logs(self, lines: int = 100) -> List[str]:
+        """Most recent stderr lines, oldest first."""
+        if lines <= 0:
+            return []
+        return list(self.logs)[-lines:]
+
+    async def _send(self, message: Dict[str, Any]):
+        process = self._process
+        if process is None or process.stdin is None or process.stdin.is_closing():
+            raise MCPConnectionError(f"Server {self.name} is not running")
+        data = json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+        try:
+            process.stdin.write(data)
+            await process.stdin.drain()
+        except (ConnectionError, BrokenPipeError) as e:
+            raise MCPConnectionError(f"Lost connection to {self.name}: {e}") from e
+
+    async def _read_stdout(self):
+        reader = self._process.stdout
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError as e:
+                    # The reader discards the oversized line; keep going
+                    self.logger.error(f"Oversized message from {self.name}: {e}")
+                    continue
+                if not line:
+                    break
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    self._append_log(f"[stdout] {line.decode('utf-8', 'replace')}")
+                    continue
+                if isinstance(message, list):
+                    for item in message:
+                        await self._dispatch(item)
+                else:
+                    await self._dispatch(message)
+        except Exception as e:
+            self.logger.error(f"Error reading from {self.name}: {e}")
+        finally:
+            self._fail_pending(MCPConnectionError(f"Server {self.name} closed its output"))
+
+    async def _dispatch(self, message: Dict[str, Any]):
+        if not isinstance(message, dict):
+            return
+        if "method" in message:
+            if "id" in message:
+                # Server-to-client request; only ping is supported
+                if message["method"] == "ping":
+                    await self._send({"jsonrpc": "2.0", "id": message["id"], "result": {}})
+                else:
+                    await self._send({"jsonrpc": "2.0", "id": message["id"], "error": {
+                        "code": METHOD_NOT_FOUND, "message": f"Method not found: {message['method']}"
+                    }})
+            elif message["method"] == "notifications/message":
+                params = message.get("params", {})
+                self._append_log(f"[{params.get('level', 'info')}] {params.get('data', '')}")
+            return
+
+        future = self._pending.get(message.get("id"))
+        if future is None or future.done():
+            return
+        if "error" in message:
+            error = message["error"] or {}
+            future.set_exception(MCPRequestError(
+                error.get("code", 0), error.get("message", "Unknown error"), error.get("data")
+            ))
+        else:
+            future.set_result(message.get("result", {}))
+
+    async def _drain_stderr(self):
+        reader = self._process.stderr
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    self._append_log("[stderr line exceeded the message size limit]")
+                    continue
+                if not line:
+                    break
+                self._append_log(line.decode("utf-8", "replace").rstrip("\r\n"))
+        except Exception as e:
+            self.logger.error(f"Error reading stderr from {self.name}: {e}")
+
+    def _append_log(self, text: str):
+        self.logs.append(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] {text}")
+
+    def _fail_pending(self, error: Exception):
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+
+class MCPClientLoop:
+    """A background thread running the event loop shared by all sessions."""
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="mcp-client", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and wait for its result."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise MCPTimeoutError(f"Operation timed out after {timeout}s") from None
+
+    def shutdown(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+_default_loop: Optional[MCPClientLoop] = None
+_default_loop_lock = threading.Lock()
+
+
+def get_default_client_loop() -> MCPClientLoop:
+    """Process-wide client loop shared by services that do not supply their own."""
+    global _default_loop
+    with _default_loop_lock:
+        if _default_loop is None:
+            _default_loop = MCPClientLoop()
+        return _default_loop
@@ -1,39 +1,102 @@
 """
-Monitoring Service - Placeholder
-================================
+Monitoring Service
+==================
 
-Placeholder implementation for system monitoring and alerting.
+System monitoring and per-server resource telemetry.
 """
 
 import logging
-from typing import List, Dict, Optional, Any
+import os
+import shutil
+from typing import List, Dict, Optional, Any, Tuple
 
 from data.database import DatabaseManager
+from services.resource_sampler import HAS_PSUTIL, PROC_ROOT, ResourceSampler
+
+if HAS_PSUTIL:
+    import psutil
 
 
 class MonitoringService:
     """Manages system monitoring and alerting."""
-    
-    def __init__(self, db_manager: DatabaseManager, server_manager):
+
+    def __init__(self, db_manager: DatabaseManager, server_manager,
+                 sample_interval: float = 2.0, flush_interval: float = 60.0, ring_size: int = 600):
         self.db_manager = db_manager
         self.server_manager = server_manager
         self.logger = logging.getLogger(__name__)
         self._monitoring_active = False
-    
+        self._host_cpu_times: Optional[Tuple[int, int]] = None
+
+        self.sampler = ResourceSampler(self._sample_targets, db_manager, interval=sample_interval,
+                                       flush_interval=flush_interval, ring_size=ring_size)
+        if server_manager is not None:
+            server_manager.resource_sampler = self.sampler
+
+    def _sample_targets(self) -> Dict[str, Any]:
+        if self.server_manager is None or not hasattr(self.server_manager, "get_running_sessions"):
+            return {}
+        return self.server_manager.get_running_sessions()
+
     def start_monitoring(self):
         """Start monitoring services."""
         self._monitoring_active = True
+        self.sampler.start()
         self.logger.info("Monitoring service started")
-    
+
     def stop_monitoring(self):
         """Stop monitoring services."""
         self._monitoring_active = False
+        self.sampler.stop()
         self.logger.info("Monitoring service stopped")
-    
+
+    def get_server_metrics(self, server_id: str) -> Dict[str, float]:
+        """Latest sampled resource and request metrics for a server."""
+        return self.sampler.latest(server_id)
+
+    def get_metric_history(self, server_id: str, metric: str) -> List[Tuple[float, float]]:
+        """Buffered samples of one server metric, oldest first."""
+        return self.sampler.history(server_id, metric)
+
     def get_system_metrics(self) -> Dict[str, Any]:
-        """Get system performance metrics."""
-        return {
+        """Get system performance metrics.
+
+        CPU usage is measured since the previous call, so the first call
+        reports 0.
+        """
+        metrics = {
             "cpu_usage": 0.0,
             "memory_usage": 0.0,
             "disk_usage": 0.0
-        }
\ No newline at end of file
+        }
+        try:
+            if HAS_PSUTIL:
+                metrics["cpu_usage"] = psutil.cpu_percent(interval=None)
+                metrics["memory_usage"] = psutil.virtual_memory().percent
+            elif os.path.isfile(os.path.join(PROC_ROOT, "stat")):
+                metrics["cpu_usage"] = self._proc_cpu_usage()
+                metrics["memory_usage"] = self._proc_memory_usage()
+
+            disk = shutil.disk_usage(os.path.dirname(os.path.abspath(self.db_manager.db_path)))
+            metrics["disk_usage"] = disk.used / disk.total * 100
+        except Exception as e:
+            self.logger.error(f"Error reading system metrics: {e}")
+        return metrics
+
+    def _proc_cpu_usage(self) -> float:
+        with open(os.path.join(PROC_ROOT, "stat")) as f:
+            values = [int(v) for v in f.readline().split()[1:]]
+        # idle + iowait
+        idle, total = values[3] + values[4], sum(values)
+        previous, self._host_cpu_times = self._host_cpu_times, (idle, total)
+        if previous is None or total == previous[1]:
+            return 0.0
+        return (1 - (idle - previous[0]) / (total - previous[1])) * 100
+
+    def _proc_memory_usage(self) -> float:
+        meminfo = {}
+        with open(os.path.join(PROC_ROOT, "meminfo")) as f:
+            for line in f:
+                key, value = line.split(":", 1)
+                meminfo[key] = int(value.split()[0])
+        return (1 - meminfo["MemAvailable"] / meminfo["MemTotal"]) * 100
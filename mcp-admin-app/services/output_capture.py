@@ -0,0 +1,257 @@
+"""
+Process Output Capture
+======================
+
+Streams a child process's stdout and stderr without buffering them whole.
+
+Each stream is read in chunks as it arrives. The first bytes are kept in
+memory up to a cap; anything beyond spills to a file, which itself stops
+growing at a second cap (the rest is counted and dropped). A progress
+callback sees every chunk, and stdout can be parsed as JSON lines while it
+streams, keeping only the records that fit the in-memory cap.
+"""
+
+import json
+import logging
+import os
+import selectors
+import subprocess
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+# Defaults for the per-stream caps
+DEFAULT_MEMORY_BYTES = 1024 * 1024
+DEFAULT_SPILL_BYTES = 100 * 1024 * 1024
+
+CHUNK_BYTES = 64 * 1024
+
+# Called with (stream name, chunk, total bytes seen on that stream)
+OutputCallback = Callable[[str, bytes, int], None]
+
+
+class JsonLinesParser:
+    """Parses newline-delimited JSON incrementally, chunk by chunk."""
+
+    def __init__(self, max_record_bytes: int = DEFAULT_MEMORY_BYTES):
+        self.max_record_bytes = max_record_bytes
+        self.records: List[Any] = []
+        self.record_count = 0
+        self.invalid_lines = 0
+        self._kept_bytes = 0
+        self._partial = bytearray()
+
+    @property
+    def is_json_lines(self) -> bool:
+        """True when every non-empty line seen so far was valid JSON."""
+        return self.record_count > 0 and self.invalid_lines == 0
+
+    @property
+    def complete(self) -> bool:
+        """True when every parsed record is kept in ``records``."""
+        return len(self.records) == self.record_count
+
+    def feed(self, chunk: bytes):
+        if self.invalid_lines:
+            return
+        self._partial += chunk
+        start = 0
+        while True:
+            end = self._partial.find(b"\n", start)
+            if end < 0:
+                break
+            self._parse_line(self._partial[start:end])
+            start = end + 1
+        del self._partial[:start]
+        if len(self._partial) > self.max_record_bytes:
+            # A line longer than the cap cannot be kept, so this is not JSON lines output
+            self.invalid_lines += 1
+            self._partial.clear()
+
+    def close(self):
+        if self._partial and not self.invalid_lines:
+            self._parse_line(self._partial)
+        self._partial.clear()
+
+    def _parse_line(self, line: bytes):
+        if not line.strip():
+            return
+        try:
+            record = json.loads(line)
+        except (ValueError, UnicodeDecodeError):
+            self.invalid_lines += 1
+            return
+        self.record_count += 1
+        if self._kept_bytes + len(line) <= self.max_record_bytes:
+            self._kept_bytes += len(line)
+            self.records.append(record)
+
+
+class StreamCapture:
+    """Bounded capture of one output stream, spilling to a file when large."""
+
+    def __init__(self, name: str, max_memory_bytes: int = DEFAULT_MEMORY_BYTES,
+                 max_spill_bytes: int = DEFAULT_SPILL_BYTES, spill_path: Optional[str] = None,
+                 on_chunk: Optional[OutputCallback] = None, parse_json_lines: bool = False):
+        self.name = name
+        self.max_memory_bytes = max_memory_bytes
+        self.max_spill_bytes = max_spill_bytes
+        self.spill_path = spill_path
+        self.on_chunk = on_chunk
+        self.json_lines = JsonLinesParser(max_memory_bytes) if parse_json_lines else None
+
+        self.total_bytes = 0
+        self.spilled_bytes = 0
+        self.dropped_bytes = 0
+        self._head = bytearray()
+        self._spill_file = None
+
+    @property
+    def spilled(self) -> bool:
+        return self.spilled_bytes > 0
+
+    @property
+    def truncated(self) -> bool:
+        """True when bytes were lost, rather than moved to the spill file."""
+        return self.dropped_bytes > 0
+
+    @property
+    def complete(self) -> bool:
+        """True when the whole stream is held in memory."""
+        return not self.spilled and not self.truncated
+
+    def feed(self, chunk: bytes):
+        self.total_bytes += len(chunk)
+        if self.json_lines is not None:
+            self.json_lines.feed(chunk)
+
+        rest = chunk
+        room = self.max_memory_bytes - len(self._head)
+        if room > 0 and not self.spilled:
+            self._head += rest[:room]
+            rest = rest[room:]
+        if rest:
+            self._spill(rest)
+
+        if self.on_chunk is not None:
+            try:
+                self.on_chunk(self.name, chunk, self.total_bytes)
+            except Exception as e:
+                logger.error(f"Output callback failed: {e}")
+
+    def _spill(self, chunk: bytes):
+        if self.spill_path is None:
+            self.dropped_bytes += len(chunk)
+            return
+        if self._spill_file is None:
+            # The file holds the whole stream, head included
+            self._spill_file = open(self.spill_path, "wb")
+            self._spill_file.write(self._head)
+            self.spilled_bytes = len(self._head)
+        room = self.max_spill_bytes - self.spilled_bytes
+        kept = chunk[:max(room, 0)]
+        if kept:
+            self._spill_file.write(kept)
+            self.spilled_bytes += len(kept)
+        self.dropped_bytes += len(chunk) - len(kept)
+
+    def close(self):
+        if self.json_lines is not None:
+            self.json_lines.close()
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def text(self) -> str:
+        """The in-memory head, with a marker when the stream went further."""
+        text = self._head.decode("utf-8", errors="replace")
+        if self.complete:
+            return text
+        marker = f"\n... [{self.name} truncated: {self.total_bytes} bytes total"
+        if self.spilled:
+            marker += f", {self.spilled_bytes} saved to {self.spill_path}"
+        return text + marker + "]"
+
+
+def stream_process(process: subprocess.Popen, stdout: StreamCapture, stderr: StreamCapture,
+                   input_data: Optional[bytes] = None, timeout: Optional[float] = None):
+    """Feed ``input_data`` to ``process`` and capture its output until both streams close.
+
+    Raises ``subprocess.TimeoutExpired`` if the streams are still open
+    after ``timeout`` seconds.
+    """
+    try:
+        if os.name == "nt":
+            _stream_with_threads(process, stdout, stderr, input_data, timeout)
+        else:
+            _stream_with_selector(process, stdout, stderr, input_data, timeout)
+    finally:
+        stdout.close()
+        stderr.close()
+
+
+def _stream_with_selector(process, stdout, stderr, input_data, timeout):
+    deadline = None if timeout is None else time.monotonic() + timeout
+    pending = memoryview(input_data or b"")
+    with selectors.DefaultSelector() as selector:
+        selector.register(process.stdout, selectors.EVENT_READ, stdout)
+        selector.register(process.stderr, selectors.EVENT_READ, stderr)
+        if process.stdin:
+            if pending:
+                os.set_blocking(process.stdin.fileno(), False)
+                selector.register(process.stdin, selectors.EVENT_WRITE)
+            else:
+                process.stdin.close()
+
+        while selector.get_map():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise subprocess.TimeoutExpired(process.args, timeout)
+            for key, _ in selector.select(remaining):
+                if key.fileobj is process.stdin:
+                    try:
+                        written = os.write(key.fd, pending[:CHUNK_BYTES])
+                        pending = pending[written:]
+                    except BlockingIOError:
+                        continue
+                    except BrokenPipeError:
+                        pending = pending[:0]
+                    if not pending:
+                        selector.unregister(process.stdin)
+                        process.stdin.close()
+                    continue
+                chunk = os.read(key.fd, CHUNK_BYTES)
+                if chunk:
+                    key.data.feed(chunk)
+                else:
+                    selector.unregister(key.fileobj)
+                    key.fileobj.close()
+
+
+def _stream_with_threads(process, stdout, stderr, input_data, timeout):
+    def pump(pipe, capture):
+        for chunk in iter(lambda: pipe.read1(CHUNK_BYTES), b""):
+            capture.feed(chunk)
+        pipe.close()
+
+    readers = [threading.Thread(target=pump, args=(process.stdout, stdout), daemon=True),
+               threading.Thread(target=pump, args=(process.stderr, stderr), daemon=True)]
+    for reader in readers:
+        reader.start()
+    if process.stdin:
+        try:
+            if input_data:
+                process.stdin.write(input_data)
+            process.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    for reader in readers:
+        reader.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+        if reader.is_alive():
+            raise subprocess.TimeoutExpired(process.args, timeout)
@@ -0,0 +1,482 @@
+"""
+Process Supervisor
+==================
+
+One background thread supervising every live sandbox process.
+
+Limits are enforced by the kernel where possible: sandboxes set RLIMIT_AS
+and RLIMIT_CPU before exec, and where a delegated cgroup v2 subtree is
+available each process also runs in its own cgroup with ``memory.max`` and
+``cpu.max`` set. The supervisor learns about exits through pidfds in a
+selector (epoll on Linux), falling back to polling each tick elsewhere.
+Execution timeouts, kill escalation and periodic usage sampling all run
+off a single hashed timer wheel, so the supervisor costs one thread no
+matter how many processes are live.
+"""
+
+import logging
+import math
+import os
+import selectors
+import subprocess
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from models.tool import ResourceUsage
+from services.resource_sampler import ProcessReader
+
+
+logger = logging.getLogger(__name__)
+
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+# Seconds between SIGTERM and SIGKILL for processes being stopped
+KILL_GRACE_SECONDS = 2.0
+
+
+class Timer:
+    """A callback scheduled on a ``TimerWheel``."""
+
+    __slots__ = ("tick", "callback", "cancelled")
+
+    def __init__(self, tick: int, callback: Callable[[], None]):
+        self.tick = tick
+        self.callback = callback
+        self.cancelled = False
+
+
+class TimerWheel:
+    """Hashed timing wheel with constant-time schedule and cancel.
+
+    Time is cut into ticks; a timer lives in the bucket of its tick modulo
+    the wheel size, and buckets are visited as ``advance`` moves time on.
+    """
+
+    def __init__(self, tick: float = 0.1, slots: int = 512, now: Optional[float] = None):
+        self.tick = tick
+        self._slots: List[List[Timer]] = [[] for _ in range(slots)]
+        self._origin = time.monotonic() if now is None else now
+        self._current = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def schedule(self, deadline: float, callback: Callable[[], None]) -> Timer:
+        """Run ``callback`` once the wheel advances past ``deadline`` (monotonic)."""
+        tick = max(math.ceil((deadline - self._origin) / self.tick), self._current + 1)
+        timer = Timer(tick, callback)
+        self._slots[tick % len(self._slots)].append(timer)
+        self._count += 1
+        return timer
+
+    def cancel(self, timer: Optional[Timer]):
+        # Cancelled timers are dropped when their bucket comes round
+        if timer is not None and not timer.cancelled:
+            timer.cancelled = True
+            self._count -= 1
+
+    def next_deadline(self) -> Optional[float]:
+        """When the next tick falls, or None while no timers are pending."""
+        if not self._count:
+            return None
+        return self._origin + (self._current + 1) * self.tick
+
+    def advance(self, now: float) -> int:
+        """Fire every timer due by ``now``; returns how many fired."""
+        target = int((now - self._origin) / self.tick)
+        if target <= self._current:
+            return 0
+        if not self._count:
+            self._current = target
+            return 0
+
+        if target - self._current >= len(self._slots):
+            # Long gap: one pass over every bucket
+            due = self._collect(range(len(self._slots)), target)
+        else:
+            due = self._collect(
+                ((self._current + step) % len(self._slots) for step in range(1, target - self._current + 1)),
+                target)
+        self._current = target
+
+        fired = 0
+        for timer in sorted(due, key=lambda t: t.tick):
+            if timer.cancelled:
+                continue
+            timer.cancelled = True
+            self._count -= 1
+            fired += 1
+            try:
+                timer.callback()
+            except Exception as e:
+                logger.error(f"Timer callback failed: {e}")
+        return fired
+
+    def _collect(self, buckets, target: int) -> List[Timer]:
+        due = []
+        for index in buckets:
+            bucket = self._slots[index]
+            if not bucket:
+                continue
+            keep = []
+            for timer in bucket:
+                if timer.cancelled:
+                    continue
+                (due if timer.tick <= target else keep).append(timer)
+            self._slots[index] = keep
+        return due
+
+
+class CgroupLimiter:
+    """Per-process cgroup v2 groups under a delegated parent, where available."""
+
+    def __init__(self, root: str = CGROUP_ROOT):
+        self.parent: Optional[str] = None
+        self.controllers: set = set()
+        try:
+            with open(os.path.join(root, "cgroup.controllers")) as f:
+                f.read()
+            with open("/proc/self/cgroup") as f:
+                own = next((line.split("::", 1)[1].strip() for line in f if line.startswith("0::")), None)
+            if own is None:
+                return
+            parent = os.path.join(root, own.lstrip("/"))
+            with open(os.path.join(parent, "cgroup.subtree_control")) as f:
+                controllers = set(f.read().split()) & {"memory", "cpu"}
+            if controllers and os.access(parent, os.W_OK):
+                self.parent, self.controllers = parent, controllers
+        except (OSError, StopIteration):
+            pass
+
+    @property
+    def available(self) -> bool:
+        return self.parent is not None
+
+    def create(self, name: str, limits: Dict[str, Any]) -> Optional[str]:
+        """Create a cgroup enforcing ``limits``; returns its path or None."""
+        if not self.available:
+            return None
+        path = os.path.join(self.parent, f"mcp-sandbox-{name}")
+        try:
+            os.mkdir(path)
+            if "memory" in self.controllers:
+                self._write(path, "memory.max", str(int(limits.get("max_memory_mb", 512)) * 1024 * 1024))
+                self._write(path, "memory.swap.max", "0", required=False)
+            if "cpu" in self.controllers:
+                period = 100000
+                quota = max(int(period * limits.get("max_cpu_percent", 50) / 100), 1000)
+                self._write(path, "cpu.max", f"{quota} {period}")
+            return path
+        except OSError as e:
+            logger.debug(f"cgroup limits unavailable for sandbox {name}: {e}")
+            self.remove(path)
+            return None
+
+    @staticmethod
+    def _write(path: str, name: str, value: str, required: bool = True):
+        try:
+            with open(os.path.join(path, name), "w") as f:
+                f.write(value)
+        except OSError:
+            if required:
+                raise
+
+    @staticmethod
+    def join(path: str):
+        """Move the calling process into ``path`` (runs in the child before exec)."""
+        with open(os.path.join(path, "cgroup.procs"), "w") as f:
+            f.write("0")
+
+    @staticmethod
+    def memory_events(path: str) -> Dict[str, int]:
+        try:
+            with open(os.path.join(path, "memory.events")) as f:
+                return {key: int(value) for key, value in (line.split() for line in f)}
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def remove(path: Optional[str]):
+        if path:
+            try:
+                os.rmdir(path)
+            except OSError:
+                pass
+
+
+class SupervisedProcess:
+    """A process tracked by the supervisor, with its outcome once it exits."""
+
+    def __init__(self, process: subprocess.Popen, limits: Dict[str, Any], timeout: Optional[float],
+                 cgroup: Optional[str] = None, on_exit: Optional[Callable[["SupervisedProcess"], None]] = None):
+        self.process = process
+        self.pid = process.pid
+        self.limits = limits
+        self.timeout = timeout
+        self.cgroup = cgroup
+        self.on_exit = on_exit
+        self.started = time.monotonic()
+        self.usage = ResourceUsage()
+        self.returncode: Optional[int] = None
+        self.timed_out = False
+        self.limit_exceeded: Optional[str] = None
+
+        self._done = threading.Event()
+        self._pidfd: Optional[int] = None
+        # At most one pending timer of each kind; each replaces its predecessor
+        self._timeout_timer: Optional[Timer] = None
+        self._sample_timer: Optional[Timer] = None
+        self._kill_timer: Optional[Timer] = None
+        self._stopping = False
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the supervisor has recorded the exit."""
+        return self._done.wait(timeout)
+
+
+class ProcessSupervisor:
+    """Single-threaded supervisor for all live sandbox processes."""
+
+    def __init__(self, tick: float = 0.1, sample_interval: float = 0.5,
+                 reader: Optional[ProcessReader] = None, cgroups: Optional[CgroupLimiter] = None):
+        self.tick = tick
+        self.sample_interval = sample_interval
+        self.reader = reader or ProcessReader()
+        self.cgroups = cgroups if cgroups is not None else CgroupLimiter()
+        self.use_pidfd = hasattr(os, "pidfd_open")
+
+        self._lock = threading.Lock()
+        self._incoming: List[SupervisedProcess] = []
+        self._requests: List[Callable[[], None]] = []
+        self._processes: Dict[int, SupervisedProcess] = {}
+        self._wheel = TimerWheel(tick)
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        os.set_blocking(self._wakeup_read, False)
+        os.set_blocking(self._wakeup_write, False)
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    @property
+    def active_count(self) -> int:
+        with self._lock:
+            return len(self._processes) + len(self._incoming)
+
+    def create_cgroup(self, name: str, limits: Dict[str, Any]) -> Optional[str]:
+        """A cgroup enforcing ``limits`` for a process about to start, if supported."""
+        return self.cgroups.create(name, limits)
+
+    def register(self, process: subprocess.Popen, limits: Optional[Dict[str, Any]] = None,
+                 timeout: Optional[float] = None, cgroup: Optional[str] = None,
+                 on_exit: Optional[Callable[[SupervisedProcess], None]] = None) -> SupervisedProcess:
+        """Supervise a started process until it exits.
+
+        Call this right after starting the process and before anything
+        waits on it, so its pidfd refers to the right process.
+        """
+        handle = SupervisedProcess(process, limits or {}, timeout, cgroup, on_exit)
+        if self.use_pidfd:
+            try:
+                handle._pidfd = os.pidfd_open(handle.pid)
+            except OSError:
+                # Already reaped, or pidfds are unsupported here
+                handle._pidfd = None
+        with self._lock:
+            self._incoming.append(handle)
+            self._ensure_thread()
+        self._wake()
+        return handle
+
+    def terminate(self, handle: SupervisedProcess):
+        """Stop a supervised process: SIGTERM, then SIGKILL after a grace period."""
+        self._call(lambda: self._stop_process(handle))
+
+    def shutdown(self):
+        """Stop the supervisor thread; live processes are no longer watched."""
+        with self._lock:
+            self._stopped = True
+            thread = self._thread
+        self._wake()
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _call(self, request: Callable[[], None]):
+        with self._lock:
+            self._requests.append(request)
+            self._ensure_thread()
+        self._wake()
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="process-supervisor", daemon=True)
+            self._thread.start()
+
+    def _wake(self):
+        try:
+            os.write(self._wakeup_write, b"\0")
+        except BlockingIOError:
+            pass
+
+    def _run(self):
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._wakeup_read, selectors.EVENT_READ)
+        # Processes adopted by an earlier thread keep their timers on the
+        # wheel; only their pidfds need registering with the new selector
+        for handle in self._processes.values():
+            if handle._pidfd is not None:
+                self._selector.register(handle._pidfd, selectors.EVENT_READ, handle)
+        try:
+            while True:
+                with self._lock:
+                    if self._stopped:
+                        return
+                    incoming, self._incoming = self._incoming, []
+                    requests, self._requests = self._requests, []
+                # One failing process or request must not stop supervision of the rest
+                for handle in incoming:
+                    self._guarded(self._adopt, handle)
+                for request in requests:
+                    self._guarded(request)
+                self._guarded(self._poll)
+        finally:
+            self._selector.close()
+            self._selector = None
+
+    def _poll(self):
+        deadline = self._wheel.next_deadline()
+        polled = [h for h in self._processes.values() if h._pidfd is None]
+        if polled:
+            deadline = min(deadline or math.inf, time.monotonic() + self.tick)
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        for key, _ in self._selector.select(timeout):
+            if key.fd == self._wakeup_read:
+                self._drain_wakeups()
+            else:
+                self._guarded(self._check_exit, key.data)
+
+        self._wheel.advance(time.monotonic())
+        # Processes without a pidfd are polled once per tick
+        for handle in polled:
+            self._guarded(self._check_exit, handle)
+
+    def _guarded(self, function: Callable[..., None], *args):
+        try:
+            function(*args)
+        except Exception as e:
+            logger.error(f"Process supervisor error: {e}")
+            # Avoid spinning if the failure repeats every iteration
+            time.sleep(self.tick)
+
+    def _drain_wakeups(self):
+        try:
+            while os.read(self._wakeup_read, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _adopt(self, handle: SupervisedProcess):
+        self._processes[handle.pid] = handle
+        if handle._pidfd is not None:
+            self._selector.register(handle._pidfd, selectors.EVENT_READ, handle)
+        if handle.timeout:
+            handle._timeout_timer = self._wheel.schedule(handle.started + handle.timeout,
+                                                         lambda: self._on_timeout(handle))
+        if self.reader.available:
+            self._sample(handle)
+        self._check_exit(handle)
+
+    def _check_exit(self, handle: SupervisedProcess):
+        if handle.done or handle.process.poll() is None:
+            return
+        self._processes.pop(handle.pid, None)
+        if handle._pidfd is not None:
+            self._selector.unregister(handle._pidfd)
+            os.close(handle._pidfd)
+            handle._pidfd = None
+        for timer in (handle._timeout_timer, handle._sample_timer, handle._kill_timer):
+            self._wheel.cancel(timer)
+        handle._timeout_timer = handle._sample_timer = handle._kill_timer = None
+
+        handle.returncode = handle.process.returncode
+        handle.usage.execution_time = time.monotonic() - handle.started
+        if handle.cgroup:
+            if handle.limit_exceeded is None and self.cgroups.memory_events(handle.cgroup).get("oom_kill"):
+                handle.limit_exceeded = "memory"
+            self.cgroups.remove(handle.cgroup)
+        handle._done.set()
+        if handle.on_exit is not None:
+            try:
+                handle.on_exit(handle)
+            except Exception as e:
+                logger.error(f"Process exit callback failed: {e}")
+
+    def _sample(self, handle: SupervisedProcess):
+        """Record usage, warn on CPU overuse and enforce memory without kernel limits."""
+        if handle.done:
+            return
+        stats = self.reader.read(handle.pid)
+        if stats is not None:
+            cpu_seconds, rss, _ = stats
+            elapsed = time.monotonic() - handle.started
+            previous_cpu = handle.usage.cpu_time
+            handle.usage.cpu_time = cpu_seconds
+            handle.usage.memory_mb = max(handle.usage.memory_mb, rss / 1024 / 1024)
+
+            max_memory = handle.limits.get("max_memory_mb", 512)
+            if handle.usage.memory_mb > max_memory and handle.limit_exceeded is None:
+                logger.warning(f"Memory limit exceeded: {handle.usage.memory_mb:.1f}MB > {max_memory}MB")
+                handle.limit_exceeded = "memory"
+                self._stop_process(handle)
+                return
+            max_cpu = handle.limits.get("max_cpu_percent", 50)
+            interval = min(self.sample_interval, elapsed) or self.sample_interval
+            cpu_percent = (cpu_seconds - previous_cpu) / interval * 100
+            if cpu_percent > max_cpu and not handle.cgroup:
+                logger.warning(f"CPU limit exceeded: {cpu_percent:.0f}% > {max_cpu}%")
+        handle._sample_timer = self._wheel.schedule(time.monotonic() + self.sample_interval,
+                                                    lambda: self._sample(handle))
+
+    def _on_timeout(self, handle: SupervisedProcess):
+        if handle.done:
+            return
+        handle.timed_out = True
+        self._stop_process(handle)
+
+    def _stop_process(self, handle: SupervisedProcess):
+        if handle.done or handle._stopping:
+            return
+        handle._stopping = True
+        try:
+            handle.process.terminate()
+        except OSError:
+            return
+        handle._kill_timer = self._wheel.schedule(time.monotonic() + KILL_GRACE_SECONDS,
+                                                  lambda: self._kill(handle))
+
+    def _kill(self, handle: SupervisedProcess):
+        if not handle.done and handle.process.poll() is None:
+            try:
+                handle.process.kill()
+            except OSError:
+                pass
+
+
+_default_supervisor: Optional[ProcessSupervisor] = None
+_default_supervisor_lock = threading.Lock()
+
+
+def get_process_supervisor() -> ProcessSupervisor:
+    """The process-wide supervisor shared by all sandboxes."""
+    global _default_supervisor
+    with _default_supervisor_lock:
+        if _default_supervisor is None:
+            _default_supervisor = ProcessSupervisor()
+        return _default_supervisor
@@ -0,0 +1,146 @@
+"""
+Incremental Metric Aggregates
+=============================
+
+Mergeable running statistics used by the performance tracker: Welford
+mean/variance accumulators and a log-bucketed quantile sketch. Both can be
+updated one value at a time or merged from partial aggregates, so version
+metrics never require rescanning raw executions.
+"""
+
+import json
+import math
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+
+@dataclass
+class RunningStat:
+    """Welford accumulator for count, mean and sum of squared deviations."""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def add(self, value: float):
+        """Fold a single value into the accumulator."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def merge(self, other: "RunningStat"):
+        """Combine with another accumulator (Chan et al. parallel update)."""
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            return
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta * delta * self.count * other.count / total
+        self.count = total
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0.0 with fewer than two values)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """Relative-error quantile sketch over non-negative values.
+
+    Values are counted in logarithmic buckets of ratio ``gamma``, so any
+    quantile is returned within ``relative_accuracy`` of the true value.
+    Sketches with the same accuracy merge by adding bucket counts. Memory is
+    bounded by ``max_buckets``; beyond that the lowest buckets are collapsed,
+    which only degrades accuracy at the bottom of the distribution.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value: float, count: int = 1):
+        """Record ``value`` ``count`` times."""
+        if value <= 0:
+            self.zero_count += count
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + count
+            if len(self.buckets) > self.max_buckets:
+                self._collapse()
+        self.count += count
+
+    def merge(self, other: "QuantileSketch"):
+        """Add another sketch's counts into this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate value at quantile ``q`` (0..1), or None when empty."""
+        if self.count == 0:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def _collapse(self):
+        """Fold the lowest buckets together until within ``max_buckets``."""
+        indexes = sorted(self.buckets)
+        excess = len(indexes) - self.max_buckets
+        target = indexes[excess]
+        for index in indexes[:excess]:
+            self.buckets[target] += self.buckets.pop(index)
+
+    def to_json(self) -> str:
+        """Serialize for storage alongside the aggregates."""
+        return json.dumps({
+            "relative_accuracy": self.relative_accuracy,
+            "zero_count": self.zero_count,
+            "buckets": {str(index): count for index, count in self.buckets.items()}
+        })
+
+    @classmethod
+    def from_json(cls, data: Optional[str]) -> "QuantileSketch":
+        """Restore a sketch; empty input gives an empty sketch."""
+        if not data:
+            return cls()
+        payload = json.loads(data)
+        sketch = cls(relative_accuracy=payload.get("relative_accuracy", 0.01))
+        sketch.zero_count = payload.get("zero_count", 0)
+        sketch.buckets = {int(index): count for index, count in payload.get("buckets", {}).items()}
+        sketch.count = sketch.zero_count + sum(sketch.buckets.values())
+        return sketch
+
+    @classmethod
+    def from_values(cls, values: Iterable[float]) -> "QuantileSketch":
+        """Build a sketch from raw values."""
+        sketch = cls()
+        for value in values:
+            sketch.add(value)
+        return sketch
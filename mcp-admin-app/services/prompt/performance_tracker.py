@@ -18,6 +18,7 @@ from enum import Enum
 from models.prompt_advanced.models import (
     PerformanceMetrics, EvaluationResult, TokenUsage
 )
+from .metric_aggregates import QuantileSketch, RunningStat
 
 
 class MetricType(Enum):
@@ -98,6 +99,83 @@ class PerformanceTrend:
         }
 
 
+class _VersionAggregate:
+    """Running aggregate of one version's scored executions."""
+    
+    def __init__(self):
+        self.success_count = 0
+        self.total_tokens = 0
+        self.total_cost = 0.0
+        self.score = RunningStat()
+        self.tokens = RunningStat()
+        self.cost = RunningStat()
+        self.response_time = RunningStat()
+        self.latency_sketch = QuantileSketch()
+    
+    @property
+    def count(self) -> int:
+        return self.score.count
+    
+    def add(self, success: bool, score: float, tokens: int, cost: float, response_time: float):
+        """Fold one execution into the aggregate."""
+        self.success_count += 1 if success else 0
+        self.total_tokens += tokens
+        self.total_cost += cost
+        self.score.add(score)
+        self.tokens.add(tokens)
+        self.cost.add(cost)
+        self.response_time.add(response_time)
+        self.latency_sketch.add(response_time)
+    
+    def merge(self, other: "_VersionAggregate"):
+        """Combine with another partial aggregate."""
+        self.success_count += other.success_count
+        self.total_tokens += other.total_tokens
+        self.total_cost += other.total_cost
+        self.score.merge(other.score)
+        self.tokens.merge(other.tokens)
+        self.cost.merge(other.cost)
+        self.response_time.merge(other.response_time)
+        self.latency_sketch.merge(other.latency_sketch)
+    
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "_VersionAggregate":
+        """Load from a prompt_performance_metrics row."""
+        aggregate = cls()
+        count = row["total_executions"] or 0
+        aggregate.success_count = row["success_count"] or 0
+        aggregate.total_tokens = row["total_tokens"] or 0
+        aggregate.total_cost = row["total_cost"] or 0.0
+        tokens_mean = row["tokens_mean"] if row["tokens_mean"] is not None else row["average_tokens"]
+        aggregate.score = RunningStat(count, row["average_score"] or 0.0, row["score_m2"] or 0.0)
+        aggregate.tokens = RunningStat(count, tokens_mean or 0.0, row["tokens_m2"] or 0.0)
+        aggregate.cost = RunningStat(count, row["average_cost"] or 0.0, row["cost_m2"] or 0.0)
+        aggregate.response_time = RunningStat(
+            count, row["average_response_time"] or 0.0, row["response_time_m2"] or 0.0
+        )
+        aggregate.latency_sketch = QuantileSketch.from_json(row["latency_sketch"])
+        return aggregate
+    
+    def to_statistics(self) -> Dict[str, Any]:
+        """Summary statistics for reports."""
+        return {
+            "total_executions": self.count,
+            "success_count": self.success_count,
+            "success_rate": self.success_count / self.count if self.count else 0.0,
+            "total_tokens": self.total_tokens,
+            "total_cost": self.total_cost,
+            "score": {"mean": self.score.mean, "stddev": self.score.stddev},
+            "tokens": {"mean": self.tokens.mean, "stddev": self.tokens.stddev},
+            "cost": {"mean": self.cost.mean, "stddev": self.cost.stddev},
+            "response_time": {
+                "mean": self.response_time.mean,
+                "stddev": self.response_time.stddev,
+                "p50": self.latency_sketch.quantile(0.5),
+                "p95": self.latency_sketch.quantile(0.95)
+            }
+        }
+
+
 class PerformanceTracker:
     """Service for tracking and analyzing prompt performance across versions."""
     
@@ -118,29 +196,14 @@ class PerformanceTracker:
         try:
             with self.db_manager.get_connection() as conn:
                 # Insert execution record
-                conn.execute("""
-                    INSERT INTO prompt_executions 
-                    (id, prompt_id, version_id, model, input_variables, output, success,
-                     error, tokens_used, cost, execution_time, quality_score, executed_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    result.result_id,
-                    result.prompt_version_id.split('-')[0],  # Extract prompt_id from version_id
-                    version_id,
-                    result.model,
-                    json.dumps(result.input_variables),
-                    result.output,
-                    result.error is None,
-                    result.error,
-                    result.token_usage.total_tokens if result.token_usage else 0,
-                    result.cost,
-                    result.execution_time,
-                    result.scores.get('overall', 0.0) if result.scores else None,
-                    result.created_at
-                ))
+                conn.execute(self._EXECUTION_INSERT_SQL, self._execution_row(version_id, result))
                 
-                # Update aggregated performance metrics
-                self._update_version_performance_metrics(conn, version_id)
+                # Fold the execution into the version's running aggregates
+                sample = self._execution_sample(result)
+                if sample is not None:
+                    batch = _VersionAggregate()
+                    batch.add(*sample)
+                    self._merge_version_aggregate(conn, version_id, batch)
                 
                 conn.commit()
                 return True
@@ -149,6 +212,83 @@ class PerformanceTracker:
             self.logger.error(f"Failed to record execution metrics for version {version_id}: {e}")
             return False
     
+    def record_execution_metrics_batch(self, executions: List[Tuple[str, EvaluationResult]]) -> int:
+        """Record many executions (e.g. an evaluation sweep) in one transaction.
+        
+        Executions are aggregated per version in memory and merged into the
+        stored aggregates with one update per version. Returns the number of
+        executions recorded, or 0 if the batch was rolled back.
+        """
+        if not executions:
+            return 0
+        
+        try:
+            batches: Dict[str, _VersionAggregate] = {}
+            for version_id, result in executions:
+                sample = self._execution_sample(result)
+                if sample is not None:
+                    batches.setdefault(version_id, _VersionAggregate()).add(*sample)
+            
+            with self.db_manager.get_connection() as conn:
+                conn.executemany(
+                    self._EXECUTION_INSERT_SQL,
+                    [self._execution_row(version_id, result) for version_id, result in executions]
+                )
+                for version_id, batch in batches.items():
+                    self._merge_version_aggregate(conn, version_id, batch)
+                conn.commit()
+            
+            return len(executions)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to record execution batch of {len(executions)}: {e}")
+            return 0
+    
+    def reconcile_version_metrics(self, version_id: Optional[str] = None) -> int:
+        """Rebuild running aggregates from raw executions.
+        
+        Reconciles one version, or every version with executions when
+        ``version_id`` is None. Returns the number of versions rebuilt.
+        """
+        try:
+            with self.db_manager.get_connection() as conn:
+                if version_id is not None:
+                    version_ids = [version_id]
+                else:
+                    cursor = conn.execute("""
+                        SELECT DISTINCT version_id FROM prompt_executions
+                        WHERE version_id IS NOT NULL AND quality_score IS NOT NULL
+                    """)
+                    version_ids = [row["version_id"] for row in cursor.fetchall()]
+                
+                for vid in version_ids:
+                    self._rebuild_version_aggregate(conn, vid)
+                
+                conn.commit()
+                return len(version_ids)
+                
+        except Exception as e:
+            self.logger.error(f"Failed to reconcile performance metrics: {e}")
+            return 0
+    
+    def get_version_statistics(self, version_id: str) -> Optional[Dict[str, Any]]:
+        """Get means, standard deviations and latency percentiles for a version."""
+        try:
+            with self.db_manager.get_connection() as conn:
+                row = conn.execute("""
+                    SELECT * FROM prompt_performance_metrics WHERE version_id = ?
+                """, (version_id,)).fetchone()
+                
+                if not row:
+                    return None
+                
+                aggregate = _VersionAggregate.from_row(row)
+                return aggregate.to_statistics()
+                
+        except Exception as e:
+            self.logger.error(f"Failed to get statistics for version {version_id}: {e}")
+            return None
+    
     def get_version_performance(self, version_id: str) -> Optional[PerformanceMetrics]:
         """Get performance metrics for a specific version."""
         try:
@@ -376,38 +516,127 @@ class PerformanceTracker:
             self.logger.error(f"Failed to get performance history: {e}")
             return []
     
-    def _update_version_performance_metrics(self, conn: sqlite3.Connection, version_id: str):
-        """Update aggregated performance metrics for a version."""
-        # Calculate aggregated metrics from executions
+    _EXECUTION_INSERT_SQL = """
+        INSERT INTO prompt_executions 
+        (id, prompt_id, version_id, model, input_variables, output, success,
+         error, tokens_used, cost, execution_time, quality_score, executed_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    def _execution_row(self, version_id: str, result: EvaluationResult) -> Tuple:
+        """Column values for a prompt_executions insert."""
+        return (
+            result.result_id,
+            result.prompt_version_id.split('-')[0],  # Extract prompt_id from version_id
+            version_id,
+            result.model,
+            json.dumps(result.input_variables),
+            result.output,
+            result.error is None,
+            result.error,
+            result.token_usage.total_tokens if result.token_usage else 0,
+            result.cost,
+            result.execution_time,
+            self._quality_score(result),
+            result.created_at
+        )
+    
+    def _quality_score(self, result: EvaluationResult) -> Optional[float]:
+        """Overall score, or None for unscored executions."""
+        return result.scores.get('overall', 0.0) if result.scores else None
+    
+    def _execution_sample(self, result: EvaluationResult) -> Optional[Tuple[bool, float, int, float, float]]:
+        """Values folded into the aggregates; unscored executions are excluded."""
+        score = self._quality_score(result)
+        if score is None:
+            return None
+        return (
+            result.error is None,
+            score,
+            result.token_usage.total_tokens if result.token_usage else 0,
+            result.cost or 0.0,
+            result.execution_time or 0.0
+        )
+    
+    def _merge_version_aggregate(self, conn: sqlite3.Connection, version_id: str,
+                                 batch: "_VersionAggregate"):
+        """Merge new executions into the stored aggregate with one UPSERT."""
+        row = conn.execute("""
+            SELECT * FROM prompt_performance_metrics WHERE version_id = ?
+        """, (version_id,)).fetchone()
+        
+        if row is not None and row["score_m2"] is None and row["total_executions"]:
+            # Row predates running aggregates; rebuild it from raw executions,
+            # which already include the rows inserted by this transaction
+            self._rebuild_version_aggregate(conn, version_id)
+            return
+        
+        aggregate = _VersionAggregate.from_row(row) if row is not None else _VersionAggregate()
+        aggregate.merge(batch)
+        self._store_version_aggregate(conn, version_id, aggregate)
+    
+    def _rebuild_version_aggregate(self, conn: sqlite3.Connection, version_id: str):
+        """Recompute a version's aggregate by streaming its executions."""
+        aggregate = _VersionAggregate()
         cursor = conn.execute("""
-            SELECT 
-                COUNT(*) as total_executions,
-                AVG(CASE WHEN success = 1 THEN 1.0 ELSE 0.0 END) as success_rate,
-                AVG(quality_score) as average_score,
-                AVG(tokens_used) as average_tokens,
-                AVG(cost) as average_cost,
-                AVG(execution_time) as average_response_time
+            SELECT success, quality_score, tokens_used, cost, execution_time
             FROM prompt_executions 
             WHERE version_id = ? AND quality_score IS NOT NULL
         """, (version_id,))
+        for row in cursor:
+            aggregate.add(bool(row[0]), row[1], row[2] or 0, row[3] or 0.0, row[4] or 0.0)
         
-        stats = cursor.fetchone()
-        if stats and stats["total_executions"] > 0:
-            conn.execute("""
-                INSERT OR REPLACE INTO prompt_performance_metrics 
-                (version_id, average_score, total_executions, success_rate,
-                 average_tokens, average_cost, average_response_time, last_updated)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                version_id,
-                stats["average_score"] or 0.0,
-                stats["total_executions"],
-                stats["success_rate"] or 0.0,
-                int(stats["average_tokens"] or 0),
-                stats["average_cost"] or 0.0,
-                stats["average_response_time"] or 0.0,
-                datetime.now()
-            ))
+        if aggregate.count > 0:
+            self._store_version_aggregate(conn, version_id, aggregate)
+        else:
+            conn.execute("DELETE FROM prompt_performance_metrics WHERE version_id = ?", (version_id,))
+    
+    def _store_version_aggregate(self, conn: sqlite3.Connection, version_id: str,
+                                 aggregate: "_VersionAggregate"):
+        """UPSERT the aggregate and the derived averages read elsewhere."""
+        conn.execute("""
+            INSERT INTO prompt_performance_metrics 
+            (version_id, average_score, total_executions, success_rate,
+             average_tokens, average_cost, average_response_time, last_updated,
+             success_count, total_tokens, total_cost, tokens_mean,
+             score_m2, tokens_m2, cost_m2, response_time_m2, latency_sketch)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(version_id) DO UPDATE SET
+                average_score = excluded.average_score,
+                total_executions = excluded.total_executions,
+                success_rate = excluded.success_rate,
+                average_tokens = excluded.average_tokens,
+                average_cost = excluded.average_cost,
+                average_response_time = excluded.average_response_time,
+                last_updated = excluded.last_updated,
+                success_count = excluded.success_count,
+                total_tokens = excluded.total_tokens,
+                total_cost = excluded.total_cost,
+                tokens_mean = excluded.tokens_mean,
+                score_m2 = excluded.score_m2,
+                tokens_m2 = excluded.tokens_m2,
+                cost_m2 = excluded.cost_m2,
+                response_time_m2 = excluded.response_time_m2,
+                latency_sketch = excluded.latency_sketch
+        """, (
+            version_id,
+            aggregate.score.mean,
+            aggregate.count,
+            aggregate.success_count / aggregate.count if aggregate.count else 0.0,
+            int(round(aggregate.tokens.mean)),
+            aggregate.cost.mean,
+            aggregate.response_time.mean,
+            datetime.now(),
+            aggregate.success_count,
+            aggregate.total_tokens,
+            aggregate.total_cost,
+            aggregate.tokens.mean,
+            aggregate.score.m2,
+            aggregate.tokens.m2,
+            aggregate.cost.m2,
+            aggregate.response_time.m2,
+            aggregate.latency_sketch.to_json()
+        ))
     
     def _get_metric_weight(self, metric_name: str) -> float:
         """Get weight for metric in overall impact calculation."""
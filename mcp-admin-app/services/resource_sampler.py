@@ -0,0 +1,290 @@
+"""
+Resource Sampler
+================
+
+Background telemetry for managed MCP server processes.
+
+A single daemon thread samples every running server at a fixed interval:
+CPU percentage, resident memory and open file descriptors of its process
+(read from ``/proc``, or through psutil where there is no ``/proc``), and
+request rate and mean latency from its session counters. Each metric keeps
+a fixed-size ring buffer of recent samples in memory. The samples are also
+averaged per flush interval and written to ``monitoring_metrics`` in one
+batched insert.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+from models.base import generate_id
+
+
+logger = logging.getLogger(__name__)
+
+
+PROC_ROOT = "/proc"
+
+# Unit stored alongside each metric type in monitoring_metrics
+METRIC_UNITS = {
+    "cpu_percent": "%",
+    "memory_rss": "MB",
+    "open_fds": "count",
+    "request_rate": "req/s",
+    "latency": "ms",
+}
+
+METRICS_INSERT = """
+    INSERT INTO monitoring_metrics (id, timestamp, server_id, metric_type, value, unit)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+class ProcessReader:
+    """Reads cumulative CPU time, RSS and open FD count of a process."""
+
+    def __init__(self, proc_root: str = PROC_ROOT):
+        self.proc_root = proc_root
+        self.use_proc = os.path.isfile(os.path.join(proc_root, "self", "stat"))
+        if self.use_proc:
+            self._clock_ticks = os.sysconf("SC_CLK_TCK")
+            self._page_size = os.sysconf("SC_PAGE_SIZE")
+        self._processes: Dict[int, Any] = {}
+
+    @property
+    def available(self) -> bool:
+        return self.use_proc or HAS_PSUTIL
+
+    def read(self, pid: int) -> Optional[Tuple[float, int, Optional[int]]]:
+        """``(cpu seconds, rss bytes, open fds)``, or None if the process is gone.
+
+        The FD count is None where it cannot be read.
+        """
+        if self.use_proc:
+            return self._read_proc(pid)
+        if HAS_PSUTIL:
+            return self._read_psutil(pid)
+        return None
+
+    def _read_proc(self, pid: int) -> Optional[Tuple[float, int, Optional[int]]]:
+        base = f"{self.proc_root}/{pid}"
+        try:
+            with open(f"{base}/stat", "rb") as f:
+                stat = f.read()
+        except OSError:
+            return None
+        # The command name may contain spaces; fields resume after its ')'
+        fields = stat[stat.rfind(b")") + 2:].split()
+        cpu_seconds = (int(fields[11]) + int(fields[12])) / self._clock_ticks
+        rss = int(fields[21]) * self._page_size
+        try:
+            open_fds = len(os.listdir(f"{base}/fd"))
+        except OSError:
+            open_fds = None
+        return cpu_seconds, rss, open_fds
+
+    def _read_psutil(self, pid: int) -> Optional[Tuple[float, int, Optional[int]]]:
+        process = self._processes.get(pid)
+        try:
+            if process is None:
+                process = self._processes[pid] = psutil.Process(pid)
+            with process.oneshot():
+                times = process.cpu_times()
+                rss = process.memory_info().rss
+                if hasattr(process, "num_fds"):
+                    open_fds = process.num_fds()
+                else:
+                    open_fds = process.num_handles()
+            return times.user + times.system, rss, open_fds
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self._processes.pop(pid, None)
+            return None
+
+    def forget(self, pid: int):
+        """Drop any handle kept for ``pid``."""
+        self._processes.pop(pid, None)
+
+
+class ResourceSampler:
+    """Samples server processes into ring buffers and batched metric rows.
+
+    ``targets`` returns the servers to sample as ``{server_id: session}``,
+    where a session exposes ``pid``, ``request_count`` and ``latency_total``
+    (see ``MCPSession``).
+    """
+
+    def __init__(self, targets: Callable[[], Dict[str, Any]], db_manager=None,
+                 interval: float = 2.0, flush_interval: float = 60.0, ring_size: int = 600,
+                 reader: Optional[ProcessReader] = None):
+        self.targets = targets
+        self.db_manager = db_manager
+        self.interval = interval
+        self.flush_interval = flush_interval
+        self.ring_size = ring_size
+        self.reader = reader or ProcessReader()
+
+        self._lock = threading.Lock()
+        self._rings: Dict[Tuple[str, str], Deque[Tuple[float, float]]] = {}
+        # Running [sum, count] per metric since the last flush
+        self._pending: Dict[Tuple[str, str], List[float]] = {}
+        # Per server: pid, monotonic time, cpu seconds, request count, latency total
+        self._previous: Dict[str, Tuple[Optional[int], float, Optional[float], int, float]] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_flush = time.monotonic()
+
+        self.samples_taken = 0
+        self.sample_seconds = 0.0  # CPU time spent sampling
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the background sampling thread."""
+        if self.running:
+            return
+        if not self.reader.available:
+            logger.warning("Neither /proc nor psutil is available; only request metrics will be sampled")
+        self._stop_event.clear()
+        self._last_flush = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="resource-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, flush: bool = True):
+        """Stop sampling and, by default, write out pending samples."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 5)
+            self._thread = None
+        if flush:
+            self.flush()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.sample_once()
+                if time.monotonic() - self._last_flush >= self.flush_interval:
+                    self.flush()
+            except Exception as e:
+                logger.error(f"Resource sampling error: {e}")
+
+    def sample_once(self):
+        """Take one sample of every target."""
+        cpu_started = time.thread_time()
+        timestamp = time.time()
+        now = time.monotonic()
+        targets = self.targets()
+
+        with self._lock:
+            for server_id, session in targets.items():
+                self._sample_server(server_id, session, timestamp, now)
+            for server_id in [s for s in self._previous if s not in targets]:
+                pid = self._previous.pop(server_id)[0]
+                if pid is not None:
+                    self.reader.forget(pid)
+
+        self.samples_taken += 1
+        self.sample_seconds += time.thread_time() - cpu_started
+
+    def _sample_server(self, server_id: str, session: Any, timestamp: float, now: float):
+        pid = session.pid
+        stats = self.reader.read(pid) if pid is not None else None
+        cpu_seconds = None
+        if stats is not None:
+            cpu_seconds, rss, open_fds = stats
+            self._record(server_id, "memory_rss", timestamp, rss / (1024 * 1024))
+            if open_fds is not None:
+                self._record(server_id, "open_fds", timestamp, open_fds)
+
+        request_count, latency_total = session.request_count, session.latency_total
+        previous = self._previous.get(server_id)
+        self._previous[server_id] = (pid, now, cpu_seconds, request_count, latency_total)
+        if previous is None:
+            return
+
+        previous_pid, previous_now, previous_cpu, previous_count, previous_latency = previous
+        elapsed = now - previous_now
+        requests = request_count - previous_count
+        if elapsed <= 0 or pid != previous_pid or requests < 0:
+            # A restarted server only sets a new baseline
+            return
+        if cpu_seconds is not None and previous_cpu is not None:
+            self._record(server_id, "cpu_percent", timestamp,
+                         max(cpu_seconds - previous_cpu, 0.0) / elapsed * 100)
+        self._record(server_id, "request_rate", timestamp, requests / elapsed)
+        if requests:
+            self._record(server_id, "latency", timestamp,
+                         (latency_total - previous_latency) / requests * 1000)
+
+    def _record(self, server_id: str, metric: str, timestamp: float, value: float):
+        key = (server_id, metric)
+        ring = self._rings.get(key)
+        if ring is None:
+            ring = self._rings[key] = deque(maxlen=self.ring_size)
+        ring.append((timestamp, value))
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = [value, 1]
+        else:
+            pending[0] += value
+            pending[1] += 1
+
+    def flush(self) -> int:
+        """Write the mean of each metric since the last flush; returns rows written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        self._last_flush = time.monotonic()
+        if not pending or self.db_manager is None:
+            return 0
+
+        timestamp = datetime.now().isoformat()
+        rows = [
+            (generate_id(), timestamp, server_id, metric, total / count, METRIC_UNITS[metric])
+            for (server_id, metric), (total, count) in pending.items()
+        ]
+        try:
+            with self.db_manager.get_connection() as conn:
+                conn.executemany(METRICS_INSERT, rows)
+                conn.commit()
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Error writing monitoring metrics: {e}")
+            return 0
+
+    def latest(self, server_id: str) -> Dict[str, float]:
+        """Most recent value of each metric sampled for a server."""
+        with self._lock:
+            return {metric: ring[-1][1] for (sid, metric), ring in self._rings.items()
+                    if sid == server_id and ring}
+
+    def history(self, server_id: str, metric: str) -> List[Tuple[float, float]]:
+        """Buffered ``(unix timestamp, value)`` samples of one metric, oldest first."""
+        with self._lock:
+            return list(self._rings.get((server_id, metric), ()))
+
+    def forget_server(self, server_id: str):
+        """Drop buffered samples of a removed server."""
+        with self._lock:
+            for key in [key for key in self._rings if key[0] == server_id]:
+                del self._rings[key]
+            self._previous.pop(server_id, None)
+
+    def get_stats(self) -> Dict[str, float]:
+        """Sampling cost: CPU time per sample and as a share of the interval."""
+        per_sample = self.sample_seconds / self.samples_taken if self.samples_taken else 0.0
+        return {
+            "samples_taken": self.samples_taken,
+            "cpu_seconds_per_sample": per_sample,
+            "overhead_percent": per_sample / self.interval * 100 if self.interval else 0.0,
+        }
@@ -7,13 +7,17 @@ Tools for customizable review checklists, policy-as-code integration, and compli
 
 import json
 import logging
-from typing import Dict, List, Optional, Any, Union
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
 from enum import Enum
 import yaml
 
 from models.base import generate_id
+from .policy_program import CompiledRule, ContentScan, PolicyProgram, policy_signature
 
 
 class ComplianceStandard(Enum):
@@ -227,6 +231,8 @@ class PolicyEngine:
         """Initialize policy engine."""
         self.logger = logging.getLogger(__name__)
         self.policies: Dict[str, CompliancePolicy] = {}
+        self._program: Optional[PolicyProgram] = None
+        self._program_lock = threading.Lock()
         self._init_default_policies()
     
     def _init_default_policies(self):
@@ -338,12 +344,34 @@ class PolicyEngine:
         """Add a new compliance policy."""
         try:
             self.policies[policy.id] = policy
+            self.invalidate_compiled_policies()
             self.logger.info(f"Added compliance policy: {policy.name}")
             return True
         except Exception as e:
             self.logger.error(f"Failed to add policy: {e}")
             return False
     
+    def invalidate_compiled_policies(self):
+        """Force a rebuild of the compiled policy program.
+        
+        Needed only after editing a rule definition dict in place; other
+        policy changes are detected automatically.
+        """
+        with self._program_lock:
+            self._program = None
+    
+    def _get_program(self) -> PolicyProgram:
+        """Compiled program for the current policies, rebuilt on change."""
+        signature = policy_signature(self.policies)
+        with self._program_lock:
+            if self._program is None or self._program.signature != signature:
+                self._program = PolicyProgram(self.policies)
+                self.logger.debug(
+                    f"Compiled {len(self._program.patterns)} patterns and "
+                    f"{len(self._program.keywords)} keywords from {len(self.policies)} policies"
+                )
+            return self._program
+    
     def evaluate_compliance(self, content: str, prompt_id: str = "", 
                           prompt_version: str = "", policy_ids: List[str] = None) -> ComplianceAssessment:
         """Evaluate content against compliance policies."""
@@ -357,20 +385,13 @@ class PolicyEngine:
         assessment.policies_evaluated = policies_to_evaluate
         
         try:
+            program = self._get_program()
+            scan = program.scan(content)
+            
             for policy_id in policies_to_evaluate:
-                if policy_id not in self.policies:
-                    continue
-                
-                policy = self.policies[policy_id]
-                if not policy.is_active:
-                    continue
-                
-                # Evaluate each rule in the policy
-                for rule in policy.rules:
-                    if not rule.enabled:
-                        continue
-                    
-                    violations = self._evaluate_rule(rule, content, policy_id, prompt_id, prompt_version)
+                # Inactive and unknown policies have no compiled rules
+                for compiled_rule in program.rules_by_policy.get(policy_id, []):
+                    violations = self._evaluate_rule(compiled_rule, scan, prompt_id, prompt_version)
                     assessment.violations.extend(violations)
             
             # Calculate overall compliance status and score
@@ -396,19 +417,54 @@ class PolicyEngine:
             assessment.overall_status = ComplianceStatus.NON_COMPLIANT
         
         return assessment 
+    
+    def evaluate_compliance_batch(self, items: List[Tuple[str, str, str]],
+                                  policy_ids: List[str] = None,
+                                  max_workers: Optional[int] = None,
+                                  min_pool_size: int = 16) -> List[ComplianceAssessment]:
+        """Evaluate many ``(content, prompt_id, prompt_version)`` items.
+        
+        Batches of at least ``min_pool_size`` items fan out across a process
+        pool whose workers each compile the policies once; smaller batches
+        (or ``max_workers=1``) run in-process. Results keep input order.
+        """
+        items = list(items)
+        if max_workers == 1 or len(items) < min_pool_size:
+            return [self.evaluate_compliance(content, prompt_id, prompt_version, policy_ids)
+                    for content, prompt_id, prompt_version in items]
+        
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(items) // (workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                     initargs=(self.policies,)) as executor:
+                return list(executor.map(
+                    _evaluate_batch_item,
+                    [(content, prompt_id, prompt_version, policy_ids)
+                     for content, prompt_id, prompt_version in items],
+                    chunksize=chunksize
+                ))
+        except Exception as e:
+            self.logger.warning(f"Process pool compliance evaluation failed, running in-process: {e}")
+            return [self.evaluate_compliance(content, prompt_id, prompt_version, policy_ids)
+                    for content, prompt_id, prompt_version in items]
    
-    def _evaluate_rule(self, rule: PolicyRule, content: str, policy_id: str, 
+    def _evaluate_rule(self, compiled_rule: CompiledRule, scan: ContentScan,
                       prompt_id: str, prompt_version: str) -> List[ComplianceViolation]:
-        """Evaluate a single policy rule against content."""
+        """Evaluate a single compiled policy rule against scanned content."""
         violations = []
+        rule = compiled_rule.rule
+        policy_id = compiled_rule.policy_id
         
         try:
+            if compiled_rule.error is not None:
+                raise compiled_rule.error
             if rule.rule_type == "regex":
-                violations.extend(self._evaluate_regex_rule(rule, content, policy_id, prompt_id, prompt_version))
+                violations.extend(self._evaluate_regex_rule(compiled_rule, scan, prompt_id, prompt_version))
             elif rule.rule_type == "checklist":
-                violations.extend(self._evaluate_checklist_rule(rule, content, policy_id, prompt_id, prompt_version))
+                violations.extend(self._evaluate_checklist_rule(compiled_rule, scan, prompt_id, prompt_version))
             elif rule.rule_type == "function":
-                violations.extend(self._evaluate_function_rule(rule, content, policy_id, prompt_id, prompt_version))
+                violations.extend(self._evaluate_function_rule(rule, scan.content, policy_id, prompt_id, prompt_version))
         
         except Exception as e:
             self.logger.error(f"Error evaluating rule {rule.name}: {e}")
@@ -427,42 +483,39 @@ class PolicyEngine:
         
         return violations
     
-    def _evaluate_regex_rule(self, rule: PolicyRule, content: str, policy_id: str, 
+    def _evaluate_regex_rule(self, compiled_rule: CompiledRule, scan: ContentScan,
                            prompt_id: str, prompt_version: str) -> List[ComplianceViolation]:
-        """Evaluate regex-based rule."""
+        """Evaluate regex-based rule from the shared pattern scans."""
         violations = []
-        patterns = rule.rule_definition.get("patterns", [])
+        rule = compiled_rule.rule
         
-        import re
-        for pattern in patterns:
-            matches = re.finditer(pattern, content, re.IGNORECASE)
-            
-            for match in matches:
+        for pattern_id in compiled_rule.pattern_ids:
+            for start, end in scan.pattern_spans(pattern_id):
                 violation = ComplianceViolation(
-                    policy_id=policy_id,
+                    policy_id=compiled_rule.policy_id,
                     rule_id=rule.id,
                     prompt_id=prompt_id,
                     prompt_version=prompt_version,
                     violation_type="pattern_match",
                     severity=rule.severity,
                     description=f"Rule '{rule.name}' violation detected",
-                    evidence=self._get_context(content, match.start(), match.end()),
+                    evidence=self._get_context(scan.content, start, end),
                     remediation=f"Review and address the issue identified by rule: {rule.description}"
                 )
                 violations.append(violation)
         
         return violations
     
-    def _evaluate_checklist_rule(self, rule: PolicyRule, content: str, policy_id: str, 
+    def _evaluate_checklist_rule(self, compiled_rule: CompiledRule, scan: ContentScan,
                                prompt_id: str, prompt_version: str) -> List[ComplianceViolation]:
-        """Evaluate checklist-based rule."""
+        """Evaluate checklist-based rule from the shared keyword checks."""
         violations = []
-        rule_def = rule.rule_definition
+        rule = compiled_rule.rule
+        policy_id = compiled_rule.policy_id
         
         # Check for required phrases
-        required_phrases = rule_def.get("required_phrases", [])
-        for phrase in required_phrases:
-            if phrase.lower() not in content.lower():
+        for phrase, keyword_id in compiled_rule.required:
+            if not scan.has_keyword(keyword_id):
                 violation = ComplianceViolation(
                     policy_id=policy_id,
                     rule_id=rule.id,
@@ -477,10 +530,9 @@ class PolicyEngine:
                 violations.append(violation)
         
         # Check for prohibited terms
-        prohibited_terms = rule_def.get("prohibited_terms", [])
-        for term in prohibited_terms:
-            if term.lower() in content.lower():
-                alternatives = rule_def.get("preferred_alternatives", [])
+        for term, keyword_id in compiled_rule.prohibited:
+            if scan.has_keyword(keyword_id):
+                alternatives = rule.rule_definition.get("preferred_alternatives", [])
                 alternative_text = f" Consider using: {', '.join(alternatives)}" if alternatives else ""
                 
                 violation = ComplianceViolation(
@@ -565,6 +617,21 @@ class PolicyEngine:
         return policies
 
 
+_batch_engine: Optional[PolicyEngine] = None
+
+
+def _init_batch_worker(policies: Dict[str, CompliancePolicy]):
+    """Process pool initializer: one engine (and compiled program) per worker."""
+    global _batch_engine
+    _batch_engine = PolicyEngine()
+    _batch_engine.policies = policies
+
+
+def _evaluate_batch_item(item: Tuple[str, str, str, Optional[List[str]]]) -> ComplianceAssessment:
+    content, prompt_id, prompt_version, policy_ids = item
+    return _batch_engine.evaluate_compliance(content, prompt_id, prompt_version, policy_ids)
+
+
 class ChecklistManager:
     """Manager for review checklists."""
     
@@ -842,6 +909,11 @@ class ComplianceGovernanceFramework:
             prompt_content, prompt_id, prompt_version
         )
     
+    def evaluate_prompts_compliance(self, prompts: List[Tuple[str, str, str]],
+                                    max_workers: Optional[int] = None) -> List[ComplianceAssessment]:
+        """Evaluate many ``(content, prompt_id, prompt_version)`` prompts."""
+        return self.policy_engine.evaluate_compliance_batch(prompts, max_workers=max_workers)
+    
     def get_review_checklist(self, compliance_standards: List[ComplianceStandard] = None) -> ReviewChecklist:
         """Get appropriate review checklist for given compliance standards."""
         checklists = self.checklist_manager.list_checklists()
@@ -0,0 +1,130 @@
+"""
+Compiled Policy Program
+=======================
+
+Compiled form of the active compliance policies. Every distinct regex
+across all rules is compiled once and every distinct checklist keyword is
+interned once, so policies for several standards that share patterns (PII,
+secrets, ...) cost one scan per pattern per prompt instead of one per rule.
+Scans are lazy and memoized per content, so evaluating a subset of policies
+only runs the patterns those policies need.
+
+A program is tied to the policy signature it was built from and is rebuilt
+when that signature changes.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def policy_signature(policies: Dict[str, Any]) -> Tuple:
+    """Cheap fingerprint of the policy set used to detect changes.
+
+    Covers policy membership, activation, version/update time and each
+    rule's id, enabled flag, type and definition object. In-place edits to
+    a rule definition dict are not detected; call
+    ``PolicyEngine.invalidate_compiled_policies`` after making them.
+    """
+    return tuple(
+        (policy_id, policy.is_active, policy.version, policy.updated_at,
+         tuple((rule.id, rule.enabled, rule.rule_type, id(rule.rule_definition))
+               for rule in policy.rules))
+        for policy_id, policy in policies.items()
+    )
+
+
+@dataclass
+class CompiledRule:
+    """A rule with its patterns and keywords resolved to shared indexes."""
+    policy_id: str
+    rule: Any
+    pattern_ids: List[int] = field(default_factory=list)
+    required: List[Tuple[str, int]] = field(default_factory=list)
+    prohibited: List[Tuple[str, int]] = field(default_factory=list)
+    error: Optional[Exception] = None
+
+
+class PolicyProgram:
+    """Shared pattern and keyword tables plus per-policy rule lists."""
+
+    def __init__(self, policies: Dict[str, Any]):
+        self.signature = policy_signature(policies)
+        self.patterns: List[re.Pattern] = []
+        self.keywords: List[str] = []
+        self.rules_by_policy: Dict[str, List[CompiledRule]] = {}
+        self._pattern_index: Dict[str, int] = {}
+        self._keyword_index: Dict[str, int] = {}
+
+        for policy_id, policy in policies.items():
+            if not policy.is_active:
+                continue
+            self.rules_by_policy[policy_id] = [
+                self._compile_rule(policy_id, rule) for rule in policy.rules if rule.enabled
+            ]
+
+    def _compile_rule(self, policy_id: str, rule) -> CompiledRule:
+        compiled = CompiledRule(policy_id=policy_id, rule=rule)
+        try:
+            if rule.rule_type == "regex":
+                compiled.pattern_ids = [
+                    self._intern_pattern(pattern)
+                    for pattern in rule.rule_definition.get("patterns", [])
+                ]
+            elif rule.rule_type == "checklist":
+                compiled.required = [
+                    (phrase, self._intern_keyword(phrase))
+                    for phrase in rule.rule_definition.get("required_phrases", [])
+                ]
+                compiled.prohibited = [
+                    (term, self._intern_keyword(term))
+                    for term in rule.rule_definition.get("prohibited_terms", [])
+                ]
+        except Exception as e:
+            # Reported as a rule evaluation error each time the rule runs
+            compiled.error = e
+        return compiled
+
+    def _intern_pattern(self, pattern: str) -> int:
+        if pattern not in self._pattern_index:
+            self._pattern_index[pattern] = len(self.patterns)
+            self.patterns.append(re.compile(pattern, re.IGNORECASE))
+        return self._pattern_index[pattern]
+
+    def _intern_keyword(self, keyword: str) -> int:
+        lowered = keyword.lower()
+        if lowered not in self._keyword_index:
+            self._keyword_index[lowered] = len(self.keywords)
+            self.keywords.append(lowered)
+        return self._keyword_index[lowered]
+
+    def scan(self, content: str) -> "ContentScan":
+        """Memoizing view of ``content`` against this program."""
+        return ContentScan(self, content)
+
+
+class ContentScan:
+    """Per-content match cache; each pattern and keyword is tested at most once."""
+
+    def __init__(self, program: PolicyProgram, content: str):
+        self.program = program
+        self.content = content
+        self._lowered: Optional[str] = None
+        self._spans: Dict[int, List[Tuple[int, int]]] = {}
+        self._keywords: Dict[int, bool] = {}
+
+    def pattern_spans(self, pattern_id: int) -> List[Tuple[int, int]]:
+        spans = self._spans.get(pattern_id)
+        if spans is None:
+            spans = [match.span() for match in self.program.patterns[pattern_id].finditer(self.content)]
+            self._spans[pattern_id] = spans
+        return spans
+
+    def has_keyword(self, keyword_id: int) -> bool:
+        present = self._keywords.get(keyword_id)
+        if present is None:
+            if self._lowered is None:
+                self._lowered = self.content.lower()
+            present = self.program.keywords[keyword_id] in self._lowered
+            self._keywords[keyword_id] = present
+        return present
@@ -5,13 +5,17 @@ Quality Assurance Framework for MCP Admin Application
 Framework for automated bias detection, hallucination analysis, and quality scoring.
 """
 
+import os
 import re
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from dataclasses import dataclass, field
 from enum import Enum
 import statistics
+from collections import Counter
 
 from models.base import generate_id
 
@@ -117,124 +121,243 @@ class QualityAssessmentResult:
         }
 
 
+# Severity weights shared by the score calculations
+SEVERITY_WEIGHTS = {
+    QualitySeverity.CRITICAL: 1.0,
+    QualitySeverity.HIGH: 0.8,
+    QualitySeverity.MEDIUM: 0.5,
+    QualitySeverity.LOW: 0.2
+}
+
+SENTENCE_BOUNDARY = re.compile(r'[.!?]+')
+
+BIAS_PATTERNS = {
+    "gender_bias": {
+        "patterns": [
+            r'\b(?:he|she)\s+(?:is\s+)?(?:better|worse|more|less)\s+(?:at|in|with)',
+            r'\b(?:men|women|boys|girls)\s+(?:are|can\'t|cannot|should|shouldn\'t)',
+            r'\b(?:male|female)\s+(?:dominated|oriented|typical)'
+        ],
+        "description": "Gender-based stereotyping or assumptions",
+        "severity": QualitySeverity.HIGH
+    },
+    "racial_bias": {
+        "patterns": [
+            r'\b(?:race|ethnicity|nationality)\s+(?:determines|affects|influences)',
+            r'\b(?:typical|characteristic)\s+(?:of|for)\s+(?:asian|black|white|hispanic|latino)',
+            r'\b(?:all|most)\s+(?:asians|blacks|whites|hispanics|latinos)\s+(?:are|do|have)'
+        ],
+        "description": "Racial or ethnic stereotyping",
+        "severity": QualitySeverity.CRITICAL
+    },
+    "age_bias": {
+        "patterns": [
+            r'\b(?:old|young)\s+people\s+(?:are|can\'t|cannot|should)',
+            r'\b(?:millennials|boomers|gen\s*z)\s+(?:are|always|never)',
+            r'\b(?:too\s+old|too\s+young)\s+(?:for|to)'
+        ],
+        "description": "Age-based discrimination or stereotyping",
+        "severity": QualitySeverity.MEDIUM
+    },
+    "cultural_bias": {
+        "patterns": [
+            r'\b(?:western|eastern)\s+(?:values|culture)\s+(?:is|are)\s+(?:better|superior)',
+            r'\b(?:primitive|backward|advanced)\s+(?:culture|society)',
+            r'\b(?:all|most)\s+(?:cultures|countries)\s+(?:should|must)'
+        ],
+        "description": "Cultural superiority or ethnocentrism",
+        "severity": QualitySeverity.HIGH
+    },
+    "socioeconomic_bias": {
+        "patterns": [
+            r'\b(?:poor|rich)\s+people\s+(?:are|always|never)',
+            r'\b(?:low|high)\s+(?:class|income)\s+(?:families|individuals)\s+(?:tend\s+to|usually)',
+            r'\b(?:welfare|benefits)\s+(?:recipients|users)\s+(?:are|should)'
+        ],
+        "description": "Socioeconomic stereotyping",
+        "severity": QualitySeverity.MEDIUM
+    }
+}
+
+HALLUCINATION_PATTERNS = {
+    "absolute_claims": {
+        "patterns": [
+            r'\b(?:always|never|all|none|every|no\s+one)\s+(?:is|are|do|does|will|can)',
+            r'\b(?:definitely|certainly|absolutely|guaranteed|proven)\s+(?:true|false|correct)',
+            r'\b(?:impossible|certain|sure)\s+(?:that|to)'
+        ],
+        "description": "Absolute claims that may not be verifiable",
+        "severity": QualitySeverity.MEDIUM
+    },
+    "specific_statistics": {
+        "patterns": [
+            r'\b\d+(?:\.\d+)?%\s+of\s+(?:people|users|customers)',
+            r'\b(?:studies\s+show|research\s+proves)\s+that',
+            r'\b(?:according\s+to|based\s+on)\s+(?:recent|latest)\s+(?:data|research)'
+        ],
+        "description": "Specific statistics or research claims without sources",
+        "severity": QualitySeverity.HIGH
+    },
+    "future_predictions": {
+        "patterns": [
+            r'\b(?:will\s+definitely|will\s+certainly|guaranteed\s+to)\s+(?:happen|occur|be)',
+            r'\b(?:in\s+the\s+future|by\s+\d{4}|within\s+\d+\s+years)',
+            r'\b(?:predict|forecast|expect)\s+(?:that|to)'
+        ],
+        "description": "Definitive future predictions",
+        "severity": QualitySeverity.MEDIUM
+    },
+    "unverifiable_facts": {
+        "patterns": [
+            r'\b(?:it\s+is\s+known|everyone\s+knows|obviously|clearly)\s+that',
+            r'\b(?:fact|truth)\s+(?:is|that)',
+            r'\b(?:scientists|experts|researchers)\s+(?:agree|confirm|prove)'
+        ],
+        "description": "Claims presented as facts without verification",
+        "severity": QualitySeverity.MEDIUM
+    }
+}
+
+
+class AnalysisDocument:
+    """Prompt content preprocessed once and shared by every detector.
+    
+    Tokens, sentences and the newline offset index are computed on first
+    use and cached, so a full assessment splits and scans the text once.
+    Detectors accept either a plain string or an ``AnalysisDocument``.
+    """
+    
+    def __init__(self, content: str):
+        self.content = content
+        self._words: Optional[List[str]] = None
+        self._lowered_words: Optional[List[str]] = None
+        self._sentences: Optional[List[str]] = None
+        self._newlines: Optional[List[int]] = None
+    
+    @classmethod
+    def of(cls, content: Union[str, "AnalysisDocument"]) -> "AnalysisDocument":
+        """Wrap ``content`` unless it is already a document."""
+        return content if isinstance(content, cls) else cls(content)
+    
+    @property
+    def words(self) -> List[str]:
+        """Whitespace-separated tokens."""
+        if self._words is None:
+            self._words = self.content.split()
+        return self._words
+    
+    @property
+    def word_count(self) -> int:
+        return len(self.words)
+    
+    @property
+    def lowered_words(self) -> List[str]:
+        """Lower-cased whitespace-separated tokens."""
+        if self._lowered_words is None:
+            self._lowered_words = self.content.lower().split()
+        return self._lowered_words
+    
+    @property
+    def sentences(self) -> List[str]:
+        """Non-empty stripped sentences split on terminal punctuation."""
+        if self._sentences is None:
+            self._sentences = [s.strip() for s in SENTENCE_BOUNDARY.split(self.content) if s.strip()]
+        return self._sentences
+    
+    @property
+    def newline_offsets(self) -> List[int]:
+        """Sorted positions of every newline character."""
+        if self._newlines is None:
+            offsets = []
+            position = self.content.find('\n')
+            while position != -1:
+                offsets.append(position)
+                position = self.content.find('\n', position + 1)
+            self._newlines = offsets
+        return self._newlines
+    
+    def line_number(self, position: int) -> int:
+        """1-based line number of a character offset."""
+        return bisect_left(self.newline_offsets, position) + 1
+    
+    def context(self, start: int, end: int, context_size: int = 30) -> str:
+        """Text around a match."""
+        return self.content[max(0, start - context_size):min(len(self.content), end + context_size)]
+
+
+def _compile_pattern_table(table: Dict[str, Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any], List[re.Pattern]]]:
+    """Compile each entry's patterns once."""
+    return [
+        (name, info, [re.compile(pattern, re.IGNORECASE) for pattern in info["patterns"]])
+        for name, info in table.items()
+    ]
+
+
+def _match_issues(document: AnalysisDocument, compiled_table, issue_type: QualityIssueType,
+                  title_suffix: str, suggestion: str, confidence: float) -> List[QualityIssue]:
+    """Run a compiled pattern table over a document and build issues."""
+    issues = []
+    content = document.content
+    
+    for name, info, patterns in compiled_table:
+        title = f"{name.replace('_', ' ').title()} {title_suffix}"
+        for pattern in patterns:
+            for match in pattern.finditer(content):
+                start, end = match.span()
+                issues.append(QualityIssue(
+                    issue_type=issue_type,
+                    severity=info["severity"],
+                    title=title,
+                    description=info["description"],
+                    location={
+                        "start": start,
+                        "end": end,
+                        "line": document.line_number(start)
+                    },
+                    evidence=document.context(start, end),
+                    suggestion=suggestion,
+                    confidence=confidence
+                ))
+    
+    return issues
+
+
+_COMPILED_BIAS_PATTERNS = _compile_pattern_table(BIAS_PATTERNS)
+_COMPILED_HALLUCINATION_PATTERNS = _compile_pattern_table(HALLUCINATION_PATTERNS)
+
+
 class BiasDetector:
     """Bias detection component."""
     
     def __init__(self):
         """Initialize bias detector."""
         self.logger = logging.getLogger(__name__)
-        self._init_bias_patterns()
-    
-    def _init_bias_patterns(self):
-        """Initialize bias detection patterns."""
-        self.bias_patterns = {
-            "gender_bias": {
-                "patterns": [
-                    r'\b(?:he|she)\s+(?:is\s+)?(?:better|worse|more|less)\s+(?:at|in|with)',
-                    r'\b(?:men|women|boys|girls)\s+(?:are|can\'t|cannot|should|shouldn\'t)',
-                    r'\b(?:male|female)\s+(?:dominated|oriented|typical)'
-                ],
-                "description": "Gender-based stereotyping or assumptions",
-                "severity": QualitySeverity.HIGH
-            },
-            "racial_bias": {
-                "patterns": [
-                    r'\b(?:race|ethnicity|nationality)\s+(?:determines|affects|influences)',
-                    r'\b(?:typical|characteristic)\s+(?:of|for)\s+(?:asian|black|white|hispanic|latino)',
-                    r'\b(?:all|most)\s+(?:asians|blacks|whites|hispanics|latinos)\s+(?:are|do|have)'
-                ],
-                "description": "Racial or ethnic stereotyping",
-                "severity": QualitySeverity.CRITICAL
-            },
-            "age_bias": {
-                "patterns": [
-                    r'\b(?:old|young)\s+people\s+(?:are|can\'t|cannot|should)',
-                    r'\b(?:millennials|boomers|gen\s*z)\s+(?:are|always|never)',
-                    r'\b(?:too\s+old|too\s+young)\s+(?:for|to)'
-                ],
-                "description": "Age-based discrimination or stereotyping",
-                "severity": QualitySeverity.MEDIUM
-            },
-            "cultural_bias": {
-                "patterns": [
-                    r'\b(?:western|eastern)\s+(?:values|culture)\s+(?:is|are)\s+(?:better|superior)',
-                    r'\b(?:primitive|backward|advanced)\s+(?:culture|society)',
-                    r'\b(?:all|most)\s+(?:cultures|countries)\s+(?:should|must)'
-                ],
-                "description": "Cultural superiority or ethnocentrism",
-                "severity": QualitySeverity.HIGH
-            },
-            "socioeconomic_bias": {
-                "patterns": [
-                    r'\b(?:poor|rich)\s+people\s+(?:are|always|never)',
-                    r'\b(?:low|high)\s+(?:class|income)\s+(?:families|individuals)\s+(?:tend\s+to|usually)',
-                    r'\b(?:welfare|benefits)\s+(?:recipients|users)\s+(?:are|should)'
-                ],
-                "description": "Socioeconomic stereotyping",
-                "severity": QualitySeverity.MEDIUM
-            }
-        }
+        self.bias_patterns = BIAS_PATTERNS
+        self._compiled_patterns = _COMPILED_BIAS_PATTERNS
     
-    def detect_bias(self, content: str) -> List[QualityIssue]:
+    def detect_bias(self, content: Union[str, AnalysisDocument]) -> List[QualityIssue]:
         """Detect bias in content."""
-        issues = []
-        
-        for bias_type, bias_info in self.bias_patterns.items():
-            for pattern in bias_info["patterns"]:
-                matches = re.finditer(pattern, content, re.IGNORECASE)
-                
-                for match in matches:
-                    issue = QualityIssue(
-                        issue_type=QualityIssueType.BIAS_DETECTED,
-                        severity=bias_info["severity"],
-                        title=f"{bias_type.replace('_', ' ').title()} Detected",
-                        description=bias_info["description"],
-                        location={
-                            "start": match.start(),
-                            "end": match.end(),
-                            "line": self._get_line_number(content, match.start())
-                        },
-                        evidence=self._get_context(content, match.start(), match.end()),
-                        suggestion="Consider rephrasing to avoid stereotyping or biased assumptions",
-                        confidence=0.8
-                    )
-                    issues.append(issue)
-        
-        return issues
+        return _match_issues(
+            AnalysisDocument.of(content), self._compiled_patterns,
+            QualityIssueType.BIAS_DETECTED, "Detected",
+            "Consider rephrasing to avoid stereotyping or biased assumptions", 0.8
+        )
     
-    def calculate_bias_score(self, content: str, issues: List[QualityIssue]) -> float:
+    def calculate_bias_score(self, content: Union[str, AnalysisDocument], issues: List[QualityIssue]) -> float:
         """Calculate bias score (0-1, where 1 is no bias)."""
         bias_issues = [i for i in issues if i.issue_type == QualityIssueType.BIAS_DETECTED]
         
         if not bias_issues:
             return 1.0
         
-        # Weight by severity
-        severity_weights = {
-            QualitySeverity.CRITICAL: 1.0,
-            QualitySeverity.HIGH: 0.8,
-            QualitySeverity.MEDIUM: 0.5,
-            QualitySeverity.LOW: 0.2
-        }
-        
-        total_penalty = sum(severity_weights.get(issue.severity, 0.5) for issue in bias_issues)
-        content_length = len(content.split())
+        total_penalty = sum(SEVERITY_WEIGHTS.get(issue.severity, 0.5) for issue in bias_issues)
+        content_length = AnalysisDocument.of(content).word_count
         
         # Normalize by content length
         penalty_per_word = total_penalty / max(content_length, 1)
         
         # Convert to score (0-1)
         return max(0.0, 1.0 - min(penalty_per_word * 100, 1.0))
-    
-    def _get_line_number(self, content: str, position: int) -> int:
-        """Get line number for a given position."""
-        return content[:position].count('\n') + 1
-    
-    def _get_context(self, content: str, start: int, end: int, context_size: int = 30) -> str:
-        """Get context around a match."""
-        context_start = max(0, start - context_size)
-        context_end = min(len(content), end + context_size)
-        return content[context_start:context_end]
 
 
 class HallucinationDetector:
@@ -243,109 +366,33 @@ class HallucinationDetector:
     def __init__(self):
         """Initialize hallucination detector."""
         self.logger = logging.getLogger(__name__)
-        self._init_hallucination_patterns()
-    
-    def _init_hallucination_patterns(self):
-        """Initialize hallucination detection patterns."""
-        self.hallucination_patterns = {
-            "absolute_claims": {
-                "patterns": [
-                    r'\b(?:always|never|all|none|every|no\s+one)\s+(?:is|are|do|does|will|can)',
-                    r'\b(?:definitely|certainly|absolutely|guaranteed|proven)\s+(?:true|false|correct)',
-                    r'\b(?:impossible|certain|sure)\s+(?:that|to)'
-                ],
-                "description": "Absolute claims that may not be verifiable",
-                "severity": QualitySeverity.MEDIUM
-            },
-            "specific_statistics": {
-                "patterns": [
-                    r'\b\d+(?:\.\d+)?%\s+of\s+(?:people|users|customers)',
-                    r'\b(?:studies\s+show|research\s+proves)\s+that',
-                    r'\b(?:according\s+to|based\s+on)\s+(?:recent|latest)\s+(?:data|research)'
-                ],
-                "description": "Specific statistics or research claims without sources",
-                "severity": QualitySeverity.HIGH
-            },
-            "future_predictions": {
-                "patterns": [
-                    r'\b(?:will\s+definitely|will\s+certainly|guaranteed\s+to)\s+(?:happen|occur|be)',
-                    r'\b(?:in\s+the\s+future|by\s+\d{4}|within\s+\d+\s+years)',
-                    r'\b(?:predict|forecast|expect)\s+(?:that|to)'
-                ],
-                "description": "Definitive future predictions",
-                "severity": QualitySeverity.MEDIUM
-            },
-            "unverifiable_facts": {
-                "patterns": [
-                    r'\b(?:it\s+is\s+known|everyone\s+knows|obviously|clearly)\s+that',
-                    r'\b(?:fact|truth)\s+(?:is|that)',
-                    r'\b(?:scientists|experts|researchers)\s+(?:agree|confirm|prove)'
-                ],
-                "description": "Claims presented as facts without verification",
-                "severity": QualitySeverity.MEDIUM
-            }
-        }
+        self.hallucination_patterns = HALLUCINATION_PATTERNS
+        self._compiled_patterns = _COMPILED_HALLUCINATION_PATTERNS
     
-    def detect_hallucination_risk(self, content: str) -> List[QualityIssue]:
+    def detect_hallucination_risk(self, content: Union[str, AnalysisDocument]) -> List[QualityIssue]:
         """Detect hallucination risks in content."""
-        issues = []
-        
-        for risk_type, risk_info in self.hallucination_patterns.items():
-            for pattern in risk_info["patterns"]:
-                matches = re.finditer(pattern, content, re.IGNORECASE)
-                
-                for match in matches:
-                    issue = QualityIssue(
-                        issue_type=QualityIssueType.HALLUCINATION_RISK,
-                        severity=risk_info["severity"],
-                        title=f"{risk_type.replace('_', ' ').title()} Risk",
-                        description=risk_info["description"],
-                        location={
-                            "start": match.start(),
-                            "end": match.end(),
-                            "line": self._get_line_number(content, match.start())
-                        },
-                        evidence=self._get_context(content, match.start(), match.end()),
-                        suggestion="Consider adding qualifiers or sources to support claims",
-                        confidence=0.7
-                    )
-                    issues.append(issue)
-        
-        return issues
+        return _match_issues(
+            AnalysisDocument.of(content), self._compiled_patterns,
+            QualityIssueType.HALLUCINATION_RISK, "Risk",
+            "Consider adding qualifiers or sources to support claims", 0.7
+        )
     
-    def calculate_hallucination_risk(self, content: str, issues: List[QualityIssue]) -> float:
+    def calculate_hallucination_risk(self, content: Union[str, AnalysisDocument],
+                                     issues: List[QualityIssue]) -> float:
         """Calculate hallucination risk score (0-1, where 0 is no risk)."""
         hallucination_issues = [i for i in issues if i.issue_type == QualityIssueType.HALLUCINATION_RISK]
         
         if not hallucination_issues:
             return 0.0
         
-        # Weight by severity
-        severity_weights = {
-            QualitySeverity.CRITICAL: 1.0,
-            QualitySeverity.HIGH: 0.8,
-            QualitySeverity.MEDIUM: 0.5,
-            QualitySeverity.LOW: 0.2
-        }
-        
-        total_risk = sum(severity_weights.get(issue.severity, 0.5) for issue in hallucination_issues)
-        content_length = len(content.split())
+        total_risk = sum(SEVERITY_WEIGHTS.get(issue.severity, 0.5) for issue in hallucination_issues)
+        content_length = AnalysisDocument.of(content).word_count
         
         # Normalize by content length
         risk_per_word = total_risk / max(content_length, 1)
         
         # Convert to risk score (0-1)
         return min(risk_per_word * 50, 1.0)
-    
-    def _get_line_number(self, content: str, position: int) -> int:
-        """Get line number for a given position."""
-        return content[:position].count('\n') + 1
-    
-    def _get_context(self, content: str, start: int, end: int, context_size: int = 30) -> str:
-        """Get context around a match."""
-        context_start = max(0, start - context_size)
-        context_end = min(len(content), end + context_size)
-        return content[context_start:context_end]
 
 
 class CoherenceAnalyzer:
@@ -355,12 +402,13 @@ class CoherenceAnalyzer:
         """Initialize coherence analyzer."""
         self.logger = logging.getLogger(__name__)
     
-    def analyze_coherence(self, content: str) -> Tuple[List[QualityIssue], float]:
+    def analyze_coherence(self, content: Union[str, AnalysisDocument]) -> Tuple[List[QualityIssue], float]:
         """Analyze content coherence and return issues and score."""
         issues = []
+        document = AnalysisDocument.of(content)
         
         # Check for basic coherence issues
-        sentences = self._split_sentences(content)
+        sentences = document.sentences
         
         # Check sentence length variation
         sentence_lengths = [len(sentence.split()) for sentence in sentences]
@@ -383,11 +431,9 @@ class CoherenceAnalyzer:
                     issues.append(issue)
         
         # Check for repetitive patterns
-        words = content.lower().split()
-        word_freq = {}
-        for word in words:
-            if len(word) > 3:  # Only check meaningful words
-                word_freq[word] = word_freq.get(word, 0) + 1
+        words = document.lowered_words
+        # Only check meaningful words
+        word_freq = Counter(word for word in words if len(word) > 3)
         
         # Flag excessive repetition
         total_words = len(words)
@@ -406,17 +452,11 @@ class CoherenceAnalyzer:
                 issues.append(issue)
         
         # Calculate coherence score
-        coherence_score = self._calculate_coherence_score(content, issues)
+        coherence_score = self._calculate_coherence_score(document, issues)
         
         return issues, coherence_score
     
-    def _split_sentences(self, content: str) -> List[str]:
-        """Split content into sentences."""
-        # Simple sentence splitting
-        sentences = re.split(r'[.!?]+', content)
-        return [s.strip() for s in sentences if s.strip()]
-    
-    def _calculate_coherence_score(self, content: str, issues: List[QualityIssue]) -> float:
+    def _calculate_coherence_score(self, document: AnalysisDocument, issues: List[QualityIssue]) -> float:
         """Calculate coherence score (0-1, where 1 is most coherent)."""
         coherence_issues = [i for i in issues if i.issue_type == QualityIssueType.COHERENCE_ISSUE]
         language_issues = [i for i in issues if i.issue_type == QualityIssueType.LANGUAGE_QUALITY]
@@ -427,7 +467,7 @@ class CoherenceAnalyzer:
             return 1.0
         
         # Penalty based on number of issues
-        content_length = len(content.split())
+        content_length = document.word_count
         issue_density = total_issues / max(content_length / 100, 1)  # Issues per 100 words
         
         return max(0.0, 1.0 - min(issue_density * 0.2, 1.0))
@@ -454,26 +494,29 @@ class QualityAssuranceFramework:
         )
         
         try:
+            # Tokens, sentences and line offsets are computed once for all detectors
+            document = AnalysisDocument(prompt_content)
+            
             # Detect bias
-            bias_issues = self.bias_detector.detect_bias(prompt_content)
+            bias_issues = self.bias_detector.detect_bias(document)
             result.issues.extend(bias_issues)
             
             # Detect hallucination risks
-            hallucination_issues = self.hallucination_detector.detect_hallucination_risk(prompt_content)
+            hallucination_issues = self.hallucination_detector.detect_hallucination_risk(document)
             result.issues.extend(hallucination_issues)
             
             # Analyze coherence
-            coherence_issues, coherence_score = self.coherence_analyzer.analyze_coherence(prompt_content)
+            coherence_issues, coherence_score = self.coherence_analyzer.analyze_coherence(document)
             result.issues.extend(coherence_issues)
             
             # Calculate metrics
             result.metrics = QualityMetrics(
-                bias_score=self.bias_detector.calculate_bias_score(prompt_content, result.issues),
-                hallucination_risk=self.hallucination_detector.calculate_hallucination_risk(prompt_content, result.issues),
+                bias_score=self.bias_detector.calculate_bias_score(document, result.issues),
+                hallucination_risk=self.hallucination_detector.calculate_hallucination_risk(document, result.issues),
                 coherence_score=coherence_score,
-                factual_score=self._calculate_factual_score(prompt_content, result.issues),
-                language_score=self._calculate_language_score(prompt_content, result.issues),
-                ethical_score=self._calculate_ethical_score(prompt_content, result.issues)
+                factual_score=self._calculate_factual_score(document, result.issues),
+                language_score=self._calculate_language_score(document, result.issues),
+                ethical_score=self._calculate_ethical_score(document, result.issues)
             )
             
             # Calculate overall score
@@ -499,7 +542,31 @@ class QualityAssuranceFramework:
         
         return result
     
-    def _calculate_factual_score(self, content: str, issues: List[QualityIssue]) -> float:
+    def assess_many(self, items: List[Tuple[str, str, str]],
+                    max_workers: Optional[int] = None,
+                    min_pool_size: int = 16) -> List[QualityAssessmentResult]:
+        """Assess many ``(content, prompt_id, prompt_version)`` items.
+        
+        Batches of at least ``min_pool_size`` items fan out across a process
+        pool; smaller batches (or ``max_workers=1``) run in-process. Results
+        keep input order.
+        """
+        items = list(items)
+        if max_workers == 1 or len(items) < min_pool_size:
+            return [self.assess_quality(content, prompt_id, prompt_version)
+                    for content, prompt_id, prompt_version in items]
+        
+        workers = max_workers or os.cpu_count() or 1
+        chunksize = max(1, len(items) // (workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(_assess_batch_item, items, chunksize=chunksize))
+        except Exception as e:
+            self.logger.warning(f"Process pool quality assessment failed, running in-process: {e}")
+            return [self.assess_quality(content, prompt_id, prompt_version)
+                    for content, prompt_id, prompt_version in items]
+    
+    def _calculate_factual_score(self, content: Union[str, AnalysisDocument], issues: List[QualityIssue]) -> float:
         """Calculate factual accuracy score."""
         # This is a simplified implementation
         # In practice, this would use more sophisticated fact-checking
@@ -508,24 +575,24 @@ class QualityAssuranceFramework:
         if hallucination_risk == 0:
             return 1.0
         
-        content_length = len(content.split())
+        content_length = AnalysisDocument.of(content).word_count
         risk_density = hallucination_risk / max(content_length / 100, 1)
         
         return max(0.0, 1.0 - min(risk_density * 0.3, 1.0))
     
-    def _calculate_language_score(self, content: str, issues: List[QualityIssue]) -> float:
+    def _calculate_language_score(self, content: Union[str, AnalysisDocument], issues: List[QualityIssue]) -> float:
         """Calculate language quality score."""
         language_issues = [i for i in issues if i.issue_type == QualityIssueType.LANGUAGE_QUALITY]
         
         if not language_issues:
             return 1.0
         
-        content_length = len(content.split())
+        content_length = AnalysisDocument.of(content).word_count
         issue_density = len(language_issues) / max(content_length / 100, 1)
         
         return max(0.0, 1.0 - min(issue_density * 0.2, 1.0))
     
-    def _calculate_ethical_score(self, content: str, issues: List[QualityIssue]) -> float:
+    def _calculate_ethical_score(self, content: Union[str, AnalysisDocument], issues: List[QualityIssue]) -> float:
         """Calculate ethical score."""
         ethical_issues = [i for i in issues if i.issue_type in [
             QualityIssueType.BIAS_DETECTED,
@@ -536,15 +603,7 @@ class QualityAssuranceFramework:
         if not ethical_issues:
             return 1.0
         
-        # Weight by severity
-        severity_weights = {
-            QualitySeverity.CRITICAL: 1.0,
-            QualitySeverity.HIGH: 0.8,
-            QualitySeverity.MEDIUM: 0.5,
-            QualitySeverity.LOW: 0.2
-        }
-        
-        total_penalty = sum(severity_weights.get(issue.severity, 0.5) for issue in ethical_issues)
+        total_penalty = sum(SEVERITY_WEIGHTS.get(issue.severity, 0.5) for issue in ethical_issues)
         
         return max(0.0, 1.0 - min(total_penalty * 0.3, 1.0))
     
@@ -664,4 +723,16 @@ class QualityAssuranceFramework:
                 "Address critical quality issues immediately before deployment"
             )
         
-        return recommendations
\ No newline at end of file
+        return recommendations
+
+
+_batch_framework: Optional[QualityAssuranceFramework] = None
+
+
+def _assess_batch_item(item: Tuple[str, str, str]) -> QualityAssessmentResult:
+    """Process pool worker: one framework per worker process."""
+    global _batch_framework
+    if _batch_framework is None:
+        _batch_framework = QualityAssuranceFramework()
+    content, prompt_id, prompt_version = item
+    return _batch_framework.assess_quality(content, prompt_id, prompt_version)
@@ -6,10 +6,8 @@ Handles MCP server discovery, configuration, lifecycle management, and monitorin
 """
 
 import logging
-import subprocess
 import json
-import time
-import os
+import threading
 from typing import List, Dict, Optional, Any
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -18,17 +16,32 @@ from models.server import MCPServer, MCPTool
 from models.base import ServerStatus
 from core.config import ConfigurationManager
 from data.database import DatabaseManager
+from services.mcp_client import (
+    MCPClientError, MCPClientLoop, MCPConnectionError, MCPSession, get_default_client_loop
+)
 
 
 class ServerManager:
     """Manages MCP server operations and configurations."""
     
-    def __init__(self, config_manager: ConfigurationManager, db_manager: DatabaseManager):
+    def __init__(self, config_manager: ConfigurationManager, db_manager: DatabaseManager,
+                 client_loop: Optional[MCPClientLoop] = None, startup_timeout: float = 10.0,
+                 request_timeout: float = 30.0, log_lines: int = 1000):
         self.config_manager = config_manager
         self.db_manager = db_manager
         self.logger = logging.getLogger(__name__)
         self._servers: Dict[str, MCPServer] = {}
-        self._running_processes: Dict[str, subprocess.Popen] = {}
+        self._client_loop = client_loop
+        self.startup_timeout = startup_timeout
+        self.request_timeout = request_timeout
+        self.log_lines = log_lines
+        # Open sessions, plus the last session per server so its logs
+        # remain available after it stops
+        self._sessions: Dict[str, MCPSession] = {}
+        self._last_sessions: Dict[str, MCPSession] = {}
+        self._sessions_lock = threading.Lock()
+        # Attached by MonitoringService when process telemetry is sampled
+        self.resource_sampler = None
         
         # Load existing servers
         self._load_servers()
@@ -98,11 +111,15 @@ class ServerManager:
                 return False
             
             # Stop server if running
-            if server_id in self._running_processes:
+            if server_id in self._sessions:
                 self.stop_server(server_id)
             
             server_name = self._servers[server_id].name
             del self._servers[server_id]
+            with self._sessions_lock:
+                self._last_sessions.pop(server_id, None)
+            if self.resource_sampler is not None:
+                self.resource_sampler.forget_server(server_id)
             self._save_servers()
             
             self.logger.info(f"Removed server: {server_name} ({server_id})")
@@ -112,8 +129,18 @@ class ServerManager:
             self.logger.error(f"Failed to remove server {server_id}: {e}")
             return False
     
+    @property
+    def client_loop(self) -> MCPClientLoop:
+        if self._client_loop is None:
+            self._client_loop = get_default_client_loop()
+        return self._client_loop
+    
     def start_server(self, server_id: str) -> bool:
-        """Start an MCP server."""
+        """Start an MCP server and open a session with it.
+        
+        The server counts as started once it has answered the ``initialize``
+        handshake, or failed once the handshake errors or times out.
+        """
         try:
             if server_id not in self._servers:
                 self.logger.error(f"Server not found: {server_id}")
@@ -122,45 +149,40 @@ class ServerManager:
             server = self._servers[server_id]
             
             # Check if already running
-            if server_id in self._running_processes:
-                if self._running_processes[server_id].poll() is None:
+            existing = self._sessions.get(server_id)
+            if existing is not None:
+                if existing.is_alive:
                     self.logger.warning(f"Server {server.name} is already running")
                     return True
                 else:
                     # Process died, clean up
-                    del self._running_processes[server_id]
-            
-            # Start the server process
-            cmd = [server.command] + server.args
-            env = {**os.environ, **server.env} if server.env else None
-            
-            process = subprocess.Popen(
-                cmd,
-                env=env,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            # Give it a moment to start
-            time.sleep(1)
-            
-            if process.poll() is None:
-                # Process is running
-                self._running_processes[server_id] = process
-                server.status = ServerStatus.RUNNING
-                server.last_seen = datetime.now()
-                self._save_servers()
-                
-                self.logger.info(f"Started server: {server.name}")
-                return True
-            else:
-                # Process failed to start
-                stdout, stderr = process.communicate()
-                self.logger.error(f"Failed to start server {server.name}: {stderr}")
+                    self._discard_session(server_id)
+            
+            session = MCPSession(server.command, server.args, server.env,
+                                 log_lines=self.log_lines, name=server.name)
+            with self._sessions_lock:
+                self._last_sessions[server_id] = session
+            
+            try:
+                self.client_loop.run(session.start(timeout=self.startup_timeout),
+                                     timeout=self.startup_timeout + 10)
+            except MCPClientError as e:
+                # Server failed to start or never completed the handshake
+                stderr = "\n".join(session.get_logs(20))
+                self.logger.error(f"Failed to start server {server.name}: {e}\n{stderr}")
                 server.status = ServerStatus.ERROR
                 self._save_servers()
                 return False
+            
+            with self._sessions_lock:
+                self._sessions[server_id] = session
+            server.status = ServerStatus.RUNNING
+            server.last_seen = datetime.now()
+            self._save_servers()
+            
+            self.logger.info(f"Started server: {server.name} "
+                             f"({session.server_info.get('name', 'unknown')}, protocol {session.protocol_version})")
+            return True
                 
         except Exception as e:
             self.logger.error(f"Failed to start server {server_id}: {e}")
@@ -177,21 +199,9 @@ class ServerManager:
             
             server = self._servers[server_id]
             
-            if server_id in self._running_processes:
-                process = self._running_processes[server_id]
-                
-                # Try graceful shutdown first
-                process.terminate()
-                
-                # Wait up to 5 seconds for graceful shutdown
-                try:
-                    process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
-                    # Force kill if graceful shutdown failed
-                    process.kill()
-                    process.wait()
-                
-                del self._running_processes[server_id]
+            if server_id in self._sessions:
+                # Closes stdin, then terminates and finally kills the process
+                self._discard_session(server_id)
                 
             server.status = ServerStatus.STOPPED
             self._save_servers()
@@ -203,10 +213,59 @@ class ServerManager:
             self.logger.error(f"Failed to stop server {server_id}: {e}")
             return False
     
+    def _discard_session(self, server_id: str):
+        with self._sessions_lock:
+            session = self._sessions.pop(server_id, None)
+        if session is not None:
+            self.client_loop.run(session.close(timeout=5), timeout=20)
+    
+    def get_running_sessions(self) -> Dict[str, MCPSession]:
+        """Open sessions of running servers, keyed by server id."""
+        with self._sessions_lock:
+            sessions = list(self._sessions.items())
+        return {server_id: session for server_id, session in sessions if session.is_alive}
+    
+    def get_session(self, server_id: str) -> Optional[MCPSession]:
+        """The open session for a running server, if any."""
+        session = self._sessions.get(server_id)
+        return session if session is not None and session.is_alive else None
+    
+    def request(self, server_id: str, method: str, params: Optional[Dict[str, Any]] = None,
+                timeout: Optional[float] = None) -> Any:
+        """Send a JSON-RPC request over a running server's session."""
+        session = self.get_session(server_id)
+        if session is None:
+            raise MCPConnectionError(f"Server {server_id} is not running")
+        timeout = timeout or self.request_timeout
+        result = self.client_loop.run(session.request(method, params, timeout=timeout),
+                                      timeout=timeout + 5)
+        self._mark_seen(server_id)
+        return result
+    
+    def list_server_tools(self, server_id: str, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Tool definitions reported by ``tools/list`` on a running server."""
+        session = self.get_session(server_id)
+        if session is None:
+            raise MCPConnectionError(f"Server {server_id} is not running")
+        timeout = timeout or self.request_timeout
+        tools = self.client_loop.run(session.list_tools(timeout=timeout), timeout=timeout * 4)
+        self._mark_seen(server_id)
+        return tools
+    
+    def _mark_seen(self, server_id: str):
+        server = self._servers.get(server_id)
+        if server is not None:
+            server.last_seen = datetime.now()
+    
+    def shutdown(self):
+        """Stop every running server."""
+        for server_id in list(self._sessions):
+            self.stop_server(server_id)
+    
     def restart_server(self, server_id: str) -> bool:
         """Restart an MCP server."""
+        # stop_server waits for the process to exit
         if self.stop_server(server_id):
-            time.sleep(1)  # Brief pause between stop and start
             return self.start_server(server_id)
         return False
     
@@ -218,14 +277,15 @@ class ServerManager:
         server = self._servers[server_id]
         
         # Check if process is still running
-        if server_id in self._running_processes:
-            process = self._running_processes[server_id]
-            if process.poll() is None:
+        session = self._sessions.get(server_id)
+        if session is not None:
+            if session.is_alive:
                 server.status = ServerStatus.RUNNING
                 server.last_seen = datetime.now()
             else:
                 # Process died
-                del self._running_processes[server_id]
+                with self._sessions_lock:
+                    self._sessions.pop(server_id, None)
                 server.status = ServerStatus.STOPPED
         
         return server.status
@@ -288,9 +348,12 @@ class ServerManager:
         return result
     
     def get_server_logs(self, server_id: str, lines: int = 100) -> List[str]:
-        """Get recent logs from a server."""
-        # In a full implementation, this would read from server log files
-        # For now, return placeholder logs
+        """Get recent stderr output from a server's current or last session."""
+        session = self._last_sessions.get(server_id)
+        if session is not None:
+            return session.get_logs(lines)
+        
+        # Never started in this process
         if server_id in self._servers:
             server = self._servers[server_id]
             return [
@@ -300,17 +363,36 @@ class ServerManager:
         return []
     
     def get_server_metrics(self, server_id: str) -> Dict[str, Any]:
-        """Get performance metrics for a server."""
-        # Placeholder implementation
-        # In a full implementation, this would collect real metrics
-        return {
+        """Get performance metrics for a server.
+        
+        Request figures cover the current session; CPU and memory come from
+        the resource sampler, when one is attached.
+        """
+        metrics = {
             "cpu_usage": 0.0,
             "memory_usage": 0.0,
+            "open_fds": 0,
             "response_time": 0.0,
             "request_count": 0,
             "error_count": 0,
             "uptime": 0
         }
+        session = self.get_session(server_id)
+        if session is None:
+            return metrics
+        
+        metrics["request_count"] = session.request_count
+        metrics["error_count"] = session.error_count
+        if session.request_count:
+            metrics["response_time"] = session.latency_total / session.request_count * 1000
+        if session.started_at:
+            metrics["uptime"] = int((datetime.now() - session.started_at).total_seconds())
+        if self.resource_sampler is not None:
+            latest = self.resource_sampler.latest(server_id)
+            metrics["cpu_usage"] = latest.get("cpu_percent", 0.0)
+            metrics["memory_usage"] = latest.get("memory_rss", 0.0)
+            metrics["open_fds"] = int(latest.get("open_fds", 0))
+        return metrics
     
     def get_servers(self) -> List[MCPServer]:
         """Get all configured servers (alias for get_all_servers)."""
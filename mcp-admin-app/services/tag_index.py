@@ -0,0 +1,206 @@
+"""
+Tag Similarity Index
+====================
+
+In-memory inverted index from tags to tools for related-tool lookups.
+
+Two tools are related when ``shared tags / max(tag counts) > threshold``
+(0.3 by default). Every tool owns a bit slot, and each tag's postings are
+one integer bitset over those slots, as are the tools of each tag-set
+size. A lookup adds the postings of the queried tool's tags into
+bit-sliced counters, giving every tool's shared-tag count at once as a
+handful of big-integer operations. It then visits ``(size, shared count)``
+groups from the highest similarity down, and only decodes tool slots for
+the rows it returns.
+
+Slots are kept in tool-name order (new tools go to an unordered tail until
+the next re-layout), so ties are broken by name without sorting the
+candidates. Results are exactly those of a full scan, ordered by
+similarity and then by name.
+
+The index is updated incrementally as tool tags change.
+"""
+
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class TagSimilarityIndex:
+    """Tag and tag-set-size bitsets over tool slots."""
+
+    # Unordered or freed slots tolerated before slots are laid out again
+    MIN_RELAYOUT_SLOTS = 1024
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._tags: Dict[str, frozenset] = {}
+        self._names: Dict[str, str] = {}
+        self._slot_of: Dict[str, int] = {}
+        self._slots: List[Optional[str]] = []
+        # Slots below this are laid out in name order
+        self._ordered = 0
+        self._tag_bits: Dict[str, int] = {}
+        self._size_bits: Dict[int, int] = {}
+        self._name_bits: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._tags)
+
+    def __contains__(self, tool_id: str) -> bool:
+        return tool_id in self._tags
+
+    def rebuild(self, tools: Iterable[Tuple[str, str, Iterable[str]]]):
+        """Replace the index contents with ``(tool_id, name, tags)`` triples."""
+        with self._lock:
+            self._layout([(tool_id, name, frozenset(tags)) for tool_id, name, tags in tools])
+
+    def update_tool(self, tool_id: str, name: str, tags: Iterable[str]):
+        """Add a tool or replace its name and tags."""
+        tags = frozenset(tags)
+        with self._lock:
+            if self._tags.get(tool_id) == tags and self._names.get(tool_id) == name:
+                return
+            self._remove(tool_id)
+            self._add(tool_id, name, tags)
+
+    def remove_tool(self, tool_id: str):
+        with self._lock:
+            self._remove(tool_id)
+
+    def _layout(self, tools: List[Tuple[str, str, frozenset]]):
+        self._tags.clear()
+        self._names.clear()
+        self._slot_of.clear()
+        self._slots = []
+        self._tag_bits.clear()
+        self._size_bits.clear()
+        self._name_bits.clear()
+        for tool_id, name, tags in sorted(tools, key=lambda tool: tool[1]):
+            self._add(tool_id, name, tags)
+        self._ordered = len(self._slots)
+
+    def _add(self, tool_id: str, name: str, tags: frozenset):
+        slot = len(self._slots)
+        bit = 1 << slot
+        self._slots.append(tool_id)
+        self._slot_of[tool_id] = slot
+        self._tags[tool_id] = tags
+        self._names[tool_id] = name
+        self._name_bits[name] = self._name_bits.get(name, 0) | bit
+        self._size_bits[len(tags)] = self._size_bits.get(len(tags), 0) | bit
+        for tag in tags:
+            self._tag_bits[tag] = self._tag_bits.get(tag, 0) | bit
+
+    def _remove(self, tool_id: str):
+        tags = self._tags.pop(tool_id, None)
+        if tags is None:
+            return
+        name = self._names.pop(tool_id)
+        slot = self._slot_of.pop(tool_id)
+        self._slots[slot] = None
+        bit = 1 << slot
+        self._clear_bit(self._name_bits, name, bit)
+        self._clear_bit(self._size_bits, len(tags), bit)
+        for tag in tags:
+            self._clear_bit(self._tag_bits, tag, bit)
+
+    @staticmethod
+    def _clear_bit(table: Dict, key, bit: int):
+        remaining = table[key] & ~bit
+        if remaining:
+            table[key] = remaining
+        else:
+            del table[key]
+
+    def _maybe_relayout(self):
+        freed = len(self._slots) - len(self._tags)
+        unordered = len(self._slots) - self._ordered
+        if max(freed, unordered) > max(self.MIN_RELAYOUT_SLOTS, len(self._tags) // 4):
+            self._layout([(tool_id, self._names[tool_id], tags) for tool_id, tags in self._tags.items()])
+
+    def related(self, tool_id: str, limit: int = 5, threshold: float = 0.3) -> List[Dict[str, object]]:
+        """Tools whose tag similarity to ``tool_id`` exceeds ``threshold``.
+
+        Tools sharing the queried tool's name are excluded.
+        """
+        with self._lock:
+            tags = self._tags.get(tool_id)
+            if not tags or limit <= 0:
+                return []
+            self._maybe_relayout()
+            return self._related(self._names[tool_id], tags, limit, threshold)
+
+    def _related(self, name: str, tags: frozenset, limit: int, threshold: float) -> List[Dict[str, object]]:
+        # Bit-sliced shared-tag counters: plane i holds bit i of each count
+        planes: List[int] = []
+        candidates = 0
+        for tag in tags:
+            carry = self._tag_bits.get(tag, 0)
+            candidates |= carry
+            for i, plane in enumerate(planes):
+                if not carry:
+                    break
+                planes[i], carry = plane ^ carry, plane & carry
+            if carry:
+                planes.append(carry)
+        candidates &= ~self._name_bits.get(name, 0)
+        if not candidates:
+            return []
+
+        # (tag-set size, shared count) pairs grouped by the similarity they give
+        size = len(tags)
+        groups: Dict[float, List[Tuple[int, int]]] = {}
+        for other_size in self._size_bits:
+            longest = max(size, other_size, 1)
+            for shared in range(1, min(size, other_size) + 1):
+                similarity = shared / longest
+                if similarity > threshold:
+                    groups.setdefault(similarity, []).append((other_size, shared))
+
+        with_count: Dict[int, int] = {}
+        results: List[Tuple[float, str]] = []
+        for similarity in sorted(groups, reverse=True):
+            bits = 0
+            for other_size, shared in groups[similarity]:
+                if shared not in with_count:
+                    with_count[shared] = self._count_equals(planes, candidates, shared)
+                bits |= with_count[shared] & self._size_bits[other_size]
+            if bits:
+                results.extend((similarity, tool) for tool in self._first_by_name(bits, limit - len(results)))
+                if len(results) >= limit:
+                    break
+
+        return [
+            {"id": tool, "name": self._names[tool], "similarity": similarity,
+             "shared_tags": sorted(tags & self._tags[tool])}
+            for similarity, tool in results
+        ]
+
+    @staticmethod
+    def _count_equals(planes: List[int], candidates: int, count: int) -> int:
+        """Candidates whose shared-tag count is exactly ``count``."""
+        if count >> len(planes):
+            return 0
+        bits = candidates
+        for i, plane in enumerate(planes):
+            bits &= plane if (count >> i) & 1 else ~plane
+        return bits
+
+    def _first_by_name(self, bits: int, count: int) -> List[str]:
+        """The ``count`` tools with the smallest names among ``bits``."""
+        chosen: List[str] = []
+        ordered = bits & ((1 << self._ordered) - 1)
+        while ordered and len(chosen) < count:
+            lowest = ordered & -ordered
+            chosen.append(self._slots[lowest.bit_length() - 1])
+            ordered ^= lowest
+
+        # Tools added since the last layout may sort anywhere
+        tail = bits >> self._ordered << self._ordered
+        while tail:
+            lowest = tail & -tail
+            chosen.append(self._slots[lowest.bit_length() - 1])
+            tail ^= lowest
+
+        chosen.sort(key=lambda tool: self._names[tool])
+        return chosen[:count]
@@ -0,0 +1,265 @@
+"""
+Tool Classifier
+===============
+
+Compiled form of the discovery engine's category and security patterns.
+
+The patterns are alternations of plain keywords (``file|read|write``).
+Every distinct keyword across all categories and security levels is
+interned once. Keywords are made of word characters only, so they never
+span a word boundary: a tool text is split into words once, and each
+distinct word's keyword occurrences are computed once and cached. Summing
+them gives every keyword's count in the text, from which all category
+scores and security level verdicts follow. The result equals the original
+per-pattern ``re.findall`` / ``re.search`` evaluation.
+
+Summed counts equal the regex count unless two keywords of one pattern
+can overlap in the text ("filesystem" holds "file" and "system"; "apiece"
+ends where "piece" begins). Such pairs are found at compile time, and a
+pattern is re-counted with its compiled regex only when both keywords of
+one of its pairs occur. Patterns that are not plain keyword alternations
+always use their compiled regex.
+
+Results are memoized by schema fingerprint, so re-classifying an unchanged
+registry costs one dictionary lookup per tool.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from models.tool import ToolCategory, SecurityLevel
+
+
+_KEYWORD = re.compile(r'[A-Za-z0-9_\-]+')
+
+# Distinct words whose keyword occurrences are remembered
+WORD_CACHE_SIZE = 50000
+
+
+def schema_fingerprint(schema: Dict[str, Any]) -> str:
+    """Stable hash of a tool schema, independent of key order."""
+    canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class Classification:
+    """Category, confidence and security level of one tool."""
+    category: ToolCategory
+    confidence: float
+    security_level: SecurityLevel
+
+
+UNCLASSIFIED = Classification(ToolCategory.GENERAL, 0.0, SecurityLevel.MEDIUM)
+
+
+@dataclass
+class _CompiledPattern:
+    regex: re.Pattern
+    keyword_ids: Optional[Tuple[int, ...]]  # None when not a plain keyword alternation
+    overlapping: Tuple[Tuple[int, int], ...] = ()
+
+
+def _can_overlap(first: str, second: str) -> bool:
+    """Whether occurrences of two distinct keywords can share characters."""
+    if first in second or second in first:
+        return True
+    shorter = min(len(first), len(second))
+    return any(first.endswith(second[:size]) or second.endswith(first[:size])
+               for size in range(1, shorter))
+
+
+def _classification_text(tool_schema: Dict[str, Any]) -> str:
+    function_info = tool_schema.get("function", {})
+    return f"{function_info.get('name', '')} {function_info.get('description', '')}".lower()
+
+
+class ToolClassifier:
+    """Scores all categories and security levels from one keyword table."""
+
+    def __init__(self, category_patterns: Dict[ToolCategory, List[str]],
+                 security_patterns: Dict[SecurityLevel, List[str]], cache_size: int = 4096):
+        self.keywords: List[str] = []
+        self.patterns: List[_CompiledPattern] = []
+        self._keyword_index: Dict[str, int] = {}
+        self._pattern_index: Dict[str, int] = {}
+        # Patterns each keyword belongs to, and patterns scanned by regex only
+        self._keyword_patterns: List[List[int]] = []
+        self._regex_patterns: List[int] = []
+
+        self._categories: List[Tuple[ToolCategory, List[int], float]] = [
+            (category, [self._intern_pattern(pattern) for pattern in patterns], 1.0 / len(patterns))
+            for category, patterns in category_patterns.items() if patterns
+        ]
+        self._security_levels: List[Tuple[SecurityLevel, List[int]]] = [
+            (level, [self._intern_pattern(pattern) for pattern in patterns])
+            for level, patterns in security_patterns.items()
+        ]
+        self._word_hits: Dict[str, Tuple[Tuple[int, int], ...]] = {}
+
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Classification]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _intern_pattern(self, pattern: str) -> int:
+        if pattern in self._pattern_index:
+            return self._pattern_index[pattern]
+        pattern_id = len(self.patterns)
+        self._pattern_index[pattern] = pattern_id
+
+        alternatives = pattern.split('|')
+        compiled = _CompiledPattern(re.compile(pattern), None)
+        if all(_KEYWORD.fullmatch(keyword) for keyword in alternatives):
+            # Repeated alternatives match once, so count them once
+            compiled.keyword_ids = tuple(dict.fromkeys(self._intern_keyword(k) for k in alternatives))
+            compiled.overlapping = tuple(
+                (self._keyword_index[first], self._keyword_index[second])
+                for i, first in enumerate(alternatives)
+                for second in alternatives[i + 1:]
+                if first != second and _can_overlap(first, second)
+            )
+            for keyword_id in compiled.keyword_ids:
+                self._keyword_patterns[keyword_id].append(pattern_id)
+        else:
+            self._regex_patterns.append(pattern_id)
+
+        self.patterns.append(compiled)
+        return pattern_id
+
+    def _intern_keyword(self, keyword: str) -> int:
+        if keyword not in self._keyword_index:
+            self._keyword_index[keyword] = len(self.keywords)
+            self.keywords.append(keyword)
+            self._keyword_patterns.append([])
+        return self._keyword_index[keyword]
+
+    def _keyword_counts(self, text: str) -> Dict[int, int]:
+        """Occurrences of each interned keyword in ``text`` (absent ones omitted)."""
+        counts: Dict[int, int] = {}
+        word_hits = self._word_hits
+        for word in _KEYWORD.findall(text):
+            hits = word_hits.get(word)
+            if hits is None:
+                hits = tuple(
+                    (keyword_id, word.count(keyword))
+                    for keyword_id, keyword in enumerate(self.keywords) if keyword in word
+                )
+                if len(word_hits) >= WORD_CACHE_SIZE:
+                    word_hits.clear()
+                word_hits[word] = hits
+            for keyword_id, count in hits:
+                counts[keyword_id] = counts.get(keyword_id, 0) + count
+        return counts
+
+    def _pattern_counts(self, text: str) -> Dict[int, int]:
+        """Match count of every pattern that matches ``text`` at least once."""
+        counts = self._keyword_counts(text)
+        pattern_counts: Dict[int, int] = {}
+        for keyword_id, count in counts.items():
+            for pattern_id in self._keyword_patterns[keyword_id]:
+                pattern_counts[pattern_id] = pattern_counts.get(pattern_id, 0) + count
+
+        for pattern_id in pattern_counts:
+            for first, second in self.patterns[pattern_id].overlapping:
+                if first in counts and second in counts:
+                    # Occurrences of these keywords may overlap; let the regex decide
+                    pattern_counts[pattern_id] = len(self.patterns[pattern_id].regex.findall(text))
+                    break
+
+        for pattern_id in self._regex_patterns:
+            matches = len(self.patterns[pattern_id].regex.findall(text))
+            if matches:
+                pattern_counts[pattern_id] = matches
+        return pattern_counts
+
+    def classify_text(self, text: str) -> Classification:
+        """Classify lowercased ``"<name> <description>"`` text."""
+        pattern_counts = self._pattern_counts(text)
+
+        best_category = None
+        best_score = 0.0
+        for category, pattern_ids, weight in self._categories:
+            score = 0.0
+            for pattern_id in pattern_ids:
+                score += pattern_counts.get(pattern_id, 0) * weight
+            # Ties keep the earliest category, as max() over the scores did
+            if score > best_score:
+                best_category, best_score = category, score
+
+        security_level = SecurityLevel.MEDIUM
+        for level, pattern_ids in self._security_levels:
+            if any(pattern_id in pattern_counts for pattern_id in pattern_ids):
+                security_level = level
+                break
+
+        if best_category is None:
+            return Classification(ToolCategory.GENERAL, 0.0, security_level)
+        return Classification(best_category, min(best_score, 1.0), security_level)
+
+    def classify(self, tool_schema: Dict[str, Any], fingerprint: Optional[str] = None) -> Classification:
+        """Classify a tool schema, memoized by its fingerprint.
+
+        Pass ``fingerprint`` when it is already known (e.g. the registry's
+        stored schema hash) to skip hashing the schema.
+        """
+        if fingerprint is None:
+            fingerprint = schema_fingerprint(tool_schema)
+
+        with self._lock:
+            cached = self._cache.get(fingerprint)
+            if cached is not None:
+                self._cache.move_to_end(fingerprint)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        result = self.classify_text(_classification_text(tool_schema))
+
+        with self._lock:
+            self._cache[fingerprint] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def classify_many(self, items: Iterable[Tuple[Dict[str, Any], Optional[str]]]) -> List[Classification]:
+        """Classify ``(schema, fingerprint)`` pairs, scanning each distinct schema once.
+        
+        Schemas that cannot be classified come back as ``UNCLASSIFIED``.
+        """
+        results = []
+        batch: Dict[str, Classification] = {}
+        for tool_schema, fingerprint in items:
+            try:
+                if fingerprint is None:
+                    fingerprint = schema_fingerprint(tool_schema)
+                result = batch.get(fingerprint)
+                if result is None:
+                    result = batch[fingerprint] = self.classify(tool_schema, fingerprint)
+            except Exception:
+                result = UNCLASSIFIED
+            results.append(result)
+        return results
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Memo hit/miss counters and table sizes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "cached": len(self._cache),
+                "keywords": len(self.keywords),
+                "cached_words": len(self._word_hits),
+            }
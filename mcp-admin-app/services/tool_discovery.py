@@ -5,7 +5,6 @@ Tool Discovery Engine
 Automatic detection, classification, and metadata extraction for MCP tools.
 """
 
-import re
 import json
 import logging
 from datetime import datetime
@@ -17,6 +16,7 @@ from models.tool import (
     ToolMetadata, ValidationRule, SecurityLevel, ToolStatus
 )
 from models.server import MCPServer
+from services.tool_classifier import Classification, ToolClassifier
 
 
 logger = logging.getLogger(__name__)
@@ -59,10 +59,18 @@ class DiscoveryStatus:
 class ToolDiscoveryEngine:
     """Engine for discovering and analyzing MCP tools."""
     
-    def __init__(self):
+    def __init__(self, server_manager=None):
+        # ServerManager whose open MCP sessions are queried; without one the
+        # engine falls back to sample tools for demonstration
+        self.server_manager = server_manager
         self.category_patterns = self._initialize_category_patterns()
         self.security_patterns = self._initialize_security_patterns()
         self.parameter_type_mapping = self._initialize_parameter_mapping()
+        self.refresh_classifier()
+    
+    def refresh_classifier(self):
+        """Recompile the classifier after editing the category or security patterns."""
+        self.classifier = ToolClassifier(self.category_patterns, self.security_patterns)
         
     def _initialize_category_patterns(self) -> Dict[ToolCategory, List[str]]:
         """Initialize category classification patterns."""
@@ -155,22 +163,55 @@ class ToolDiscoveryEngine:
             'object': 'dict'
         }
     
-    def scan_server_tools(self, server_id: str) -> List[DiscoveredTool]:
-        """Scan MCP server for available tools."""
+    def scan_server_tools(self, server_id: str, raise_errors: bool = False) -> List[DiscoveredTool]:
+        """Scan MCP server for available tools.
+        
+        Errors are logged and an empty list returned unless ``raise_errors``.
+        """
         logger.info(f"Scanning server {server_id} for tools")
         
         try:
-            # In a real implementation, this would connect to the MCP server
-            # and retrieve the actual tool list. For now, we'll simulate this.
-            discovered_tools = self._simulate_tool_discovery(server_id)
+            if self.server_manager is not None:
+                discovered_tools = [
+                    self._to_discovered_tool(server_id, tool)
+                    for tool in self.server_manager.list_server_tools(server_id)
+                ]
+            else:
+                discovered_tools = self._simulate_tool_discovery(server_id)
             
             logger.info(f"Discovered {len(discovered_tools)} tools from server {server_id}")
             return discovered_tools
             
         except Exception as e:
             logger.error(f"Error scanning server {server_id}: {e}")
+            if raise_errors:
+                raise
             return []
     
+    def _to_discovered_tool(self, server_id: str, tool: Dict[str, Any]) -> DiscoveredTool:
+        """Convert a ``tools/list`` entry into a classified discovered tool."""
+        name = tool.get("name", "")
+        description = tool.get("description", "")
+        schema = {
+            "type": "function",
+            "function": {
+                "name": name,
+                "description": description,
+                "parameters": tool.get("inputSchema", {"type": "object", "properties": {}})
+            }
+        }
+        analysis = self.analyze_tool_schema(schema)
+        
+        return DiscoveredTool(
+            name=name,
+            description=description,
+            schema=schema,
+            server_id=server_id,
+            classification_confidence=analysis.confidence,
+            suggested_category=analysis.category,
+            metadata_extracted=analysis.extracted_metadata
+        )
+    
     def _simulate_tool_discovery(self, server_id: str) -> List[DiscoveredTool]:
         """Simulate tool discovery for demonstration."""
         # Sample tools that might be discovered
@@ -281,11 +322,10 @@ class ToolDiscoveryEngine:
             description = function_info.get("description", "")
             parameters = function_info.get("parameters", {})
             
-            # Classify tool category
-            category, confidence = self._classify_tool_category(name, description)
-            
-            # Determine security level
-            security_level = self._determine_security_level(name, description)
+            # Classify tool category and security level
+            classification = self.classifier.classify(tool_schema)
+            category, confidence = classification.category, classification.confidence
+            security_level = classification.security_level
             
             # Extract parameter information
             suggested_parameters = self._extract_parameters(parameters)
@@ -318,34 +358,12 @@ class ToolDiscoveryEngine:
     
     def _classify_tool_category(self, name: str, description: str) -> Tuple[ToolCategory, float]:
         """Classify tool into category based on name and description."""
-        text = f"{name} {description}".lower()
-        
-        category_scores = {}
-        for category, patterns in self.category_patterns.items():
-            score = 0.0
-            for pattern in patterns:
-                matches = len(re.findall(pattern, text))
-                score += matches * (1.0 / len(patterns))
-            category_scores[category] = score
-        
-        if not category_scores or max(category_scores.values()) == 0:
-            return ToolCategory.GENERAL, 0.0
-        
-        best_category = max(category_scores, key=category_scores.get)
-        confidence = min(category_scores[best_category], 1.0)
-        
-        return best_category, confidence
+        classification = self.classifier.classify_text(f"{name} {description}".lower())
+        return classification.category, classification.confidence
     
     def _determine_security_level(self, name: str, description: str) -> SecurityLevel:
         """Determine security level based on tool functionality."""
-        text = f"{name} {description}".lower()
-        
-        for level, patterns in self.security_patterns.items():
-            for pattern in patterns:
-                if re.search(pattern, text):
-                    return level
-        
-        return SecurityLevel.MEDIUM
+        return self.classifier.classify_text(f"{name} {description}".lower()).security_level
     
     def _extract_parameters(self, parameters_schema: Dict[str, Any]) -> List[ToolParameter]:
         """Extract parameter information from schema."""
@@ -482,9 +500,14 @@ class ToolDiscoveryEngine:
             errors=[]
         )
     
-    def extract_tool_metadata(self, tool_schema: Dict[str, Any]) -> ToolMetadata:
-        """Extract comprehensive metadata from tool schema."""
-        analysis = self.analyze_tool_schema(tool_schema)
+    def extract_tool_metadata(self, tool_schema: Dict[str, Any],
+                              analysis: Optional[ToolAnalysis] = None) -> ToolMetadata:
+        """Extract comprehensive metadata from tool schema.
+        
+        Pass ``analysis`` when the schema has already been analyzed.
+        """
+        if analysis is None:
+            analysis = self.analyze_tool_schema(tool_schema)
         
         return ToolMetadata(
             version="1.0.0",
@@ -670,17 +693,15 @@ class ToolDiscoveryEngine:
     
     def auto_categorize_batch(self, tools: List[ToolRegistryEntry]) -> Dict[str, ToolCategory]:
         """Automatically categorize a batch of tools."""
-        categorizations = {}
-        
-        for tool in tools:
-            try:
-                analysis = self.analyze_tool_schema(tool.schema)
-                categorizations[tool.id] = analysis.category
-            except Exception as e:
-                logger.error(f"Error categorizing tool {tool.name}: {e}")
-                categorizations[tool.id] = ToolCategory.GENERAL
+        classifications = self.classify_batch([(tool.schema, None) for tool in tools])
+        return {tool.id: result.category for tool, result in zip(tools, classifications)}
+    
+    def classify_batch(self, items: List[Tuple[Dict[str, Any], Optional[str]]]) -> List[Classification]:
+        """Classify ``(schema, fingerprint)`` pairs without the full schema analysis.
         
-        return categorizations
+        Fingerprints may be ``None``; stored registry hashes avoid rehashing.
+        """
+        return self.classifier.classify_many(items)
     
     def generate_tool_recommendations(self, user_context: Dict[str, Any], 
                                     available_tools: List[ToolRegistryEntry]) -> List[Dict[str, Any]]:
@@ -739,74 +760,6 @@ class ToolDiscoveryEngine:
         recommendations.sort(key=lambda x: x["score"], reverse=True)
         return recommendations[:10]
     
-    def scan_server_tools(self, server_id: str) -> List[DiscoveredTool]:
-        """Scan a server for available tools."""
-        try:
-            # In a real implementation, this would connect to the MCP server
-            # and discover actual tools. For now, we'll return mock tools.
-            
-            logger.info(f"Scanning server {server_id} for tools")
-            
-            # Mock discovered tools for testing
-            mock_tools = [
-                DiscoveredTool(
-                    name="file_reader",
-                    description="Read files from the filesystem",
-                    schema={
-                        "type": "function",
-                        "function": {
-                            "name": "file_reader",
-                            "description": "Read files from the filesystem",
-                            "parameters": {
-                                "type": "object",
-                                "properties": {
-                                    "path": {
-                                        "type": "string",
-                                        "description": "Path to the file to read"
-                                    }
-                                },
-                                "required": ["path"]
-                            }
-                        }
-                    },
-                    server_id=server_id
-                ),
-                DiscoveredTool(
-                    name="web_search",
-                    description="Search the web for information",
-                    schema={
-                        "type": "function",
-                        "function": {
-                            "name": "web_search",
-                            "description": "Search the web for information",
-                            "parameters": {
-                                "type": "object",
-                                "properties": {
-                                    "query": {
-                                        "type": "string",
-                                        "description": "Search query"
-                                    },
-                                    "limit": {
-                                        "type": "integer",
-                                        "description": "Maximum number of results",
-                                        "default": 10
-                                    }
-                                },
-                                "required": ["query"]
-                            }
-                        }
-                    },
-                    server_id=server_id
-                )
-            ]
-            
-            logger.info(f"Discovered {len(mock_tools)} tools from server {server_id}")
-            return mock_tools
-            
-        except Exception as e:
-            logger.error(f"Error scanning server {server_id}: {e}")
-            return []
-    
     def discover_tools_from_server(self, server_id: str) -> List[DiscoveredTool]:
         """Discover tools from a specific server (alias for scan_server_tools)."""
         return self.scan_server_tools(server_id)
\ No newline at end of file
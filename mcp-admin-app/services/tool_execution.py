@@ -9,15 +9,9 @@ and result management.
 import logging
 import json
 import time
-import threading
 import subprocess
 import tempfile
 import os
-try:
-    import psutil
-    HAS_PSUTIL = True
-except ImportError:
-    HAS_PSUTIL = False
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass, field
@@ -28,6 +22,12 @@ from models.tool import (
     ToolParameter, ValidationRule
 )
 from models.base import generate_id
+from services.output_capture import (
+    DEFAULT_MEMORY_BYTES, DEFAULT_SPILL_BYTES, OutputCallback, StreamCapture, stream_process
+)
+from services.process_supervisor import (
+    KILL_GRACE_SECONDS, CgroupLimiter, ProcessSupervisor, SupervisedProcess, get_process_supervisor
+)
 
 
 logger = logging.getLogger(__name__)
@@ -203,12 +203,13 @@ class ParameterValidator:
 class ProcessSandbox:
     """Process-based sandbox for tool execution."""
     
-    def __init__(self, config: SandboxConfig):
+    def __init__(self, config: SandboxConfig, supervisor: Optional[ProcessSupervisor] = None):
         self.config = config
         self.process = None
         self.start_time = None
-        self.resource_monitor = None
-        self.monitoring_thread = None
+        self.supervisor = supervisor or get_process_supervisor()
+        self.supervised: Optional[SupervisedProcess] = None
+        self.cgroup: Optional[str] = None
         self.resource_usage = ResourceUsage()
         
     def create(self) -> bool:
@@ -232,16 +233,35 @@ class ProcessSandbox:
             logger.error(f"Failed to create sandbox {self.config.id}: {e}")
             return False
     
-    def execute(self, command: List[str], input_data: Optional[str] = None) -> ExecutionResult:
-        """Execute a command in the sandbox."""
+    def execute(self, command: List[str], input_data: Optional[str] = None,
+                on_output: Optional[OutputCallback] = None) -> ExecutionResult:
+        """Execute a command in the sandbox.
+        
+        Output is streamed rather than buffered whole. Each stream keeps up
+        to ``max_output_memory_bytes`` in memory; stdout beyond that spills
+        to a file in the sandbox directory (up to ``max_output_bytes``),
+        referenced from the result. ``on_output`` is called with
+        ``(stream, chunk, total_bytes)`` as chunks arrive.
+        """
         execution_id = generate_id()
         result = ExecutionResult(execution_id=execution_id, success=False)
+        limits = self.config.resource_limits
+        stdout_capture = StreamCapture(
+            "stdout", limits.get("max_output_memory_bytes", DEFAULT_MEMORY_BYTES),
+            limits.get("max_output_bytes", DEFAULT_SPILL_BYTES),
+            spill_path=os.path.join(self.config.working_directory, f"{execution_id}.stdout"),
+            on_chunk=on_output, parse_json_lines=True
+        )
+        stderr_capture = StreamCapture(
+            "stderr", limits.get("max_output_memory_bytes", DEFAULT_MEMORY_BYTES), on_chunk=on_output
+        )
         
         try:
             self.start_time = time.time()
+            max_execution_time = limits.get("max_execution_time", 30)
             
-            # Start resource monitoring
-            self._start_resource_monitoring()
+            # Kernel-enforced memory and CPU limits, where cgroups v2 allows
+            self.cgroup = self.supervisor.create_cgroup(self.config.id, self.config.resource_limits)
             
             # Execute the command
             popen_kwargs = {
@@ -249,8 +269,7 @@ class ProcessSandbox:
                 "env": self.env,
                 "stdin": subprocess.PIPE,
                 "stdout": subprocess.PIPE,
-                "stderr": subprocess.PIPE,
-                "text": True
+                "stderr": subprocess.PIPE
             }
             
             # Add preexec_fn only on Unix systems
@@ -259,11 +278,17 @@ class ProcessSandbox:
             
             self.process = subprocess.Popen(command, **popen_kwargs)
             
-            # Communicate with process
-            stdout, stderr = self.process.communicate(
-                input=input_data,
-                timeout=self.config.resource_limits.get("max_execution_time", 30)
+            # Start resource monitoring; the supervisor enforces the timeout
+            self._start_resource_monitoring(max_execution_time)
+            
+            # Stream output until the process closes it (the timeout here is only a backstop)
+            stream_process(
+                self.process, stdout_capture, stderr_capture,
+                input_data=input_data.encode() if input_data is not None else None,
+                timeout=max_execution_time + KILL_GRACE_SECONDS + 5
             )
+            self.process.wait(timeout=KILL_GRACE_SECONDS + 5)
+            stdout, stderr = stdout_capture.text(), stderr_capture.text()
             
             # Calculate execution time
             result.execution_time = time.time() - self.start_time
@@ -272,19 +297,25 @@ class ProcessSandbox:
             self._stop_resource_monitoring()
             
             # Process results
-            if self.process.returncode == 0:
+            if self.supervised.timed_out:
+                result.error_message = "Execution timeout"
+            elif self.supervised.limit_exceeded:
+                result.error_message = f"Resource limit exceeded: {self.supervised.limit_exceeded}"
+            elif self.process.returncode == 0:
                 result.success = True
-                try:
-                    # Try to parse JSON output
-                    result.result = json.loads(stdout) if stdout.strip() else {}
-                except json.JSONDecodeError:
-                    # If not JSON, return as text
-                    result.result = {"output": stdout, "type": "text"}
+                result.result = self._parse_output(stdout_capture)
             else:
                 result.error_message = stderr or f"Process exited with code {self.process.returncode}"
             
             result.resource_usage = self.resource_usage
             result.logs = [stdout, stderr] if stderr else [stdout]
+            result.metadata.update({
+                "stdout_bytes": stdout_capture.total_bytes,
+                "stderr_bytes": stderr_capture.total_bytes,
+                "output_truncated": stdout_capture.truncated or stderr_capture.truncated
+            })
+            if stdout_capture.spilled:
+                result.metadata["output_file"] = stdout_capture.spill_path
             
             logger.info(f"Executed command in sandbox {self.config.id}: success={result.success}")
             
@@ -299,6 +330,31 @@ class ProcessSandbox:
         
         return result
     
+    @staticmethod
+    def _parse_output(capture: StreamCapture) -> Dict[str, Any]:
+        """Result payload from captured stdout: JSON, JSON lines or text."""
+        json_lines = capture.json_lines
+        if capture.complete:
+            stdout = capture.text()
+            try:
+                # Try to parse JSON output
+                return json.loads(stdout) if stdout.strip() else {}
+            except json.JSONDecodeError:
+                if json_lines.is_json_lines:
+                    return {"records": json_lines.records, "type": "json_lines"}
+                # If not JSON, return as text
+                return {"output": stdout, "type": "text"}
+        
+        # Too large to hold: keep what fits and point at the spill file
+        if json_lines.is_json_lines:
+            payload = {"records": json_lines.records, "record_count": json_lines.record_count,
+                       "type": "json_lines"}
+        else:
+            payload = {"output": capture.text(), "type": "text"}
+        payload.update({"output_file": capture.spill_path if capture.spilled else None,
+                        "bytes": capture.total_bytes, "truncated": capture.truncated})
+        return payload
+    
     def _setup_process_limits(self):
         """Set up process resource limits (Unix only)."""
         try:
@@ -315,59 +371,26 @@ class ProcessSandbox:
         except (ImportError, AttributeError):
             # Windows doesn't support resource module
             pass
+        
+        if self.cgroup:
+            try:
+                CgroupLimiter.join(self.cgroup)
+            except OSError:
+                # The rlimits above still apply
+                pass
     
-    def _start_resource_monitoring(self):
-        """Start monitoring resource usage."""
-        self.monitoring_thread = threading.Thread(target=self._monitor_resources)
-        self.monitoring_thread.daemon = True
-        self.monitoring_thread.start()
-    
-    def _monitor_resources(self):
-        """Monitor process resource usage."""
-        try:
-            if not HAS_PSUTIL:
-                # Basic monitoring without psutil
-                while self.process and self.process.poll() is None:
-                    time.sleep(0.1)
-                return
-            
-            while self.process and self.process.poll() is None:
-                if self.process.pid:
-                    try:
-                        proc = psutil.Process(self.process.pid)
-                        
-                        # Get memory usage
-                        memory_info = proc.memory_info()
-                        self.resource_usage.memory_mb = memory_info.rss / 1024 / 1024
-                        
-                        # Get CPU usage
-                        cpu_percent = proc.cpu_percent()
-                        
-                        # Check limits
-                        max_memory = self.config.resource_limits.get("max_memory_mb", 512)
-                        max_cpu = self.config.resource_limits.get("max_cpu_percent", 50)
-                        
-                        if self.resource_usage.memory_mb > max_memory:
-                            logger.warning(f"Memory limit exceeded: {self.resource_usage.memory_mb}MB > {max_memory}MB")
-                            self._terminate_process()
-                            break
-                        
-                        if cpu_percent > max_cpu:
-                            logger.warning(f"CPU limit exceeded: {cpu_percent}% > {max_cpu}%")
-                    
-                    except psutil.NoSuchProcess:
-                        break
-                
-                time.sleep(0.1)  # Monitor every 100ms
-                
-        except Exception as e:
-            logger.error(f"Resource monitoring error: {e}")
+    def _start_resource_monitoring(self, timeout: Optional[float] = None):
+        """Hand the process to the shared supervisor."""
+        self.supervised = self.supervisor.register(
+            self.process, self.config.resource_limits, timeout=timeout, cgroup=self.cgroup
+        )
     
     def _stop_resource_monitoring(self):
-        """Stop resource monitoring."""
-        if self.monitoring_thread and self.monitoring_thread.is_alive():
-            # Thread will stop when process ends
-            pass
+        """Collect resource usage once the supervisor has seen the exit."""
+        if self.supervised is not None:
+            self.supervised.wait(timeout=1.0)
+            self.resource_usage = self.supervised.usage
+            self.resource_usage.execution_time = time.time() - self.start_time
     
     def _terminate_process(self):
         """Terminate the running process."""
@@ -387,6 +410,10 @@ class ProcessSandbox:
             if self.process and self.process.poll() is None:
                 self._terminate_process()
             
+            # The supervisor removes the cgroup on exit; this covers failed launches
+            if self.cgroup and self.supervised is None:
+                CgroupLimiter.remove(self.cgroup)
+            
             # Clean up temporary files (optional)
             # Could implement cleanup of working directory here
             
@@ -8,16 +8,22 @@ configuration, and lifecycle management.
 
 import logging
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
 
 from models.tool import (
     ToolRegistryEntry, ToolFilters, DiscoveredTool, ToolCategory, 
     ToolStatus, ToolParameter, ToolPermission, SecurityLevel
 )
 from models.base import generate_id
+from models.security import AuditEvent
 from models.server import MCPServer
+from services.tag_index import TagSimilarityIndex
+from services.tool_classifier import schema_fingerprint
 from services.tool_discovery import ToolDiscoveryEngine, ToolAnalysis
 from data.database import DatabaseManager
 
@@ -25,6 +31,26 @@ from data.database import DatabaseManager
 logger = logging.getLogger(__name__)
 
 
+REGISTRY_UPSERT = """
+    INSERT OR REPLACE INTO tool_registry (
+        id, name, description, server_id, category, schema, parameters,
+        permissions, status, metadata, created_at, updated_at, last_used,
+        usage_count, average_execution_time, success_rate, enabled,
+        aliases, default_parameters, security_level, schema_hash
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Ids per ``IN (...)`` clause, below SQLite's default bound-parameter limit
+BULK_CHUNK_SIZE = 500
+
+# Fields bulk_update_tools may set, with the converter validating each value
+BULK_UPDATE_FIELDS = {
+    "enabled": bool,
+    "category": lambda value: ToolCategory(value).value,
+    "security_level": lambda value: SecurityLevel(value).value,
+}
+
+
 @dataclass
 class ToolInfo:
     """Basic tool information for discovery."""
@@ -58,16 +84,23 @@ class BulkUpdateResult:
     updated_tools: int
     failed_tools: int
     errors: List[str]
+    # Per-update outcome: tool_id, success and error
+    results: List[Dict[str, Any]] = field(default_factory=list)
 
 
 class AdvancedToolManager:
     """Advanced tool management service."""
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, server_manager=None, audit_service=None):
         self.db_manager = db_manager
-        self.discovery_engine = ToolDiscoveryEngine()
+        self.audit_service = audit_service
+        self.change_callbacks: List[Callable[[str, List[str]], None]] = []
+        self.discovery_engine = ToolDiscoveryEngine(server_manager)
         self._tool_cache = {}  # Cache for frequently accessed tools
         self._last_cache_update = None
+        # Built from the registry on first related-tools lookup
+        self._tag_index: Optional[TagSimilarityIndex] = None
+        self._tag_index_lock = threading.Lock()
         self._ensure_tables()
     
     def _ensure_tables(self):
@@ -100,6 +133,16 @@ class AdvancedToolManager:
                 )
                 """)
                 
+                # Canonical schema hash used by sync to skip unchanged tools;
+                # NULL for rows written before it existed
+                columns = {row[1] for row in conn.execute("PRAGMA table_info(tool_registry)")}
+                if "schema_hash" not in columns:
+                    conn.execute("ALTER TABLE tool_registry ADD COLUMN schema_hash TEXT")
+                conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_tool_registry_server
+                ON tool_registry (server_id, name)
+                """)
+                
                 # Create tool executions table
                 conn.execute("""
                 CREATE TABLE IF NOT EXISTS tool_executions (
@@ -188,7 +231,7 @@ class AdvancedToolManager:
         try:
             # Analyze the tool
             analysis = self.discovery_engine.analyze_tool_schema(tool_info.schema)
-            metadata = self.discovery_engine.extract_tool_metadata(tool_info.schema)
+            metadata = self.discovery_engine.extract_tool_metadata(tool_info.schema, analysis)
             
             # Create registry entry
             registry_entry = ToolRegistryEntry(
@@ -395,7 +438,11 @@ class AdvancedToolManager:
             return []
     
     def bulk_update_tools(self, updates: List[Dict[str, Any]]) -> BulkUpdateResult:
-        """Perform bulk updates on multiple tools."""
+        """Perform bulk updates on multiple tools.
+        
+        Every update is validated before any is written; the valid ones are
+        then applied in one transaction.
+        """
         logger.info(f"Performing bulk update on {len(updates)} tools")
         
         result = BulkUpdateResult(
@@ -405,57 +452,142 @@ class AdvancedToolManager:
             errors=[]
         )
         
+        try:
+            existing = self._existing_tool_ids([u.get("tool_id") for u in updates if u.get("tool_id")])
+        except Exception as e:
+            logger.error(f"Error validating bulk update: {e}")
+            existing = set()
+        
+        # Valid updates grouped by the fields they set, one statement per group
+        groups: Dict[Tuple[str, ...], List[tuple]] = {}
+        changes: Dict[str, Dict[str, Any]] = {}
+        now = datetime.now().isoformat()
         for update in updates:
+            tool_id = update.get("tool_id")
             try:
-                tool_id = update.get("tool_id")
                 if not tool_id:
-                    result.errors.append("Missing tool_id in update")
-                    result.failed_tools += 1
-                    continue
-                
-                tool = self.get_tool_by_id(tool_id)
-                if not tool:
-                    result.errors.append(f"Tool {tool_id} not found")
-                    result.failed_tools += 1
-                    continue
-                
-                # Apply updates
-                if "enabled" in update:
-                    tool.enabled = update["enabled"]
-                
-                if "category" in update:
-                    tool.category = ToolCategory(update["category"])
-                
-                if "security_level" in update:
-                    tool.security_level = SecurityLevel(update["security_level"])
-                
-                tool.updated_at = datetime.now()
-                
-                # Save changes
-                self._save_registry_entry(tool)
-                result.updated_tools += 1
-                
+                    raise ValueError("Missing tool_id in update")
+                if tool_id not in existing:
+                    raise ValueError(f"Tool {tool_id} not found")
+                values = {name: convert(update[name])
+                          for name, convert in BULK_UPDATE_FIELDS.items() if name in update}
+            except ValueError as e:
+                self._record_bulk_item(result, tool_id, str(e))
+                continue
             except Exception as e:
-                result.errors.append(f"Error updating tool: {e}")
-                result.failed_tools += 1
+                self._record_bulk_item(result, tool_id, f"Error updating tool: {e}")
+                continue
+            
+            fields = tuple(values)
+            groups.setdefault(fields, []).append(tuple(values.values()) + (now, tool_id))
+            changes.setdefault(tool_id, {}).update(values)
+            self._record_bulk_item(result, tool_id)
+        
+        if changes:
+            try:
+                with self.db_manager.get_connection() as conn:
+                    for fields, params in groups.items():
+                        assignments = "".join(f"{name} = ?, " for name in fields)
+                        conn.executemany(
+                            f"UPDATE tool_registry SET {assignments}updated_at = ? WHERE id = ?", params
+                        )
+                    conn.commit()
+            except Exception as e:
+                logger.error(f"Error applying bulk update: {e}")
+                for item in result.results:
+                    if item["success"]:
+                        item["success"], item["error"] = False, f"Error updating tool: {e}"
+                        result.errors.append(f"Error updating tool {item['tool_id']}: {e}")
+                result.failed_tools, result.updated_tools = result.total_tools, 0
+                changes = {}
+        
+        if changes:
+            self._tools_changed("bulk_update_tools", list(changes), {"changes": changes})
         
         logger.info(f"Bulk update completed: {result.updated_tools} updated, {result.failed_tools} failed")
         return result
     
-    def _save_registry_entry(self, entry: ToolRegistryEntry):
-        """Save registry entry to database."""
-        import json
+    @staticmethod
+    def _record_bulk_item(result: BulkUpdateResult, tool_id: Optional[str], error: Optional[str] = None):
+        result.results.append({"tool_id": tool_id, "success": error is None, "error": error})
+        if error is None:
+            result.updated_tools += 1
+        else:
+            result.errors.append(error)
+            result.failed_tools += 1
+    
+    def _existing_tool_ids(self, tool_ids: List[str]) -> set:
+        """The subset of ``tool_ids`` present in the registry."""
+        unique = list(dict.fromkeys(tool_ids))
+        existing = set()
+        with self.db_manager.get_connection() as conn:
+            for start in range(0, len(unique), BULK_CHUNK_SIZE):
+                chunk = unique[start:start + BULK_CHUNK_SIZE]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(f"SELECT id FROM tool_registry WHERE id IN ({placeholders})", chunk)
+                existing.update(row[0] for row in rows)
+        return existing
+    
+    def add_change_callback(self, callback: Callable[[str, List[str]], None]):
+        """Add callback notified with ``(action, tool_ids)`` after bulk changes."""
+        self.change_callbacks.append(callback)
+    
+    def _tools_changed(self, action: str, tool_ids: List[str], details: Dict[str, Any]):
+        """Invalidate caches, then emit one audit event and one change notification."""
+        for tool_id in tool_ids:
+            self._tool_cache.pop(tool_id, None)
         
-        query = """
-            INSERT OR REPLACE INTO tool_registry (
-                id, name, description, server_id, category, schema, parameters,
-                permissions, status, metadata, created_at, updated_at, last_used,
-                usage_count, average_execution_time, success_rate, enabled,
-                aliases, default_parameters, security_level
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """
+        if self.audit_service is not None:
+            try:
+                self.audit_service.log_event(AuditEvent(
+                    action=action,
+                    resource_type="tool",
+                    resource_id=",".join(tool_ids) if len(tool_ids) == 1 else f"{len(tool_ids)} tools",
+                    new_value={"tool_ids": tool_ids, **details}
+                ))
+            except Exception as e:
+                logger.error(f"Error auditing {action}: {e}")
         
-        params = (
+        for callback in self.change_callbacks:
+            try:
+                callback(action, tool_ids)
+            except Exception as e:
+                logger.error(f"Tool change callback failed: {e}")
+    
+    def _save_registry_entry(self, entry: ToolRegistryEntry):
+        """Save registry entry to database."""
+        with self.db_manager.get_connection() as conn:
+            conn.execute(REGISTRY_UPSERT, self._registry_params(entry))
+            conn.commit()
+        self._index_tool_tags(entry.id, entry.name, entry.metadata.tags)
+    
+    def _get_tag_index(self) -> TagSimilarityIndex:
+        """Tag similarity index over the registry, loaded on first use."""
+        with self._tag_index_lock:
+            if self._tag_index is None:
+                with self.db_manager.get_connection() as conn:
+                    rows = conn.execute("SELECT id, name, metadata FROM tool_registry").fetchall()
+                index = TagSimilarityIndex()
+                index.rebuild((row[0], row[1], self._metadata_tags(row[2])) for row in rows)
+                self._tag_index = index
+            return self._tag_index
+    
+    def _index_tool_tags(self, tool_id: str, name: str, tags: List[str]):
+        """Keep a loaded tag index in step with a registry write."""
+        index = self._tag_index
+        if index is not None:
+            index.update_tool(tool_id, name, tags)
+    
+    @staticmethod
+    def _metadata_tags(metadata: Optional[str]) -> List[str]:
+        try:
+            return json.loads(metadata).get("tags", []) if metadata else []
+        except (json.JSONDecodeError, AttributeError):
+            return []
+    
+    def _registry_params(self, entry: ToolRegistryEntry) -> tuple:
+        """Row values for ``REGISTRY_UPSERT``."""
+        return (
             entry.id,
             entry.name,
             entry.description,
@@ -475,12 +607,9 @@ class AdvancedToolManager:
             entry.enabled,
             json.dumps(entry.aliases),
             json.dumps(entry.default_parameters),
-            entry.security_level.value
+            entry.security_level.value,
+            schema_fingerprint(entry.schema)
         )
-        
-        with self.db_manager.get_connection() as conn:
-            conn.execute(query, params)
-            conn.commit()
     
     def _row_to_registry_entry(self, row: tuple) -> ToolRegistryEntry:
         """Convert database row to registry entry."""
@@ -785,120 +914,236 @@ class AdvancedToolManager:
             logger.error(f"Error getting tool statistics: {e}")
             return {}
     
-    def sync_tools_with_server(self, server_id: str) -> Dict[str, int]:
+    def sync_tools_with_server(self, server_id: str) -> Dict[str, Any]:
         """Synchronize tools with a specific server and detect changes."""
+        return self.sync_all_servers([server_id], max_concurrency=1)[server_id]
+    
+    def sync_all_servers(self, server_ids: List[str], max_concurrency: int = 8) -> Dict[str, Dict[str, Any]]:
+        """Synchronize tools with many servers.
+        
+        Discovery runs concurrently on up to ``max_concurrency`` servers. Each
+        server's changes are applied on the calling thread as its discovery
+        completes, in one transaction per server. Tools whose canonical
+        schema hash matches the registry are skipped without re-analysis.
+        Returns per-server stats (added, updated, removed, unchanged) with
+        discovery and apply timings.
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        server_ids = list(dict.fromkeys(server_ids))
+        if not server_ids:
+            return results
+        
+        def discover(server_id: str):
+            started = time.perf_counter()
+            try:
+                tools = self.discovery_engine.scan_server_tools(server_id, raise_errors=True)
+                error = None
+            except Exception as e:
+                tools, error = [], str(e)
+            return tools, error, time.perf_counter() - started
+        
+        workers = max(1, min(max_concurrency, len(server_ids)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tool-sync") as executor:
+            futures = {executor.submit(discover, server_id): server_id for server_id in server_ids}
+            for future in as_completed(futures):
+                server_id = futures[future]
+                discovered_tools, error, discovery_seconds = future.result()
+                results[server_id] = self._apply_server_sync(
+                    server_id, discovered_tools, discovery_seconds, [error] if error else []
+                )
+        
+        logger.info(f"Synchronized tools with {len(server_ids)} servers")
+        return results
+    
+    def _apply_server_sync(self, server_id: str, discovered_tools: List[DiscoveredTool],
+                           discovery_seconds: float, errors: List[str]) -> Dict[str, Any]:
+        """Diff discovered tools against the registry and write the changes."""
+        stats: Dict[str, Any] = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        started = time.perf_counter()
+        
         try:
-            logger.info(f"Synchronizing tools with server {server_id}")
-            
-            # Get current tools from database
-            current_tools = {tool.name: tool for tool in self.get_tools_by_server(server_id)}
-            
-            # Discover tools from server
-            discovered_tools = self.discovery_engine.scan_server_tools(server_id)
-            discovered_names = {tool.name for tool in discovered_tools}
-            
-            stats = {
-                "added": 0,
-                "updated": 0,
-                "removed": 0,
-                "unchanged": 0
-            }
-            
-            # Process discovered tools
-            for discovered in discovered_tools:
-                if discovered.name in current_tools:
-                    # Check if tool has changed
-                    current_tool = current_tools[discovered.name]
-                    if current_tool.schema != discovered.schema:
+            with self.db_manager.get_connection() as conn:
+                if errors:
+                    # A failed discovery says nothing about the catalogue; keep it as is
+                    stats["discovery_seconds"] = discovery_seconds
+                    stats["apply_seconds"] = time.perf_counter() - started
+                    self._write_discovery_status(conn, server_id, 0, stats,
+                                                 discovery_seconds + stats["apply_seconds"], errors)
+                    conn.commit()
+                    stats["errors"] = errors
+                    logger.warning(f"Sync skipped for {server_id}: {errors}")
+                    return stats
+                
+                # Lightweight view of the registry; full rows are never decoded
+                current: Dict[str, List[Tuple[str, Optional[str], str, str]]] = {}
+                for row in conn.execute(
+                    "SELECT id, name, schema_hash, schema, status FROM tool_registry WHERE server_id = ?",
+                    (server_id,)
+                ):
+                    current.setdefault(row[1], []).append((row[0], row[2], row[3], row[4]))
+                
+                now = datetime.now().isoformat()
+                inserts, updates, reactivated, backfill = [], [], [], []
+                retagged = []
+                seen = set()
+                
+                for discovered in discovered_tools:
+                    if discovered.name in seen:
+                        continue
+                    seen.add(discovered.name)
+                    fingerprint = schema_fingerprint(discovered.schema)
+                    rows = current.get(discovered.name)
+                    
+                    if rows is None:
+                        # New tool discovered
+                        inserts.append(self._registry_params(
+                            self._build_registry_entry(server_id, discovered)
+                        ))
+                        stats["added"] += 1
+                        continue
+                    
+                    changed = False
+                    for tool_id, stored_hash, stored_schema, status in rows:
+                        if stored_hash is None:
+                            stored_hash = schema_fingerprint(json.loads(stored_schema))
+                            backfill.append((stored_hash, tool_id))
+                        if stored_hash != fingerprint:
+                            changed = True
+                        elif status != ToolStatus.AVAILABLE.value:
+                            reactivated.append((now, tool_id))
+                    
+                    if changed:
                         # Tool has been updated
-                        self._update_existing_tool(current_tool, discovered)
+                        params = self._updated_tool_params(discovered, fingerprint, now)
+                        updates.extend(params + (tool_id,) for tool_id, _, _, _ in rows)
+                        retagged.extend((tool_id, discovered.name, params[6]) for tool_id, _, _, _ in rows)
+                        stats["updated"] += 1
+                    elif any(status != ToolStatus.AVAILABLE.value for _, _, _, status in rows):
                         stats["updated"] += 1
                     else:
                         stats["unchanged"] += 1
-                else:
-                    # New tool discovered
-                    tool_info = ToolInfo(
-                        name=discovered.name,
-                        description=discovered.description,
-                        schema=discovered.schema,
-                        server_id=server_id
+                
+                # Mark removed tools as unavailable (once)
+                removed = []
+                for name, rows in current.items():
+                    if name in seen:
+                        continue
+                    still_listed = [(now, tool_id) for tool_id, _, _, status in rows
+                                    if status != ToolStatus.UNAVAILABLE.value]
+                    if still_listed:
+                        removed.extend(still_listed)
+                        stats["removed"] += 1
+                
+                if inserts:
+                    conn.executemany(REGISTRY_UPSERT, inserts)
+                if updates:
+                    conn.executemany("""
+                        UPDATE tool_registry
+                        SET description = ?, schema = ?, schema_hash = ?, parameters = ?,
+                            category = ?, security_level = ?, metadata = ?, status = ?, updated_at = ?
+                        WHERE id = ?
+                    """, updates)
+                if reactivated:
+                    conn.executemany(
+                        "UPDATE tool_registry SET status = 'available', updated_at = ? WHERE id = ?",
+                        reactivated
                     )
-                    self.register_tool(tool_info)
-                    stats["added"] += 1
-            
-            # Mark removed tools as unavailable
-            for tool_name, tool in current_tools.items():
-                if tool_name not in discovered_names:
-                    tool.status = ToolStatus.UNAVAILABLE
-                    tool.updated_at = datetime.now()
-                    self._save_registry_entry(tool)
-                    stats["removed"] += 1
-            
-            # Update discovery status
-            self._update_discovery_status(server_id, len(discovered_tools), stats)
-            
-            logger.info(f"Sync completed: {stats}")
-            return stats
+                if removed:
+                    conn.executemany(
+                        "UPDATE tool_registry SET status = 'unavailable', updated_at = ? WHERE id = ?",
+                        removed
+                    )
+                if backfill:
+                    conn.executemany("UPDATE tool_registry SET schema_hash = ? WHERE id = ?", backfill)
+                
+                stats["discovery_seconds"] = discovery_seconds
+                stats["apply_seconds"] = time.perf_counter() - started
+                self._write_discovery_status(conn, server_id, len(discovered_tools), stats,
+                                             discovery_seconds + stats["apply_seconds"], errors)
+                conn.commit()
             
         except Exception as e:
             logger.error(f"Error syncing tools with server {server_id}: {e}")
-            return {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+            return {"added": 0, "updated": 0, "removed": 0, "unchanged": 0,
+                    "discovery_seconds": discovery_seconds, "apply_seconds": 0.0,
+                    "errors": errors + [str(e)]}
+        
+        for params in inserts:
+            self._index_tool_tags(params[0], params[1], self._metadata_tags(params[9]))
+        for tool_id, name, metadata in retagged:
+            self._index_tool_tags(tool_id, name, self._metadata_tags(metadata))
+        
+        if errors:
+            stats["errors"] = errors
+        logger.info(f"Sync completed for {server_id}: {stats}")
+        return stats
     
-    def _update_existing_tool(self, current_tool: ToolRegistryEntry, discovered: DiscoveredTool):
-        """Update an existing tool with new information."""
-        try:
-            # Analyze the updated schema
-            analysis = self.discovery_engine.analyze_tool_schema(discovered.schema)
-            
-            # Update tool information
-            current_tool.description = discovered.description
-            current_tool.schema = discovered.schema
-            current_tool.parameters = analysis.suggested_parameters
-            current_tool.category = analysis.category
-            current_tool.security_level = analysis.security_level
-            current_tool.updated_at = datetime.now()
-            
-            # Update metadata
-            current_tool.metadata = self.discovery_engine.extract_tool_metadata(discovered.schema)
-            
-            self._save_registry_entry(current_tool)
-            logger.info(f"Updated existing tool: {current_tool.name}")
-            
-        except Exception as e:
-            logger.error(f"Error updating existing tool: {e}")
+    def _build_registry_entry(self, server_id: str, discovered: DiscoveredTool) -> ToolRegistryEntry:
+        """Analyze a newly discovered tool into a registry entry."""
+        analysis = self.discovery_engine.analyze_tool_schema(discovered.schema)
+        return ToolRegistryEntry(
+            name=discovered.name,
+            description=discovered.description,
+            server_id=server_id,
+            category=analysis.category,
+            schema=discovered.schema,
+            parameters=analysis.suggested_parameters,
+            status=ToolStatus.AVAILABLE,
+            metadata=self.discovery_engine.extract_tool_metadata(discovered.schema, analysis),
+            security_level=analysis.security_level
+        )
+    
+    def _updated_tool_params(self, discovered: DiscoveredTool, fingerprint: str, now: str) -> tuple:
+        """Column values for a tool whose schema changed."""
+        analysis = self.discovery_engine.analyze_tool_schema(discovered.schema)
+        metadata = self.discovery_engine.extract_tool_metadata(discovered.schema, analysis)
+        return (
+            discovered.description,
+            json.dumps(discovered.schema),
+            fingerprint,
+            json.dumps([p.__dict__ for p in analysis.suggested_parameters]),
+            analysis.category.value,
+            analysis.security_level.value,
+            json.dumps(metadata.__dict__),
+            ToolStatus.AVAILABLE.value,
+            now
+        )
     
     def _update_discovery_status(self, server_id: str, tools_discovered: int, 
-                               sync_stats: Optional[Dict[str, int]] = None):
+                               sync_stats: Optional[Dict[str, int]] = None,
+                               scan_duration: float = 0.0, errors: Optional[List[str]] = None):
         """Update discovery status for a server."""
         try:
-            if sync_stats is None:
-                sync_stats = {"added": tools_discovered, "updated": 0, "removed": 0, "unchanged": 0}
-            
-            query = """
-                INSERT OR REPLACE INTO discovery_status (
-                    server_id, last_scan, tools_discovered, tools_added,
-                    tools_updated, tools_removed, scan_duration, errors
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """
-            
-            params = (
-                server_id,
-                datetime.now().isoformat(),
-                tools_discovered,
-                sync_stats["added"],
-                sync_stats["updated"],
-                sync_stats["removed"],
-                1.0,  # Placeholder scan duration
-                json.dumps([])
-            )
-            
             with self.db_manager.get_connection() as conn:
-                conn.execute(query, params)
+                self._write_discovery_status(conn, server_id, tools_discovered, sync_stats,
+                                             scan_duration, errors)
                 conn.commit()
             
         except Exception as e:
             logger.error(f"Error updating discovery status: {e}")
     
+    def _write_discovery_status(self, conn, server_id: str, tools_discovered: int,
+                                sync_stats: Optional[Dict[str, Any]], scan_duration: float,
+                                errors: Optional[List[str]]):
+        if sync_stats is None:
+            sync_stats = {"added": tools_discovered, "updated": 0, "removed": 0, "unchanged": 0}
+        
+        conn.execute("""
+            INSERT OR REPLACE INTO discovery_status (
+                server_id, last_scan, tools_discovered, tools_added,
+                tools_updated, tools_removed, scan_duration, errors
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            server_id,
+            datetime.now().isoformat(),
+            tools_discovered,
+            sync_stats["added"],
+            sync_stats["updated"],
+            sync_stats["removed"],
+            scan_duration,
+            json.dumps(errors or [])
+        ))
+    
     def add_tool_tags(self, tool_id: str, tags: List[str]) -> bool:
         """Add tags to a tool."""
         try:
@@ -1020,29 +1265,41 @@ class AdvancedToolManager:
             return False
     
     def auto_recategorize_tools(self, tool_ids: Optional[List[str]] = None) -> Dict[str, str]:
-        """Automatically recategorize tools using the discovery engine."""
+        """Automatically recategorize tools using the discovery engine.
+        
+        Classifies only name and description (keyed by the stored schema
+        hash) and writes every changed category in one transaction.
+        """
         try:
+            query = "SELECT id, schema, schema_hash, category FROM tool_registry"
+            params: List[Any] = []
             if tool_ids:
-                tools = [self.get_tool_by_id(tid) for tid in tool_ids if self.get_tool_by_id(tid)]
-            else:
-                tools = self.get_tool_registry()
-            
-            results = {}
-            categorizations = self.discovery_engine.auto_categorize_batch(tools)
+                query += f" WHERE id IN ({','.join('?' * len(tool_ids))})"
+                params = list(tool_ids)
             
-            for tool in tools:
-                if tool.id in categorizations:
-                    new_category = categorizations[tool.id]
-                    old_category = tool.category
-                    
+            with self.db_manager.get_connection() as conn:
+                rows = conn.execute(query, params).fetchall()
+                classifications = self.discovery_engine.classify_batch(
+                    [(json.loads(row[1]), row[2]) for row in rows]
+                )
+                
+                now = datetime.now().isoformat()
+                results = {}
+                changes = []
+                for row, classification in zip(rows, classifications):
+                    old_category = row[3]
+                    new_category = classification.category.value
                     if new_category != old_category:
-                        tool.category = new_category
-                        tool.updated_at = datetime.now()
-                        self._save_registry_entry(tool)
-                        
-                        results[tool.id] = f"Changed from {old_category.value} to {new_category.value}"
+                        changes.append((new_category, now, row[0]))
+                        results[row[0]] = f"Changed from {old_category} to {new_category}"
                     else:
-                        results[tool.id] = "No change needed"
+                        results[row[0]] = "No change needed"
+                
+                if changes:
+                    conn.executemany(
+                        "UPDATE tool_registry SET category = ?, updated_at = ? WHERE id = ?", changes
+                    )
+                    conn.commit()
             
             logger.info(f"Auto-recategorized {len(results)} tools")
             return results
@@ -1067,15 +1324,13 @@ class AdvancedToolManager:
     def get_related_tools(self, tool_id: str) -> List[Dict[str, Any]]:
         """Get tools related to the specified tool."""
         try:
-            tool = self.get_tool_by_id(tool_id)
-            if not tool:
-                return []
-            
-            all_tools = self.get_tool_registry()
-            related = self.discovery_engine.get_related_tools(
-                tool.name, tool.metadata.tags, all_tools
-            )
-            return related
+            index = self._get_tag_index()
+            if tool_id not in index:
+                tool = self.get_tool_by_id(tool_id)
+                if not tool:
+                    return []
+                index.update_tool(tool.id, tool.name, tool.metadata.tags)
+            return index.related(tool_id)
             
         except Exception as e:
             logger.error(f"Error getting related tools: {e}")
@@ -1149,6 +1404,8 @@ class AdvancedToolManager:
             # Clear from cache if exists
             if tool_id in self._tool_cache:
                 del self._tool_cache[tool_id]
+            if self._tag_index is not None:
+                self._tag_index.remove_tool(tool_id)
             
             logger.info(f"Deleted tool {tool.name} (ID: {tool_id})")
             return True
@@ -1158,16 +1415,31 @@ class AdvancedToolManager:
             return False
     
     def bulk_delete_tools(self, tool_ids: List[str]) -> Dict[str, bool]:
-        """Delete multiple tools from the registry."""
+        """Delete multiple tools from the registry in one transaction."""
         try:
-            results = {}
-            
+            existing = self._existing_tool_ids(tool_ids)
+            results = {tool_id: tool_id in existing for tool_id in tool_ids}
             for tool_id in tool_ids:
-                success = self.delete_tool(tool_id)
-                results[tool_id] = success
+                if tool_id not in existing:
+                    logger.error(f"Tool {tool_id} not found")
+            
+            deleted = [tool_id for tool_id in results if results[tool_id]]
+            with self.db_manager.get_connection() as conn:
+                for start in range(0, len(deleted), BULK_CHUNK_SIZE):
+                    chunk = deleted[start:start + BULK_CHUNK_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    # Delete tool executions first (foreign key constraint)
+                    conn.execute(f"DELETE FROM tool_executions WHERE tool_id IN ({placeholders})", chunk)
+                    conn.execute(f"DELETE FROM tool_registry WHERE id IN ({placeholders})", chunk)
+                conn.commit()
+            
+            if deleted:
+                if self._tag_index is not None:
+                    for tool_id in deleted:
+                        self._tag_index.remove_tool(tool_id)
+                self._tools_changed("bulk_delete_tools", deleted, {})
             
-            successful_deletes = sum(1 for success in results.values() if success)
-            logger.info(f"Bulk delete completed: {successful_deletes}/{len(tool_ids)} tools deleted")
+            logger.info(f"Bulk delete completed: {len(deleted)}/{len(tool_ids)} tools deleted")
             
             return results
             
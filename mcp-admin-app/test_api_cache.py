@@ -0,0 +1,264 @@
+"""
+Unit Tests for the API Response Cache
+=====================================
+
+Tests cache keys, ETags, tag invalidation and both storage backends.
+"""
+
+import asyncio
+import json
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from typing import Dict
+
+from api.response_cache import (
+    CachedResponse, MemoryCacheBackend, SQLiteCacheBackend,
+    build_cache_key, compute_etag, etag_matches, invalidation_tags, resource_tags
+)
+
+
+def make_entry(body: bytes = b'{"ok": true}', ttl: float = 60, tags=None) -> CachedResponse:
+    """Build a cache entry for tests."""
+    return CachedResponse(
+        body=body,
+        status_code=200,
+        headers={"content-type": "application/json"},
+        media_type="application/json",
+        etag=compute_etag(body),
+        expires_at=time.time() + ttl,
+        tags=set(tags or ())
+    )
+
+
+class TestCacheKeys(unittest.TestCase):
+    """Test key construction and tag helpers."""
+
+    def test_key_depends_on_principal(self):
+        """Test that different credentials never share a cache key."""
+        alice = build_cache_key("GET", "/api/v1/prompts", [], {"authorization": "Bearer alice"})
+        bob = build_cache_key("GET", "/api/v1/prompts", [], {"authorization": "Bearer bob"})
+        self.assertNotEqual(alice, bob)
+
+    def test_key_depends_on_accept(self):
+        """Test that content negotiation headers are part of the key."""
+        json_key = build_cache_key("GET", "/api/v1/prompts", [], {"accept": "application/json"})
+        csv_key = build_cache_key("GET", "/api/v1/prompts", [], {"accept": "text/csv"})
+        self.assertNotEqual(json_key, csv_key)
+
+    def test_key_ignores_query_order(self):
+        """Test that query parameter order does not matter."""
+        first = build_cache_key("GET", "/p", [("a", "1"), ("b", "2")], {})
+        second = build_cache_key("GET", "/p", [("b", "2"), ("a", "1")], {})
+        self.assertEqual(first, second)
+
+    def test_etag_matching(self):
+        """Test If-None-Match evaluation."""
+        etag = compute_etag(b"body")
+        self.assertTrue(etag_matches(etag, etag))
+        self.assertTrue(etag_matches(f'"other", W/{etag}', etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches('"other"', etag))
+        self.assertFalse(etag_matches(None, etag))
+
+    def test_mutation_invalidates_resource_and_collection(self):
+        """Test the tags derived from a mutated path."""
+        self.assertEqual(invalidation_tags("/api/v1/prompts/abc"),
+                         {"/api/v1/prompts/abc", "/api/v1/prompts"})
+        self.assertEqual(resource_tags("/api/v1/prompts/"), {"/api/v1/prompts"})
+
+
+class BackendContract:
+    """Behaviour shared by every cache backend."""
+
+    def make_backend(self, max_entries):
+        raise NotImplementedError
+
+    def test_round_trip(self):
+        """Test storing and reading an entry."""
+        backend = self.make_backend(10)
+        entry = make_entry()
+        backend.set("key", entry)
+
+        cached = backend.get("key")
+        self.assertEqual(cached.body, entry.body)
+        self.assertEqual(cached.etag, entry.etag)
+        self.assertEqual(backend.stats()["hits"], 1)
+
+    def test_expired_entry_is_a_miss(self):
+        """Test that expired entries are not served."""
+        backend = self.make_backend(10)
+        backend.set("key", make_entry(ttl=-1))
+        self.assertIsNone(backend.get("key"))
+
+    def test_tag_invalidation(self):
+        """Test that invalidating a tag removes only tagged entries."""
+        backend = self.make_backend(10)
+        backend.set("list", make_entry(tags={"/api/v1/prompts"}))
+        backend.set("item", make_entry(tags={"/api/v1/prompts/abc"}))
+        backend.set("other", make_entry(tags={"/api/v1/evaluations"}))
+
+        removed = backend.invalidate_tags(invalidation_tags("/api/v1/prompts/abc"))
+        self.assertEqual(removed, 2)
+        self.assertIsNone(backend.get("list"))
+        self.assertIsNone(backend.get("item"))
+        self.assertIsNotNone(backend.get("other"))
+
+
+class TestMemoryCacheBackend(BackendContract, unittest.TestCase):
+    """Test the in-process LRU backend."""
+
+    def make_backend(self, max_entries):
+        return MemoryCacheBackend(max_entries=max_entries)
+
+    def test_lru_bound(self):
+        """Test that the least recently used entry is evicted."""
+        backend = self.make_backend(2)
+        backend.set("a", make_entry())
+        backend.set("b", make_entry())
+        backend.get("a")
+        backend.set("c", make_entry())
+
+        self.assertIsNone(backend.get("b"))
+        self.assertIsNotNone(backend.get("a"))
+        self.assertEqual(backend.stats()["evictions"], 1)
+
+
+class TestSQLiteCacheBackend(BackendContract, unittest.TestCase):
+    """Test the shared SQLite backend."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / "api_cache.db"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def make_backend(self, max_entries):
+        return SQLiteCacheBackend(self.db_path, max_entries=max_entries)
+
+    def test_entries_shared_between_instances(self):
+        """Test that a second worker sees hits and invalidations."""
+        worker_a = self.make_backend(10)
+        worker_b = self.make_backend(10)
+
+        worker_a.set("key", make_entry(tags={"/api/v1/prompts"}))
+        self.assertIsNotNone(worker_b.get("key"))
+
+        worker_b.invalidate_tags({"/api/v1/prompts"})
+        self.assertIsNone(worker_a.get("key"))
+
+    def test_trim_to_max_entries(self):
+        """Test that periodic trimming enforces the size bound."""
+        backend = self.make_backend(5)
+        backend.trim_interval = 1
+        for i in range(8):
+            backend.set(f"key-{i}", make_entry())
+
+        self.assertEqual(backend.stats()["size"], 5)
+        self.assertIsNone(backend.get("key-0"))
+
+
+def call_asgi(app, method: str, path: str, headers: Dict[str, str] = None, query: str = ""):
+    """Send one request through an ASGI app; returns (status, headers, body)."""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": query.encode(), "root_path": "", "server": ("testserver", 80), "client": ("127.0.0.1", 5000),
+        "headers": [(key.lower().encode(), value.encode()) for key, value in (headers or {}).items()],
+    }
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    start = next(message for message in sent if message["type"] == "http.response.start")
+    response_headers = {key.decode().lower(): value.decode() for key, value in start["headers"]}
+    content = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return start["status"], response_headers, content
+
+
+class TestCacheMiddleware(unittest.TestCase):
+    """Test CacheMiddleware end to end through an ASGI app."""
+
+    def setUp(self):
+        from fastapi import FastAPI, HTTPException
+        from api.middleware import CacheMiddleware
+
+        self.calls = {"list": 0, "create": 0}
+        self.prompts = ["alpha"]
+        app = FastAPI()
+
+        @app.get("/api/v1/prompts")
+        def list_prompts():
+            self.calls["list"] += 1
+            return {"prompts": list(self.prompts)}
+
+        @app.post("/api/v1/prompts")
+        def create_prompt(name: str = "beta"):
+            self.calls["create"] += 1
+            if name == "invalid":
+                raise HTTPException(status_code=400, detail="invalid")
+            self.prompts.append(name)
+            return {"created": name}
+
+        app.add_middleware(CacheMiddleware, config={"cache_ttl": 60})
+        self.app = app
+
+    def get(self, **headers):
+        return call_asgi(self.app, "GET", "/api/v1/prompts", headers)
+
+    def test_etag_and_conditional_request(self):
+        """Test MISS then HIT with a stable ETag, and 304 for If-None-Match."""
+        status, headers, body = self.get()
+        self.assertEqual((status, headers["x-cache"]), (200, "MISS"))
+        etag = headers["etag"]
+
+        status, headers, cached_body = self.get()
+        self.assertEqual((status, headers["x-cache"], headers["etag"]), (200, "HIT", etag))
+        self.assertEqual(cached_body, body)
+
+        status, headers, body = self.get(**{"If-None-Match": etag})
+        self.assertEqual((status, body), (304, b""))
+        self.assertEqual(headers["etag"], etag)
+        self.assertEqual(self.calls["list"], 1)
+
+    def test_entries_are_per_principal(self):
+        """Test that each credential gets its own cache entry."""
+        self.assertEqual(self.get(Authorization="Bearer alice")[1]["x-cache"], "MISS")
+        self.assertEqual(self.get(Authorization="Bearer bob")[1]["x-cache"], "MISS")
+        self.assertEqual(self.get(**{"X-API-Key": "key-1"})[1]["x-cache"], "MISS")
+        self.assertEqual(self.get(Authorization="Bearer alice")[1]["x-cache"], "HIT")
+        self.assertEqual(self.calls["list"], 3)
+
+    def test_non_get_requests_are_not_cached(self):
+        """Test that POST responses always reach the handler."""
+        for _ in range(2):
+            status, headers, _ = call_asgi(self.app, "POST", "/api/v1/prompts")
+            self.assertEqual(status, 200)
+            self.assertNotIn("x-cache", headers)
+        self.assertEqual(self.calls["create"], 2)
+
+    def test_successful_mutation_invalidates(self):
+        """Test that a successful POST invalidates the collection and a failed one does not."""
+        self.get()
+        status, _, _ = call_asgi(self.app, "POST", "/api/v1/prompts", query="name=invalid")
+        self.assertEqual(status, 400)
+        self.assertEqual(self.get()[1]["x-cache"], "HIT")
+
+        status, _, _ = call_asgi(self.app, "POST", "/api/v1/prompts", query="name=beta")
+        self.assertEqual(status, 200)
+        status, headers, body = self.get()
+        self.assertEqual(headers["x-cache"], "MISS")
+        self.assertEqual(json.loads(body), {"prompts": ["alpha", "beta"]})
+        self.assertEqual(self.calls["list"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Unit Tests for the API Rate Limiter
+===================================
+
+Tests GCRA limiting, multi-scope checks, lazy eviction and the shared backend.
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from api.rate_limit import (
+    MemoryRateLimitBackend, RateLimiter, RateLimitRule, SQLiteRateLimitBackend,
+    create_rate_limiter
+)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test GCRA behaviour with the in-memory backend."""
+
+    def setUp(self):
+        """Create a limiter of 5 requests per 10 seconds per IP."""
+        self.limiter = RateLimiter({"ip": RateLimitRule(5, 10.0)})
+
+    def test_burst_then_reject(self):
+        """Test that a full burst is allowed and the next request rejected."""
+        results = [self.limiter.check({"ip": "1.2.3.4"}, now=100.0) for _ in range(6)]
+
+        self.assertTrue(all(result.allowed for result in results[:5]))
+        self.assertEqual([result.remaining for result in results[:5]], [4, 3, 2, 1, 0])
+        self.assertFalse(results[5].allowed)
+        self.assertAlmostEqual(results[5].retry_after, 2.0)
+
+    def test_capacity_recovers_over_time(self):
+        """Test that one emission interval frees one request."""
+        for _ in range(5):
+            self.limiter.check({"ip": "1.2.3.4"}, now=100.0)
+
+        self.assertFalse(self.limiter.check({"ip": "1.2.3.4"}, now=101.0).allowed)
+        self.assertTrue(self.limiter.check({"ip": "1.2.3.4"}, now=102.0).allowed)
+
+    def test_headers(self):
+        """Test the remaining/reset headers returned to clients."""
+        result = self.limiter.check({"ip": "1.2.3.4"}, now=100.0)
+        headers = result.headers()
+
+        self.assertEqual(headers["X-RateLimit-Limit"], "5")
+        self.assertEqual(headers["X-RateLimit-Remaining"], "4")
+        self.assertEqual(headers["X-RateLimit-Reset"], "2")
+        self.assertNotIn("Retry-After", headers)
+
+    def test_rejection_does_not_charge_other_scopes(self):
+        """Test that a request rejected by one scope leaves the others untouched."""
+        limiter = RateLimiter({"ip": RateLimitRule(10, 10.0), "user": RateLimitRule(1, 10.0)})
+        limiter.check({"ip": "1.2.3.4", "user": "u1"}, now=100.0)
+
+        rejected = limiter.check({"ip": "1.2.3.4", "user": "u1"}, now=100.0)
+        self.assertFalse(rejected.allowed)
+        self.assertEqual(rejected.scope, "user")
+
+        other_user = limiter.check({"ip": "1.2.3.4", "user": "u2"}, now=100.0)
+        self.assertEqual(other_user.scope, "user")
+        self.assertEqual(limiter.check({"ip": "1.2.3.4"}, now=100.0).remaining, 7)
+
+    def test_expired_keys_evicted_lazily(self):
+        """Test that idle keys are dropped as later requests arrive."""
+        backend = MemoryRateLimitBackend()
+        limiter = RateLimiter({"ip": RateLimitRule(5, 10.0)}, backend)
+        for i in range(5):
+            limiter.check({"ip": f"10.0.0.{i}"}, now=100.0)
+        self.assertEqual(backend.key_count(), 5)
+
+        limiter.check({"ip": "10.0.1.1"}, now=200.0)
+        self.assertEqual(backend.key_count(), 1)
+
+    def test_max_keys_bound(self):
+        """Test that the memory backend never exceeds max_keys."""
+        backend = MemoryRateLimitBackend(max_keys=3)
+        limiter = RateLimiter({"ip": RateLimitRule(5, 10.0)}, backend)
+        results = [limiter.check({"ip": f"10.0.0.{i}"}, now=100.0) for i in range(10)]
+        self.assertEqual(backend.key_count(), 3)
+        self.assertEqual([result.allowed for result in results], [True] * 3 + [False] * 7)
+        self.assertEqual(results[-1].headers()["Retry-After"], "2")
+
+    def test_eviction_follows_expiry_not_recency(self):
+        """Test that expired keys behind a live one are evicted and live state is never dropped."""
+        backend = MemoryRateLimitBackend(max_keys=3)
+        limiter = RateLimiter({"ip": RateLimitRule(5, 10.0)}, backend)
+        for _ in range(4):
+            limiter.check({"ip": "busy"}, now=100.0)
+        limiter.check({"ip": "idle-1"}, now=101.0)
+        limiter.check({"ip": "idle-2"}, now=101.0)
+
+        # The idle keys expired at 103; busy is live until 108
+        self.assertTrue(limiter.check({"ip": "new-1"}, now=104.0).allowed)
+        self.assertEqual(backend.key_count(), 2)
+        self.assertTrue(limiter.check({"ip": "new-2"}, now=104.0).allowed)
+
+        # A flood of unique clients is refused instead of resetting busy
+        for i in range(20):
+            self.assertFalse(limiter.check({"ip": f"spoofed-{i}"}, now=104.0).allowed)
+        self.assertEqual(limiter.check({"ip": "busy"}, now=104.0).remaining, 2)
+
+    def test_config(self):
+        """Test building a limiter from middleware config."""
+        limiter = create_rate_limiter({"rate_limits": {"ip": {"limit": 2, "window_seconds": 1}}})
+        self.assertEqual(limiter.rules, {"ip": RateLimitRule(2, 1.0)})
+        with self.assertRaises(ValueError):
+            create_rate_limiter({"rate_limit_backend": "redis"})
+
+
+class TestSQLiteRateLimitBackend(unittest.TestCase):
+    """Test the shared multi-worker backend."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = Path(self.temp_dir.name) / "rate_limits.db"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_limits_shared_between_workers(self):
+        """Test that two workers draw from the same budget."""
+        rules = {"api_key": RateLimitRule(4, 10.0)}
+        worker_a = RateLimiter(rules, SQLiteRateLimitBackend(self.db_path))
+        worker_b = RateLimiter(rules, SQLiteRateLimitBackend(self.db_path))
+
+        for _ in range(2):
+            self.assertTrue(worker_a.check({"api_key": "k"}, now=100.0).allowed)
+            self.assertTrue(worker_b.check({"api_key": "k"}, now=100.0).allowed)
+        self.assertFalse(worker_a.check({"api_key": "k"}, now=100.0).allowed)
+
+    def test_expired_rows_cleaned_up(self):
+        """Test periodic deletion of expired keys."""
+        backend = SQLiteRateLimitBackend(self.db_path)
+        backend.cleanup_interval = 2
+        limiter = RateLimiter({"ip": RateLimitRule(5, 10.0)}, backend)
+
+        limiter.check({"ip": "a"}, now=100.0)
+        limiter.check({"ip": "b"}, now=200.0)
+        self.assertEqual(backend.key_count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
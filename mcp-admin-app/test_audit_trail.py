@@ -0,0 +1,390 @@
+"""
+Unit Tests for the Audit Trail Writer
+=====================================
+
+Tests group commit, hash chain exactness under concurrency, durability
+futures and migration of tables written before chain sequencing.
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from data.database import DatabaseManager
+from models.collaboration import AuditEvent, AuditEventType
+from services.collaboration.audit_trail import AuditTrailService
+from services.collaboration.audit_writer import _open_writers
+
+
+class FileDatabaseManager:
+    """Database manager handing out a fresh connection per use."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    @contextmanager
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+class TestAuditWriter(unittest.TestCase):
+    """Test the group-commit audit writer."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.db_manager = FileDatabaseManager(self.db_path)
+        self.service = AuditTrailService(self.db_manager)
+
+    def tearDown(self):
+        self.service.flush()
+        os.unlink(self.db_path)
+
+    def test_concurrent_events_keep_exact_chain(self):
+        """Test that events from many threads form one valid chain."""
+        def worker(n):
+            for i in range(50):
+                self.service.log_event(
+                    AuditEventType.PROMPT_UPDATED, f"user{n}", "prompt", f"p{i}", "update"
+                )
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        result = self.service.verify_integrity()
+        self.assertTrue(result["valid"], result.get("invalid_events"))
+        self.assertEqual(result["total_events"], 400)
+
+        with self.db_manager.get_connection() as conn:
+            seqs = [row[0] for row in conn.execute("SELECT chain_seq FROM audit_events ORDER BY chain_seq")]
+        self.assertEqual(seqs, list(range(1, 401)))
+
+    def test_async_events_are_group_committed(self):
+        """Test that queued events share commits and resolve their futures."""
+        futures = [
+            self.service.log_event_async(
+                AuditEventType.PROMPT_UPDATED, "bulk", "prompt", f"p{i}", "bulk_update"
+            )
+            for i in range(1000)
+        ]
+        events = [future.result(timeout=10) for future in futures]
+
+        self.assertTrue(all(event.checksum for event in events))
+        stats = self.service.get_writer_stats()
+        self.assertEqual(stats["events_written"], 1000)
+        self.assertLess(stats["batches_committed"], 100)
+        self.assertTrue(self.service.verify_integrity()["valid"])
+
+    def test_reads_see_queued_events(self):
+        """Test that reads flush pending events first."""
+        for i in range(20):
+            self.service.log_event_async(AuditEventType.USER_LOGIN, "u", "user", "u", "login")
+        self.assertEqual(len(self.service.get_events()), 20)
+
+    def test_failed_event_does_not_break_chain(self):
+        """Test that a rejected event fails alone and the chain stays exact."""
+        first = self.service.log_event(AuditEventType.USER_LOGIN, "u", "user", "u", "login")
+
+        duplicate = AuditEvent(id=first.id, event_type=AuditEventType.USER_LOGIN,
+                               user_id="u", resource_type="user", resource_id="u", action="login")
+        future = self.service._writer.submit(duplicate)
+        following = self.service.log_event_async(AuditEventType.USER_LOGOUT, "u", "user", "u", "logout")
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            future.result(timeout=5)
+        following.result(timeout=5)
+        self.assertTrue(self.service.verify_integrity()["valid"])
+
+    def test_unserializable_details_fail_alone(self):
+        """Test that an event whose details are not JSON fails without stalling the writer."""
+        before = self.service.log_event_async(AuditEventType.USER_LOGIN, "u", "user", "u", "login")
+        bad = self.service.log_event_async(AuditEventType.USER_LOGIN, "u", "user", "u", "login",
+                                           details={"handle": object()})
+        after = self.service.log_event_async(AuditEventType.USER_LOGOUT, "u", "user", "u", "logout")
+
+        with self.assertRaises(TypeError):
+            bad.result(timeout=5)
+        with self.assertRaises(TypeError):
+            self.service.log_event(AuditEventType.USER_LOGIN, "u", "user", "u", "login",
+                                   details={"handle": object()})
+        before.result(timeout=5)
+        after.result(timeout=5)
+
+        result = self.service.verify_integrity()
+        self.assertTrue(result["valid"], result.get("invalid_events"))
+        self.assertEqual(result["total_events"], 2)
+
+    def test_writers_sharing_a_database_extend_one_chain(self):
+        """Test that two services on one database interleave into a single chain."""
+        other = AuditTrailService(self.db_manager)
+        try:
+            for service in (self.service, other, self.service, other, self.service):
+                service.log_event(AuditEventType.USER_LOGIN, "u", "user", "u", "login")
+            futures = [service.log_event_async(AuditEventType.USER_LOGOUT, "u", "user", "u", "logout")
+                       for service in (other, self.service) * 20]
+            for future in futures:
+                future.result(timeout=10)
+        finally:
+            self.assertTrue(other.close(5))
+        self.assertNotIn(other._writer, _open_writers)
+
+        result = self.service.verify_integrity()
+        self.assertTrue(result["valid"], result.get("invalid_events"))
+        self.assertEqual(result["total_events"], 45)
+        with self.db_manager.get_connection() as conn:
+            seqs = [row[0] for row in conn.execute("SELECT chain_seq FROM audit_events ORDER BY chain_seq")]
+        self.assertEqual(seqs, list(range(1, 46)))
+
+    def test_date_range_verification(self):
+        """Test verification of a window inside the chain."""
+        for i in range(5):
+            self.service.log_event(AuditEventType.PROMPT_UPDATED, "u", "prompt", f"p{i}", "update")
+            time.sleep(0.002)
+        events = sorted(self.service.get_events(), key=lambda event: event.timestamp)
+
+        result = self.service.verify_integrity(start_date=events[2].timestamp)
+        self.assertTrue(result["valid"])
+        self.assertEqual(result["total_events"], 3)
+
+
+class TestAuditQueries(unittest.TestCase):
+    """Test keyset pagination, full-text search and lazy decoding."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.service = AuditTrailService(FileDatabaseManager(self.db_path))
+        futures = [
+            self.service.log_event_async(
+                AuditEventType.PROMPT_UPDATED, f"user{i % 3}", "prompt", f"prompt{i}", "update",
+                details={"note": "quarterly review" if i % 10 == 0 else "routine"},
+                new_values={"owner": "compliance" if i == 7 else "team"}
+            )
+            for i in range(250)
+        ]
+        for future in futures:
+            future.result(timeout=10)
+
+    def tearDown(self):
+        self.service.flush()
+        os.unlink(self.db_path)
+
+    def test_pages_cover_all_events_once(self):
+        """Test that following cursors visits every event exactly once, newest first."""
+        seen = []
+        cursor = None
+        pages = 0
+        while True:
+            page = self.service.get_events_page(page_size=100, cursor=cursor)
+            seen.extend(page.events)
+            pages += 1
+            if not page.has_more:
+                break
+            cursor = page.next_cursor
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(len({event.id for event in seen}), 250)
+        keys = [(event.timestamp, event.id) for event in seen]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_filtered_pages(self):
+        """Test pagination combined with a user filter."""
+        first = self.service.get_events_page(page_size=50, user_id="user1")
+        second = self.service.get_events_page(page_size=50, cursor=first.next_cursor, user_id="user1")
+        self.assertEqual(len(first.events) + len(second.events), 83)
+        self.assertFalse(second.has_more)
+        self.assertTrue(all(event.user_id == "user1" for event in first.events + second.events))
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is rejected."""
+        with self.assertRaises(ValueError):
+            self.service.get_events_page(cursor="not-a-cursor")
+
+    def test_full_text_search(self):
+        """Test FTS over details and old/new values."""
+        self.assertEqual(len(self.service.search_events("quarterly", limit=100)), 25)
+        matches = self.service.search_events("compliance", search_fields=["values"])
+        self.assertEqual([event.resource_id for event in matches], ["prompt7"])
+        self.assertEqual(self.service.search_events("compliance"), [])
+
+    def test_search_index_rebuilt_after_vacuum(self):
+        """Test that VACUUM through the database manager rebuilds the FTS index."""
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("DELETE FROM audit_events WHERE resource_id IN ('prompt1', 'prompt2')")
+            conn.execute("INSERT INTO audit_events_fts (audit_events_fts) VALUES ('delete-all')")
+        self.assertEqual(self.service.search_events("quarterly", limit=100), [])
+
+        DatabaseManager(Path(self.db_path)).vacuum()
+        self.assertEqual(len(self.service.search_events("quarterly", limit=100)), 25)
+        matches = self.service.search_events("compliance", search_fields=["values"])
+        self.assertEqual([event.resource_id for event in matches], ["prompt7"])
+
+    def test_search_pagination(self):
+        """Test continuation tokens on search results."""
+        page = self.service.search_events_page("quarterly", page_size=10)
+        rest = self.service.search_events_page("quarterly", page_size=100, cursor=page.next_cursor)
+        self.assertEqual(len(page.events) + len(rest.events), 25)
+
+    def test_json_decoded_lazily(self):
+        """Test that JSON columns are decoded only when read."""
+        event = self.service.get_events(limit=1)[0]
+        self.assertEqual(event._decoded, {})
+        self.assertIn(event.details["note"], ("routine", "quarterly review"))
+        self.assertEqual(set(event._decoded), {"details"})
+
+
+class TestAuditExport(unittest.TestCase):
+    """Test streaming export and offline verification."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.db_manager = FileDatabaseManager(self.db_path)
+        self.service = AuditTrailService(self.db_manager)
+        for i in range(120):
+            self.service.log_event_async(
+                AuditEventType.PROMPT_UPDATED, f"user{i % 2}", "prompt", f"p{i}", "update",
+                details={"i": i, "text": "a,b \"quoted\"\nline"}, new_values={"v": i}
+            )
+        self.service.flush()
+
+    def tearDown(self):
+        os.unlink(self.db_path)
+
+    def test_csv_export_in_chunks_with_progress(self):
+        """Test chunked CSV export, progress reporting and verification."""
+        progress = []
+        output = io.StringIO()
+        footer = self.service.export_audit_trail_to(
+            output, "csv", chunk_size=50, progress_callback=lambda done, total: progress.append((done, total))
+        )
+
+        self.assertEqual(progress, [(50, 120), (100, 120), (120, 120)])
+        self.assertEqual(footer["event_count"], 120)
+        output.seek(0)
+        result = self.service.verify_export(output, "csv")
+        self.assertTrue(result["valid"], result)
+
+    def test_legacy_string_export_shape(self):
+        """Test that export_audit_trail keeps its original CSV and JSON shape."""
+        rows = list(csv.reader(io.StringIO(self.service.export_audit_trail("csv", user_id="user1"))))
+        self.assertEqual(len(rows), 61)
+        self.assertEqual(rows[0][-1], "Checksum")
+        self.assertTrue(all(len(row) == 14 for row in rows))
+        self.assertEqual(json.loads(rows[1][10]), {"i": 119, "text": "a,b \"quoted\"\nline"})
+
+        document = json.loads(self.service.export_audit_trail("json", user_id="user0"))
+        self.assertEqual(document["export_metadata"]["total_events"], 60)
+        self.assertEqual(document["export_metadata"]["format_version"], "1.0")
+        self.assertEqual(document["events"][0]["new_values"], {"v": 118})
+        self.assertEqual(document["events"][0], self.service.get_events(user_id="user0", limit=1)[0].to_dict())
+
+    def test_gzip_jsonl_file_export(self):
+        """Test compressed JSON Lines export to a path."""
+        path = self.db_path + ".jsonl.gz"
+        try:
+            self.service.export_audit_trail_to(path, "jsonl", compress=True, chunk_size=7)
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f]
+
+            self.assertIn("_header", lines[0])
+            self.assertIn("_footer", lines[-1])
+            self.assertEqual(lines[1]["details"]["i"], 0)
+            self.assertTrue(self.service.verify_export(path, "jsonl", compressed=True)["valid"])
+        finally:
+            os.unlink(path)
+
+    def test_filtered_export_verifies(self):
+        """Test that exports skipping parts of the chain still verify."""
+        output = io.BytesIO()
+        footer = self.service.export_audit_trail_to(output, "jsonl", user_id="user1")
+        self.assertEqual(footer["event_count"], 60)
+
+        output.seek(0)
+        self.assertTrue(self.service.verify_export(output, "jsonl")["valid"])
+
+    def test_tampering_detected(self):
+        """Test that an edited row fails verification."""
+        output = io.StringIO()
+        self.service.export_audit_trail_to(output, "csv")
+        tampered = io.StringIO(output.getvalue().replace("user1", "mallory", 1))
+
+        result = self.service.verify_export(tampered, "csv")
+        self.assertFalse(result["valid"])
+        self.assertEqual(len(result["invalid_events"]), 1)
+
+    def test_compressed_text_sink_rejected(self):
+        """Test that gzip output requires a binary sink."""
+        with self.assertRaises(ValueError):
+            self.service.export_audit_trail_to(io.StringIO(), "csv", compress=True)
+
+
+class TestAuditChainMigration(unittest.TestCase):
+    """Test upgrading a table written before chain_seq existed."""
+
+    def test_existing_events_are_numbered_and_extended(self):
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            db_manager = FileDatabaseManager(db_path)
+            service = AuditTrailService(db_manager)
+            legacy = []
+            previous = ""
+            for i in range(3):
+                event = AuditEvent(event_type=AuditEventType.USER_LOGIN, user_id="u",
+                                   resource_type="user", resource_id="u", action="login",
+                                   timestamp=datetime(2024, 1, 1, 0, 0, i))
+                event.checksum = service._calculate_checksum(event, previous)
+                previous = event.checksum
+                legacy.append(event)
+
+            with db_manager.get_connection() as conn:
+                conn.execute("DROP TABLE audit_events")
+                conn.execute("""
+                    CREATE TABLE audit_events (
+                        id TEXT PRIMARY KEY, event_type TEXT NOT NULL, user_id TEXT NOT NULL,
+                        resource_type TEXT NOT NULL, resource_id TEXT NOT NULL, action TEXT NOT NULL,
+                        details TEXT DEFAULT '{}', ip_address TEXT, user_agent TEXT, session_id TEXT,
+                        old_values TEXT, new_values TEXT,
+                        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP, checksum TEXT NOT NULL
+                    )
+                """)
+                conn.executemany(
+                    "INSERT INTO audit_events (id, event_type, user_id, resource_type, resource_id, "
+                    "action, details, timestamp, checksum) VALUES (?, ?, ?, ?, ?, ?, '{}', ?, ?)",
+                    [(e.id, e.event_type.value, e.user_id, e.resource_type, e.resource_id,
+                      e.action, e.timestamp.isoformat(), e.checksum) for e in legacy]
+                )
+                conn.commit()
+
+            upgraded = AuditTrailService(db_manager)
+            upgraded.log_event(AuditEventType.USER_LOGOUT, "u", "user", "u", "logout")
+
+            result = upgraded.verify_integrity()
+            self.assertTrue(result["valid"], result.get("invalid_events"))
+            self.assertEqual(result["total_events"], 4)
+            upgraded.flush()
+            service.flush()
+        finally:
+            os.unlink(db_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
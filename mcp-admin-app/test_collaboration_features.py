@@ -9,12 +9,18 @@ import unittest
 import tempfile
 import os
 import sqlite3
+import asyncio
+import hashlib
+import threading
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 from pathlib import Path
 
 # Import the services and models
 from services.collaboration.user_management import UserManagementService
+from services.collaboration.password_hashing import (
+    AuthenticationOverloadedError, KDFPool, PasswordHasher
+)
 from services.collaboration.workspace_management import WorkspaceManagementService
 from services.collaboration.approval_workflow import ApprovalWorkflowService
 from services.collaboration.quality_gate import QualityGateService
@@ -228,6 +234,200 @@ class TestUserManagement(unittest.TestCase):
         ))
 
 
+class TestAuthorizationCache(unittest.TestCase):
+    """Test cached permission and session checks."""
+    
+    def setUp(self):
+        """Set up test database and service."""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False)
+        self.test_db.close()
+        
+        self.db_manager = MockDatabaseManager(self.test_db.name)
+        self.user_service = UserManagementService(self.db_manager)
+        self.viewer = self.user_service.create_user(
+            username="viewer", email="viewer@example.com",
+            full_name="Viewer User", password="password123",
+            role=UserRole.VIEWER
+        )
+        self.admin = self.user_service.create_user(
+            username="admin", email="admin@example.com",
+            full_name="Admin User", password="password123",
+            role=UserRole.ADMIN
+        )
+    
+    def tearDown(self):
+        """Clean up test database."""
+        self.db_manager.close()
+        os.unlink(self.test_db.name)
+    
+    def test_steady_state_checks_skip_database(self):
+        """Repeated checks are answered from the compiled permission set."""
+        self.user_service.grant_permission(
+            self.viewer.id, "prompt", "p1", PermissionType.WRITE, self.admin.id
+        )
+        self.assertTrue(self.user_service.check_permission(
+            self.viewer.id, "prompt", "p1", PermissionType.WRITE
+        ))
+        
+        with patch.object(self.db_manager, "get_connection", side_effect=AssertionError("DB used")):
+            self.assertTrue(self.user_service.check_permission(
+                self.viewer.id, "prompt", "p1", PermissionType.WRITE
+            ))
+            self.assertFalse(self.user_service.check_permission(
+                self.viewer.id, "prompt", "p2", PermissionType.WRITE
+            ))
+        
+        self.assertGreater(self.user_service.authorization_cache.get_stats()["hits"], 0)
+    
+    def test_bulk_check_permissions(self):
+        """A page of resources is answered in one call."""
+        self.user_service.grant_permission(
+            self.viewer.id, "prompt", "p2", PermissionType.DELETE, self.admin.id
+        )
+        self.user_service.grant_permission(
+            self.viewer.id, "prompt", "p3", PermissionType.DELETE, self.admin.id,
+            expires_at=datetime.now() - timedelta(minutes=1)
+        )
+        
+        resources = [("prompt", "p1"), ("prompt", "p2"), ("prompt", "p3")]
+        results = self.user_service.check_permissions(self.viewer.id, resources, PermissionType.DELETE)
+        self.assertEqual(results, {("prompt", "p1"): False, ("prompt", "p2"): True, ("prompt", "p3"): False})
+        
+        admin_results = self.user_service.check_permissions(self.admin.id, resources, PermissionType.DELETE)
+        self.assertTrue(all(admin_results.values()))
+        
+        unknown = self.user_service.check_permissions("missing", resources, PermissionType.READ)
+        self.assertFalse(any(unknown.values()))
+    
+    def test_duplicate_grants_keep_longest_expiry(self):
+        """Overlapping grants for one key resolve to the longest-lasting."""
+        soon = datetime.now() + timedelta(minutes=5)
+        later = datetime.now() + timedelta(days=1)
+        for resource_id, expiries in (("p1", (None, soon)), ("p2", (soon, None)), ("p3", (later, soon))):
+            for expires_at in expiries:
+                self.user_service.grant_permission(
+                    self.viewer.id, "prompt", resource_id, PermissionType.WRITE, self.admin.id,
+                    expires_at=expires_at
+                )
+        
+        grants = self.user_service._get_permission_set(self.viewer.id).grants
+        self.assertIsNone(grants[("prompt", "p1", PermissionType.WRITE.value)])
+        self.assertIsNone(grants[("prompt", "p2", PermissionType.WRITE.value)])
+        self.assertEqual(grants[("prompt", "p3", PermissionType.WRITE.value)], later)
+    
+    def test_user_changes_invalidate_cache(self):
+        """Role changes and deletion take effect immediately."""
+        self.assertFalse(self.user_service.check_permission(
+            self.viewer.id, "prompt", "p1", PermissionType.WRITE
+        ))
+        
+        self.user_service.update_user(self.viewer.id, {"role": UserRole.EDITOR})
+        self.assertTrue(self.user_service.check_permission(
+            self.viewer.id, "prompt", "p1", PermissionType.WRITE
+        ))
+        
+        self.user_service.delete_user(self.viewer.id)
+        self.assertFalse(self.user_service.check_permission(
+            self.viewer.id, "prompt", "p1", PermissionType.READ
+        ))
+    
+    def test_session_cache_invalidation(self):
+        """Cached sessions end on logout, replacement and deletion."""
+        token = self.user_service.create_session(self.viewer.id)
+        self.assertEqual(self.user_service.validate_session(token).id, self.viewer.id)
+        
+        with patch.object(self.db_manager, "get_connection", side_effect=AssertionError("DB used")):
+            self.assertEqual(self.user_service.validate_session(token).id, self.viewer.id)
+        
+        new_token = self.user_service.create_session(self.viewer.id)
+        self.assertIsNone(self.user_service.validate_session(token))
+        self.assertIsNotNone(self.user_service.validate_session(new_token))
+        
+        self.user_service.logout_user(self.viewer.id)
+        self.assertIsNone(self.user_service.validate_session(new_token))
+        
+        token = self.user_service.create_session(self.viewer.id)
+        self.assertIsNotNone(self.user_service.validate_session(token))
+        self.user_service.delete_user(self.viewer.id)
+        self.assertIsNone(self.user_service.validate_session(token))
+
+
+class TestPasswordHashing(unittest.TestCase):
+    """Test pooled key derivation and hash upgrades."""
+    
+    def setUp(self):
+        """Set up test database and service."""
+        self.test_db = tempfile.NamedTemporaryFile(delete=False)
+        self.test_db.close()
+        
+        self.db_manager = MockDatabaseManager(self.test_db.name)
+        self.kdf_pool = KDFPool(max_workers=1, max_queue=0)
+        self.user_service = UserManagementService(self.db_manager, kdf_pool=self.kdf_pool)
+    
+    def tearDown(self):
+        """Clean up test database."""
+        self.kdf_pool.shutdown()
+        self.db_manager.close()
+        os.unlink(self.test_db.name)
+    
+    def _stored_hash(self, user_id):
+        return self.db_manager.connection.execute(
+            "SELECT password_hash, salt FROM users WHERE id = ?", (user_id,)
+        ).fetchone()
+    
+    def test_legacy_hash_upgraded_on_login(self):
+        """PBKDF2 hashes still verify and are replaced with scrypt on login."""
+        legacy = UserManagementService(
+            self.db_manager, kdf_pool=self.kdf_pool,
+            password_hasher=PasswordHasher(scheme="pbkdf2_sha256")
+        )
+        user = legacy.create_user("legacy", "legacy@example.com", "Legacy", "password123")
+        # Rewrite as the original bare-hex PBKDF2 format
+        salt = "a" * 64
+        legacy_hash = hashlib.pbkdf2_hmac('sha256', b"password123", salt.encode(), 100000).hex()
+        self.db_manager.connection.execute(
+            "UPDATE users SET password_hash = ?, salt = ? WHERE id = ?", (legacy_hash, salt, user.id)
+        )
+        
+        self.assertIsNone(self.user_service.authenticate_user("legacy", "wrong"))
+        self.assertEqual(self._stored_hash(user.id)[0], legacy_hash)
+        
+        self.assertIsNotNone(self.user_service.authenticate_user("legacy", "password123"))
+        upgraded = self._stored_hash(user.id)[0]
+        self.assertTrue(upgraded.startswith("scrypt$"))
+        
+        self.assertIsNotNone(self.user_service.authenticate_user("legacy", "password123"))
+        self.assertEqual(self._stored_hash(user.id)[0], upgraded)
+        
+        metrics = self.user_service.get_login_metrics()
+        self.assertEqual((metrics["succeeded"], metrics["failed"], metrics["rehashed"]), (2, 1, 1))
+        self.assertGreater(metrics["kdf"]["latency_ms_p95"], 0)
+    
+    def test_full_backlog_sheds_logins(self):
+        """Logins are rejected immediately while the pool backlog is full."""
+        self.user_service.create_user("user", "user@example.com", "User", "password123")
+        release = threading.Event()
+        blocker = self.kdf_pool.submit(release.wait, 5)
+        try:
+            with self.assertRaises(AuthenticationOverloadedError):
+                self.user_service.authenticate_user("user", "password123")
+        finally:
+            release.set()
+            blocker.result(5)
+        
+        self.assertIsNotNone(self.user_service.authenticate_user("user", "password123"))
+        self.assertEqual(self.user_service.get_login_metrics()["shed"], 1)
+        self.assertEqual(self.kdf_pool.get_stats()["shed"], 1)
+    
+    def test_async_authentication(self):
+        """The coroutine variant awaits the pool instead of blocking."""
+        user = self.user_service.create_user("async", "async@example.com", "Async", "password123")
+        
+        authenticated = asyncio.run(self.user_service.authenticate_user_async("async", "password123"))
+        self.assertEqual(authenticated.id, user.id)
+        self.assertIsNone(asyncio.run(self.user_service.authenticate_user_async("async", "nope")))
+
+
 class TestWorkspaceManagement(unittest.TestCase):
     """Test workspace management functionality."""
     
@@ -522,6 +722,77 @@ class TestQualityGate(unittest.TestCase):
         result = self.quality_service.evaluate_prompt(security_gate.id, problematic_prompt_data)
         self.assertIn("overall_score", result)
         self.assertFalse(result["passed"])  # Should fail security check
+    
+    def _create_review_gate(self):
+        return self.quality_service.create_gate(
+            name="Review Gate",
+            description="Approval plus content scans",
+            criteria=[
+                {"type": "security_scan", "weight": 0.1, "threshold": 0.0},
+                {"type": "approval_status", "weight": 0.8, "threshold": 1.0},
+                {"type": "pii_detection", "weight": 0.1, "threshold": 0.0}
+            ],
+            required_score=0.5,
+            created_by="system"
+        )
+    
+    def test_evaluation_results_memoized(self):
+        """Repeat evaluations are served from the persistent result cache."""
+        gate = self._create_review_gate()
+        prompt_data = {"content": "Summarize {text}", "approval_status": "approved",
+                       "author": "alice"}
+        
+        first = self.quality_service.evaluate_prompt(gate.id, prompt_data)
+        self.assertNotIn("cached", first)
+        
+        # Fields the gate does not read are not part of the key
+        second = self.quality_service.evaluate_prompt(gate.id, dict(prompt_data, author="bob"))
+        self.assertTrue(second.pop("cached"))
+        self.assertEqual(second, first)
+        
+        reopened = QualityGateService(self.db_manager)
+        self.assertTrue(reopened.evaluate_prompt(gate.id, prompt_data)["cached"])
+        self.assertEqual(reopened.result_cache.get_stats()["stored_results"], 1)
+        
+        changed = self.quality_service.evaluate_prompt(gate.id, dict(prompt_data, approval_status="rejected"))
+        self.assertNotIn("cached", changed)
+        self.assertNotIn("cached", self.quality_service.evaluate_prompt(
+            gate.id, dict(prompt_data, content="Summarize {text} briefly")))
+    
+    def test_gate_update_invalidates_results(self):
+        """Editing a gate drops its cached definition and results."""
+        gate = self._create_review_gate()
+        prompt_data = {"content": "Summarize {text}", "approval_status": "pending"}
+        
+        self.assertFalse(self.quality_service.evaluate_prompt(gate.id, prompt_data)["passed"])
+        self.quality_service.update_gate(gate.id, required_score=0.3)
+        
+        result = self.quality_service.evaluate_prompt(gate.id, prompt_data)
+        self.assertNotIn("cached", result)
+        self.assertTrue(result["passed"])
+        self.assertEqual(self.quality_service.get_gate(gate.id).required_score, 0.3)
+        self.assertEqual(self.quality_service.result_cache.get_stats()["stored_results"], 1)
+        
+        with self.assertRaises(ValueError):
+            self.quality_service.update_gate(gate.id, owner="someone")
+    
+    def test_short_circuit_skips_content_scans(self):
+        """Content scans are skipped once the verdict is decided."""
+        gate = self._create_review_gate()
+        rejected = {"content": "Call 555-123-4567", "approval_status": "rejected"}
+        
+        result = self.quality_service.evaluate_prompt(gate.id, rejected, short_circuit=True)
+        self.assertTrue(result["short_circuited"])
+        self.assertFalse(result["passed"])
+        self.assertEqual([c.get("skipped", False) for c in result["criteria_results"]],
+                         [True, False, True])
+        self.assertEqual(self.quality_service.result_cache.get_stats()["stored_results"], 0)
+        
+        full = self.quality_service.evaluate_prompt(gate.id, rejected)
+        self.assertEqual(full["passed"], result["passed"])
+        self.assertFalse(self.quality_service.passes_gate(gate.id, rejected))
+        self.assertTrue(self.quality_service.passes_gate(
+            gate.id, dict(rejected, approval_status="approved")))
 
 
 class TestAuditTrail(unittest.TestCase):
@@ -0,0 +1,132 @@
+"""
+Tests for the Dashboard Data Service
+====================================
+
+Checks that panels are computed on the worker, published as snapshots
+through the UI state manager, and only recomputed when their source
+tables' watermarks, their parameters or their age say so.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from test_tool_sync import FileDatabaseManager
+from ui.dashboard_data import DashboardDataService
+from ui.state_manager import UIStateManager
+
+
+class TestDashboardDataService(unittest.TestCase):
+    """Test watermark-driven panel refreshes."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("CREATE TABLE evaluation_results (id INTEGER PRIMARY KEY, score REAL, created_at TEXT)")
+            conn.execute("CREATE TABLE llm_usage_records (id INTEGER PRIMARY KEY, cost REAL, timestamp TEXT)")
+
+        self.state_manager = UIStateManager()
+        self.service = DashboardDataService(FileDatabaseManager(self.db_path), self.state_manager)
+        self.calls = {"scores": 0, "costs": 0}
+        self.published = []
+        self.delivered = threading.Event()
+        self.service.subscribe(self.on_snapshot)
+
+        self.service.register_panel("scores", self.compute_scores, ["evaluation_results"], {"scale": 1})
+        self.service.register_panel("costs", self.compute_costs, ["llm_usage_records"])
+
+    def tearDown(self):
+        self.service.shutdown()
+        self.state_manager.shutdown()
+        os.remove(self.db_path)
+
+    def on_snapshot(self, snapshot):
+        self.published.append(snapshot)
+        self.delivered.set()
+
+    def compute_scores(self, params):
+        self.calls["scores"] += 1
+        with sqlite3.connect(self.db_path) as conn:
+            total = conn.execute("SELECT COALESCE(SUM(score), 0) FROM evaluation_results").fetchone()[0]
+        return {"text": f"{total * params['scale']:.1f}"}
+
+    def compute_costs(self, params):
+        self.calls["costs"] += 1
+        return {"text": "costs"}
+
+    def refresh(self, **kwargs):
+        self.service.refresh(**kwargs).result(timeout=5)
+
+    def test_only_changed_panels_recompute(self):
+        """A new row recomputes the panels reading that table and nothing else."""
+        self.refresh()
+        self.assertTrue(self.delivered.wait(5))
+        self.assertEqual(self.calls, {"scores": 1, "costs": 1})
+
+        self.refresh()
+        self.assertEqual(self.calls, {"scores": 1, "costs": 1})
+        self.assertEqual(self.service.get_stats()["skipped"], 2)
+
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("INSERT INTO evaluation_results (score, created_at) VALUES (2.5, '2026-01-01T10:00:00')")
+        self.refresh()
+        self.assertEqual(self.calls, {"scores": 2, "costs": 1})
+        snapshot = self.service.latest("scores")
+        self.assertEqual(snapshot.view_model, {"text": "2.5"})
+        self.assertEqual(snapshot.watermark, (("2026-01-01T10:00:00", 1),))
+
+        # Parameter changes and explicit forcing also recompute
+        self.assertTrue(self.service.set_params("scores", scale=2))
+        self.assertFalse(self.service.set_params("scores", scale=2))
+        self.refresh(panels=["scores"])
+        self.assertEqual(self.service.latest("scores").view_model, {"text": "5.0"})
+        self.refresh(panels=["costs"], force=True)
+        self.assertEqual(self.calls, {"scores": 3, "costs": 2})
+
+        # The latest snapshots arrive through the state manager
+        latest = [self.service.latest("scores"), self.service.latest("costs")]
+        deadline = time.monotonic() + 5
+        while not all(any(s is snapshot for s in self.published) for snapshot in latest):
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_errors_and_age(self):
+        """Failed panels are retried; old snapshots are recomputed after max_age."""
+        def broken(params):
+            raise RuntimeError("no data")
+
+        self.service.register_panel("broken", broken, ["missing_table"])
+        self.refresh(panels=["broken"])
+        snapshot = self.service.latest("broken")
+        self.assertEqual(snapshot.error, "no data")
+        self.assertEqual(snapshot.watermark, (None,))
+        self.refresh(panels=["broken"])
+        self.assertIsNot(self.service.latest("broken"), snapshot)
+
+        self.service.max_age = 0
+        self.refresh(panels=["costs"])
+        self.refresh(panels=["costs"])
+        self.assertEqual(self.calls["costs"], 2)
+
+    def test_worker_failure_does_not_stop_refreshes(self):
+        """A refresh that fails outside a panel leaves later refreshes working."""
+        db_manager = self.service.db_manager
+        self.service.db_manager = None
+        with self.assertRaises(AttributeError):
+            self.refresh()
+        self.assertFalse(self.service.get_stats()["running"])
+
+        self.service.db_manager = db_manager
+        self.refresh()
+        self.assertEqual(self.calls, {"scores": 1, "costs": 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+"""
+Tests for Human Rating Storage
+==============================
+
+Covers the SQLite rating store: config migration, per-record writes,
+paged task and rating queries, and incremental rater statistics.
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.evaluation.human_rating import (
+    HumanRater, HumanRating, HumanRatingInterface, RatingPriority, RatingStatus, RatingTask
+)
+from services.evaluation.scoring_engine import EvaluationScore
+
+
+class FileDatabaseManager:
+    """Database manager opening a fresh connection per use."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    @contextmanager
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+class DictConfigManager:
+    """Config manager backed by a plain dict."""
+
+    def __init__(self, values=None):
+        self.values = values or {}
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def set(self, key, value):
+        self.values[key] = value
+        return True
+
+
+class TestHumanRatingStore(unittest.TestCase):
+    """Test rating persistence through HumanRatingInterface."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_manager = FileDatabaseManager(os.path.join(self.temp_dir, "ratings.db"))
+        self.config = DictConfigManager()
+        self.interface = HumanRatingInterface(self.config, self.db_manager)
+
+        self.alice = HumanRater(name="Alice", expertise_areas=["code"], reliability_score=0.9)
+        self.bob = HumanRater(name="Bob", expertise_areas=["writing"], reliability_score=0.7)
+        self.interface.add_rater(self.alice)
+        self.interface.add_rater(self.bob)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _complete_task(self, response_id, rater, overall_score, minutes=4):
+        task = self.interface.create_rating_task(response_id, "rubric-1", rater_id=rater.id)
+        self.assertTrue(self.interface.start_rating_task(task.id, rater.id))
+        scores = [EvaluationScore(criterion_id="accuracy", score=overall_score)]
+        return self.interface.submit_rating(task.id, rater.id, scores, overall_score,
+                                            rating_time_minutes=minutes)
+
+    def test_records_persist_across_instances(self):
+        """Raters, tasks and ratings are read back from the database."""
+        rating = self._complete_task("resp-1", self.alice, 8.0)
+        self.assertIsNotNone(rating)
+
+        reopened = HumanRatingInterface(self.config, self.db_manager)
+        self.assertEqual(reopened.get_rater(self.alice.id).name, "Alice")
+
+        stored = reopened.get_ratings_for_response("resp-1")
+        self.assertEqual([r.id for r in stored], [rating.id])
+        self.assertEqual(stored[0].scores[0].criterion_id, "accuracy")
+        self.assertEqual(reopened.get_task(rating.task_id).status, RatingStatus.COMPLETED)
+        self.assertEqual(self.config.values, {})
+
+    def test_available_raters_sorted_and_auto_assigned(self):
+        """Auto-assignment picks the most reliable active rater."""
+        self.bob.reliability_score = 0.95
+        self.interface.update_rater(self.bob)
+
+        raters = self.interface.get_available_raters()
+        self.assertEqual([r.name for r in raters], ["Bob", "Alice"])
+        self.assertEqual([r.name for r in self.interface.get_available_raters("code")], ["Alice"])
+
+        task = self.interface.create_rating_task("resp-1", "rubric-1")
+        self.assertEqual(task.rater_id, self.bob.id)
+        self.assertGreater(task.due_date, datetime.now() + timedelta(hours=23))
+
+    def test_tasks_for_rater_ordered_and_paged(self):
+        """Tasks come back by priority then due date, one page at a time."""
+        created = {}
+        for priority, hours in ((RatingPriority.LOW, 1), (RatingPriority.URGENT, 48),
+                                (RatingPriority.NORMAL, 2), (RatingPriority.URGENT, 3)):
+            task = self.interface.create_rating_task("resp", "rubric-1", rater_id=self.alice.id,
+                                                     priority=priority, due_hours=hours)
+            created[(priority, hours)] = task.id
+        self.interface.create_rating_task("resp", "rubric-1", rater_id=self.bob.id)
+
+        expected = [created[(RatingPriority.URGENT, 3)], created[(RatingPriority.URGENT, 48)],
+                    created[(RatingPriority.NORMAL, 2)], created[(RatingPriority.LOW, 1)]]
+        all_tasks = self.interface.get_tasks_for_rater(self.alice.id)
+        self.assertEqual([t.id for t in all_tasks], expected)
+
+        first = self.interface.get_tasks_for_rater(self.alice.id, limit=2)
+        second = self.interface.get_tasks_for_rater(self.alice.id, limit=2, offset=2)
+        self.assertEqual([t.id for t in first + second], expected)
+
+        self.interface.start_rating_task(expected[0], self.alice.id)
+        pending = self.interface.get_tasks_for_rater(self.alice.id, RatingStatus.PENDING)
+        self.assertEqual([t.id for t in pending], expected[1:])
+
+    def test_task_transitions_are_conditional(self):
+        """Tasks only start, submit and reassign from the expected state."""
+        task = self.interface.create_rating_task("resp-1", "rubric-1", rater_id=self.alice.id)
+        self.assertFalse(self.interface.start_rating_task(task.id, self.bob.id))
+        self.assertIsNone(self.interface.submit_rating(task.id, self.alice.id, [], 5.0))
+
+        self.assertTrue(self.interface.reassign_task(task.id, self.bob.id))
+        self.assertTrue(self.interface.start_rating_task(task.id, self.bob.id))
+        self.assertFalse(self.interface.reassign_task(task.id, self.alice.id))
+        self.assertIsNotNone(self.interface.submit_rating(task.id, self.bob.id, [], 5.0))
+        self.assertIsNone(self.interface.submit_rating(task.id, self.bob.id, [], 5.0))
+        self.assertEqual(len(self.interface.get_ratings_for_response("resp-1")), 1)
+
+        skipped = self.interface.create_rating_task("resp-2", "rubric-1", rater_id=self.alice.id)
+        self.assertTrue(self.interface.skip_rating_task(skipped.id, self.alice.id, "conflict"))
+        stored = self.interface.get_task(skipped.id)
+        self.assertEqual(stored.status, RatingStatus.SKIPPED)
+        self.assertEqual(stored.metadata["skip_reason"], "conflict")
+
+    def test_rater_statistics_maintained_incrementally(self):
+        """Rating totals and averages update with each submission."""
+        self._complete_task("resp-1", self.alice, 6.0, minutes=2)
+        self._complete_task("resp-2", self.alice, 8.0, minutes=6)
+        self.interface.create_rating_task("resp-3", "rubric-1", rater_id=self.alice.id)
+
+        stats = self.interface.get_rater_statistics(self.alice.id)
+        self.assertEqual(stats["total_ratings"], 2)
+        self.assertAlmostEqual(stats["average_score"], 7.0)
+        self.assertEqual(stats["rater"]["rating_count"], 2)
+        self.assertAlmostEqual(stats["rater"]["average_rating_time"], 4.0)
+        self.assertEqual(stats["task_counts"]["completed"], 2)
+        self.assertEqual(stats["task_counts"]["pending"], 1)
+        self.assertEqual(stats["recent_ratings"][0]["response_id"], "resp-2")
+        self.assertEqual(self.interface.get_rater_statistics("missing"), {})
+
+    def test_quality_metrics_and_pending_summary(self):
+        """Aggregates are computed from the stored rows."""
+        self._complete_task("resp-1", self.alice, 6.0)
+        self._complete_task("resp-1", self.bob, 8.0)
+        self._complete_task("resp-2", self.alice, 7.0)
+        self.interface.create_rating_task("resp-3", "rubric-1", rater_id=self.bob.id,
+                                          priority=RatingPriority.HIGH)
+
+        metrics = self.interface.get_rating_quality_metrics()
+        self.assertEqual(metrics["total_ratings"], 3)
+        self.assertEqual(metrics["unique_responses_rated"], 2)
+        self.assertEqual(metrics["multi_rated_responses"], 1)
+        self.assertAlmostEqual(metrics["average_inter_rater_agreement"], 0.5)
+        self.assertAlmostEqual(metrics["average_overall_score"], 7.0)
+
+        summary = self.interface.get_pending_tasks_summary()
+        self.assertEqual(summary["total_pending"], 1)
+        self.assertEqual(summary["priority_breakdown"]["high"], 1)
+        self.assertEqual(summary["rater_workload"], {self.bob.id: 1})
+        self.assertEqual(summary["overdue_count"], 0)
+
+    def test_migrates_config_blobs(self):
+        """Legacy config data is imported once and the config entries cleared."""
+        rater = HumanRater(name="Carol", rating_count=1)
+        task = RatingTask(response_id="resp-9", rater_id=rater.id, status=RatingStatus.COMPLETED)
+        rating = HumanRating(task_id=task.id, response_id="resp-9", rater_id=rater.id,
+                             overall_score=9.0,
+                             scores=[EvaluationScore(criterion_id="clarity", score=9.0)])
+        config = DictConfigManager({
+            "human_raters": {rater.id: rater.to_dict()},
+            "rating_tasks": {task.id: task.to_dict()},
+            "human_ratings": {rating.id: rating.to_dict()},
+        })
+
+        interface = HumanRatingInterface(config, self.db_manager)
+        self.assertEqual(config.values["human_raters"], {})
+        self.assertEqual(interface.get_task(task.id).status, RatingStatus.COMPLETED)
+        migrated = interface.get_ratings_for_response("resp-9")
+        self.assertEqual(migrated[0].scores[0].criterion_id, "clarity")
+
+        stats = interface.get_rater_statistics(rater.id)
+        self.assertEqual(stats["total_ratings"], 1)
+        self.assertAlmostEqual(stats["average_score"], 9.0)
+
+        # A second import of the same data leaves existing rows alone
+        interface.store.migrate_from_config(DictConfigManager({"human_ratings": {rating.id: rating.to_dict()}}))
+        self.assertEqual(len(interface.get_ratings_for_response("resp-9")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
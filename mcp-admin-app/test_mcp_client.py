@@ -0,0 +1,223 @@
+"""
+Tests for the MCP Stdio Client
+==============================
+
+Runs a stub MCP server script as a real subprocess and exercises the
+handshake, request multiplexing, tool discovery and stderr capture.
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import textwrap
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.base import ServerStatus
+from services.mcp_client import (
+    MCPClientLoop, MCPConnectionError, MCPRequestError, MCPSession
+)
+from services.server_manager import ServerManager
+from services.tool_discovery import ToolDiscoveryEngine
+
+
+STUB_SERVER = textwrap.dedent('''
+    import json
+    import sys
+
+    TOOLS = [
+        {"name": "read_file", "description": "Read a file from the filesystem",
+         "inputSchema": {"type": "object", "properties": {"path": {"type": "string"}},
+                         "required": ["path"]}},
+        {"name": "web_search", "description": "Search the web for a query",
+         "inputSchema": {"type": "object", "properties": {"query": {"type": "string"}}}},
+    ]
+
+    def send(message):
+        sys.stdout.write(json.dumps(message) + "\\n")
+        sys.stdout.flush()
+
+    def reply(request, result):
+        send({"jsonrpc": "2.0", "id": request["id"], "result": result})
+
+    deferred = []
+    for line in sys.stdin:
+        request = json.loads(line)
+        method = request.get("method")
+        if method == "initialize":
+            sys.stderr.write("stub ready\\n")
+            sys.stderr.flush()
+            reply(request, {"protocolVersion": request["params"]["protocolVersion"],
+                            "serverInfo": {"name": "stub", "version": "0.1"},
+                            "capabilities": {"tools": {}}})
+        elif method == "notifications/initialized":
+            sys.stderr.write("initialized\\n")
+            sys.stderr.flush()
+        elif method == "tools/list":
+            if request.get("params", {}).get("cursor") == "page-2":
+                reply(request, {"tools": TOOLS[1:]})
+            else:
+                reply(request, {"tools": TOOLS[:1], "nextCursor": "page-2"})
+        elif method == "defer":
+            deferred.append(request)
+        elif method == "release":
+            reply(request, {"released": len(deferred)})
+            for held in deferred:
+                reply(held, {"value": held["params"]["value"]})
+            deferred = []
+        elif method == "spam":
+            for i in range(request["params"]["lines"]):
+                sys.stderr.write("line %d %s\\n" % (i, "x" * 100))
+            sys.stderr.flush()
+            reply(request, {})
+        elif method == "fail":
+            send({"jsonrpc": "2.0", "id": request["id"],
+                  "error": {"code": -32000, "message": "stub failure"}})
+        elif method == "exit":
+            sys.exit(3)
+''')
+
+
+class StubConfigManager:
+    """Config manager keeping the servers config in memory."""
+
+    def __init__(self):
+        self.servers_config = {"servers": []}
+
+    def get_servers_config(self):
+        return self.servers_config
+
+    def save_servers_config(self, config):
+        self.servers_config = config
+
+
+class TestMCPSession(unittest.TestCase):
+    """Test the JSON-RPC session against the stub server."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.stub_path = os.path.join(cls.temp_dir, "stub_mcp_server.py")
+        with open(cls.stub_path, "w") as f:
+            f.write(STUB_SERVER)
+        cls.loop = MCPClientLoop()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.shutdown()
+        shutil.rmtree(cls.temp_dir)
+
+    def setUp(self):
+        self.session = MCPSession(sys.executable, [self.stub_path], log_lines=100, name="stub")
+        self.loop.run(self.session.start(timeout=10), timeout=20)
+
+    def tearDown(self):
+        self.loop.run(self.session.close(timeout=5), timeout=20)
+
+    def test_handshake_and_paginated_tool_list(self):
+        """initialize completes the handshake and tools/list follows cursors."""
+        self.assertTrue(self.session.is_alive)
+        self.assertEqual(self.session.server_info["name"], "stub")
+        self.assertIn("tools", self.session.capabilities)
+
+        tools = self.loop.run(self.session.list_tools(timeout=5), timeout=10)
+        self.assertEqual([t["name"] for t in tools], ["read_file", "web_search"])
+        self.assertTrue(any(line.endswith("initialized") for line in self.session.get_logs()))
+
+    def test_responses_matched_by_id(self):
+        """Concurrent requests resolve correctly when answered out of order."""
+        async def exchange():
+            deferred = [asyncio.ensure_future(self.session.request("defer", {"value": i}, timeout=5))
+                        for i in range(3)]
+            await asyncio.sleep(0.05)
+            released = await self.session.request("release", timeout=5)
+            return released, await asyncio.gather(*deferred)
+
+        released, values = self.loop.run(exchange(), timeout=10)
+        self.assertEqual(released, {"released": 3})
+        self.assertEqual([v["value"] for v in values], [0, 1, 2])
+
+    def test_error_response_and_server_exit(self):
+        """JSON-RPC errors raise MCPRequestError; exit fails pending requests."""
+        with self.assertRaises(MCPRequestError) as context:
+            self.loop.run(self.session.request("fail", timeout=5), timeout=10)
+        self.assertEqual(context.exception.code, -32000)
+
+        with self.assertRaises(MCPConnectionError):
+            self.loop.run(self.session.request("exit", timeout=5), timeout=10)
+        self.loop.run(asyncio.sleep(0.1))
+        self.assertFalse(self.session.is_alive)
+        self.assertEqual(self.session.returncode, 3)
+
+    def test_stderr_drained_into_ring_buffer(self):
+        """A chatty server never blocks and only recent lines are kept."""
+        # Far more than a pipe buffer holds
+        self.loop.run(self.session.request("spam", {"lines": 5000}, timeout=10), timeout=20)
+        self.loop.run(asyncio.sleep(0.1))
+
+        logs = self.session.get_logs(1000)
+        self.assertEqual(len(logs), 100)
+        self.assertIn("line 4999", logs[-1])
+        self.assertEqual(len(self.session.get_logs(10)), 10)
+
+
+class TestServerManagerSessions(unittest.TestCase):
+    """Test ServerManager lifecycle and tool discovery over sessions."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.mkdtemp()
+        cls.stub_path = os.path.join(cls.temp_dir, "stub_mcp_server.py")
+        with open(cls.stub_path, "w") as f:
+            f.write(STUB_SERVER)
+        cls.loop = MCPClientLoop()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.loop.shutdown()
+        shutil.rmtree(cls.temp_dir)
+
+    def setUp(self):
+        self.manager = ServerManager(StubConfigManager(), None, client_loop=self.loop,
+                                     startup_timeout=10)
+        server_id = self.manager.add_server({"name": "Stub", "command": sys.executable,
+                                             "args": [self.stub_path]})
+        self.server = self.manager.get_server(server_id)
+
+    def tearDown(self):
+        self.manager.shutdown()
+
+    def test_start_discover_and_stop(self):
+        """Started servers serve tools/list and stderr logs over the session."""
+        self.assertTrue(self.manager.start_server(self.server.id))
+        self.assertEqual(self.manager.get_server_status(self.server.id), ServerStatus.RUNNING)
+        self.assertTrue(self.manager.start_server(self.server.id))
+
+        tools = ToolDiscoveryEngine(self.manager).scan_server_tools(self.server.id)
+        self.assertEqual([t.name for t in tools], ["read_file", "web_search"])
+        self.assertEqual(tools[0].schema["function"]["parameters"]["required"], ["path"])
+        self.assertIsNotNone(tools[0].suggested_category)
+
+        self.assertTrue(self.manager.stop_server(self.server.id))
+        self.assertEqual(self.manager.get_server_status(self.server.id), ServerStatus.STOPPED)
+        self.assertIsNone(self.manager.get_session(self.server.id))
+        self.assertTrue(any("stub ready" in line for line in self.manager.get_server_logs(self.server.id)))
+        self.assertEqual(ToolDiscoveryEngine(self.manager).scan_server_tools(self.server.id), [])
+
+    def test_failed_handshake_marks_error(self):
+        """A process that exits before initializing is reported as failed."""
+        broken_id = self.manager.add_server({
+            "name": "Broken", "command": sys.executable,
+            "args": ["-c", "import sys; sys.stderr.write('boom\\n'); sys.exit(1)"]
+        })
+
+        self.assertFalse(self.manager.start_server(broken_id))
+        self.assertEqual(self.manager.get_server(broken_id).status, ServerStatus.ERROR)
+        self.assertTrue(any("boom" in line for line in self.manager.get_server_logs(broken_id)))
+
+
+if __name__ == "__main__":
+    unittest.main()
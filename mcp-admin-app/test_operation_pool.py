@@ -0,0 +1,110 @@
+"""
+Unit Tests for the UI Operation Pool
+====================================
+
+Tests priority lanes, bounded workers and the shared asyncio loop.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+from ui.operation_pool import OperationPool, OperationPriority
+
+
+class TestOperationPool(unittest.TestCase):
+    """Test the bounded priority worker pool."""
+
+    def setUp(self):
+        """Create a single-worker pool so ordering is deterministic."""
+        self.pool = OperationPool(max_workers=1, name="test-pool")
+
+    def tearDown(self):
+        """Stop the pool."""
+        self.pool.shutdown()
+
+    def test_submit_returns_result(self):
+        """Test that submitted callables resolve their futures."""
+        future = self.pool.submit(lambda a, b: a + b, 2, 3)
+        self.assertEqual(future.result(timeout=2), 5)
+
+    def test_exceptions_propagate(self):
+        """Test that worker exceptions surface on the future."""
+        def fail():
+            raise ValueError("boom")
+
+        future = self.pool.submit(fail)
+        with self.assertRaises(ValueError):
+            future.result(timeout=2)
+
+    def test_interactive_lane_runs_before_background(self):
+        """Test that queued interactive work overtakes background work."""
+        gate = threading.Event()
+        order = []
+
+        # Occupy the only worker so the rest queue up
+        blocker = self.pool.submit(gate.wait, 2)
+        time.sleep(0.05)
+
+        futures = [
+            self.pool.submit(order.append, "background", priority=OperationPriority.BACKGROUND),
+            self.pool.submit(order.append, "normal", priority=OperationPriority.NORMAL),
+            self.pool.submit(order.append, "interactive", priority=OperationPriority.INTERACTIVE),
+        ]
+        gate.set()
+
+        blocker.result(timeout=2)
+        for future in futures:
+            future.result(timeout=2)
+
+        self.assertEqual(order, ["interactive", "normal", "background"])
+
+    def test_worker_count_is_bounded(self):
+        """Test that a burst of submissions never exceeds max_workers threads."""
+        pool = OperationPool(max_workers=3, name="bounded-pool")
+        try:
+            futures = [pool.submit(time.sleep, 0.01) for _ in range(50)]
+            for future in futures:
+                future.result(timeout=5)
+            self.assertLessEqual(len(pool._workers), 3)
+        finally:
+            pool.shutdown()
+
+    def test_coroutines_share_one_loop(self):
+        """Test that coroutines run on the same long-lived event loop."""
+        async def current_loop():
+            await asyncio.sleep(0)
+            return asyncio.get_running_loop()
+
+        first = self.pool.submit(lambda: self.pool.run_coroutine(current_loop())).result(timeout=2)
+        second = self.pool.submit(lambda: self.pool.run_coroutine(current_loop())).result(timeout=2)
+
+        self.assertIs(first, second)
+        self.assertFalse(first.is_closed())
+
+    def test_cancelled_future_is_skipped(self):
+        """Test that cancelling a queued item prevents it from running."""
+        gate = threading.Event()
+        ran = []
+
+        blocker = self.pool.submit(gate.wait, 2)
+        time.sleep(0.05)
+        queued = self.pool.submit(ran.append, "ran")
+        self.assertTrue(queued.cancel())
+        gate.set()
+        blocker.result(timeout=2)
+
+        # Drain the queue with a follow-up item
+        self.pool.submit(lambda: None).result(timeout=2)
+        self.assertEqual(ran, [])
+
+    def test_submit_after_shutdown_raises(self):
+        """Test that a shut down pool rejects new work."""
+        self.pool.shutdown()
+        with self.assertRaises(RuntimeError):
+            self.pool.submit(lambda: None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+"""
+Tests for Streaming Output Capture
+==================================
+
+Checks byte caps, spill files and truncation markers, incremental JSON
+lines parsing, and ProcessSandbox.execute streaming real process output.
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.output_capture import JsonLinesParser, StreamCapture
+from services.process_supervisor import ProcessSupervisor
+from services.tool_execution import ProcessSandbox, SandboxConfig, SandboxType
+
+
+class TestStreamCapture(unittest.TestCase):
+    """Test capture caps and the JSON lines parser."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_spill_then_truncate(self):
+        """Memory holds the head, the file the stream up to its cap."""
+        chunks = []
+        spill_path = os.path.join(self.temp_dir, "out")
+        capture = StreamCapture("stdout", max_memory_bytes=10, max_spill_bytes=25, spill_path=spill_path,
+                                on_chunk=lambda name, chunk, total: chunks.append((name, len(chunk), total)))
+        for _ in range(4):
+            capture.feed(b"0123456789")
+        capture.close()
+
+        self.assertEqual(chunks[-1], ("stdout", 10, 40))
+        self.assertEqual((capture.spilled_bytes, capture.dropped_bytes), (25, 15))
+        with open(spill_path, "rb") as f:
+            self.assertEqual(f.read(), b"0123456789" * 2 + b"01234")
+        self.assertTrue(capture.text().startswith("0123456789\n... [stdout truncated: 40 bytes total, 25 saved"))
+
+        dropped = StreamCapture("stderr", max_memory_bytes=4)
+        dropped.feed(b"abcdef")
+        self.assertEqual(dropped.text(), "abcd\n... [stderr truncated: 6 bytes total]")
+
+    def test_json_lines_across_chunk_boundaries(self):
+        """Records split over chunks parse once complete; other text disables parsing."""
+        data = b"".join(json.dumps({"n": i}).encode() + b"\n" for i in range(50))
+        parser = JsonLinesParser(max_record_bytes=100)
+        for start in range(0, len(data), 7):
+            parser.feed(data[start:start + 7])
+        parser.close()
+        self.assertTrue(parser.is_json_lines)
+        self.assertEqual(parser.record_count, 50)
+        self.assertEqual(parser.records, [{"n": i} for i in range(len(parser.records))])
+        self.assertFalse(parser.complete)
+
+        parser = JsonLinesParser()
+        parser.feed(b'{"a": 1}\nplain text\n{"b": 2}')
+        parser.close()
+        self.assertFalse(parser.is_json_lines)
+
+
+class TestSandboxStreaming(unittest.TestCase):
+    """Test ProcessSandbox.execute output handling end to end."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.supervisor = ProcessSupervisor()
+
+    def tearDown(self):
+        self.supervisor.shutdown()
+        shutil.rmtree(self.temp_dir)
+
+    def execute(self, code, input_data=None, on_output=None, **limits):
+        config = SandboxConfig(
+            id="streaming", type=SandboxType.PROCESS, working_directory=self.temp_dir,
+            resource_limits={"max_memory_mb": 512, "max_execution_time": 20, **limits}
+        )
+        sandbox = ProcessSandbox(config, supervisor=self.supervisor)
+        sandbox.create()
+        return sandbox.execute([sys.executable, "-c", code], input_data=input_data, on_output=on_output)
+
+    def test_large_output_spills_to_file(self):
+        """Output beyond the memory cap lands in a file referenced by the result."""
+        progress = []
+        result = self.execute(
+            "import sys\nfor i in range(20000): sys.stdout.write('line %06d ' % i + 'x' * 240 + '\\n')",
+            on_output=lambda name, chunk, total: progress.append(total),
+            max_output_memory_bytes=64 * 1024
+        )
+
+        self.assertTrue(result.success, result.error_message)
+        self.assertEqual(result.result["type"], "text")
+        self.assertEqual(result.result["bytes"], 20000 * 253)
+        self.assertFalse(result.result["truncated"])
+        self.assertEqual(os.path.getsize(result.metadata["output_file"]), 20000 * 253)
+        self.assertLess(len(result.result["output"]), 64 * 1024 + 200)
+        self.assertIn("stdout truncated", result.logs[0])
+        self.assertGreater(len(progress), 10)
+
+    def test_json_lines_and_input(self):
+        """JSON lines output becomes records; stdin input is delivered."""
+        result = self.execute(
+            "import json, sys\nfor word in sys.stdin.read().split(): print(json.dumps({'word': word}))",
+            input_data="alpha beta gamma"
+        )
+        self.assertEqual(result.result, {"records": [{"word": "alpha"}, {"word": "beta"}, {"word": "gamma"}],
+                                         "type": "json_lines"})
+
+        result = self.execute("import json; print(json.dumps({'ok': True}, indent=2))")
+        self.assertEqual(result.result, {"ok": True})
+        self.assertEqual(result.metadata["output_truncated"], False)
+
+    def test_output_cap_truncates(self):
+        """Past the spill cap output is dropped and flagged."""
+        result = self.execute("import sys; sys.stdout.write('y' * 300000)",
+                              max_output_memory_bytes=1000, max_output_bytes=100000)
+        self.assertTrue(result.result["truncated"])
+        self.assertEqual(result.result["bytes"], 300000)
+        self.assertEqual(os.path.getsize(result.result["output_file"]), 100000)
+        self.assertTrue(result.metadata["output_truncated"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+"""
+Unit Tests for the Performance Tracker
+======================================
+
+Tests incremental version aggregates, batch ingest, reconciliation and the
+mergeable statistics they are built from.
+"""
+
+import random
+import sqlite3
+import statistics
+import tempfile
+import unittest
+from contextlib import contextmanager
+from pathlib import Path
+
+from data.prompt_database import PromptDatabaseManager
+from models.prompt_advanced.models import EvaluationResult, TokenUsage
+from services.prompt.metric_aggregates import QuantileSketch, RunningStat
+from services.prompt.performance_tracker import PerformanceTracker
+
+
+class ExecutionDatabase:
+    """Prompt schema without foreign key enforcement, so executions need no parent rows."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        PromptDatabaseManager(db_path).initialize_prompt_schema(initialize_vector_db=False)
+
+    @contextmanager
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+def make_result(score, tokens=100, cost=0.01, latency=1.0, error=None):
+    """Build a scored evaluation result."""
+    return EvaluationResult(
+        prompt_version_id="prompt1-v1",
+        model="test-model",
+        output="ok",
+        scores={"overall": score},
+        token_usage=TokenUsage(total_tokens=tokens),
+        execution_time=latency,
+        cost=cost,
+        error=error
+    )
+
+
+class TestRunningStatistics(unittest.TestCase):
+    """Test Welford accumulators and the quantile sketch."""
+
+    def test_welford_matches_statistics_module(self):
+        """Test mean and variance against a direct computation."""
+        values = [random.uniform(0, 10) for _ in range(500)]
+        stat = RunningStat()
+        for value in values:
+            stat.add(value)
+
+        self.assertAlmostEqual(stat.mean, statistics.mean(values))
+        self.assertAlmostEqual(stat.variance, statistics.variance(values))
+
+    def test_merge_equals_sequential(self):
+        """Test that merging partial accumulators gives the same result."""
+        values = [random.uniform(0, 10) for _ in range(200)]
+        left, right, whole = RunningStat(), RunningStat(), RunningStat()
+        for value in values[:70]:
+            left.add(value)
+        for value in values[70:]:
+            right.add(value)
+        for value in values:
+            whole.add(value)
+
+        left.merge(right)
+        self.assertEqual(left.count, whole.count)
+        self.assertAlmostEqual(left.mean, whole.mean)
+        self.assertAlmostEqual(left.m2, whole.m2)
+
+    def test_sketch_quantiles_within_accuracy(self):
+        """Test p50/p95 of a merged sketch against exact quantiles."""
+        values = [random.expovariate(1.0) for _ in range(5000)]
+        sketch = QuantileSketch.from_values(values[:2500])
+        sketch.merge(QuantileSketch.from_values(values[2500:]))
+        restored = QuantileSketch.from_json(sketch.to_json())
+
+        ordered = sorted(values)
+        for q in (0.5, 0.95):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            self.assertAlmostEqual(restored.quantile(q), exact, delta=exact * 0.03)
+
+
+class TestPerformanceTracker(unittest.TestCase):
+    """Test recording and reading version metrics."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db = ExecutionDatabase(Path(self.temp_dir.name) / "prompts.db")
+        self.tracker = PerformanceTracker(None, self.db)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_incremental_metrics(self):
+        """Test that per-execution updates give exact averages."""
+        scores = [0.5, 0.7, 0.9, 0.6]
+        for i, score in enumerate(scores):
+            self.assertTrue(self.tracker.record_execution_metrics(
+                "v1", make_result(score, tokens=100 + i, latency=1.0 + i,
+                                  error="boom" if i == 3 else None)
+            ))
+
+        metrics = self.tracker.get_version_performance("v1")
+        self.assertEqual(metrics.total_executions, 4)
+        self.assertAlmostEqual(metrics.average_score, statistics.mean(scores))
+        self.assertAlmostEqual(metrics.success_rate, 0.75)
+        self.assertAlmostEqual(metrics.average_response_time, 2.5)
+
+        stats = self.tracker.get_version_statistics("v1")
+        self.assertAlmostEqual(stats["score"]["stddev"], statistics.stdev(scores))
+        self.assertEqual(stats["total_tokens"], 406)
+        self.assertIsNotNone(stats["response_time"]["p95"])
+
+    def test_unscored_executions_not_aggregated(self):
+        """Test that executions without scores are stored but not counted."""
+        unscored = make_result(0.0)
+        unscored.scores = {}
+        self.tracker.record_execution_metrics("v1", unscored)
+        self.assertIsNone(self.tracker.get_version_performance("v1"))
+
+    def test_batch_matches_incremental(self):
+        """Test that batch ingest produces the same aggregates as single inserts."""
+        results = [make_result(random.random(), latency=random.uniform(0.1, 3)) for _ in range(50)]
+        self.assertEqual(self.tracker.record_execution_metrics_batch(
+            [("batch", result) for result in results]), 50)
+        for result in results:
+            copy = make_result(result.scores["overall"], latency=result.execution_time)
+            self.tracker.record_execution_metrics("single", copy)
+
+        batch = self.tracker.get_version_statistics("batch")
+        single = self.tracker.get_version_statistics("single")
+        self.assertEqual(batch["total_executions"], single["total_executions"])
+        self.assertAlmostEqual(batch["score"]["mean"], single["score"]["mean"])
+        self.assertAlmostEqual(batch["score"]["stddev"], single["score"]["stddev"])
+        self.assertEqual(batch["response_time"]["p50"], single["response_time"]["p50"])
+
+    def test_reconcile_rebuilds_from_raw_rows(self):
+        """Test that reconciliation repairs drifted aggregates."""
+        for score in (0.2, 0.4, 0.6):
+            self.tracker.record_execution_metrics("v1", make_result(score))
+
+        with self.db.get_connection() as conn:
+            conn.execute("UPDATE prompt_performance_metrics SET average_score = 0, total_executions = 99")
+            conn.commit()
+
+        self.assertEqual(self.tracker.reconcile_version_metrics(), 1)
+        metrics = self.tracker.get_version_performance("v1")
+        self.assertEqual(metrics.total_executions, 3)
+        self.assertAlmostEqual(metrics.average_score, 0.4)
+
+    def test_legacy_rows_rebuilt_on_next_update(self):
+        """Test that rows written before running aggregates are rebuilt once."""
+        self.tracker.record_execution_metrics("v1", make_result(0.2))
+        with self.db.get_connection() as conn:
+            conn.execute("UPDATE prompt_performance_metrics SET score_m2 = NULL, success_count = NULL")
+            conn.commit()
+
+        self.tracker.record_execution_metrics("v1", make_result(0.6))
+        stats = self.tracker.get_version_statistics("v1")
+        self.assertEqual(stats["total_executions"], 2)
+        self.assertEqual(stats["success_count"], 2)
+        self.assertAlmostEqual(stats["score"]["mean"], 0.4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+"""
+Tests for the Process Supervisor
+================================
+
+Checks the timer wheel, and that concurrent sandboxes share one supervisor
+thread which records exits, enforces timeouts and reports resource usage.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.process_supervisor import ProcessSupervisor, TimerWheel
+from services.tool_execution import ProcessSandbox, SandboxConfig, SandboxType
+
+
+class TestTimerWheel(unittest.TestCase):
+    """Test scheduling, cancellation and long gaps on the timer wheel."""
+
+    def test_fires_in_deadline_order(self):
+        wheel = TimerWheel(tick=0.1, slots=8, now=0.0)
+        fired = []
+        for deadline in (0.35, 0.1, 2.5, 0.2):
+            wheel.schedule(deadline, lambda d=deadline: fired.append(d))
+        cancelled = wheel.schedule(0.3, lambda: fired.append("cancelled"))
+        wheel.cancel(cancelled)
+        self.assertEqual(len(wheel), 4)
+
+        self.assertEqual(wheel.advance(0.25), 2)
+        self.assertEqual(fired, [0.1, 0.2])
+        self.assertAlmostEqual(wheel.next_deadline(), 0.3)
+        # 2.5 shares a bucket with earlier ticks but waits its turn
+        self.assertEqual(wheel.advance(0.9), 1)
+        self.assertEqual(wheel.advance(60.0), 1)
+        self.assertEqual(fired, [0.1, 0.2, 0.35, 2.5])
+        self.assertIsNone(wheel.next_deadline())
+
+
+class TestProcessSupervisor(unittest.TestCase):
+    """Test sandboxes running under one shared supervisor."""
+
+    def setUp(self):
+        self.supervisor = ProcessSupervisor(tick=0.05, sample_interval=0.1)
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.supervisor.shutdown()
+        shutil.rmtree(self.temp_dir)
+
+    def run_in_sandbox(self, code, **limits):
+        config = SandboxConfig(
+            id=f"test-{threading.get_ident()}-{time.monotonic_ns()}",
+            type=SandboxType.PROCESS,
+            resource_limits={"max_memory_mb": 512, "max_cpu_percent": 100, "max_execution_time": 10, **limits},
+            working_directory=self.temp_dir
+        )
+        sandbox = ProcessSandbox(config, supervisor=self.supervisor)
+        sandbox.create()
+        return sandbox.execute([sys.executable, "-c", code])
+
+    def test_concurrent_sandboxes_share_one_thread(self):
+        """Dozens of parallel executions are watched by a single thread."""
+        code = "import json, time; time.sleep(0.3); print(json.dumps({'ok': True}))"
+        with ThreadPoolExecutor(max_workers=24) as pool:
+            futures = [pool.submit(self.run_in_sandbox, code) for _ in range(24)]
+            time.sleep(0.2)
+            supervisors = [t for t in threading.enumerate() if t.name == "process-supervisor"]
+            results = [future.result() for future in futures]
+
+        self.assertEqual(len([t for t in supervisors if t.is_alive()]), 1)
+        self.assertTrue(all(result.success and result.result == {"ok": True} for result in results))
+        self.assertTrue(all(result.resource_usage.execution_time >= 0.3 for result in results))
+        self.assertEqual(self.supervisor.active_count, 0)
+
+    def test_timeout_enforced_by_timer(self):
+        """A hung process is stopped at its deadline rather than waited on."""
+        started = time.monotonic()
+        result = self.run_in_sandbox("import time; time.sleep(30)", max_execution_time=1)
+        self.assertFalse(result.success)
+        self.assertEqual(result.error_message, "Execution timeout")
+        self.assertLess(time.monotonic() - started, 5)
+
+    def test_long_running_process_keeps_constant_timers(self):
+        """Periodic sampling replaces its timer instead of accumulating them."""
+        process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        handle = self.supervisor.register(process, {"max_memory_mb": 512}, timeout=20)
+        try:
+            time.sleep(1.0)
+            self.assertFalse(handle.done)
+            self.assertLessEqual(len(self.supervisor._wheel), 2)
+            self.assertFalse(handle._sample_timer.cancelled)
+        finally:
+            self.supervisor.terminate(handle)
+            self.assertTrue(handle.wait(10))
+        self.assertIsNone(handle._sample_timer)
+        self.assertEqual(len(self.supervisor._wheel), 0)
+
+    def test_errors_do_not_stop_supervision(self):
+        """A failing request is logged and the same thread keeps watching processes."""
+        first = self.supervisor.register(subprocess.Popen([sys.executable, "-c", "pass"]))
+        self.assertTrue(first.wait(10))
+        thread = self.supervisor._thread
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with self.assertLogs("services.process_supervisor", level="ERROR"):
+            self.supervisor._call(fail)
+            handle = self.supervisor.register(subprocess.Popen([sys.executable, "-c", "pass"]))
+            self.assertTrue(handle.wait(10))
+        self.assertIs(self.supervisor._thread, thread)
+        self.assertTrue(thread.is_alive())
+
+    def test_restarted_thread_keeps_watching_live_processes(self):
+        """Processes adopted before a restart still have their exits recorded."""
+        process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        handle = self.supervisor.register(process, timeout=20)
+        time.sleep(0.2)
+        self.supervisor.shutdown()
+
+        self.supervisor.terminate(handle)
+        self.assertTrue(handle.wait(10))
+        self.assertEqual(self.supervisor.active_count, 0)
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "RLIMIT_AS and /proc sampling")
+    def test_limits_and_usage(self):
+        """RLIMIT_AS stops oversized allocations; CPU time and memory are recorded."""
+        result = self.run_in_sandbox("x = bytearray(1024 * 1024 * 1024)", max_memory_mb=256)
+        self.assertFalse(result.success)
+        self.assertIn("MemoryError", result.error_message)
+
+        result = self.run_in_sandbox(
+            "import time\nend = time.time() + 0.5\nwhile time.time() < end: pass\nprint('{}')"
+        )
+        self.assertTrue(result.success)
+        self.assertGreater(result.resource_usage.cpu_time, 0.1)
+        self.assertGreater(result.resource_usage.memory_mb, 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Tests for the Resource Sampler
+==============================
+
+Samples real child processes: per-metric ring buffers, rates derived from
+counter deltas, restarts, batched writes to monitoring_metrics, and the
+telemetry reported for a running stub MCP server.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from data.database import DatabaseManager
+from services.mcp_client import MCPClientLoop
+from services.monitoring_service import MonitoringService
+from services.resource_sampler import ProcessReader, ResourceSampler
+from services.server_manager import ServerManager
+from test_mcp_client import STUB_SERVER, StubConfigManager
+
+
+IDLE_CHILD = [sys.executable, "-c", "import sys; sys.stdin.read()"]
+
+
+@unittest.skipUnless(ProcessReader().available, "needs /proc or psutil")
+class TestResourceSampler(unittest.TestCase):
+    """Test sampling of child processes into rings and metric rows."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_manager = DatabaseManager(Path(self.temp_dir) / "metrics.db")
+        self.db_manager.initialize(initialize_vector_db=False)
+        self.children = []
+
+    def tearDown(self):
+        for child in self.children:
+            child.kill()
+            child.wait()
+        shutil.rmtree(self.temp_dir)
+
+    def spawn(self):
+        child = subprocess.Popen(IDLE_CHILD, stdin=subprocess.PIPE)
+        self.children.append(child)
+        return SimpleNamespace(pid=child.pid, request_count=0, latency_total=0.0)
+
+    def test_rings_rates_and_batched_flush(self):
+        """Counter deltas become rates; flush writes one mean per metric."""
+        session = self.spawn()
+        sampler = ResourceSampler(lambda: {"alpha": session}, self.db_manager, ring_size=3)
+
+        sampler.sample_once()
+        first = sampler.latest("alpha")
+        self.assertEqual(set(first), {"memory_rss", "open_fds"})
+        self.assertGreater(first["memory_rss"], 0.0)
+        self.assertGreaterEqual(first["open_fds"], 3)
+
+        for latency in (0.010, 0.030, 0.020, 0.040):
+            session.request_count += 2
+            session.latency_total += 2 * latency
+            sampler.sample_once()
+        latest = sampler.latest("alpha")
+        self.assertGreaterEqual(latest["cpu_percent"], 0.0)
+        self.assertGreater(latest["request_rate"], 0.0)
+        self.assertAlmostEqual(latest["latency"], 40.0)
+        self.assertEqual([round(v) for _, v in sampler.history("alpha", "latency")], [30, 20, 40])
+        self.assertEqual(len(sampler.history("alpha", "memory_rss")), 3)
+
+        self.assertEqual(sampler.flush(), 5)
+        self.assertEqual(sampler.flush(), 0)
+        with self.db_manager.get_connection() as conn:
+            rows = dict(conn.execute(
+                "SELECT metric_type, value FROM monitoring_metrics WHERE server_id = 'alpha'"
+            ).fetchall())
+        self.assertAlmostEqual(rows["latency"], 25.0)
+        self.assertEqual(set(rows), {"cpu_percent", "memory_rss", "open_fds", "request_rate", "latency"})
+        self.assertEqual(sampler.get_stats()["samples_taken"], 5)
+
+    def test_restart_and_exit(self):
+        """A new process only sets a baseline; exited processes are skipped."""
+        sessions = {"alpha": self.spawn()}
+        sampler = ResourceSampler(lambda: sessions, self.db_manager)
+        sampler.sample_once()
+
+        sessions["alpha"] = self.spawn()
+        sessions["alpha"].request_count = 5
+        sampler.sample_once()
+        self.assertEqual(sampler.history("alpha", "request_rate"), [])
+
+        self.children[1].kill()
+        self.children[1].wait()
+        sampler.sample_once()
+        self.assertEqual(len(sampler.history("alpha", "memory_rss")), 2)
+        self.assertEqual(len(sampler.history("alpha", "request_rate")), 1)
+
+        sessions.clear()
+        sampler.sample_once()
+        sampler.forget_server("alpha")
+        self.assertEqual(sampler.latest("alpha"), {})
+
+
+@unittest.skipUnless(ProcessReader().available, "needs /proc or psutil")
+class TestServerTelemetry(unittest.TestCase):
+    """Test telemetry for servers run by ServerManager."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        stub_path = os.path.join(self.temp_dir, "stub_mcp_server.py")
+        with open(stub_path, "w") as f:
+            f.write(STUB_SERVER)
+        self.db_manager = DatabaseManager(Path(self.temp_dir) / "metrics.db")
+        self.db_manager.initialize(initialize_vector_db=False)
+        self.loop = MCPClientLoop()
+        self.manager = ServerManager(StubConfigManager(), self.db_manager, client_loop=self.loop,
+                                     startup_timeout=10)
+        self.server_id = self.manager.add_server({"name": "Stub", "command": sys.executable,
+                                                  "args": [stub_path]})
+
+    def tearDown(self):
+        self.manager.shutdown()
+        self.loop.shutdown()
+        shutil.rmtree(self.temp_dir)
+
+    def test_server_metrics_from_session_and_sampler(self):
+        """Running servers report request counts, latency and process usage."""
+        monitoring = MonitoringService(self.db_manager, self.manager, sample_interval=0.05)
+        self.assertTrue(self.manager.start_server(self.server_id))
+        monitoring.sampler.sample_once()
+        self.manager.list_server_tools(self.server_id, timeout=5)
+        monitoring.sampler.sample_once()
+
+        metrics = self.manager.get_server_metrics(self.server_id)
+        # initialize plus two tools/list pages
+        self.assertEqual(metrics["request_count"], 3)
+        self.assertEqual(metrics["error_count"], 0)
+        self.assertGreater(metrics["response_time"], 0.0)
+        self.assertGreater(metrics["memory_usage"], 1.0)
+        self.assertGreater(monitoring.get_server_metrics(self.server_id)["request_rate"], 0.0)
+
+        monitoring.start_monitoring()
+        monitoring.stop_monitoring()
+        with self.db_manager.get_connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM monitoring_metrics").fetchone()[0]
+        self.assertGreaterEqual(count, 4)
+
+        system = monitoring.get_system_metrics()
+        self.assertGreater(system["disk_usage"], 0.0)
+        self.assertGreater(system["memory_usage"], 0.0)
+
+        # Removing the server drops its buffered samples
+        self.assertTrue(self.manager.remove_server(self.server_id))
+        self.assertEqual(monitoring.sampler.latest(self.server_id), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,7 +16,8 @@ from services.security.security_scanner import (
 )
 from services.security.quality_assurance import (
     QualityAssuranceFramework, QualityAssessmentResult, QualityIssue,
-    QualityIssueType, QualitySeverity, BiasDetector, HallucinationDetector
+    QualityIssueType, QualitySeverity, BiasDetector, HallucinationDetector,
+    AnalysisDocument
 )
 from services.security.compliance_governance import (
     ComplianceGovernanceFramework, PolicyEngine, ChecklistManager,
@@ -189,6 +190,63 @@ class TestQualityAssurance(unittest.TestCase):
 
 
 
+class TestQualityAnalysisDocument(unittest.TestCase):
+    """Test shared preprocessing and batch quality assessment."""
+    
+    def setUp(self):
+        """Set up test quality assurance framework."""
+        self.qa_framework = QualityAssuranceFramework()
+        self.content = (
+            "Women are naturally better at nurturing roles.\n"
+            "Studies show that 95% of people agree!\n\n"
+            "It is known that the future is bright? Maybe."
+        )
+    
+    def test_document_preprocessing(self):
+        """Sentences, tokens and line numbers match naive computation."""
+        document = AnalysisDocument(self.content)
+        
+        self.assertEqual(document.words, self.content.split())
+        self.assertEqual(document.lowered_words, self.content.lower().split())
+        self.assertEqual(len(document.sentences), 4)
+        self.assertEqual(document.sentences[-1], "Maybe")
+        for position in range(len(self.content) + 1):
+            self.assertEqual(document.line_number(position),
+                             self.content[:position].count('\n') + 1)
+        self.assertIs(AnalysisDocument.of(document), document)
+    
+    def test_detectors_accept_documents(self):
+        """Detectors give the same issues for a string or a document."""
+        document = AnalysisDocument(self.content)
+        detector = HallucinationDetector()
+        
+        from_text = detector.detect_hallucination_risk(self.content)
+        from_document = detector.detect_hallucination_risk(document)
+        self.assertGreater(len(from_text), 0)
+        self.assertEqual([(i.title, i.location, i.evidence) for i in from_text],
+                         [(i.title, i.location, i.evidence) for i in from_document])
+        self.assertEqual(from_text[0].location["line"], 2)
+        
+        bias_issues = BiasDetector().detect_bias(document)
+        self.assertEqual(bias_issues[0].location["line"], 1)
+    
+    def test_assess_many_matches_single_assessments(self):
+        """Batch results keep input order and match assess_quality."""
+        items = [
+            (self.content, "p1", "v1"),
+            ("Please provide a clear summary.", "p2", "v1"),
+            ("Women are always better at multitasking than men.", "p3", "v2"),
+        ]
+        expected = [self.qa_framework.assess_quality(*item) for item in items]
+        
+        for batch in (self.qa_framework.assess_many(items),
+                      self.qa_framework.assess_many(items, max_workers=2, min_pool_size=1)):
+            self.assertEqual([r.prompt_id for r in batch], ["p1", "p2", "p3"])
+            for result, single in zip(batch, expected):
+                self.assertEqual(result.metrics.to_dict(), single.metrics.to_dict())
+                self.assertEqual([i.title for i in result.issues], [i.title for i in single.issues])
+
+
 class TestComplianceGovernance(unittest.TestCase):
     """Test compliance governance framework."""
     
@@ -398,6 +456,88 @@ class TestComplianceGovernance(unittest.TestCase):
         ])
 
 
+class TestCompiledPolicyProgram(unittest.TestCase):
+    """Test compiled policy evaluation and batch processing."""
+    
+    def setUp(self):
+        """Set up policy engine with a policy sharing GDPR's PII patterns."""
+        self.policy_engine = PolicyEngine()
+        gdpr = next(p for p in self.policy_engine.policies.values()
+                    if ComplianceStandard.GDPR in p.compliance_standards)
+        pii_rule = gdpr.rules[0]
+        self.hipaa_policy = CompliancePolicy(
+            name="HIPAA PHI",
+            policy_type=PolicyType.PRIVACY,
+            compliance_standards=[ComplianceStandard.HIPAA],
+            rules=[
+                PolicyRule(name="PHI Identifiers", rule_type="regex",
+                           rule_definition={"patterns": list(pii_rule.rule_definition["patterns"])},
+                           severity="high"),
+                PolicyRule(name="PHI Terms", rule_type="checklist",
+                           rule_definition={"prohibited_terms": ["Diagnosis", "guys"]},
+                           severity="medium")
+            ]
+        )
+        self.policy_engine.add_policy(self.hipaa_policy)
+    
+    def test_shared_patterns_compiled_once(self):
+        """Identical patterns and keywords across policies share one entry."""
+        program = self.policy_engine._get_program()
+        self.assertEqual(len(program.patterns), len(set(p.pattern for p in program.patterns)))
+        self.assertEqual(len(program.keywords), len(set(program.keywords)))
+        
+        assessment = self.policy_engine.evaluate_compliance("Mail jane@example.com about the diagnosis")
+        by_policy = {}
+        for violation in assessment.violations:
+            by_policy.setdefault(violation.policy_id, []).append(violation.violation_type)
+        self.assertEqual(by_policy[self.hipaa_policy.id], ["pattern_match", "prohibited_term"])
+        self.assertIn("pattern_match", by_policy[next(iter(self.policy_engine.policies))])
+    
+    def test_program_rebuilt_only_on_policy_change(self):
+        """The compiled program is reused until policies change."""
+        program = self.policy_engine._get_program()
+        self.policy_engine.evaluate_compliance("some text")
+        self.assertIs(self.policy_engine._get_program(), program)
+        
+        self.hipaa_policy.rules[1].enabled = False
+        rebuilt = self.policy_engine._get_program()
+        self.assertIsNot(rebuilt, program)
+        assessment = self.policy_engine.evaluate_compliance(
+            "the diagnosis", policy_ids=[self.hipaa_policy.id]
+        )
+        self.assertEqual(assessment.violations, [])
+        
+        self.hipaa_policy.is_active = False
+        self.assertNotIn(self.hipaa_policy.id, self.policy_engine._get_program().rules_by_policy)
+    
+    def test_invalid_pattern_reported_as_rule_error(self):
+        """A pattern that fails to compile yields a rule evaluation error."""
+        broken = CompliancePolicy(name="Broken", rules=[
+            PolicyRule(name="Broken Rule", rule_type="regex", rule_definition={"patterns": ["(unclosed"]})
+        ])
+        self.policy_engine.add_policy(broken)
+        assessment = self.policy_engine.evaluate_compliance("text", policy_ids=[broken.id])
+        self.assertEqual([v.violation_type for v in assessment.violations], ["rule_evaluation_error"])
+    
+    def test_batch_matches_sequential(self):
+        """Process-pool batch evaluation returns the in-process results in order."""
+        items = [
+            (f"Contact user{i}@example.com, api_key: {'x' * 24}" if i % 2 else "consent opt-in permission",
+             f"prompt_{i}", "v1")
+            for i in range(6)
+        ]
+        batch = self.policy_engine.evaluate_compliance_batch(items, max_workers=2, min_pool_size=1)
+        sequential = [self.policy_engine.evaluate_compliance(*item) for item in items]
+        
+        self.assertEqual([a.prompt_id for a in batch], [item[1] for item in items])
+        for pooled, local in zip(batch, sequential):
+            self.assertEqual(
+                [(v.rule_id, v.violation_type, v.evidence) for v in pooled.violations],
+                [(v.rule_id, v.violation_type, v.evidence) for v in local.violations]
+            )
+            self.assertEqual(pooled.compliance_score, local.compliance_score)
+
+
 class TestIntegratedSecurityWorkflow(unittest.TestCase):
     """Test integrated security workflow combining all components."""
     
@@ -0,0 +1,180 @@
+"""
+Unit Tests for the UI Service Bridge
+====================================
+
+Tests lazy service construction, operation coalescing, progress reporting
+and cancellation on the bridge's worker pool.
+"""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+from ui.service_bridge import UIServiceBridge, OperationStatus
+
+
+class FakeService:
+    """Service double with sync, async and progress-reporting methods."""
+
+    def __init__(self):
+        self.calls = 0
+        self.gate = threading.Event()
+
+    def refresh(self):
+        self.calls += 1
+        self.gate.wait(2)
+        return {"calls": self.calls}
+
+    async def fetch(self, value):
+        await asyncio.sleep(0)
+        return value * 2
+
+    def sweep(self, progress_callback=None):
+        for step in range(1, 5):
+            progress_callback(step, 4)
+        return "swept"
+
+    def long_sweep(self, progress_callback=None):
+        self.gate.wait(2)
+        progress_callback(1, 2)
+        return "should not complete"
+
+
+class TestUIServiceBridge(unittest.TestCase):
+    """Test the service bridge operation pipeline."""
+
+    def setUp(self):
+        """Create a bridge with a fake service registered."""
+        self.bridge = UIServiceBridge(Mock(), Mock(), max_workers=2)
+        self.service = FakeService()
+        self.bridge.services.register('fake', lambda: self.service)
+
+    def tearDown(self):
+        """Stop the worker pool."""
+        self.service.gate.set()
+        self.bridge.shutdown()
+
+    def _wait_until_finished(self, operation_id, timeout=2.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            status = self.bridge.get_operation_status(operation_id).status
+            if status not in (OperationStatus.PENDING, OperationStatus.IN_PROGRESS):
+                return status
+            time.sleep(0.01)
+        self.fail(f"Operation {operation_id} did not finish")
+
+    def test_services_are_not_built_until_used(self):
+        """Test that registering the bridge constructs no backend services."""
+        self.assertIn('templating', self.bridge.services)
+        self.assertEqual(self.bridge.services.built_services(), {})
+        self.assertTrue(all(self.bridge.health_check().values()))
+
+    def test_duplicate_requests_share_one_operation(self):
+        """Test that requests with the same dedupe key are coalesced."""
+        first = self.bridge.submit_operation("Refresh", "fake", "refresh", dedupe_key="refresh")
+        second = self.bridge.submit_operation("Refresh", "fake", "refresh", dedupe_key="refresh")
+        self.assertEqual(first, second)
+
+        received = []
+        self.bridge.register_callback(first, lambda result: received.append(result.status))
+        self.service.gate.set()
+
+        self.assertEqual(self._wait_until_finished(first), OperationStatus.COMPLETED)
+        self.assertEqual(self.service.calls, 1)
+        self.assertEqual(self.bridge.get_operation_status(first).data, {"calls": 1})
+
+        # A finished operation no longer absorbs new requests
+        third = self.bridge.submit_operation("Refresh", "fake", "refresh", dedupe_key="refresh")
+        self.assertNotEqual(first, third)
+
+    def test_async_methods_run_on_shared_loop(self):
+        """Test that coroutine service methods complete through the pool."""
+        operation_id = self.bridge.execute_operation("Fetch", "fake", "fetch", 21)
+        self.assertEqual(self._wait_until_finished(operation_id), OperationStatus.COMPLETED)
+        self.assertEqual(self.bridge.get_operation_status(operation_id).data, 42)
+
+    def test_progress_callback_reports_real_progress(self):
+        """Test that services can report progress through the injected callback."""
+        progress = []
+        completed = threading.Event()
+
+        def on_update(result):
+            progress.append(result.progress)
+            if result.status == OperationStatus.COMPLETED:
+                completed.set()
+
+        operation_id = self.bridge.submit_operation("Sweep", "fake", "sweep")
+        self.bridge.register_callback(operation_id, on_update)
+
+        self.assertTrue(completed.wait(2))
+        self.assertEqual(self.bridge.get_operation_status(operation_id).data, "swept")
+        self.assertEqual(progress[-1], 100.0)
+
+    def test_cancel_running_operation(self):
+        """Test that a running operation stops at its next progress report."""
+        operation_id = self.bridge.submit_operation("Long Sweep", "fake", "long_sweep")
+        time.sleep(0.05)
+
+        self.assertTrue(self.bridge.cancel_operation(operation_id))
+        self.service.gate.set()
+
+        self.assertEqual(self._wait_until_finished(operation_id), OperationStatus.CANCELLED)
+        self.assertIsNone(self.bridge.get_operation_status(operation_id).data)
+
+    def test_cancel_is_not_overwritten_by_completion(self):
+        """Test that a method finishing after cancellation leaves the operation cancelled."""
+        operation_id = self.bridge.submit_operation("Refresh", "fake", "refresh")
+        time.sleep(0.05)
+
+        self.assertTrue(self.bridge.cancel_operation(operation_id))
+        self.service.gate.set()
+        deadline = time.time() + 2
+        while operation_id in self.bridge._operation_futures and time.time() < deadline:
+            time.sleep(0.01)
+
+        result = self.bridge.get_operation_status(operation_id)
+        self.assertEqual(self.service.calls, 1)
+        self.assertEqual(result.status, OperationStatus.CANCELLED)
+        self.assertIsNone(result.data)
+
+    def test_unknown_service_fails_with_friendly_error(self):
+        """Test error reporting for unknown services."""
+        operation_id = self.bridge.execute_operation("Missing", "nope", "refresh")
+        self.assertEqual(self._wait_until_finished(operation_id), OperationStatus.FAILED)
+        self.assertIn("Invalid input", self.bridge.get_operation_status(operation_id).error)
+
+    def test_audit_export_reports_progress(self):
+        """Test that a real audit export reports chunk progress through the bridge."""
+        from models.collaboration import AuditEventType
+        from test_audit_trail import FileDatabaseManager
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bridge = UIServiceBridge(Mock(), FileDatabaseManager(os.path.join(temp_dir, "audit.db")))
+            try:
+                audit = bridge.get_service('audit')
+                for i in range(2500):
+                    audit.log_event_async(AuditEventType.USER_LOGIN, "u", "user", f"u{i}", "login")
+
+                progress = []
+                operation_id = bridge.export_audit_trail(
+                    os.path.join(temp_dir, "audit.csv"),
+                    callback=lambda result: progress.append((result.status, result.progress))
+                )
+                deadline = time.time() + 10
+                while bridge.get_operation_status(operation_id).status != OperationStatus.COMPLETED:
+                    self.assertLess(time.time(), deadline)
+                    time.sleep(0.01)
+
+                self.assertEqual(bridge.get_operation_status(operation_id).data["event_count"], 2500)
+                chunks = [value for status, value in progress if status == OperationStatus.IN_PROGRESS]
+                self.assertEqual(chunks[-2:], [80.0, 100.0])
+            finally:
+                bridge.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+"""
+Unit Tests for Startup Profiling and Lazy Services
+==================================================
+
+Tests the import timer, startup report and the lazy service registry.
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from core.service_registry import LazyServiceRegistry
+from core.startup_profile import ImportTimer, StartupProfiler
+
+
+class TestImportTimer(unittest.TestCase):
+    """Test import-time recording."""
+
+    def setUp(self):
+        """Create a throwaway package to import."""
+        self.temp_dir = tempfile.mkdtemp()
+        package_dir = Path(self.temp_dir) / "profiled_pkg"
+        package_dir.mkdir()
+        (package_dir / "__init__.py").write_text("from . import child\n")
+        (package_dir / "child.py").write_text("VALUE = sum(range(1000))\n")
+        sys.path.insert(0, self.temp_dir)
+
+    def tearDown(self):
+        """Remove the throwaway package."""
+        sys.path.remove(self.temp_dir)
+        for name in ("profiled_pkg", "profiled_pkg.child"):
+            sys.modules.pop(name, None)
+
+    def test_records_nested_imports(self):
+        """Test that self and cumulative times are recorded with depth."""
+        timer = ImportTimer()
+        timer.install()
+        try:
+            import profiled_pkg
+        finally:
+            timer.uninstall()
+
+        self.assertEqual(profiled_pkg.child.VALUE, 499500)
+        records = {r["module"]: r for r in timer.records}
+        self.assertIn("profiled_pkg", records)
+        self.assertIn("profiled_pkg.child", records)
+        self.assertEqual(records["profiled_pkg"]["depth"], 0)
+        self.assertEqual(records["profiled_pkg.child"]["depth"], 1)
+        self.assertGreaterEqual(records["profiled_pkg"]["cumulative_us"],
+                                records["profiled_pkg.child"]["cumulative_us"])
+        self.assertNotIn(timer, sys.meta_path)
+
+    def test_report_written(self):
+        """Test the JSON report contents and the import budget check."""
+        profiler = StartupProfiler(import_budget_ms=0)
+        with profiler.phase("database"):
+            pass
+        profiler.record_service("templating", 0.25)
+        profiler.mark("first_paint")
+
+        report_path = Path(self.temp_dir) / "logs" / "startup-profile.json"
+        self.assertEqual(profiler.write_report(report_path), report_path)
+
+        report = json.loads(report_path.read_text())
+        self.assertIn("database", report["phases_ms"])
+        self.assertAlmostEqual(report["service_init_ms"]["templating"], 250.0)
+        self.assertIn("first_paint", report["marks_ms"])
+        self.assertEqual(report["imports"]["importtime"][0],
+                         "import time: self [us] | cumulative | imported package")
+        self.assertTrue(profiler.check_import_budget())
+
+
+class TestLazyServiceRegistry(unittest.TestCase):
+    """Test on-demand service construction."""
+
+    def test_factory_runs_once_on_first_use(self):
+        """Test that services are built lazily and cached."""
+        calls = []
+        registry = LazyServiceRegistry()
+        registry.register("analytics", lambda: calls.append(1) or object())
+
+        self.assertIn("analytics", registry)
+        self.assertFalse(registry.is_built("analytics"))
+        self.assertEqual(calls, [])
+
+        first = registry["analytics"]
+        second = registry.get("analytics")
+        self.assertIs(first, second)
+        self.assertEqual(calls, [1])
+        self.assertIn("analytics", registry.init_timings)
+
+    def test_unknown_service(self):
+        """Test lookups for unregistered names."""
+        registry = LazyServiceRegistry()
+        self.assertIsNone(registry.get("missing"))
+        with self.assertRaises(KeyError):
+            registry["missing"]
+
+    def test_concurrent_access_builds_once(self):
+        """Test that racing threads share one construction."""
+        calls = []
+        gate = threading.Event()
+
+        def slow_factory():
+            gate.wait(1)
+            calls.append(1)
+            return object()
+
+        registry = LazyServiceRegistry()
+        registry.register("testing", slow_factory)
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry["testing"])) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        gate.set()
+        for thread in threads:
+            thread.join(2)
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(len({id(r) for r in results}), 1)
+
+    def test_warm_up_builds_in_background(self):
+        """Test background warm-up and failure isolation."""
+        done = threading.Event()
+        profiler = StartupProfiler()
+        registry = LazyServiceRegistry(profiler=profiler)
+        registry.register("ok", lambda: "service")
+        registry.register("broken", lambda: 1 / 0)
+
+        registry.warm_up(on_complete=done.set)
+        self.assertTrue(done.wait(2))
+
+        self.assertTrue(registry.is_built("ok"))
+        self.assertFalse(registry.is_built("broken"))
+        self.assertIn("ok", profiler.service_timings)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+"""
+Unit Tests for UI State Manager
+===============================
+
+Tests the condition-variable event bus and the LRU/TTL data cache.
+"""
+
+import threading
+import time
+import unittest
+
+from ui.state_manager import UIStateManager, UICache, EventType, EventPriority
+
+
+class TestEventBus(unittest.TestCase):
+    """Test event publishing and dispatch."""
+
+    def setUp(self):
+        """Create a state manager."""
+        self.state_manager = UIStateManager()
+
+    def tearDown(self):
+        """Stop the background thread."""
+        self.state_manager.shutdown()
+
+    def _wait_for(self, predicate, timeout=2.0):
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.005)
+        return False
+
+    def test_event_dispatched_without_polling_delay(self):
+        """Test that a published event wakes the dispatcher immediately."""
+        received = threading.Event()
+        self.state_manager.subscribe(EventType.TEST_COMPLETED, lambda event: received.set())
+
+        start = time.perf_counter()
+        self.state_manager.publish_event(EventType.TEST_COMPLETED, {"ok": True})
+        self.assertTrue(received.wait(1))
+        self.assertLess(time.perf_counter() - start, 0.08)
+
+    def test_coalesced_events_deliver_latest_data(self):
+        """Test that queued events for the same type and target are merged."""
+        received = []
+        gate = threading.Event()
+
+        def blocking_callback(event):
+            gate.wait(2)
+
+        self.state_manager.subscribe(EventType.WORKSPACE_CHANGED, blocking_callback)
+        self.state_manager.subscribe(EventType.ANALYTICS_UPDATED, lambda event: received.append(event.data))
+
+        # Hold the dispatcher so the analytics events queue up
+        self.state_manager.publish_event(EventType.WORKSPACE_CHANGED, {})
+        time.sleep(0.05)
+        for i in range(5):
+            self.state_manager.publish_event(EventType.ANALYTICS_UPDATED, {"n": i},
+                                             target="dashboard", coalesce=True)
+        gate.set()
+
+        self.assertTrue(self._wait_for(lambda: received))
+        time.sleep(0.05)
+        self.assertEqual(received, [{"n": 4}])
+
+    def test_high_priority_events_dispatch_first(self):
+        """Test that queued events dispatch in priority order."""
+        order = []
+        gate = threading.Event()
+
+        self.state_manager.subscribe(EventType.WORKSPACE_CHANGED, lambda event: gate.wait(2))
+        self.state_manager.subscribe(EventType.USER_NOTIFICATION, lambda event: order.append(event.data))
+
+        self.state_manager.publish_event(EventType.WORKSPACE_CHANGED, {})
+        time.sleep(0.05)
+        self.state_manager.publish_event(EventType.USER_NOTIFICATION, "low", priority=EventPriority.LOW)
+        self.state_manager.publish_event(EventType.USER_NOTIFICATION, "high", priority=EventPriority.HIGH)
+        gate.set()
+
+        self.assertTrue(self._wait_for(lambda: len(order) == 2))
+        self.assertEqual(order, ["high", "low"])
+
+    def test_batches_are_bounded(self):
+        """Test that one drain never takes more than max_batch_size events."""
+        manager = UIStateManager(max_batch_size=3)
+        try:
+            manager.shutdown()
+            for i in range(10):
+                manager.publish_event(EventType.USER_NOTIFICATION, i)
+            with manager.event_condition:
+                batch = manager._take_event_batch()
+            self.assertEqual(len(batch), 3)
+            self.assertEqual(len(manager.event_queue), 7)
+        finally:
+            manager.shutdown()
+
+
+class TestUICache(unittest.TestCase):
+    """Test the size-bounded LRU cache with TTL index."""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = UICache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.get_stats()["evictions"], 1)
+
+    def test_expired_entries_are_purged(self):
+        """Test that the TTL heap removes only due entries."""
+        cache = UICache()
+        cache.set("short", 1, ttl_seconds=0)
+        cache.set("long", 2, ttl_seconds=60)
+        time.sleep(0.01)
+
+        cache.purge_expired()
+        self.assertEqual(cache.keys(), ["long"])
+        self.assertEqual(cache.get_stats()["expirations"], 1)
+
+    def test_overwrite_keeps_new_ttl(self):
+        """Test that a stale heap record does not expire a refreshed key."""
+        cache = UICache()
+        cache.set("key", "old", ttl_seconds=0)
+        cache.set("key", "new", ttl_seconds=60)
+        time.sleep(0.01)
+
+        cache.purge_expired()
+        self.assertEqual(cache.get("key"), "new")
+
+    def test_hit_rate_statistics(self):
+        """Test hit and miss accounting."""
+        cache = UICache()
+        cache.set("key", "value")
+        cache.get("key")
+        cache.get("key")
+        cache.get("missing")
+
+        stats = cache.get_stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+
+    def test_state_manager_cache_api(self):
+        """Test the state manager cache wrappers."""
+        manager = UIStateManager(max_cache_entries=10)
+        try:
+            manager.cache_data("analytics_summary", {"total": 3}, ttl_seconds=60)
+            self.assertEqual(manager.get_cached_data("analytics_summary"), {"total": 3})
+            manager.invalidate_cache("analytics_summary")
+            self.assertIsNone(manager.get_cached_data("analytics_summary"))
+            self.assertEqual(manager.get_cache_stats()["max_entries"], 10)
+        finally:
+            manager.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+"""
+Tests for the Tag Similarity Index
+==================================
+
+Checks related-tool lookups against the discovery engine's full scan,
+through incremental updates, and via AdvancedToolManager.
+"""
+
+import os
+import random
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.tag_index import TagSimilarityIndex
+from services.tool_discovery import ToolDiscoveryEngine
+from services.tool_manager import AdvancedToolManager
+from test_tool_sync import FileDatabaseManager, make_tool
+
+
+TAGS = ["file", "web", "data", "search", "analysis", "security", "database", "network",
+        "system", "text", "json", "read", "update", "delete", "list", "simple", "moderate"]
+
+
+def make_entry(i, rng):
+    return SimpleNamespace(id=f"tool-{i}", name=f"tool_{rng.randint(0, 400):03d}", category=None,
+                           metadata=SimpleNamespace(tags=rng.sample(TAGS, rng.randint(0, 7))))
+
+
+class TestTagSimilarityIndex(unittest.TestCase):
+    """Test the bitset index against the linear scan."""
+
+    def setUp(self):
+        self.engine = ToolDiscoveryEngine()
+        self.rng = random.Random(11)
+        self.entries = {f"tool-{i}": make_entry(i, self.rng) for i in range(600)}
+        self.index = TagSimilarityIndex()
+        self.index.rebuild((e.id, e.name, e.metadata.tags) for e in self.entries.values())
+
+    def assert_matches_scan(self, sample=60):
+        registry = sorted(self.entries.values(), key=lambda e: e.name)
+        for entry in self.rng.sample(registry, min(sample, len(registry))):
+            expected = self.engine.get_related_tools(entry.name, entry.metadata.tags, registry)
+            actual = self.index.related(entry.id)
+            self.assertEqual([(r["similarity"], sorted(r["shared_tags"])) for r in expected],
+                             [(r["similarity"], r["shared_tags"]) for r in actual])
+            # Equal-similarity ties are ordered by name, as in the name-ordered registry
+            self.assertEqual([r["name"] for r in expected], [r["name"] for r in actual])
+
+    def test_matches_full_scan(self):
+        """Lookups return exactly what the full scan returns."""
+        self.assertEqual(len(self.index), 600)
+        self.assert_matches_scan()
+
+    def test_incremental_updates(self):
+        """Adds, retags and removals keep results exact, across re-layouts."""
+        self.index.MIN_RELAYOUT_SLOTS = 50
+        for i in range(600, 900):
+            entry = make_entry(i, self.rng)
+            self.entries[entry.id] = entry
+            self.index.update_tool(entry.id, entry.name, entry.metadata.tags)
+            if i % 3 == 0:
+                retagged = self.entries[self.rng.choice(sorted(self.entries))]
+                retagged.metadata.tags = self.rng.sample(TAGS, self.rng.randint(1, 6))
+                self.index.update_tool(retagged.id, retagged.name, retagged.metadata.tags)
+            if i % 5 == 0:
+                removed = self.entries.pop(self.rng.choice(sorted(self.entries)))
+                self.index.remove_tool(removed.id)
+            if i % 50 == 0:
+                self.assert_matches_scan(sample=10)
+
+        self.assertEqual(len(self.index), len(self.entries))
+        self.assert_matches_scan()
+
+    def test_manager_tracks_tag_changes(self):
+        """add_tool_tags/remove_tool_tags update related tools without a reload."""
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            manager = AdvancedToolManager(FileDatabaseManager(db_path))
+            manager.discovery_engine.scan_server_tools = lambda server_id, raise_errors=False: [
+                make_tool("alpha"), make_tool("beta"), make_tool("gamma")
+            ]
+            manager.sync_all_servers(["local"])
+            tools = {tool.name: tool for tool in manager.get_tool_registry()}
+            for tool in tools.values():
+                manager.remove_tool_tags(tool.id, tool.metadata.tags)
+
+            self.assertEqual(manager.get_related_tools(tools["alpha"].id), [])
+            manager.add_tool_tags(tools["alpha"].id, ["crm", "export"])
+            manager.add_tool_tags(tools["beta"].id, ["crm", "export", "pdf"])
+            manager.add_tool_tags(tools["gamma"].id, ["pdf"])
+
+            related = manager.get_related_tools(tools["alpha"].id)
+            self.assertEqual([(r["name"], r["shared_tags"]) for r in related], [("beta", ["crm", "export"])])
+
+            manager.remove_tool_tags(tools["beta"].id, ["crm", "export"])
+            self.assertEqual(manager.get_related_tools(tools["alpha"].id), [])
+            self.assertEqual(manager.get_related_tools(tools["gamma"].id)[0]["name"], "beta")
+        finally:
+            os.unlink(db_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
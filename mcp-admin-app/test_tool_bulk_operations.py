@@ -0,0 +1,105 @@
+"""
+Tests for Bulk Tool Operations
+==============================
+
+Checks up-front validation and per-item results of bulk updates and
+deletes, the single audit event and change notification each emits, and
+that unrelated tools are left alone.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from data.database import DatabaseManager
+from models.tool import SecurityLevel, ToolCategory
+from services.audit_service import AuditService
+from services.tool_manager import BULK_CHUNK_SIZE, AdvancedToolManager
+from test_tool_sync import make_tool
+
+
+class TestBulkToolOperations(unittest.TestCase):
+    """Test set-based bulk updates and deletes."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.db_manager = DatabaseManager(Path(self.db_path))
+        self.db_manager.initialize(initialize_vector_db=False)
+        self.manager = AdvancedToolManager(self.db_manager, audit_service=AuditService(self.db_manager))
+        self.changes = []
+        self.manager.add_change_callback(lambda action, tool_ids: self.changes.append((action, tool_ids)))
+
+        self.manager.discovery_engine.scan_server_tools = lambda server_id, raise_errors=False: [
+            make_tool(f"tool_{i:04d}") for i in range(BULK_CHUNK_SIZE + 20)
+        ]
+        self.manager.sync_all_servers(["local"])
+        self.ids = sorted(tool.id for tool in self.manager.get_tool_registry())
+
+    def tearDown(self):
+        os.unlink(self.db_path)
+
+    def audit_rows(self):
+        with self.db_manager.get_connection() as conn:
+            return conn.execute(
+                "SELECT action, resource_type, resource_id, new_value FROM audit_events"
+            ).fetchall()
+
+    def test_bulk_update_validates_and_reports_per_item(self):
+        """Invalid updates fail individually; valid ones land together."""
+        updates = [{"tool_id": tool_id, "enabled": False} for tool_id in self.ids[:BULK_CHUNK_SIZE + 5]]
+        updates += [
+            {"tool_id": self.ids[-1], "category": "communication", "security_level": "high"},
+            {"tool_id": self.ids[-2], "category": "not-a-category"},
+            {"tool_id": "missing-tool", "enabled": True},
+            {"enabled": True},
+        ]
+
+        result = self.manager.bulk_update_tools(updates)
+
+        self.assertEqual(result.total_tools, len(updates))
+        self.assertEqual(result.updated_tools, BULK_CHUNK_SIZE + 6)
+        self.assertEqual(result.failed_tools, 3)
+        self.assertEqual([item["success"] for item in result.results[-4:]], [True, False, False, False])
+        self.assertIn("missing-tool not found", result.results[-2]["error"])
+
+        updated = self.manager.get_tool_by_id(self.ids[-1])
+        self.assertEqual(updated.category, ToolCategory.COMMUNICATION)
+        self.assertEqual(updated.security_level, SecurityLevel.HIGH)
+        self.assertTrue(updated.enabled)
+        self.assertFalse(self.manager.get_tool_by_id(self.ids[0]).enabled)
+        self.assertEqual(self.manager.get_tool_by_id(self.ids[-2]).category, ToolCategory.GENERAL)
+
+        self.assertEqual(len(self.changes), 1)
+        self.assertEqual(self.changes[0][0], "bulk_update_tools")
+        self.assertEqual(len(self.changes[0][1]), BULK_CHUNK_SIZE + 6)
+        rows = self.audit_rows()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0][:3], ("bulk_update_tools", "tool", f"{BULK_CHUNK_SIZE + 6} tools"))
+        self.assertEqual(json.loads(rows[0][3])["changes"][self.ids[-1]]["security_level"], "high")
+
+    def test_bulk_delete_in_one_pass(self):
+        """Deletes span chunks, report missing ids and refresh the tag index."""
+        self.assertTrue(self.manager.get_related_tools(self.ids[-1]))
+        doomed = self.ids[:-1] + ["missing-tool"]
+
+        results = self.manager.bulk_delete_tools(doomed)
+
+        self.assertEqual(sum(results.values()), len(self.ids) - 1)
+        self.assertFalse(results["missing-tool"])
+        self.assertEqual([tool.id for tool in self.manager.get_tool_registry()], [self.ids[-1]])
+        self.assertEqual(self.manager.get_related_tools(self.ids[-1]), [])
+        self.assertEqual(self.changes, [("bulk_delete_tools", self.ids[:-1])])
+        self.assertEqual([row[0] for row in self.audit_rows()], ["bulk_delete_tools"])
+
+        self.assertEqual(self.manager.bulk_delete_tools(["missing-tool"]), {"missing-tool": False})
+        self.assertEqual(len(self.changes), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
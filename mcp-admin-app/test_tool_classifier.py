@@ -0,0 +1,120 @@
+"""
+Tests for the Compiled Tool Classifier
+======================================
+
+Checks the classifier against per-pattern regex evaluation, its memo, and
+batch re-categorization of the registry.
+"""
+
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.tool import SecurityLevel, ToolCategory
+from services.tool_classifier import ToolClassifier
+from services.tool_discovery import ToolDiscoveryEngine
+from services.tool_manager import AdvancedToolManager
+from test_tool_sync import FileDatabaseManager, make_tool
+
+
+def reference_classify(category_patterns, security_patterns, text):
+    scores = {category: sum(len(re.findall(p, text)) * (1.0 / len(patterns)) for p in patterns)
+              for category, patterns in category_patterns.items()}
+    if max(scores.values()) == 0:
+        category, confidence = ToolCategory.GENERAL, 0.0
+    else:
+        category = max(scores, key=scores.get)
+        confidence = min(scores[category], 1.0)
+    security_level = SecurityLevel.MEDIUM
+    for level, patterns in security_patterns.items():
+        if any(re.search(p, text) for p in patterns):
+            security_level = level
+            break
+    return category, confidence, security_level
+
+
+class TestToolClassifier(unittest.TestCase):
+    """Test the keyword-table classifier."""
+
+    def setUp(self):
+        self.engine = ToolDiscoveryEngine()
+
+    def assert_matches_reference(self, classifier, category_patterns, security_patterns, texts):
+        for text in texts:
+            result = classifier.classify_text(text)
+            self.assertEqual((result.category, result.confidence, result.security_level),
+                             reference_classify(category_patterns, security_patterns, text), text)
+
+    def test_matches_regex_evaluation(self):
+        """Scores equal per-pattern findall/search, including overlapping keywords."""
+        keywords = [k for patterns in self.engine.category_patterns.values()
+                    for p in patterns for k in p.split('|')]
+        rng = random.Random(3)
+        texts = ["filesystem internet api", "googlebing duckduckgoogle", "javascriptcpp",
+                 "responsendpoint", "templateformat", "", "nothing relevant here"]
+        texts += [" ".join(rng.choice(keywords) + rng.choice(["", "s", "_x", "-"])
+                           for _ in range(rng.randint(1, 12))).replace(" -", "-")
+                  for _ in range(2000)]
+        self.assert_matches_reference(self.engine.classifier, self.engine.category_patterns,
+                                      self.engine.security_patterns, texts)
+
+    def test_regex_patterns_and_repeated_keywords(self):
+        """Non-keyword patterns fall back to regex; duplicate alternatives count once."""
+        category_patterns = {
+            ToolCategory.FILE_OPERATIONS: [r'file|file|path', r'\bdir\w*'],
+            ToolCategory.WEB_SEARCH: [r'search|searchable'],
+        }
+        security_patterns = {SecurityLevel.HIGH: [r'wri?te'], SecurityLevel.LOW: [r'search']}
+        classifier = ToolClassifier(category_patterns, security_patterns)
+        self.assert_matches_reference(classifier, category_patterns, security_patterns, [
+            "file file path", "directory dirs", "searchable search", "wrte file", "search write",
+        ])
+
+    def test_memoized_by_fingerprint(self):
+        """Repeated schemas are classified once; refresh picks up pattern edits."""
+        schema = make_tool("send_email", "Send an email message").schema
+        first = self.engine.classifier.classify(schema)
+        second = self.engine.analyze_tool_schema(schema)
+        self.assertEqual(first.category, ToolCategory.COMMUNICATION)
+        self.assertEqual(second.category, first.category)
+        self.assertEqual(self.engine.classifier.get_stats()["hits"], 1)
+
+        results = self.engine.classify_batch([(schema, None), (schema, "stored-hash"), ({}, None)])
+        self.assertEqual([r.category for r in results],
+                         [ToolCategory.COMMUNICATION, ToolCategory.COMMUNICATION, ToolCategory.GENERAL])
+
+        self.engine.category_patterns[ToolCategory.SECURITY] = [r'email']
+        self.engine.refresh_classifier()
+        self.assertEqual(self.engine.classifier.classify(schema).category, ToolCategory.SECURITY)
+
+    def test_batch_recategorize_registry(self):
+        """auto_recategorize_tools writes only changed categories."""
+        fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            manager = AdvancedToolManager(FileDatabaseManager(db_path))
+            manager.discovery_engine.scan_server_tools = lambda server_id, raise_errors=False: [
+                make_tool("send_email", "Send an email message"),
+                make_tool("read_file", "Read a file from disk"),
+            ]
+            manager.sync_all_servers(["mail"])
+            with sqlite3.connect(db_path) as conn:
+                conn.execute("UPDATE tool_registry SET category = 'general' WHERE name = 'send_email'")
+
+            results = manager.auto_recategorize_tools()
+            changed = [tool_id for tool_id, message in results.items() if message.startswith("Changed")]
+            self.assertEqual(len(results), 2)
+            self.assertEqual(len(changed), 1)
+            self.assertEqual(manager.get_tool_by_id(changed[0]).category, ToolCategory.COMMUNICATION)
+        finally:
+            os.unlink(db_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
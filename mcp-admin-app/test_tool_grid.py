@@ -0,0 +1,259 @@
+"""
+Tests for the Tool Grid
+=======================
+
+Checks row diffing and windowing, and drives ToolGrid against an in-memory
+stand-in for the Treeview (no display is needed): debounced queries,
+dropped stale results, virtualized rows, cached server names and selection
+that survives scrolling.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.tool import ToolCategory, ToolRegistryEntry
+from ui.tool_grid import ToolGrid, ToolQuery, plan_row_changes, window_bounds
+
+
+class FakeTree:
+    """The Treeview and ``after`` calls ToolGrid uses, kept in memory."""
+
+    def __init__(self):
+        self.rows = []
+        self.values = {}
+        self.selected = ()
+        self.bindings = {}
+        self.options = {}
+        self.writes = 0
+        self.scrolled_to = None
+        self._callbacks = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    def bind(self, sequence, func, add=None):
+        self.bindings[sequence] = func
+
+    def after(self, ms, func, *args):
+        with self._lock:
+            self._next_id += 1
+            self._callbacks[self._next_id] = (ms, func, args)
+            return self._next_id
+
+    def after_cancel(self, after_id):
+        with self._lock:
+            self._callbacks.pop(after_id, None)
+
+    def run_after(self):
+        with self._lock:
+            callbacks, self._callbacks = list(self._callbacks.values()), {}
+        for _, func, args in callbacks:
+            func(*args)
+        return len(callbacks)
+
+    def insert(self, parent, index, iid, values, tags):
+        self.rows.insert(index, iid)
+        self.values[iid] = values
+        self.writes += 1
+
+    def move(self, iid, parent, index):
+        self.rows.remove(iid)
+        self.rows.insert(index, iid)
+        self.writes += 1
+
+    def item(self, iid, values):
+        self.values[iid] = values
+        self.writes += 1
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.rows.remove(iid)
+            del self.values[iid]
+        self.selected = tuple(iid for iid in self.selected if iid not in iids)
+        self.writes += len(iids)
+
+    def selection(self):
+        return self.selected
+
+    def selection_set(self, iids):
+        self.selected = tuple(iids)
+
+    def yview_moveto(self, fraction):
+        self.scrolled_to = fraction
+
+
+class FakeScrollbar:
+    def __init__(self):
+        self.options = {}
+        self.fractions = None
+
+    def configure(self, **options):
+        self.options.update(options)
+
+    def set(self, first, last):
+        self.fractions = (first, last)
+
+
+class FakeToolManager:
+    """Serves a fixed tool list, optionally holding queries until released."""
+
+    def __init__(self, tools):
+        self.tools = tools
+        self.queries = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_tool_registry(self, filters=None):
+        self.release.wait(5)
+        self.queries.append(filters)
+        return [tool for tool in self.tools
+                if filters.category is None or tool.category == filters.category]
+
+    def advanced_search_tools(self, query, filters=None, sort_by="name", sort_order="asc"):
+        self.release.wait(5)
+        self.queries.append(query)
+        return [tool for tool in self.tools if query in tool.name]
+
+
+class FakeServerManager:
+    def __init__(self):
+        self.lookups = 0
+
+    def get_server(self, server_id):
+        self.lookups += 1
+        return SimpleNamespace(name=f"Server {server_id}")
+
+
+def make_tools(count):
+    return [
+        ToolRegistryEntry(id=f"t{i:05d}", name=f"tool_{i:05d}", server_id=f"s{i % 3}",
+                          category=ToolCategory.FILE_OPERATIONS if i % 2 else ToolCategory.GENERAL)
+        for i in range(count)
+    ]
+
+
+class TestRowPlanning(unittest.TestCase):
+    """Test the window and diff helpers."""
+
+    def test_window_bounds(self):
+        self.assertEqual(window_bounds(0, 15, 20, 5000), (0, 35))
+        self.assertEqual(window_bounds(100, 15, 20, 5000), (80, 135))
+        self.assertEqual(window_bounds(4990, 15, 20, 5000), (4970, 5000))
+
+    def test_scrolling_touches_only_entering_and_leaving_rows(self):
+        current = ["a", "b", "c", "d"]
+        values = {iid: (iid,) for iid in current}
+        desired = [(iid, (iid,)) for iid in ["c", "d", "e", "f"]]
+        self.assertEqual(plan_row_changes(current, values, desired), [
+            ("delete", ["a", "b"]), ("insert", "e", 2, ("e",)), ("insert", "f", 3, ("f",))
+        ])
+
+    def test_reorder_and_update(self):
+        current = ["a", "b", "c"]
+        values = {iid: (iid,) for iid in current}
+        desired = [("c", ("c",)), ("a", ("a", 2)), ("b", ("b",))]
+        self.assertEqual(plan_row_changes(current, values, desired), [
+            ("move", "c", 0), ("update", "a", ("a", 2))
+        ])
+        self.assertEqual(plan_row_changes(current, values, [(iid, (iid,)) for iid in current]), [])
+
+
+class TestToolGrid(unittest.TestCase):
+    """Test the grid against in-memory tree and services."""
+
+    def setUp(self):
+        self.tree = FakeTree()
+        self.scrollbar = FakeScrollbar()
+        self.tool_manager = FakeToolManager(make_tools(5000))
+        self.server_manager = FakeServerManager()
+        self.loaded = []
+        self.grid = ToolGrid(self.tree, self.scrollbar, self.tool_manager, self.server_manager,
+                             on_change=self.loaded.append)
+
+    def tearDown(self):
+        self.grid.shutdown()
+
+    def settle(self):
+        """Run ``after`` callbacks until the pending query has been delivered."""
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            self.tree.run_after()
+            if self.grid._future is None and self.grid._pending_after is None:
+                return
+            time.sleep(0.01)
+        self.fail("query did not finish")
+
+    def test_debounce_and_virtualized_rows(self):
+        """Keystrokes coalesce into one query; only the window is materialized."""
+        for text in ("t", "to", "too"):
+            self.grid.request(ToolQuery(search_text=text))
+        self.assertEqual(len(self.tree._callbacks), 1)
+        self.settle()
+
+        self.assertEqual(self.tool_manager.queries, ["too"])
+        self.assertEqual(len(self.loaded[-1]), 5000)
+        self.assertEqual(self.tree.rows, [f"t{i:05d}" for i in range(35)])
+        self.assertEqual(self.tree.values["t00001"], ("tool_00001", "file_operations", "available",
+                                                      "Server s1", 0))
+        self.assertEqual(self.server_manager.lookups, 3)
+        self.assertEqual(self.scrollbar.fractions, (0.0, 15 / 5000))
+
+    def test_stale_results_are_dropped(self):
+        """A slow query finishing after a newer one never reaches the tree."""
+        self.tool_manager.release.clear()
+        self.grid.request(ToolQuery(search_text="tool_0000"), delay=0)
+        self.tree.run_after()
+        self.grid.request(ToolQuery(category=ToolCategory.GENERAL.value), delay=0)
+        self.tree.run_after()
+        self.tool_manager.release.set()
+        self.settle()
+        time.sleep(0.05)
+        self.tree.run_after()
+
+        self.assertEqual(len(self.loaded), 1)
+        self.assertEqual(len(self.loaded[0]), 2500)
+        self.assertEqual(self.tree.rows[:2], ["t00000", "t00002"])
+        self.assertEqual(self.grid.stale_results, len(self.tool_manager.queries) - 1)
+
+    def test_scrolling_and_selection(self):
+        """Scrolling re-windows incrementally and keeps off-window selection."""
+        self.grid.set_tools(self.tool_manager.tools)
+        self.tree.selection_set(["t00003"])
+        self.grid._on_tree_select()
+
+        self.tree.writes = 0
+        self.grid._on_scrollbar("moveto", "0.5")
+        self.assertEqual(self.tree.rows[0], "t02480")
+        self.assertEqual(len(self.tree.rows), 55)
+        self.assertAlmostEqual(self.tree.scrolled_to, 20 / 55)
+        self.assertEqual(self.scrollbar.fractions, (0.5, 2515 / 5000))
+
+        # Tree-driven scrolling by a few rows only patches the edges
+        self.tree.writes = 0
+        for _ in range(12):
+            first = (self.grid._offset + 1 - self.grid._start) / len(self.tree.rows)
+            self.grid._on_tree_scrolled(first, 1.0)
+        self.assertEqual(self.grid._offset, 2512)
+        self.assertLess(self.tree.writes, 40)
+
+        self.tree.selection_set(self.tree.selection() + ("t02515",))
+        self.grid._on_tree_select()
+        self.assertEqual(self.grid.selected_ids(), ["t00003", "t02515"])
+
+        self.grid._on_scrollbar("moveto", "0.0")
+        self.assertEqual(self.tree.selection(), ("t00003",))
+        self.grid.set_tools(self.tool_manager.tools[1:])
+        self.assertEqual(self.grid.selected_ids(), ["t00003", "t02515"])
+        self.assertEqual(self.server_manager.lookups, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
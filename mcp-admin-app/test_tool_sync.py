@@ -0,0 +1,195 @@
+"""
+Tests for Fleet Tool Synchronization
+====================================
+
+Exercises AdvancedToolManager.sync_all_servers against a fake discovery
+engine: incremental diffs by schema hash, removals, failures and the
+recorded discovery status.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from models.tool import DiscoveredTool, ToolStatus
+from services.tool_classifier import schema_fingerprint
+from services.tool_discovery import ToolDiscoveryEngine
+from services.tool_manager import AdvancedToolManager
+
+
+class FileDatabaseManager:
+    """Database manager handing out a fresh connection per use."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    @contextmanager
+    def get_connection(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+
+def make_tool(name, description="A tool", properties=None):
+    return DiscoveredTool(name=name, description=description, server_id="", schema={
+        "type": "function",
+        "function": {
+            "name": name,
+            "description": description,
+            "parameters": {"type": "object", "properties": properties or {"path": {"type": "string"}}},
+        }
+    })
+
+
+class FakeDiscoveryEngine(ToolDiscoveryEngine):
+    """Serves canned tool lists per server and records scan concurrency."""
+
+    def __init__(self, catalog, delay=0.0):
+        super().__init__()
+        self.catalog = catalog
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.analyzed = 0
+        self._lock = threading.Lock()
+
+    def scan_server_tools(self, server_id, raise_errors=False):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            tools = self.catalog[server_id]
+            if isinstance(tools, Exception):
+                raise tools
+            return list(tools)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def analyze_tool_schema(self, tool_schema):
+        self.analyzed += 1
+        return super().analyze_tool_schema(tool_schema)
+
+
+class TestToolSync(unittest.TestCase):
+    """Test concurrent, incremental tool synchronization."""
+
+    def setUp(self):
+        fd, self.db_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.engine = FakeDiscoveryEngine({
+            "alpha": [make_tool("read_file"), make_tool("write_file")],
+            "beta": [make_tool("search")],
+        })
+        self.manager = AdvancedToolManager(FileDatabaseManager(self.db_path))
+        self.manager.discovery_engine = self.engine
+
+    def tearDown(self):
+        os.unlink(self.db_path)
+
+    def statuses(self, server_id):
+        with sqlite3.connect(self.db_path) as conn:
+            return dict(conn.execute(
+                "SELECT name, status FROM tool_registry WHERE server_id = ?", (server_id,)
+            ).fetchall())
+
+    def test_incremental_sync(self):
+        """Adds, updates, removals and unchanged tools are detected by hash."""
+        first = self.manager.sync_all_servers(["alpha", "beta"])
+        self.assertEqual(first["alpha"]["added"], 2)
+        self.assertEqual(first["beta"]["added"], 1)
+        self.assertIn("discovery_seconds", first["alpha"])
+
+        # Nothing changed: no re-analysis
+        self.engine.analyzed = 0
+        second = self.manager.sync_all_servers(["alpha", "beta"])
+        self.assertEqual(second["alpha"]["unchanged"], 2)
+        self.assertEqual(second["alpha"]["added"] + second["alpha"]["updated"], 0)
+        self.assertEqual(self.engine.analyzed, 0)
+
+        self.engine.catalog["alpha"] = [
+            make_tool("read_file", properties={"path": {"type": "string"}, "encoding": {"type": "string"}}),
+            make_tool("list_dir"),
+        ]
+        third = self.manager.sync_all_servers(["alpha"])
+        self.assertEqual((third["alpha"]["added"], third["alpha"]["updated"],
+                          third["alpha"]["removed"], third["alpha"]["unchanged"]), (1, 1, 1, 0))
+        self.assertEqual(self.statuses("alpha")["write_file"], ToolStatus.UNAVAILABLE.value)
+
+        tool = self.manager.get_tools_by_server("alpha")
+        read_file = next(t for t in tool if t.name == "read_file")
+        self.assertIn("encoding", read_file.schema["function"]["parameters"]["properties"])
+
+        # Already unavailable tools are not removed twice; returning ones come back
+        fourth = self.manager.sync_all_servers(["alpha"])
+        self.assertEqual(fourth["alpha"]["removed"], 0)
+        self.engine.catalog["alpha"].append(make_tool("write_file"))
+        fifth = self.manager.sync_all_servers(["alpha"])
+        self.assertEqual(fifth["alpha"]["updated"], 1)
+        self.assertEqual(self.statuses("alpha")["write_file"], ToolStatus.AVAILABLE.value)
+
+    def test_legacy_rows_are_backfilled(self):
+        """Rows without a stored hash are hashed once, not rewritten."""
+        self.manager.sync_all_servers(["beta"])
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("UPDATE tool_registry SET schema_hash = NULL")
+
+        stats = self.manager.sync_tools_with_server("beta")
+        self.assertEqual(stats["unchanged"], 1)
+        with sqlite3.connect(self.db_path) as conn:
+            stored = conn.execute("SELECT schema_hash FROM tool_registry").fetchone()[0]
+        self.assertEqual(stored, schema_fingerprint(make_tool("search").schema))
+
+    def test_concurrency_cap_and_status(self):
+        """Discovery runs in parallel up to the cap; failures are recorded."""
+        self.engine.delay = 0.05
+        self.engine.catalog.update({f"s{i}": [make_tool(f"tool_{i}")] for i in range(6)})
+        self.engine.catalog["broken"] = ConnectionError("server unreachable")
+
+        results = self.manager.sync_all_servers([f"s{i}" for i in range(6)] + ["broken"],
+                                                max_concurrency=3)
+        self.assertEqual(self.engine.peak, 3)
+        self.assertEqual(len(results), 7)
+        self.assertIn("server unreachable", results["broken"]["errors"][0])
+
+        with sqlite3.connect(self.db_path) as conn:
+            duration, errors = conn.execute(
+                "SELECT scan_duration, errors FROM discovery_status WHERE server_id = 's0'"
+            ).fetchone()
+            broken_errors = conn.execute(
+                "SELECT errors FROM discovery_status WHERE server_id = 'broken'"
+            ).fetchone()[0]
+        self.assertGreaterEqual(duration, 0.05)
+        self.assertEqual(json.loads(errors), [])
+        self.assertEqual(len(json.loads(broken_errors)), 1)
+
+    def test_failed_discovery_keeps_registered_tools(self):
+        """A timeout on a known server leaves its catalogue untouched."""
+        self.manager.sync_all_servers(["alpha"])
+        self.engine.catalog["alpha"] = TimeoutError("tools/list timed out")
+
+        stats = self.manager.sync_all_servers(["alpha"])["alpha"]
+        self.assertEqual((stats["added"], stats["updated"], stats["removed"]), (0, 0, 0))
+        self.assertIn("timed out", stats["errors"][0])
+        self.assertEqual(self.statuses("alpha"), {"read_file": ToolStatus.AVAILABLE.value,
+                                                  "write_file": ToolStatus.AVAILABLE.value})
+        with sqlite3.connect(self.db_path) as conn:
+            errors = conn.execute(
+                "SELECT errors FROM discovery_status WHERE server_id = 'alpha'"
+            ).fetchone()[0]
+        self.assertEqual(len(json.loads(errors)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
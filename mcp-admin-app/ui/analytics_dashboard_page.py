@@ -15,8 +15,19 @@ from typing import Dict, List, Optional, Any
 from services.analytics.performance_analytics import PerformanceAnalytics
 from services.analytics.trend_analysis import TrendAnalysisService
 from services.evaluation.cost_tracking import CostTracker
+from ui.dashboard_data import DashboardDataService, PanelSnapshot
 from ui.prompt_components.optimization_recommendations_simple import OptimizationRecommendationsWidget
 
+# Dashboard panels and the tables they are computed from
+PERFORMANCE_PANEL = "analytics.performance"
+COST_PANEL = "analytics.cost"
+TRENDS_PANEL = "analytics.trends"
+INSIGHTS_PANEL = "analytics.insights"
+PROMPTS_PANEL = "analytics.prompts"
+
+EVALUATION_SOURCES = ("prompts", "prompt_versions", "evaluation_runs", "evaluation_results")
+COST_SOURCES = ("llm_usage_records",)
+
 
 import tkinter as tk
 
@@ -40,9 +51,23 @@ class AnalyticsDashboardPage(tk.Frame):
         self.refresh_job = None
         self.current_insights = {}
         
+        # Panels are computed off the Tk thread and only when their inputs change
+        self.dashboard_data = DashboardDataService(db_manager)
+        self._register_dashboard_panels()
+        self.dashboard_data.subscribe(self._on_snapshot)
+        
         self.setup_ui()
+        self.bind("<Destroy>", self._on_destroy, add="+")
         self.refresh_data()
     
+    def _register_dashboard_panels(self):
+        """Register the panel behind each tab with the dashboard data service."""
+        self.dashboard_data.register_panel(PERFORMANCE_PANEL, self._compute_performance_panel, EVALUATION_SOURCES)
+        self.dashboard_data.register_panel(COST_PANEL, self._compute_cost_panel, COST_SOURCES)
+        self.dashboard_data.register_panel(TRENDS_PANEL, self._compute_trends_panel, EVALUATION_SOURCES)
+        self.dashboard_data.register_panel(INSIGHTS_PANEL, self._compute_insights_panel, EVALUATION_SOURCES)
+        self.dashboard_data.register_panel(PROMPTS_PANEL, self._compute_prompts_panel, ("prompts",))
+    
     def setup_ui(self):
         """Set up the user interface."""
         # Main container
@@ -422,28 +447,92 @@ class AnalyticsDashboardPage(tk.Frame):
         self.schedule_refresh()
     
     def refresh_data(self):
-        """Refresh all analytics data."""
+        """Queue a background refresh of every panel whose inputs changed."""
         try:
-            self.refresh_performance_data()
-            self.refresh_cost_data()
-            self.generate_trend_analysis()
-            self.load_prompt_list()
+            self._update_panel_params()
             self.load_provider_list()
+            
+            panels = [PERFORMANCE_PANEL, COST_PANEL, TRENDS_PANEL, PROMPTS_PANEL]
+            if self.current_insights:
+                panels.append(INSIGHTS_PANEL)
+            self.dashboard_data.refresh(panels)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to refresh data: {e}")
     
-    def load_prompt_list(self):
-        """Load available prompts for selection."""
+    def _update_panel_params(self):
+        """Copy the tab controls into the panel parameters."""
+        self.dashboard_data.set_params(
+            PERFORMANCE_PANEL, prompt=self.prompt_var.get(), period_days=int(self.perf_period_var.get())
+        )
+        self.dashboard_data.set_params(
+            COST_PANEL, hours=int(self.cost_period_var.get()), provider=self.provider_var.get()
+        )
+        self.dashboard_data.set_params(
+            TRENDS_PANEL, trend_type=self.trend_type_var.get(), period_days=int(self.trend_period_var.get())
+        )
+    
+    def _on_snapshot(self, snapshot: PanelSnapshot):
+        """Hand a new panel snapshot to the Tk thread."""
         try:
-            # Get all prompt IDs
-            prompt_ids = self.performance_analytics._get_all_prompt_ids()
-            
-            # Update prompt combo
-            values = ["All Prompts"] + prompt_ids[:20]  # Limit to first 20 for UI
-            self.prompt_combo['values'] = values
-            
-        except Exception as e:
-            print(f"Error loading prompt list: {e}")
+            self.after(0, self._apply_snapshot, snapshot)
+        except (RuntimeError, tk.TclError):
+            pass
+    
+    def _apply_snapshot(self, snapshot: PanelSnapshot):
+        """Swap a prepared view model into its tab."""
+        view = snapshot.view_model
+        panel_id = snapshot.panel_id
+        
+        if snapshot.error is not None:
+            error_targets = {
+                PERFORMANCE_PANEL: (self.perf_viz_text, "Failed to refresh performance data"),
+                COST_PANEL: (self.cost_viz_text, "Failed to refresh cost data"),
+                TRENDS_PANEL: (self.trends_insights_text, "Failed to generate trend analysis"),
+                INSIGHTS_PANEL: (self.recommendations_text, "Failed to generate insights"),
+            }
+            if panel_id in error_targets:
+                widget, message = error_targets[panel_id]
+                self._set_text(widget, f"{message}: {snapshot.error}")
+            return
+        
+        if panel_id == PERFORMANCE_PANEL:
+            self._set_metric_labels(self.perf_metric_labels, view["metrics"])
+            self._set_text(self.perf_viz_text, view["text"])
+        elif panel_id == COST_PANEL:
+            self._set_metric_labels(self.cost_metric_labels, view["metrics"])
+            self._set_text(self.cost_viz_text, view["text"])
+        elif panel_id == TRENDS_PANEL:
+            self.comparison_tree.delete(*self.comparison_tree.get_children())
+            for row in view["rows"]:
+                self.comparison_tree.insert("", tk.END, values=row)
+            self._set_text(self.trends_insights_text, view["text"])
+        elif panel_id == INSIGHTS_PANEL:
+            self.current_insights = view["insights"]
+            self._set_text(self.recommendations_text, view["recommendations"])
+            self._set_text(self.patterns_text, view["patterns"])
+        elif panel_id == PROMPTS_PANEL:
+            self.prompt_combo['values'] = view["values"]
+    
+    def _set_text(self, widget, content: str):
+        widget.delete(1.0, tk.END)
+        widget.insert(1.0, content)
+    
+    def _set_metric_labels(self, labels, texts: Dict[str, str]):
+        for key, text in texts.items():
+            labels[key].config(text=text)
+    
+    def _on_destroy(self, event):
+        if event.widget is self:
+            self.auto_refresh = False
+            self.dashboard_data.shutdown()
+    
+    def _compute_prompts_panel(self, params) -> Dict[str, Any]:
+        """Load available prompts for selection (worker thread)."""
+        # Get all prompt IDs
+        prompt_ids = self.performance_analytics._get_all_prompt_ids()
+        
+        # Limit to first 20 for UI
+        return {"values": ["All Prompts"] + prompt_ids[:20]}
     
     def load_provider_list(self):
         """Load available providers for filtering."""
@@ -459,59 +548,75 @@ class AnalyticsDashboardPage(tk.Frame):
             print(f"Error loading provider list: {e}")
     
     def refresh_performance_data(self):
-        """Refresh performance analytics data."""
+        """Refresh performance analytics data in the background."""
         try:
-            # Get selected prompt and period
-            selected_prompt = self.prompt_var.get()
-            period_days = int(self.perf_period_var.get())
-            
-            if selected_prompt == "All Prompts":
-                # Generate insights for all prompts
-                insights = self.performance_analytics.generate_performance_insights()
-                self.update_performance_metrics_from_insights(insights)
-                self.update_performance_visualization(insights)
-            else:
-                # Analyze specific prompt
-                metrics = self.performance_analytics.analyze_prompt_effectiveness(
-                    selected_prompt, period_days
-                )
-                self.update_performance_metrics(metrics)
-                self.update_single_prompt_visualization(selected_prompt, metrics)
-                
+            self.dashboard_data.set_params(
+                PERFORMANCE_PANEL, prompt=self.prompt_var.get(), period_days=int(self.perf_period_var.get())
+            )
+            self.dashboard_data.refresh([PERFORMANCE_PANEL])
         except Exception as e:
             messagebox.showerror("Error", f"Failed to refresh performance data: {e}")
     
+    def _compute_performance_panel(self, params) -> Dict[str, Any]:
+        """Build the performance tab view model (worker thread)."""
+        selected_prompt = params["prompt"]
+        
+        if selected_prompt == "All Prompts":
+            # Generate insights for all prompts
+            insights = self.performance_analytics.generate_performance_insights()
+            return {
+                "metrics": self.format_performance_metrics_from_insights(insights),
+                "text": self.format_performance_visualization(insights)
+            }
+        
+        # Analyze specific prompt
+        metrics = self.performance_analytics.analyze_prompt_effectiveness(
+            selected_prompt, params["period_days"]
+        )
+        return {
+            "metrics": self.format_performance_metrics(metrics),
+            "text": self.format_single_prompt_visualization(selected_prompt, metrics)
+        }
+    
     def update_performance_metrics(self, metrics):
         """Update performance metric labels."""
-        self.perf_metric_labels["avg_score"].config(text=f"{metrics.avg_score:.3f}")
-        self.perf_metric_labels["success_rate"].config(text=f"{metrics.success_rate:.1%}")
-        self.perf_metric_labels["execution_count"].config(text=f"{metrics.execution_count:,}")
-        self.perf_metric_labels["avg_response_time"].config(text=f"{metrics.avg_response_time:.0f}")
-        self.perf_metric_labels["score_variance"].config(text=f"{metrics.score_variance:.3f}")
-        self.perf_metric_labels["quality_trend"].config(text=metrics.quality_trend.title())
+        self._set_metric_labels(self.perf_metric_labels, self.format_performance_metrics(metrics))
+    
+    def format_performance_metrics(self, metrics) -> Dict[str, str]:
+        """Performance metric label texts for a single prompt."""
+        return {
+            "avg_score": f"{metrics.avg_score:.3f}",
+            "success_rate": f"{metrics.success_rate:.1%}",
+            "execution_count": f"{metrics.execution_count:,}",
+            "avg_response_time": f"{metrics.avg_response_time:.0f}",
+            "score_variance": f"{metrics.score_variance:.3f}",
+            "quality_trend": metrics.quality_trend.title()
+        }
     
     def update_performance_metrics_from_insights(self, insights):
         """Update performance metrics from insights data."""
+        self._set_metric_labels(self.perf_metric_labels, self.format_performance_metrics_from_insights(insights))
+    
+    def format_performance_metrics_from_insights(self, insights) -> Dict[str, str]:
+        """Performance metric label texts from insights data."""
         summary = insights.get("summary", {})
         
-        self.perf_metric_labels["avg_score"].config(
-            text=f"{summary.get('overall_avg_score', 0):.3f}"
-        )
-        self.perf_metric_labels["success_rate"].config(
-            text=f"{summary.get('overall_success_rate', 0):.1%}"
-        )
-        self.perf_metric_labels["execution_count"].config(
-            text=f"{summary.get('analyzed_prompts', 0):,}"
-        )
-        self.perf_metric_labels["avg_response_time"].config(text="N/A")
-        self.perf_metric_labels["score_variance"].config(text="N/A")
-        self.perf_metric_labels["quality_trend"].config(text="Mixed")
+        return {
+            "avg_score": f"{summary.get('overall_avg_score', 0):.3f}",
+            "success_rate": f"{summary.get('overall_success_rate', 0):.1%}",
+            "execution_count": f"{summary.get('analyzed_prompts', 0):,}",
+            "avg_response_time": "N/A",
+            "score_variance": "N/A",
+            "quality_trend": "Mixed"
+        }
     
     def update_performance_visualization(self, insights):
         """Update performance visualization with insights data."""
+        self._set_text(self.perf_viz_text, self.format_performance_visualization(insights))
+    
+    def format_performance_visualization(self, insights) -> str:
+        """Build the performance visualization text from insights data."""
         try:
-            self.perf_viz_text.delete(1.0, tk.END)
-            
             viz_content = "Performance Analytics Dashboard\n"
             viz_content += "=" * 50 + "\n\n"
             
@@ -569,17 +674,18 @@ class AnalyticsDashboardPage(tk.Frame):
                         viz_content += f"• {trend.replace('_', ' ').title()}: {count} prompts\n"
                 viz_content += f"Overall Health: {trends.get('overall_health', 'unknown').title()}\n"
             
-            self.perf_viz_text.insert(1.0, viz_content)
+            return viz_content
             
         except Exception as e:
-            self.perf_viz_text.delete(1.0, tk.END)
-            self.perf_viz_text.insert(1.0, f"Error generating visualization: {e}")
+            return f"Error generating visualization: {e}"
     
     def update_single_prompt_visualization(self, prompt_id, metrics):
         """Update visualization for single prompt analysis."""
+        self._set_text(self.perf_viz_text, self.format_single_prompt_visualization(prompt_id, metrics))
+    
+    def format_single_prompt_visualization(self, prompt_id, metrics) -> str:
+        """Build the visualization text for a single prompt."""
         try:
-            self.perf_viz_text.delete(1.0, tk.END)
-            
             viz_content = f"Performance Analysis: {prompt_id}\n"
             viz_content += "=" * 50 + "\n\n"
             
@@ -620,36 +726,40 @@ class AnalyticsDashboardPage(tk.Frame):
             if metrics.success_rate < 0.7:
                 viz_content += "• Low success rate - review prompt effectiveness\n"
             
-            self.perf_viz_text.insert(1.0, viz_content)
+            return viz_content
             
         except Exception as e:
-            self.perf_viz_text.delete(1.0, tk.END)
-            self.perf_viz_text.insert(1.0, f"Error generating single prompt visualization: {e}")
+            return f"Error generating single prompt visualization: {e}"
     
     def refresh_cost_data(self):
-        """Refresh cost analytics data."""
+        """Refresh cost analytics data in the background."""
         try:
-            # Get selected period and provider
-            hours = int(self.cost_period_var.get())
-            selected_provider = self.provider_var.get()
-            
-            # Generate cost report
-            end_time = datetime.now()
-            start_time = end_time - timedelta(hours=hours)
-            
-            report = self.cost_tracker.generate_cost_report(start_time, end_time, "detailed")
-            
-            # Update cost metrics
-            self.update_cost_metrics(report, selected_provider)
-            
-            # Update cost visualization
-            self.update_cost_visualization(report, selected_provider)
-            
+            self.dashboard_data.set_params(
+                COST_PANEL, hours=int(self.cost_period_var.get()), provider=self.provider_var.get()
+            )
+            self.dashboard_data.refresh([COST_PANEL])
         except Exception as e:
             messagebox.showerror("Error", f"Failed to refresh cost data: {e}")
     
+    def _compute_cost_panel(self, params) -> Dict[str, Any]:
+        """Build the cost tab view model (worker thread)."""
+        # Generate cost report
+        end_time = datetime.now()
+        start_time = end_time - timedelta(hours=params["hours"])
+        
+        report = self.cost_tracker.generate_cost_report(start_time, end_time, "detailed")
+        
+        return {
+            "metrics": self.format_cost_metrics(report, params["provider"]),
+            "text": self.format_cost_visualization(report, params["provider"])
+        }
+    
     def update_cost_metrics(self, report, selected_provider):
         """Update cost metric labels."""
+        self._set_metric_labels(self.cost_metric_labels, self.format_cost_metrics(report, selected_provider))
+    
+    def format_cost_metrics(self, report, selected_provider) -> Dict[str, str]:
+        """Cost metric label texts, filtered by provider."""
         # Filter data by provider if selected
         if selected_provider != "All Providers":
             provider_data = report.provider_breakdown.get(selected_provider, {})
@@ -665,19 +775,22 @@ class AnalyticsDashboardPage(tk.Frame):
         avg_cost_per_request = total_cost / total_requests if total_requests > 0 else 0
         avg_cost_per_token = total_cost / total_tokens if total_tokens > 0 else 0
         
-        # Update labels
-        self.cost_metric_labels["total_cost"].config(text=f"${total_cost:.4f}")
-        self.cost_metric_labels["avg_cost_per_request"].config(text=f"${avg_cost_per_request:.6f}")
-        self.cost_metric_labels["avg_cost_per_token"].config(text=f"${avg_cost_per_token:.8f}")
-        self.cost_metric_labels["total_tokens"].config(text=f"{total_tokens:,}")
-        self.cost_metric_labels["cost_trend"].config(text="Stable")  # Placeholder
-        self.cost_metric_labels["efficiency_score"].config(text="85%")  # Placeholder
+        return {
+            "total_cost": f"${total_cost:.4f}",
+            "avg_cost_per_request": f"${avg_cost_per_request:.6f}",
+            "avg_cost_per_token": f"${avg_cost_per_token:.8f}",
+            "total_tokens": f"{total_tokens:,}",
+            "cost_trend": "Stable",  # Placeholder
+            "efficiency_score": "85%"  # Placeholder
+        }
     
     def update_cost_visualization(self, report, selected_provider):
         """Update cost visualization display."""
+        self._set_text(self.cost_viz_text, self.format_cost_visualization(report, selected_provider))
+    
+    def format_cost_visualization(self, report, selected_provider) -> str:
+        """Build the cost visualization text."""
         try:
-            self.cost_viz_text.delete(1.0, tk.END)
-            
             viz_content = f"Cost Analytics Dashboard\n"
             viz_content += "=" * 50 + "\n\n"
             
@@ -746,97 +859,99 @@ class AnalyticsDashboardPage(tk.Frame):
                     
                     viz_content += f"• {hour}: ${cost:.4f} ({requests} requests)\n"
             
-            self.cost_viz_text.insert(1.0, viz_content)
+            return viz_content
             
         except Exception as e:
-            self.cost_viz_text.delete(1.0, tk.END)
-            self.cost_viz_text.insert(1.0, f"Error generating cost visualization: {e}")
+            return f"Error generating cost visualization: {e}"
     
     def generate_trend_analysis(self):
-        """Generate trend analysis and comparison tables."""
+        """Generate trend analysis and comparison tables in the background."""
         try:
-            # Get analysis parameters
-            trend_type = self.trend_type_var.get()
-            period_days = int(self.trend_period_var.get())
-            
-            # Clear existing data
-            self.comparison_tree.delete(*self.comparison_tree.get_children())
-            
-            # Get prompt IDs for analysis
-            prompt_ids = self.performance_analytics._get_all_prompt_ids()[:20]  # Limit for performance
-            
-            # Generate comparison data
-            comparison_data = []
-            
-            for prompt_id in prompt_ids:
-                try:
-                    # Get current metrics
-                    metrics = self.performance_analytics.analyze_prompt_effectiveness(prompt_id, period_days)
-                    
-                    if metrics.execution_count >= 3:  # Minimum for reliable data
-                        # Get historical tracking for trend
-                        historical = self.trend_analysis.track_historical_performance(prompt_id, period_days)
-                        
-                        # Calculate change percentage (placeholder)
-                        change_pct = 0.0
-                        if historical.get("status") == "success":
-                            trends = historical.get("trends", {})
-                            score_trend = trends.get("score", {})
-                            if score_trend.get("trend_type") == "improving":
-                                change_pct = 5.0
-                            elif score_trend.get("trend_type") == "declining":
-                                change_pct = -5.0
-                        
-                        comparison_data.append({
-                            "prompt_id": prompt_id,
-                            "avg_score": metrics.avg_score,
-                            "success_rate": metrics.success_rate,
-                            "execution_count": metrics.execution_count,
-                            "quality_trend": metrics.quality_trend,
-                            "change_pct": change_pct
-                        })
-                
-                except Exception as e:
-                    print(f"Error analyzing prompt {prompt_id}: {e}")
-                    continue
-            
-            # Sort by average score
-            comparison_data.sort(key=lambda x: x["avg_score"], reverse=True)
-            
-            # Populate comparison tree
-            for data in comparison_data:
-                trend_symbol = {
-                    "improving": "↗",
-                    "declining": "↘",
-                    "stable": "→",
-                    "volatile": "↕"
-                }.get(data["quality_trend"], "?")
-                
-                change_text = f"{data['change_pct']:+.1f}%" if data["change_pct"] != 0 else "0.0%"
-                
-                self.comparison_tree.insert("", tk.END, values=(
-                    data["prompt_id"][:15] + "..." if len(data["prompt_id"]) > 15 else data["prompt_id"],
-                    f"{data['avg_score']:.3f}",
-                    f"{data['success_rate']:.1%}",
-                    f"{data['execution_count']:,}",
-                    f"{trend_symbol} {data['quality_trend'].title()}",
-                    change_text
-                ))
-            
-            # Generate trend insights
-            self.generate_trend_insights(comparison_data)
-            
+            self.dashboard_data.set_params(
+                TRENDS_PANEL, trend_type=self.trend_type_var.get(), period_days=int(self.trend_period_var.get())
+            )
+            self.dashboard_data.refresh([TRENDS_PANEL])
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate trend analysis: {e}")
     
+    def _compute_trends_panel(self, params) -> Dict[str, Any]:
+        """Build the comparison table rows and trend insights (worker thread)."""
+        period_days = params["period_days"]
+        
+        # Get prompt IDs for analysis
+        prompt_ids = self.performance_analytics._get_all_prompt_ids()[:20]  # Limit for performance
+        
+        # Generate comparison data
+        comparison_data = []
+        
+        for prompt_id in prompt_ids:
+            try:
+                # Get current metrics
+                metrics = self.performance_analytics.analyze_prompt_effectiveness(prompt_id, period_days)
+                
+                if metrics.execution_count >= 3:  # Minimum for reliable data
+                    # Get historical tracking for trend
+                    historical = self.trend_analysis.track_historical_performance(prompt_id, period_days)
+                    
+                    # Calculate change percentage (placeholder)
+                    change_pct = 0.0
+                    if historical.get("status") == "success":
+                        trends = historical.get("trends", {})
+                        score_trend = trends.get("score", {})
+                        if score_trend.get("trend_type") == "improving":
+                            change_pct = 5.0
+                        elif score_trend.get("trend_type") == "declining":
+                            change_pct = -5.0
+                    
+                    comparison_data.append({
+                        "prompt_id": prompt_id,
+                        "avg_score": metrics.avg_score,
+                        "success_rate": metrics.success_rate,
+                        "execution_count": metrics.execution_count,
+                        "quality_trend": metrics.quality_trend,
+                        "change_pct": change_pct
+                    })
+            
+            except Exception as e:
+                print(f"Error analyzing prompt {prompt_id}: {e}")
+                continue
+        
+        # Sort by average score
+        comparison_data.sort(key=lambda x: x["avg_score"], reverse=True)
+        
+        # Prepare comparison rows
+        rows = []
+        for data in comparison_data:
+            trend_symbol = {
+                "improving": "↗",
+                "declining": "↘",
+                "stable": "→",
+                "volatile": "↕"
+            }.get(data["quality_trend"], "?")
+            
+            change_text = f"{data['change_pct']:+.1f}%" if data["change_pct"] != 0 else "0.0%"
+            
+            rows.append((
+                data["prompt_id"][:15] + "..." if len(data["prompt_id"]) > 15 else data["prompt_id"],
+                f"{data['avg_score']:.3f}",
+                f"{data['success_rate']:.1%}",
+                f"{data['execution_count']:,}",
+                f"{trend_symbol} {data['quality_trend'].title()}",
+                change_text
+            ))
+        
+        # Generate trend insights
+        return {"rows": rows, "text": self.format_trend_insights(comparison_data)}
+        
     def generate_trend_insights(self, comparison_data):
         """Generate insights from trend analysis."""
+        self._set_text(self.trends_insights_text, self.format_trend_insights(comparison_data))
+    
+    def format_trend_insights(self, comparison_data) -> str:
+        """Build the trend insights text from comparison data."""
         try:
-            self.trends_insights_text.delete(1.0, tk.END)
-            
             if not comparison_data:
-                self.trends_insights_text.insert(1.0, "No data available for trend analysis.")
-                return
+                return "No data available for trend analysis."
             
             insights_content = "TREND ANALYSIS INSIGHTS\n"
             insights_content += "=" * 30 + "\n\n"
@@ -878,33 +993,36 @@ class AnalyticsDashboardPage(tk.Frame):
                 insights_content += f"Needs Attention: {worst['prompt_id'][:20]}... "
                 insights_content += f"(Score: {worst['avg_score']:.3f})\n"
             
-            self.trends_insights_text.insert(1.0, insights_content)
+            return insights_content
             
         except Exception as e:
-            self.trends_insights_text.delete(1.0, tk.END)
-            self.trends_insights_text.insert(1.0, f"Error generating trend insights: {e}")
+            return f"Error generating trend insights: {e}"
     
     def generate_insights(self):
-        """Generate comprehensive insights and recommendations."""
+        """Generate comprehensive insights and recommendations in the background."""
         try:
-            # Generate performance insights
-            insights = self.performance_analytics.generate_performance_insights()
-            self.current_insights = insights
-            
-            # Update recommendations
-            self.update_recommendations(insights)
-            
-            # Update patterns display
-            self.update_patterns_display(insights)
-            
+            self.dashboard_data.refresh([INSIGHTS_PANEL])
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate insights: {e}")
     
+    def _compute_insights_panel(self, params) -> Dict[str, Any]:
+        """Build the recommendations and patterns texts (worker thread)."""
+        # Generate performance insights
+        insights = self.performance_analytics.generate_performance_insights()
+        
+        return {
+            "insights": insights,
+            "recommendations": self.format_recommendations(insights),
+            "patterns": self.format_patterns(insights)
+        }
+    
     def update_recommendations(self, insights):
         """Update optimization recommendations display."""
+        self._set_text(self.recommendations_text, self.format_recommendations(insights))
+    
+    def format_recommendations(self, insights) -> str:
+        """Build the optimization recommendations text."""
         try:
-            self.recommendations_text.delete(1.0, tk.END)
-            
             recommendations_content = "OPTIMIZATION RECOMMENDATIONS\n"
             recommendations_content += "=" * 35 + "\n\n"
             
@@ -950,17 +1068,18 @@ class AnalyticsDashboardPage(tk.Frame):
                 recommendations_content += "• Experiment with advanced optimization techniques\n"
                 recommendations_content += "• Share successful patterns with team\n"
             
-            self.recommendations_text.insert(1.0, recommendations_content)
+            return recommendations_content
             
         except Exception as e:
-            self.recommendations_text.delete(1.0, tk.END)
-            self.recommendations_text.insert(1.0, f"Error generating recommendations: {e}")
+            return f"Error generating recommendations: {e}"
     
     def update_patterns_display(self, insights):
         """Update patterns and insights display."""
+        self._set_text(self.patterns_text, self.format_patterns(insights))
+    
+    def format_patterns(self, insights) -> str:
+        """Build the patterns and insights text."""
         try:
-            self.patterns_text.delete(1.0, tk.END)
-            
             patterns_content = "IDENTIFIED PATTERNS & INSIGHTS\n"
             patterns_content += "=" * 40 + "\n\n"
             
@@ -1011,11 +1130,10 @@ class AnalyticsDashboardPage(tk.Frame):
                     if percentage > 0:
                         patterns_content += f"{trend.replace('_', ' ').title()}: {percentage:.1f}%\n"
             
-            self.patterns_text.insert(1.0, patterns_content)
+            return patterns_content
             
         except Exception as e:
-            self.patterns_text.delete(1.0, tk.END)
-            self.patterns_text.insert(1.0, f"Error displaying patterns: {e}")
+            return f"Error displaying patterns: {e}"
     
     def filter_insights(self):
         """Filter insights based on selected type."""
@@ -0,0 +1,234 @@
+"""
+Dashboard Data Service
+======================
+
+Computes dashboard panels on a background worker and publishes the results
+as snapshots through the UI state manager.
+
+Each panel names the tables it reads. A refresh first reads one watermark
+per table (the newest timestamp and the row count) and only recomputes
+panels whose watermark or parameters changed, or whose snapshot has grown
+older than ``max_age`` (time-windowed queries drift even without new rows).
+Panels return ready-to-display view models, so pages only swap them in.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ui.operation_pool import OperationPool, OperationPriority
+from ui.state_manager import EventPriority, EventType, StateEvent, UIStateManager, get_state_manager
+
+
+DEFAULT_MAX_AGE_SECONDS = 300
+
+# Tables whose row timestamp is not in ``created_at``
+WATERMARK_COLUMNS = {
+    "llm_usage_records": "timestamp",
+}
+
+
+@dataclass
+class PanelSnapshot:
+    """Prepared view model for one panel, with the inputs it was built from."""
+    panel_id: str
+    view_model: Any
+    params: Dict[str, Any]
+    watermark: Tuple
+    computed_at: datetime = field(default_factory=datetime.now)
+    duration: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class DashboardPanel:
+    """A registered panel: how to compute it and what it reads."""
+    panel_id: str
+    compute: Callable[[Dict[str, Any]], Any]
+    sources: Tuple[str, ...]
+    params: Dict[str, Any] = field(default_factory=dict)
+    snapshot: Optional[PanelSnapshot] = None
+    computed_monotonic: float = 0.0
+
+
+class DashboardDataService:
+    """Background, watermark-driven computation of dashboard panels."""
+
+    def __init__(self, db_manager, state_manager: Optional[UIStateManager] = None,
+                 pool: Optional[OperationPool] = None, max_age: float = DEFAULT_MAX_AGE_SECONDS):
+        self.logger = logging.getLogger(__name__)
+        self.db_manager = db_manager
+        self.state_manager = state_manager or get_state_manager()
+        self.max_age = max_age
+
+        self._owns_pool = pool is None
+        self.pool = pool or OperationPool(max_workers=1, name="dashboard-data")
+
+        self.panels: Dict[str, DashboardPanel] = {}
+        self._lock = threading.Lock()
+        self._requested: set = set()
+        self._forced: set = set()
+        self._running = False
+        self._future = None
+        self._subscriptions: List[Callable] = []
+
+        # Statistics
+        self.computed_count = 0
+        self.skipped_count = 0
+
+    def register_panel(self, panel_id: str, compute: Callable[[Dict[str, Any]], Any],
+                       sources: Sequence[str], params: Optional[Dict[str, Any]] = None):
+        """Register a panel computed by ``compute(params)`` from the ``sources`` tables."""
+        for table in sources:
+            if not table.isidentifier():
+                raise ValueError(f"Invalid source table: {table}")
+        with self._lock:
+            self.panels[panel_id] = DashboardPanel(panel_id, compute, tuple(sources), dict(params or {}))
+
+    def set_params(self, panel_id: str, **params) -> bool:
+        """Update a panel's parameters; returns True when they changed."""
+        with self._lock:
+            panel = self.panels[panel_id]
+            updated = {**panel.params, **params}
+            if updated == panel.params:
+                return False
+            panel.params = updated
+            return True
+
+    def refresh(self, panels: Optional[Iterable[str]] = None, force: bool = False):
+        """Queue a refresh of ``panels`` (all by default) and return its future.
+
+        Only one refresh runs at a time; requests made while it runs are
+        folded into its next pass. Unchanged panels are skipped unless
+        ``force`` is set.
+        """
+        with self._lock:
+            targets = set(self.panels) if panels is None else set(panels)
+            self._requested |= targets
+            if force:
+                self._forced |= targets
+            if self._running:
+                return self._future
+            self._running = True
+            try:
+                self._future = self.pool.submit(self._run, priority=OperationPriority.BACKGROUND)
+            except RuntimeError as e:
+                self._running = False
+                self.logger.error(f"Error scheduling dashboard refresh: {e}")
+                return None
+            return self._future
+
+    def _run(self):
+        """Worker body: compute requested panels until no requests remain."""
+        try:
+            while True:
+                with self._lock:
+                    requested, forced = self._requested, self._forced
+                    self._requested, self._forced = set(), set()
+                    if not requested:
+                        self._running = False
+                        return
+                    panels = [self.panels[panel_id] for panel_id in requested if panel_id in self.panels]
+
+                tables = {table for panel in panels for table in panel.sources}
+                watermarks = self.read_watermarks(tables)
+                for panel in panels:
+                    watermark = tuple(watermarks.get(table) for table in panel.sources)
+                    self._refresh_panel(panel, watermark, panel.panel_id in forced)
+        except Exception as e:
+            # Clear the flag so the next refresh() starts a new worker
+            self.logger.error(f"Error refreshing dashboard panels: {e}")
+            with self._lock:
+                self._running = False
+            raise
+
+    def _refresh_panel(self, panel: DashboardPanel, watermark: Tuple, force: bool):
+        with self._lock:
+            params = dict(panel.params)
+        snapshot = panel.snapshot
+        age = time.monotonic() - panel.computed_monotonic
+        if (not force and snapshot is not None and snapshot.error is None
+                and snapshot.watermark == watermark and snapshot.params == params
+                and age < self.max_age):
+            self.skipped_count += 1
+            return
+
+        started = time.perf_counter()
+        try:
+            view_model, error = panel.compute(params), None
+        except Exception as e:
+            self.logger.error(f"Error computing dashboard panel {panel.panel_id}: {e}")
+            view_model, error = None, str(e)
+
+        snapshot = PanelSnapshot(
+            panel_id=panel.panel_id,
+            view_model=view_model,
+            params=params,
+            watermark=watermark,
+            duration=time.perf_counter() - started,
+            error=error
+        )
+        panel.snapshot = snapshot
+        panel.computed_monotonic = time.monotonic()
+        self.computed_count += 1
+
+        self.state_manager.publish_event(
+            EventType.DASHBOARD_UPDATED,
+            snapshot,
+            source="dashboard_data",
+            target=panel.panel_id,
+            priority=EventPriority.LOW,
+            coalesce=True
+        )
+
+    def read_watermarks(self, tables: Iterable[str]) -> Dict[str, Optional[Tuple]]:
+        """Newest row timestamp and row count for each table (None if unreadable)."""
+        watermarks = {}
+        with self.db_manager.get_connection() as conn:
+            for table in tables:
+                column = WATERMARK_COLUMNS.get(table, "created_at")
+                try:
+                    watermarks[table] = tuple(conn.execute(
+                        f"SELECT MAX({column}), COUNT(*) FROM {table}"
+                    ).fetchone())
+                except Exception as e:
+                    self.logger.debug(f"No watermark for {table}: {e}")
+                    watermarks[table] = None
+        return watermarks
+
+    def latest(self, panel_id: str) -> Optional[PanelSnapshot]:
+        panel = self.panels.get(panel_id)
+        return panel.snapshot if panel else None
+
+    def subscribe(self, callback: Callable[[PanelSnapshot], None]):
+        """Call ``callback`` with every snapshot of this service's panels.
+
+        Callbacks run on the state manager's dispatch thread; pages hand the
+        snapshot to Tk with ``after``.
+        """
+        def on_event(event: StateEvent):
+            snapshot = event.data
+            if isinstance(snapshot, PanelSnapshot) and self.panels.get(snapshot.panel_id) is not None \
+                    and self.panels[snapshot.panel_id].snapshot is snapshot:
+                callback(snapshot)
+
+        self.state_manager.subscribe(EventType.DASHBOARD_UPDATED, on_event)
+        self._subscriptions.append(on_event)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "panels": len(self.panels),
+            "computed": self.computed_count,
+            "skipped": self.skipped_count,
+            "running": self._running
+        }
+
+    def shutdown(self):
+        for on_event in self._subscriptions:
+            self.state_manager.unsubscribe(EventType.DASHBOARD_UPDATED, on_event)
+        self._subscriptions.clear()
+        if self._owns_pool:
+            self.pool.shutdown(wait=False)
@@ -0,0 +1,166 @@
+"""
+UI Operation Pool
+=================
+
+Bounded worker pool with priority lanes and a single long-lived asyncio loop,
+used by the UI service bridge to run backend operations off the Tk thread.
+"""
+
+import asyncio
+import itertools
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from enum import IntEnum
+from typing import Any, Callable, List, Optional
+
+
+class OperationPriority(IntEnum):
+    """Priority lanes for queued operations (lower value runs first)."""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+class OperationPool:
+    """Fixed-size worker pool that drains a priority queue.
+
+    Worker threads are started lazily up to ``max_workers``. Coroutines are
+    never given their own event loop; they are scheduled on one shared loop
+    thread owned by the pool and the calling worker waits for the result.
+    """
+
+    _STOP = object()
+
+    def __init__(self, max_workers: int = 4, name: str = "ui-operation"):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.logger = logging.getLogger(__name__)
+        self.max_workers = max_workers
+        self.name = name
+
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._workers: List[threading.Thread] = []
+        self._idle_workers = 0
+        self._lock = threading.Lock()
+        self._shutdown = False
+
+        # Shared asyncio loop, started on first coroutine
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_ready = threading.Event()
+
+    def submit(self, fn: Callable, *args,
+               priority: OperationPriority = OperationPriority.NORMAL,
+               **kwargs) -> Future:
+        """Queue a callable and return a future for its result."""
+        future: Future = Future()
+
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Operation pool has been shut down")
+
+            self._queue.put((int(priority), next(self._sequence), (future, fn, args, kwargs)))
+
+            if self._idle_workers == 0 and len(self._workers) < self.max_workers:
+                self._start_worker()
+            else:
+                self._idle_workers = max(0, self._idle_workers - 1)
+
+        return future
+
+    def _start_worker(self):
+        """Start one more worker thread (caller holds the lock)."""
+        worker = threading.Thread(
+            target=self._worker_loop,
+            name=f"{self.name}-worker-{len(self._workers) + 1}",
+            daemon=True
+        )
+        self._workers.append(worker)
+        worker.start()
+
+    def _worker_loop(self):
+        """Take work items off the priority queue until stopped."""
+        while True:
+            _, _, item = self._queue.get()
+            try:
+                if item is self._STOP:
+                    return
+
+                future, fn, args, kwargs = item
+                if not future.set_running_or_notify_cancel():
+                    continue
+
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            finally:
+                self._queue.task_done()
+                with self._lock:
+                    self._idle_workers += 1
+
+    def run_coroutine(self, coro, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the shared loop and block until it finishes."""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the shared event loop thread if it is not running."""
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("Operation pool has been shut down")
+
+            if self._loop_thread is None:
+                self._loop_thread = threading.Thread(
+                    target=self._run_loop,
+                    name=f"{self.name}-asyncio",
+                    daemon=True
+                )
+                self._loop_thread.start()
+
+        self._loop_ready.wait()
+        return self._loop
+
+    def _run_loop(self):
+        """Body of the asyncio loop thread."""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._loop_ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def pending_count(self) -> int:
+        """Approximate number of queued, not yet started, items."""
+        return self._queue.qsize()
+
+    def shutdown(self, wait: bool = True, timeout: float = 5.0):
+        """Stop the workers and the event loop thread."""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            workers = list(self._workers)
+
+        # Stop sentinels sort after every real priority lane
+        for _ in workers:
+            self._queue.put((len(OperationPriority), next(self._sequence), self._STOP))
+
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+        if wait:
+            for worker in workers:
+                worker.join(timeout=timeout)
+            if self._loop_thread is not None:
+                self._loop_thread.join(timeout=timeout)
+
+        self.logger.debug(f"Operation pool '{self.name}' shut down")
@@ -8,21 +8,20 @@ progress indicators, and user-friendly error messages.
 
 import logging
 import asyncio
+import inspect
 import threading
 from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime
 from dataclasses import dataclass
 from enum import Enum
 
-# Import all services
-from services.prompt.templating_engine import TemplatingEngine
-from services.prompt.version_control import VersionControlService
-from services.security.security_scanner import SecurityScanner
-from services.collaboration.workspace_management import WorkspaceManagementService
-from services.collaboration.approval_workflow import ApprovalWorkflowService
-from services.analytics.performance_analytics import PerformanceAnalytics
-from services.evaluation.multi_model_testing import MultiModelTestingInfrastructure
-from services.evaluation.human_rating import HumanRatingService
+from core.service_registry import LazyServiceRegistry
+from ui.operation_pool import OperationPool, OperationPriority
+
+
+class OperationCancelledError(Exception):
+    """Raised inside a running operation once the user has cancelled it."""
+    pass
 
 
 class OperationStatus(Enum):
@@ -53,18 +52,24 @@ class OperationResult:
 class UIServiceBridge:
     """Bridge layer connecting UI components with backend services."""
     
-    def __init__(self, config_manager, db_manager):
+    def __init__(self, config_manager, db_manager, max_workers: int = 4, profiler=None):
         self.logger = logging.getLogger(__name__)
         self.config_manager = config_manager
         self.db_manager = db_manager
         
-        # Initialize services
-        self.services = {}
+        # Register services; each is constructed on first use or during warm-up
+        self.services = LazyServiceRegistry(profiler=profiler)
         self._initialize_services()
         
+        # Bounded worker pool with a shared asyncio loop
+        self.operation_pool = OperationPool(max_workers=max_workers)
+        
         # Operation tracking
         self.active_operations: Dict[str, OperationResult] = {}
         self.operation_callbacks: Dict[str, List[Callable]] = {}
+        self.operation_keys: Dict[str, str] = {}  # dedupe key -> operation id
+        self._operation_futures: Dict[str, Any] = {}
+        self._operations_lock = threading.RLock()
         
         # Error handling
         self.error_handlers: Dict[type, Callable] = {}
@@ -73,31 +78,71 @@ class UIServiceBridge:
         self.logger.info("UI Service Bridge initialized")
     
     def _initialize_services(self):
-        """Initialize all backend services."""
-        try:
-            # Template management services
-            self.services['templating'] = TemplatingEngine(self.config_manager, self.db_manager)
-            self.services['version_control'] = VersionControlService(self.config_manager, self.db_manager)
-            
-            # Security services
-            self.services['security'] = SecurityScanner()
-            
-            # Collaboration services
-            self.services['workspace'] = WorkspaceManagementService(self.db_manager)
-            self.services['approval'] = ApprovalWorkflowService(self.db_manager)
-            
-            # Analytics services
-            self.services['analytics'] = PerformanceAnalytics(self.config_manager, self.db_manager)
-            
-            # Evaluation services
-            self.services['testing'] = MultiModelTestingInfrastructure(self.config_manager, self.db_manager)
-            self.services['rating'] = HumanRatingService(self.config_manager, self.db_manager)
-            
-            self.logger.info("All services initialized successfully")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to initialize services: {e}")
-            raise
+        """Register factories for all backend services.
+        
+        Service modules are imported inside their factories so that neither the
+        imports nor the constructors run until a service is first needed.
+        """
+        def templating():
+            from services.prompt.templating_engine import TemplatingEngine
+            return TemplatingEngine(self.config_manager, self.db_manager)
+        
+        def version_control():
+            from services.prompt.version_control import VersionControlService
+            return VersionControlService(self.config_manager, self.db_manager)
+        
+        def security():
+            from services.security.security_scanner import SecurityScanner
+            return SecurityScanner()
+        
+        def workspace():
+            from services.collaboration.workspace_management import WorkspaceManagementService
+            return WorkspaceManagementService(self.db_manager)
+        
+        def approval():
+            from services.collaboration.approval_workflow import ApprovalWorkflowService
+            return ApprovalWorkflowService(self.db_manager)
+        
+        def analytics():
+            from services.analytics.performance_analytics import PerformanceAnalytics
+            return PerformanceAnalytics(self.config_manager, self.db_manager)
+        
+        def testing():
+            from services.evaluation.multi_model_testing import MultiModelTestingInfrastructure
+            return MultiModelTestingInfrastructure(self.config_manager, self.db_manager)
+        
+        def rating():
+            from services.evaluation.human_rating import HumanRatingService
+            return HumanRatingService(self.config_manager, self.db_manager)
+        
+        def audit():
+            from services.collaboration.audit_trail import AuditTrailService
+            return AuditTrailService(self.db_manager)
+        
+        # Template management services
+        self.services.register('templating', templating)
+        self.services.register('version_control', version_control)
+        
+        # Security services
+        self.services.register('security', security)
+        
+        # Collaboration services
+        self.services.register('workspace', workspace)
+        self.services.register('approval', approval)
+        self.services.register('audit', audit)
+        
+        # Analytics services
+        self.services.register('analytics', analytics)
+        
+        # Evaluation services
+        self.services.register('testing', testing)
+        self.services.register('rating', rating)
+        
+        self.logger.info(f"Registered {len(self.services.names())} lazily initialized services")
+    
+    def warm_up_services(self, names: List[str] = None, on_complete: Callable = None):
+        """Construct registered services in the background."""
+        return self.services.warm_up(names, on_complete)
     
     def _setup_error_handlers(self):
         """Set up error handlers for different exception types."""
@@ -143,36 +188,65 @@ class UIServiceBridge:
     def execute_operation(self, operation_name: str, service_name: str, 
                          method_name: str, *args, **kwargs) -> str:
         """Execute a service operation with error handling and progress tracking."""
-        operation_id = f"{operation_name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+        return self.submit_operation(operation_name, service_name, method_name,
+                                     args=args, kwargs=kwargs)
+    
+    def submit_operation(self, operation_name: str, service_name: str, method_name: str,
+                         args: tuple = (), kwargs: Dict[str, Any] = None,
+                         priority: OperationPriority = OperationPriority.NORMAL,
+                         dedupe_key: Optional[str] = None) -> str:
+        """Queue a service operation on the worker pool.
         
-        # Initialize operation result
-        result = OperationResult(
-            operation_id=operation_id,
-            status=OperationStatus.PENDING,
-            message=f"Starting {operation_name}..."
-        )
-        self.active_operations[operation_id] = result
+        Operations submitted with the same ``dedupe_key`` while an earlier one is
+        still pending or running are coalesced: the existing operation id is
+        returned and callers share its result. ``priority`` selects the lane;
+        interactive work is dequeued ahead of background analytics.
+        """
+        kwargs = kwargs or {}
         
-        # Execute in background thread
-        thread = threading.Thread(
-            target=self._execute_operation_thread,
-            args=(operation_id, service_name, method_name, args, kwargs),
-            daemon=True
-        )
-        thread.start()
+        with self._operations_lock:
+            if dedupe_key is not None:
+                existing_id = self.operation_keys.get(dedupe_key)
+                existing = self.active_operations.get(existing_id) if existing_id else None
+                if existing and existing.status in (OperationStatus.PENDING, OperationStatus.IN_PROGRESS):
+                    self.logger.debug(f"Coalesced {operation_name} into {existing_id}")
+                    return existing_id
+            
+            operation_id = f"{operation_name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}"
+            while operation_id in self.active_operations:
+                operation_id += "_"
+            
+            # Initialize operation result
+            result = OperationResult(
+                operation_id=operation_id,
+                status=OperationStatus.PENDING,
+                message=f"Starting {operation_name}..."
+            )
+            self.active_operations[operation_id] = result
+            if dedupe_key is not None:
+                self.operation_keys[dedupe_key] = operation_id
+            
+            future = self.operation_pool.submit(
+                self._run_operation,
+                operation_id, service_name, method_name, args, kwargs, dedupe_key,
+                priority=priority
+            )
+            self._operation_futures[operation_id] = future
         
         return operation_id
     
-    def _execute_operation_thread(self, operation_id: str, service_name: str,
-                                method_name: str, args: tuple, kwargs: dict):
-        """Execute operation in background thread."""
+    def _run_operation(self, operation_id: str, service_name: str, method_name: str,
+                       args: tuple, kwargs: dict, dedupe_key: Optional[str]):
+        """Execute operation on a pool worker."""
         result = self.active_operations[operation_id]
         
         try:
-            # Update status
-            result.status = OperationStatus.IN_PROGRESS
-            result.message = f"Executing {method_name}..."
-            result.progress = 10.0
+            # Transitions are made under the lock so a concurrent cancel is never overwritten
+            with self._operations_lock:
+                if result.status == OperationStatus.CANCELLED:
+                    return
+                result.status = OperationStatus.IN_PROGRESS
+                result.message = f"Executing {method_name}..."
             self._notify_callbacks(operation_id)
             
             # Get service
@@ -187,47 +261,83 @@ class UIServiceBridge:
             
             method = getattr(service, method_name)
             
-            # Update progress
-            result.progress = 30.0
-            result.message = f"Processing {method_name}..."
-            self._notify_callbacks(operation_id)
+            # Services opt into progress reporting by accepting progress_callback
+            if self._accepts_progress_callback(method) and 'progress_callback' not in kwargs:
+                kwargs = dict(kwargs, progress_callback=self._make_progress_callback(operation_id))
             
             # Execute method
             if asyncio.iscoroutinefunction(method):
-                # Handle async methods
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
-                    data = loop.run_until_complete(method(*args, **kwargs))
-                finally:
-                    loop.close()
+                data = self.operation_pool.run_coroutine(method(*args, **kwargs))
             else:
-                # Handle sync methods
                 data = method(*args, **kwargs)
             
-            # Update progress
-            result.progress = 90.0
-            result.message = "Finalizing..."
-            self._notify_callbacks(operation_id)
+            with self._operations_lock:
+                if result.status == OperationStatus.CANCELLED:
+                    return
+                
+                # Complete operation (status last, so pollers never see it without data)
+                result.data = data
+                result.progress = 100.0
+                result.message = f"{method_name} completed successfully"
+                result.status = OperationStatus.COMPLETED
             
-            # Complete operation
-            result.status = OperationStatus.COMPLETED
-            result.data = data
-            result.progress = 100.0
-            result.message = f"{method_name} completed successfully"
+        except OperationCancelledError:
+            with self._operations_lock:
+                result.status = OperationStatus.CANCELLED
+                result.message = "Operation cancelled by user"
             
         except Exception as e:
-            # Handle error
-            result.status = OperationStatus.FAILED
-            result.error = self._get_user_friendly_error(e)
-            result.message = f"{method_name} failed: {result.error}"
-            result.progress = 0.0
+            error = self._get_user_friendly_error(e)
+            with self._operations_lock:
+                if result.status == OperationStatus.CANCELLED:
+                    return
+                
+                # Handle error
+                result.status = OperationStatus.FAILED
+                result.error = error
+                result.message = f"{method_name} failed: {result.error}"
+                result.progress = 0.0
             
             self.logger.error(f"Operation {operation_id} failed: {e}")
         
         finally:
-            # Notify callbacks
+            self._finish_operation(operation_id, dedupe_key)
+    
+    def _finish_operation(self, operation_id: str, dedupe_key: Optional[str]):
+        """Release bookkeeping for a finished operation and notify callbacks."""
+        with self._operations_lock:
+            self._operation_futures.pop(operation_id, None)
+            if dedupe_key is not None and self.operation_keys.get(dedupe_key) == operation_id:
+                del self.operation_keys[dedupe_key]
+        
+        self._notify_callbacks(operation_id)
+    
+    @staticmethod
+    def _accepts_progress_callback(method: Callable) -> bool:
+        """Check whether a service method takes a progress_callback argument."""
+        try:
+            return 'progress_callback' in inspect.signature(method).parameters
+        except (TypeError, ValueError):
+            return False
+    
+    def _make_progress_callback(self, operation_id: str) -> Callable[[int, int], None]:
+        """Build the callback handed to services for reporting real progress.
+        
+        Services call it as ``progress_callback(done, total)``, the same
+        convention as the audit export. It raises OperationCancelledError once
+        the operation has been cancelled so that long-running services can stop
+        at their next checkpoint.
+        """
+        def report(done: int, total: int):
+            result = self.active_operations[operation_id]
+            if result.status == OperationStatus.CANCELLED:
+                raise OperationCancelledError(operation_id)
+            
+            result.progress = max(0.0, min(100.0, done * 100.0 / total)) if total else 0.0
+            result.message = f"Processed {done} of {total}"
             self._notify_callbacks(operation_id)
+        
+        return report
     
     def _notify_callbacks(self, operation_id: str):
         """Notify registered callbacks about operation updates."""
@@ -240,25 +350,53 @@ class UIServiceBridge:
                     self.logger.error(f"Callback error for operation {operation_id}: {e}")
     
     def register_callback(self, operation_id: str, callback: Callable[[OperationResult], None]):
-        """Register callback for operation updates."""
-        if operation_id not in self.operation_callbacks:
-            self.operation_callbacks[operation_id] = []
-        self.operation_callbacks[operation_id].append(callback)
+        """Register callback for operation updates.
+        
+        If the operation has already finished (for example a coalesced request
+        whose shared result is ready), the callback is invoked immediately.
+        """
+        with self._operations_lock:
+            if operation_id not in self.operation_callbacks:
+                self.operation_callbacks[operation_id] = []
+            self.operation_callbacks[operation_id].append(callback)
+            result = self.active_operations.get(operation_id)
+            finished = result is not None and operation_id not in self._operation_futures
+        
+        if finished and result.status != OperationStatus.PENDING:
+            try:
+                callback(result)
+            except Exception as e:
+                self.logger.error(f"Callback error for operation {operation_id}: {e}")
     
     def get_operation_status(self, operation_id: str) -> Optional[OperationResult]:
         """Get current status of an operation."""
         return self.active_operations.get(operation_id)
     
     def cancel_operation(self, operation_id: str) -> bool:
-        """Cancel an active operation."""
-        if operation_id in self.active_operations:
-            result = self.active_operations[operation_id]
-            if result.status == OperationStatus.IN_PROGRESS:
-                result.status = OperationStatus.CANCELLED
-                result.message = "Operation cancelled by user"
-                self._notify_callbacks(operation_id)
-                return True
-        return False
+        """Cancel an active operation.
+        
+        Pending operations are dropped from the queue; running operations are
+        marked cancelled and stop at their next progress report.
+        """
+        with self._operations_lock:
+            result = self.active_operations.get(operation_id)
+            if result is None or result.status not in (OperationStatus.PENDING, OperationStatus.IN_PROGRESS):
+                return False
+            
+            was_pending = result.status == OperationStatus.PENDING
+            result.status = OperationStatus.CANCELLED
+            result.message = "Operation cancelled by user"
+            
+            future = self._operation_futures.get(operation_id)
+            if was_pending and future is not None and future.cancel():
+                # Never reaches a worker, so release its bookkeeping here
+                self._operation_futures.pop(operation_id, None)
+                for key, op_id in list(self.operation_keys.items()):
+                    if op_id == operation_id:
+                        del self.operation_keys[key]
+        
+        self._notify_callbacks(operation_id)
+        return True
     
     def cleanup_completed_operations(self, max_age_hours: int = 24):
         """Clean up completed operations older than specified hours."""
@@ -282,8 +420,9 @@ class UIServiceBridge:
     
     def create_template(self, template_data: Dict[str, Any], callback: Callable = None) -> str:
         """Create a new template."""
-        operation_id = self.execute_operation(
-            "Create Template", "templating", "create_template", template_data
+        operation_id = self.submit_operation(
+            "Create Template", "templating", "create_template", args=(template_data,),
+            priority=OperationPriority.INTERACTIVE
         )
         if callback:
             self.register_callback(operation_id, callback)
@@ -291,8 +430,9 @@ class UIServiceBridge:
     
     def update_template(self, template_id: str, template_data: Dict[str, Any], callback: Callable = None) -> str:
         """Update an existing template."""
-        operation_id = self.execute_operation(
-            "Update Template", "templating", "update_template", template_id, template_data
+        operation_id = self.submit_operation(
+            "Update Template", "templating", "update_template", args=(template_id, template_data),
+            priority=OperationPriority.INTERACTIVE
         )
         if callback:
             self.register_callback(operation_id, callback)
@@ -300,8 +440,9 @@ class UIServiceBridge:
     
     def scan_template_security(self, template_id: str, callback: Callable = None) -> str:
         """Scan template for security issues."""
-        operation_id = self.execute_operation(
-            "Security Scan", "security", "scan_template", template_id
+        operation_id = self.submit_operation(
+            "Security Scan", "security", "scan_template", args=(template_id,),
+            priority=OperationPriority.INTERACTIVE, dedupe_key=f"security_scan:{template_id}"
         )
         if callback:
             self.register_callback(operation_id, callback)
@@ -309,8 +450,9 @@ class UIServiceBridge:
     
     def create_workspace(self, workspace_data: Dict[str, Any], callback: Callable = None) -> str:
         """Create a new workspace."""
-        operation_id = self.execute_operation(
-            "Create Workspace", "workspace", "create_workspace", workspace_data
+        operation_id = self.submit_operation(
+            "Create Workspace", "workspace", "create_workspace", args=(workspace_data,),
+            priority=OperationPriority.INTERACTIVE
         )
         if callback:
             self.register_callback(operation_id, callback)
@@ -318,8 +460,9 @@ class UIServiceBridge:
     
     def submit_for_approval(self, item_id: str, item_type: str, callback: Callable = None) -> str:
         """Submit item for approval."""
-        operation_id = self.execute_operation(
-            "Submit for Approval", "approval", "submit_for_approval", item_id, item_type
+        operation_id = self.submit_operation(
+            "Submit for Approval", "approval", "submit_for_approval", args=(item_id, item_type),
+            priority=OperationPriority.INTERACTIVE
         )
         if callback:
             self.register_callback(operation_id, callback)
@@ -327,8 +470,21 @@ class UIServiceBridge:
     
     def generate_analytics(self, prompt_ids: List[str] = None, callback: Callable = None) -> str:
         """Generate performance analytics."""
-        operation_id = self.execute_operation(
-            "Generate Analytics", "analytics", "generate_performance_insights", prompt_ids
+        key_ids = ",".join(sorted(prompt_ids)) if prompt_ids else "*"
+        operation_id = self.submit_operation(
+            "Generate Analytics", "analytics", "generate_performance_insights", args=(prompt_ids,),
+            priority=OperationPriority.BACKGROUND, dedupe_key=f"analytics:{key_ids}"
+        )
+        if callback:
+            self.register_callback(operation_id, callback)
+        return operation_id
+    
+    def export_audit_trail(self, path: str, format_type: str = "csv", compress: bool = False,
+                           callback: Callable = None, **filters) -> str:
+        """Stream the audit trail to a file, reporting progress per chunk."""
+        operation_id = self.submit_operation(
+            "Export Audit Trail", "audit", "export_audit_trail_to", args=(path, format_type, compress),
+            kwargs=filters, priority=OperationPriority.BACKGROUND, dedupe_key=f"audit_export:{path}"
         )
         if callback:
             self.register_callback(operation_id, callback)
@@ -343,19 +499,34 @@ class UIServiceBridge:
             self.register_callback(operation_id, callback)
         return operation_id
     
+    def shutdown(self):
+        """Cancel queued operations and stop the worker pool."""
+        with self._operations_lock:
+            pending = [op_id for op_id, result in self.active_operations.items()
+                       if result.status == OperationStatus.PENDING]
+        for operation_id in pending:
+            self.cancel_operation(operation_id)
+        
+        self.operation_pool.shutdown(wait=False)
+        self.logger.info("UI Service Bridge shut down")
+    
     def get_service(self, service_name: str):
         """Get direct access to a service (use with caution)."""
         return self.services.get(service_name)
     
     def get_all_services(self) -> Dict[str, Any]:
         """Get all available services."""
-        return self.services.copy()
+        return {name: self.services[name] for name in self.services.names()}
     
     def health_check(self) -> Dict[str, bool]:
-        """Check health of all services."""
-        health_status = {}
+        """Check health of all services.
+        
+        Services that have not been constructed yet are reported healthy
+        without being built.
+        """
+        health_status = {name: True for name in self.services.names()}
         
-        for service_name, service in self.services.items():
+        for service_name, service in self.services.built_services().items():
             try:
                 # Try to call a basic method or check if service is initialized
                 if hasattr(service, 'health_check'):
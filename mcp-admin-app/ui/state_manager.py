@@ -5,13 +5,16 @@ UI State Management and Data Synchronization
 Manages state across UI components and implements real-time updates and notifications.
 """
 
+import heapq
+import itertools
 import logging
 import threading
 import time
-from typing import Dict, List, Optional, Any, Callable, Set
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Callable, Set, Tuple
 from datetime import datetime
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, IntEnum
 import json
 
 
@@ -25,9 +28,17 @@ class EventType(Enum):
     WORKSPACE_CHANGED = "workspace_changed"
     TEST_COMPLETED = "test_completed"
     ANALYTICS_UPDATED = "analytics_updated"
+    DASHBOARD_UPDATED = "dashboard_updated"
     USER_NOTIFICATION = "user_notification"
 
 
+class EventPriority(IntEnum):
+    """Dispatch priority for queued events (lower value dispatches first)."""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
 @dataclass
 class StateEvent:
     """Event representing a state change."""
@@ -36,6 +47,7 @@ class StateEvent:
     timestamp: datetime = field(default_factory=datetime.now)
     source: str = "unknown"
     target: Optional[str] = None  # Specific component target, None for broadcast
+    priority: EventPriority = EventPriority.NORMAL
 
 
 @dataclass
@@ -44,22 +56,150 @@ class CacheEntry:
     data: Any
     timestamp: datetime = field(default_factory=datetime.now)
     ttl_seconds: int = 300  # 5 minutes default
+    expires_at: float = field(init=False)
     
-    def is_expired(self) -> bool:
+    def __post_init__(self):
+        self.expires_at = time.monotonic() + self.ttl_seconds
+    
+    def is_expired(self, now: Optional[float] = None) -> bool:
         """Check if cache entry is expired."""
-        return (datetime.now() - self.timestamp).total_seconds() > self.ttl_seconds
+        return (now if now is not None else time.monotonic()) > self.expires_at
+
+
+class UICache:
+    """Size-bounded LRU cache with a heap-ordered TTL index.
+    
+    Expired entries are removed by popping the expiry heap, so a purge only
+    touches entries that are actually due. Heap records whose entry has been
+    replaced or evicted are skipped lazily.
+    """
+    
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def set(self, key: str, data: Any, ttl_seconds: int = 300):
+        """Store a value, evicting the least recently used entries if full."""
+        entry = CacheEntry(data=data, ttl_seconds=ttl_seconds)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            heapq.heappush(self._expiry_heap, (entry.expires_at, next(self._sequence), key))
+            
+            self._purge_expired_locked(time.monotonic())
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            
+            # Keep stale heap records from accumulating under heavy overwrites
+            if len(self._expiry_heap) > 2 * max(len(self._entries), 64):
+                self._rebuild_heap_locked()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return a live value and mark it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            if entry.is_expired():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.data
+    
+    def invalidate(self, key: str = None):
+        """Remove one entry, or everything when no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self._expiry_heap.clear()
+            else:
+                self._entries.pop(key, None)
+    
+    def purge_expired(self) -> int:
+        """Remove entries whose TTL has elapsed."""
+        with self._lock:
+            return self._purge_expired_locked(time.monotonic())
+    
+    def _purge_expired_locked(self, now: float) -> int:
+        """Pop due records off the expiry heap (caller holds the lock)."""
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, _, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            # Skip records superseded by a later set() of the same key
+            if entry is not None and entry.expires_at == expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                removed += 1
+        return removed
+    
+    def _rebuild_heap_locked(self):
+        """Rebuild the expiry heap from live entries only."""
+        self._expiry_heap = [
+            (entry.expires_at, next(self._sequence), key)
+            for key, entry in self._entries.items()
+        ]
+        heapq.heapify(self._expiry_heap)
+    
+    def keys(self) -> List[str]:
+        """Snapshot of cached keys in LRU order (oldest first)."""
+        with self._lock:
+            return list(self._entries.keys())
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not entry.is_expired()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return size and hit-rate statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
 
 
 class UIStateManager:
     """Manages UI state and handles cross-component data synchronization."""
     
-    def __init__(self):
+    def __init__(self, max_cache_entries: int = 1000, max_batch_size: int = 64):
         self.logger = logging.getLogger(__name__)
         
-        # Event system
+        # Event system: priority heap guarded by a condition variable
         self.event_subscribers: Dict[EventType, List[Callable]] = {}
-        self.event_queue: List[StateEvent] = []
+        self.event_queue: List[Tuple[int, int, StateEvent]] = []
+        self.coalesced_events: Dict[Tuple[EventType, Optional[str]], StateEvent] = {}
         self.event_lock = threading.Lock()
+        self.event_condition = threading.Condition(self.event_lock)
+        self.event_sequence = itertools.count()
+        self.max_batch_size = max_batch_size
         
         # State storage
         self.component_states: Dict[str, Dict[str, Any]] = {}
@@ -67,8 +207,7 @@ class UIStateManager:
         self.state_lock = threading.Lock()
         
         # Data cache
-        self.cache: Dict[str, CacheEntry] = {}
-        self.cache_lock = threading.Lock()
+        self.cache = UICache(max_entries=max_cache_entries)
         
         # Notification system
         self.notification_callbacks: List[Callable] = []
@@ -99,27 +238,55 @@ class UIStateManager:
                 except ValueError:
                     pass
     
-    def publish_event(self, event_type: EventType, data: Any, source: str = "unknown", target: str = None):
-        """Publish an event to subscribers."""
-        event = StateEvent(
-            event_type=event_type,
-            data=data,
-            source=source,
-            target=target
-        )
+    def publish_event(self, event_type: EventType, data: Any, source: str = "unknown", target: str = None,
+                      priority: EventPriority = EventPriority.NORMAL, coalesce: bool = False):
+        """Publish an event to subscribers.
         
-        with self.event_lock:
-            self.event_queue.append(event)
+        With ``coalesce=True`` an event that is still queued for the same
+        (event type, target) is updated in place instead of queueing another
+        one, so subscribers only see the latest data.
+        """
+        with self.event_condition:
+            if coalesce:
+                key = (event_type, target)
+                queued = self.coalesced_events.get(key)
+                if queued is not None:
+                    queued.data = data
+                    queued.source = source
+                    queued.timestamp = datetime.now()
+                    self.logger.debug(f"Coalesced event: {event_type.value} from {source}")
+                    return
+            
+            event = StateEvent(
+                event_type=event_type,
+                data=data,
+                source=source,
+                target=target,
+                priority=priority
+            )
+            heapq.heappush(self.event_queue, (int(priority), next(self.event_sequence), event))
+            if coalesce:
+                self.coalesced_events[(event_type, target)] = event
+            
+            self.event_condition.notify()
         
         self.logger.debug(f"Published event: {event_type.value} from {source}")
     
+    def _take_event_batch(self) -> List[StateEvent]:
+        """Pop up to max_batch_size events in priority order (caller holds the lock)."""
+        batch = []
+        while self.event_queue and len(batch) < self.max_batch_size:
+            _, _, event = heapq.heappop(self.event_queue)
+            key = (event.event_type, event.target)
+            if self.coalesced_events.get(key) is event:
+                del self.coalesced_events[key]
+            batch.append(event)
+        return batch
+    
     def _process_events(self):
-        """Process queued events."""
-        events_to_process = []
-        
-        with self.event_lock:
-            events_to_process = self.event_queue.copy()
-            self.event_queue.clear()
+        """Dispatch one bounded batch of queued events."""
+        with self.event_condition:
+            events_to_process = self._take_event_batch()
         
         for event in events_to_process:
             self._dispatch_event(event)
@@ -127,7 +294,8 @@ class UIStateManager:
     def _dispatch_event(self, event: StateEvent):
         """Dispatch event to subscribers."""
         try:
-            subscribers = self.event_subscribers.get(event.event_type, [])
+            with self.event_lock:
+                subscribers = list(self.event_subscribers.get(event.event_type, []))
             
             for callback in subscribers:
                 try:
@@ -149,7 +317,8 @@ class UIStateManager:
         self.publish_event(
             EventType.USER_NOTIFICATION,
             {"type": "state_change", "component": component_id, "key": key},
-            source="state_manager"
+            source="state_manager",
+            priority=EventPriority.LOW
         )
     
     def get_component_state(self, component_id: str, key: str, default: Any = None) -> Any:
@@ -171,7 +340,8 @@ class UIStateManager:
         self.publish_event(
             EventType.USER_NOTIFICATION,
             {"type": "shared_state_change", "key": key, "value": value},
-            source="state_manager"
+            source="state_manager",
+            priority=EventPriority.LOW
         )
     
     def get_shared_state(self, key: str, default: Any = None) -> Any:
@@ -181,27 +351,19 @@ class UIStateManager:
     
     def cache_data(self, key: str, data: Any, ttl_seconds: int = 300):
         """Cache data with expiration."""
-        with self.cache_lock:
-            self.cache[key] = CacheEntry(data=data, ttl_seconds=ttl_seconds)
+        self.cache.set(key, data, ttl_seconds)
     
     def get_cached_data(self, key: str) -> Optional[Any]:
         """Get cached data if not expired."""
-        with self.cache_lock:
-            entry = self.cache.get(key)
-            if entry and not entry.is_expired():
-                return entry.data
-            elif entry:
-                # Remove expired entry
-                del self.cache[key]
-        return None
+        return self.cache.get(key)
     
     def invalidate_cache(self, key: str = None):
         """Invalidate cache entry or all cache."""
-        with self.cache_lock:
-            if key:
-                self.cache.pop(key, None)
-            else:
-                self.cache.clear()
+        self.cache.invalidate(key)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get cache size and hit-rate statistics."""
+        return self.cache.get_stats()
     
     def add_notification_callback(self, callback: Callable[[Dict[str, Any]], None]):
         """Add callback for notifications."""
@@ -228,36 +390,35 @@ class UIStateManager:
                 self.logger.error(f"Error in notification callback: {e}")
     
     def _background_processor(self):
-        """Background thread for processing events and cleanup."""
-        while self.running:
+        """Background thread that sleeps until events are published."""
+        while True:
             try:
-                # Process events
-                self._process_events()
+                with self.event_condition:
+                    while self.running and not self.event_queue:
+                        self.event_condition.wait()
+                    if not self.running:
+                        return
+                    events_to_process = self._take_event_batch()
+                
+                for event in events_to_process:
+                    self._dispatch_event(event)
                 
                 # Clean up expired cache entries
                 self._cleanup_cache()
                 
-                # Sleep for a short interval
-                time.sleep(0.1)
-                
             except Exception as e:
                 self.logger.error(f"Error in background processor: {e}")
                 time.sleep(1)
     
     def _cleanup_cache(self):
         """Clean up expired cache entries."""
-        with self.cache_lock:
-            expired_keys = [
-                key for key, entry in self.cache.items()
-                if entry.is_expired()
-            ]
-            
-            for key in expired_keys:
-                del self.cache[key]
+        self.cache.purge_expired()
     
     def shutdown(self):
         """Shutdown the state manager."""
-        self.running = False
+        with self.event_condition:
+            self.running = False
+            self.event_condition.notify_all()
         if self.background_thread.is_alive():
             self.background_thread.join(timeout=1)
         self.logger.info("UI State Manager shutdown")
@@ -348,7 +509,8 @@ class UIStateManager:
         self.publish_event(
             EventType.ANALYTICS_UPDATED,
             {"type": analytics_type, "data": data},
-            source="analytics_service"
+            source="analytics_service",
+            priority=EventPriority.LOW
         )
     
     def get_component_registry(self) -> Dict[str, List[str]]:
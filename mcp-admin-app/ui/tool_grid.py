@@ -0,0 +1,399 @@
+"""
+Tool Grid
+=========
+
+Data-grid layer behind the tools page list.
+
+Queries are debounced and run on a worker thread; each one carries a
+generation number and results from superseded queries are dropped. The
+Treeview only ever holds the rows in view plus an overscan margin, with a
+separate scrollbar mapped over the full result list. Moving the window or
+loading new results patches the materialized rows in place (insert, move,
+update, delete) instead of clearing and rebuilding them.
+"""
+
+import logging
+import tkinter as tk
+from tkinter import ttk
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from models.tool import ToolCategory, ToolFilters, ToolRegistryEntry, ToolStatus
+from ui.operation_pool import OperationPool, OperationPriority
+
+
+SEARCH_DEBOUNCE_MS = 250
+OVERSCAN_ROWS = 20
+DEFAULT_ROW_HEIGHT = 20
+
+# Event state bits for Shift and Control
+_EXTEND_SELECTION_MASK = 0x0001 | 0x0004
+
+_SORT_KEYS = {
+    "name": lambda tool: tool.name,
+    "category": lambda tool: tool.category.value,
+    "usage_count": lambda tool: tool.usage_count,
+    "success_rate": lambda tool: tool.success_rate,
+    "created_at": lambda tool: tool.created_at,
+}
+
+
+@dataclass(frozen=True)
+class ToolQuery:
+    """Filter and sort settings for one tool list query."""
+    search_text: str = ""
+    category: str = "All"
+    status: str = "All"
+    sort_by: str = "name"
+    sort_order: str = "asc"
+
+
+def run_tool_query(tool_manager, query: ToolQuery) -> List[ToolRegistryEntry]:
+    """Fetch the tools matching ``query`` in display order."""
+    if query.search_text:
+        # Text queries go through advanced search, which also sorts
+        filter_dict = {}
+        if query.category != "All":
+            filter_dict["category"] = query.category
+        if query.status != "All":
+            filter_dict["status"] = query.status
+        return tool_manager.advanced_search_tools(
+            query.search_text, filter_dict, query.sort_by, query.sort_order
+        )
+
+    filters = ToolFilters()
+    if query.category != "All":
+        filters.category = ToolCategory(query.category)
+    if query.status != "All":
+        filters.status = ToolStatus(query.status)
+
+    tools = tool_manager.get_tool_registry(filters)
+    sort_key = _SORT_KEYS.get(query.sort_by)
+    if sort_key:
+        tools.sort(key=sort_key, reverse=query.sort_order == "desc")
+    return tools
+
+
+class ServerNameCache:
+    """Caches server display names by id for row rendering."""
+
+    def __init__(self, server_manager, unknown: str = "Unknown"):
+        self.server_manager = server_manager
+        self.unknown = unknown
+        self._names: Dict[str, str] = {}
+
+    def get(self, server_id: str) -> str:
+        name = self._names.get(server_id)
+        if name is None:
+            name = self.unknown
+            try:
+                server = self.server_manager.get_server(server_id)
+                if server:
+                    name = server.name
+            except Exception:
+                pass
+            self._names[server_id] = name
+        return name
+
+    def clear(self):
+        self._names.clear()
+
+
+def window_bounds(first: int, visible: int, overscan: int, total: int) -> Tuple[int, int]:
+    """Row range to materialize so that ``first`` and the rows after it are in view."""
+    start = max(0, first - overscan)
+    end = min(total, first + visible + overscan)
+    return start, end
+
+
+def plan_row_changes(current: Sequence[str], current_values: Dict[str, tuple],
+                     desired: Sequence[Tuple[str, tuple]]) -> List[tuple]:
+    """Operations turning the ``current`` rows into ``desired`` ones.
+
+    Returns ``("delete", ids)``, ``("insert", id, index, values)``,
+    ``("move", id, index)`` and ``("update", id, values)`` tuples to apply
+    in order. Rows that keep their position and values produce nothing, so
+    scrolling by a few rows only touches the rows entering and leaving.
+    """
+    desired_ids = {iid for iid, _ in desired}
+    ops: List[tuple] = []
+
+    deleted = [iid for iid in current if iid not in desired_ids]
+    if deleted:
+        ops.append(("delete", deleted))
+
+    order = [iid for iid in current if iid in desired_ids]
+    present = set(order)
+    for index, (iid, values) in enumerate(desired):
+        if index < len(order) and order[index] == iid:
+            pass
+        elif iid in present:
+            order.remove(iid)
+            order.insert(index, iid)
+            ops.append(("move", iid, index))
+        else:
+            order.insert(index, iid)
+            ops.append(("insert", iid, index, values))
+            continue
+        if current_values.get(iid) != values:
+            ops.append(("update", iid, values))
+    return ops
+
+
+class ToolGrid:
+    """Virtualized, asynchronously filtered tool list on a Treeview.
+
+    Row ids are tool ids, so callers can map tree items straight back to
+    tools. Selection is tracked by id because selected rows may scroll out
+    of the materialized window.
+    """
+
+    def __init__(self, tree, scrollbar, tool_manager, server_manager,
+                 on_change: Optional[Callable[[List[ToolRegistryEntry]], None]] = None,
+                 on_select: Optional[Callable[[Any], None]] = None,
+                 pool: Optional[OperationPool] = None, visible_rows: int = 15,
+                 overscan: int = OVERSCAN_ROWS, debounce_ms: int = SEARCH_DEBOUNCE_MS):
+        self.logger = logging.getLogger(__name__)
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.tool_manager = tool_manager
+        self.server_names = ServerNameCache(server_manager)
+        self.on_change = on_change
+        self.on_select = on_select
+        self.visible_rows = visible_rows
+        self.overscan = overscan
+        self.debounce_ms = debounce_ms
+
+        self._owns_pool = pool is None
+        self.pool = pool or OperationPool(max_workers=1, name="tool-grid")
+
+        self.tools: List[ToolRegistryEntry] = []
+        self._by_id: Dict[str, ToolRegistryEntry] = {}
+        self._offset = 0
+        self._start = 0
+        self._rows: List[str] = []  # materialized ids, in tree order
+        self._row_values: Dict[str, tuple] = {}
+        self._selected: Set[str] = set()
+        self._notified: Set[str] = set()
+
+        # Query state
+        self._generation = 0
+        self._pending_after = None
+        self._future = None
+        self.stale_results = 0
+
+        self.tree.configure(yscrollcommand=self._on_tree_scrolled)
+        self.scrollbar.configure(command=self._on_scrollbar)
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<ButtonPress-1>", self._on_plain_navigation, add="+")
+        self.tree.bind("<KeyPress-Up>", self._on_plain_navigation, add="+")
+        self.tree.bind("<KeyPress-Down>", self._on_plain_navigation, add="+")
+        self.tree.bind("<Configure>", self._on_configure, add="+")
+        self.tree.bind("<Destroy>", self._on_destroy, add="+")
+
+    # Queries
+
+    def request(self, query: ToolQuery, delay: Optional[int] = None):
+        """Run ``query`` after ``delay`` ms (the debounce interval by default).
+
+        A newer request replaces one still waiting for its delay, and the
+        results of any query already running are discarded when they arrive.
+        """
+        if self._pending_after is not None:
+            self.tree.after_cancel(self._pending_after)
+        self._pending_after = self.tree.after(
+            self.debounce_ms if delay is None else delay, self._dispatch, query
+        )
+
+    def _dispatch(self, query: ToolQuery):
+        self._pending_after = None
+        self._generation += 1
+        generation = self._generation
+        if self._future is not None:
+            # Only helps if the previous query has not started yet
+            self._future.cancel()
+
+        try:
+            future = self.pool.submit(run_tool_query, self.tool_manager, query,
+                                      priority=OperationPriority.INTERACTIVE)
+        except RuntimeError as e:
+            self.logger.error(f"Error submitting tool query: {e}")
+            return
+        self._future = future
+        future.add_done_callback(lambda f: self._post_result(generation, f))
+
+    def _post_result(self, generation: int, future):
+        """Hand a finished query back to the Tk thread."""
+        if future.cancelled():
+            return
+        try:
+            self.tree.after(0, self._deliver, generation, future)
+        except (RuntimeError, tk.TclError):
+            # The widget is gone
+            pass
+
+    def _deliver(self, generation: int, future):
+        if generation != self._generation:
+            self.stale_results += 1
+            return
+        self._future = None
+        try:
+            tools = future.result()
+        except Exception as e:
+            self.logger.error(f"Error loading tools: {e}")
+            return
+        self.set_tools(tools)
+
+    def set_tools(self, tools: List[ToolRegistryEntry]):
+        """Show ``tools``, superseding any query still in flight."""
+        self._generation += 1
+        self.tools = list(tools)
+        self._by_id = {tool.id: tool for tool in self.tools}
+        self._selected &= self._by_id.keys()
+        self._render(min(self._offset, self._max_offset()))
+
+        if self.on_change:
+            self.on_change(self.tools)
+
+    def refresh_server_names(self):
+        """Forget cached server names; visible rows update on the next render."""
+        self.server_names.clear()
+
+    # Rows and selection
+
+    def get_tool(self, tool_id: str) -> Optional[ToolRegistryEntry]:
+        return self._by_id.get(tool_id)
+
+    def selected_ids(self) -> List[str]:
+        """Selected tool ids in list order, including rows scrolled out of view."""
+        return [tool.id for tool in self.tools if tool.id in self._selected]
+
+    def select(self, tool_ids: Sequence[str]):
+        """Replace the selection."""
+        self._selected = {iid for iid in tool_ids if iid in self._by_id}
+        self._sync_selection()
+
+    def _row_for(self, tool: ToolRegistryEntry) -> tuple:
+        return (
+            tool.name,
+            tool.category.value,
+            tool.status.value,
+            self.server_names.get(tool.server_id),
+            tool.usage_count
+        )
+
+    def _render(self, offset: int):
+        """Materialize the window around ``offset`` and scroll it into view."""
+        self._offset = offset
+        start, end = window_bounds(offset, self.visible_rows, self.overscan, len(self.tools))
+        desired = [(tool.id, self._row_for(tool)) for tool in self.tools[start:end]]
+
+        for op in plan_row_changes(self._rows, self._row_values, desired):
+            kind, iid = op[0], op[1]
+            if kind == "delete":
+                self.tree.delete(*iid)
+            elif kind == "insert":
+                self.tree.insert("", op[2], iid=iid, values=op[3], tags=(iid,))
+            elif kind == "move":
+                self.tree.move(iid, "", op[2])
+            else:
+                self.tree.item(iid, values=op[2])
+
+        self._start = start
+        self._rows = [iid for iid, _ in desired]
+        self._row_values = dict(desired)
+        self._sync_selection()
+        if self._rows:
+            self.tree.yview_moveto((offset - start) / len(self._rows))
+        self._update_scrollbar()
+
+    def _sync_selection(self):
+        wanted = [iid for iid in self._rows if iid in self._selected]
+        if tuple(wanted) != tuple(self.tree.selection()):
+            self.tree.selection_set(wanted)
+
+    def _on_tree_select(self, event=None):
+        # Off-window ids stay selected; materialized ones follow the tree
+        self._selected = (self._selected - set(self._rows)) | set(self.tree.selection())
+        # Re-selecting rows that scroll back into view is not a change
+        if self._selected != self._notified:
+            self._notified = set(self._selected)
+            if self.on_select:
+                self.on_select(event)
+
+    def _on_plain_navigation(self, event):
+        """A click or arrow key without Shift/Control starts a new selection."""
+        if not (event.state & _EXTEND_SELECTION_MASK):
+            self._selected &= set(self._rows)
+
+    # Scrolling
+
+    def _max_offset(self) -> int:
+        return max(0, len(self.tools) - self.visible_rows)
+
+    def _update_scrollbar(self):
+        total = len(self.tools)
+        if total == 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        first = self._offset / total
+        last = min(1.0, (self._offset + self.visible_rows) / total)
+        self.scrollbar.set(first, last)
+
+    def _scroll_to(self, offset: int):
+        offset = max(0, min(offset, self._max_offset()))
+        end = self._start + len(self._rows)
+        margin = self.overscan // 2
+        near_top = offset - self._start < margin and self._start > 0
+        near_bottom = end - (offset + self.visible_rows) < margin and end < len(self.tools)
+        if near_top or near_bottom or not self._start <= offset < max(end, 1):
+            self._render(offset)
+        else:
+            self._offset = offset
+            self.tree.yview_moveto((offset - self._start) / len(self._rows))
+            self._update_scrollbar()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            offset = int(float(amount) * len(self.tools))
+        elif unit == "pages":
+            offset = self._offset + int(amount) * self.visible_rows
+        else:
+            offset = self._offset + int(amount)
+        self._scroll_to(offset)
+
+    def _on_tree_scrolled(self, first, last):
+        """Track scrolling done by the tree itself (wheel, keyboard, ``see``)."""
+        if not self._rows:
+            self._update_scrollbar()
+            return
+        offset = self._start + round(float(first) * len(self._rows))
+        if offset != self._offset:
+            self._scroll_to(offset)
+
+    def _on_configure(self, event):
+        row_height = DEFAULT_ROW_HEIGHT
+        try:
+            row_height = int(ttk.Style(self.tree).lookup("Treeview", "rowheight") or row_height)
+        except (tk.TclError, ValueError):
+            pass
+        # Less one row for the headings
+        visible = max(1, event.height // row_height - 1)
+        if visible != self.visible_rows:
+            self.visible_rows = visible
+            self._render(min(self._offset, self._max_offset()))
+
+    def _on_destroy(self, event):
+        if event.widget is self.tree:
+            self.shutdown()
+
+    def shutdown(self):
+        if self._pending_after is not None:
+            try:
+                self.tree.after_cancel(self._pending_after)
+            except tk.TclError:
+                pass
+            self._pending_after = None
+        self._generation += 1
+        if self._owns_pool:
+            self.pool.shutdown(wait=False)
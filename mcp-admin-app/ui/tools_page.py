@@ -14,11 +14,12 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 
 from models.tool import (
-    ToolRegistryEntry, ToolFilters, ToolCategory, ToolStatus, 
+    ToolRegistryEntry, ToolCategory, ToolStatus, 
     SecurityLevel
 )
 from services.tool_manager import AdvancedToolManager, ToolConfiguration
 from services.tool_execution import ToolExecutionEngine, ExecutionRequest
+from ui.tool_grid import ToolGrid, ToolQuery
 
 
 class ToolsPage(tk.Frame):
@@ -217,15 +218,18 @@ class ToolsPage(tk.Frame):
         self.tools_tree.column("Server", width=120)
         self.tools_tree.column("Usage", width=80)
         
-        # Scrollbar for treeview
-        tree_scroll = ttk.Scrollbar(list_frame, orient="vertical", command=self.tools_tree.yview)
-        self.tools_tree.configure(yscrollcommand=tree_scroll.set)
+        # Scrollbar spans the whole result list; the tree only holds the rows in view
+        tree_scroll = ttk.Scrollbar(list_frame, orient="vertical")
         
         self.tools_tree.pack(side="left", fill="both", expand=True)
         tree_scroll.pack(side="right", fill="y")
         
-        # Bind selection event
-        self.tools_tree.bind("<<TreeviewSelect>>", self._on_tool_selected)
+        # Grid runs queries off the UI thread and handles selection events
+        self.tool_grid = ToolGrid(
+            self.tools_tree, tree_scroll, self.tool_manager, self.server_manager,
+            on_change=self._on_tools_loaded,
+            on_select=self._on_tool_selected
+        )
         
         # Create context menu
         self.context_menu = tk.Menu(self, tearoff=0)
@@ -642,124 +646,43 @@ class ToolsPage(tk.Frame):
             messagebox.showerror("Discovery Error", f"Error discovering tools: {e}")
     
     def _on_search_changed(self, *args):
-        """Handle search text change."""
+        """Handle search text change; the query waits for typing to pause."""
         self._apply_filters()
     
     def _on_filter_changed(self, event=None):
         """Handle filter change."""
-        self._apply_filters()
+        self._apply_filters(delay=0)
     
-    def _apply_filters(self):
-        """Apply current filters to tool list."""
-        try:
-            search_text = self.search_var.get().strip()
-            
-            if search_text:
-                # Use advanced search for text queries
-                filter_dict = {}
-                
-                # Category filter
-                category_text = self.category_var.get()
-                if category_text != "All":
-                    filter_dict["category"] = category_text
-                
-                # Status filter
-                status_text = self.status_var.get()
-                if status_text != "All":
-                    filter_dict["status"] = status_text
-                
-                # Get sort options
-                sort_by = self.sort_var.get()
-                sort_order = self.sort_order_var.get()
-                
-                filtered_tools = self.tool_manager.advanced_search_tools(
-                    search_text, filter_dict, sort_by, sort_order
-                )
-            else:
-                # Use regular filtering for non-text queries
-                filters = ToolFilters()
-                
-                # Category filter
-                category_text = self.category_var.get()
-                if category_text != "All":
-                    filters.category = ToolCategory(category_text)
-                
-                # Status filter
-                status_text = self.status_var.get()
-                if status_text != "All":
-                    filters.status = ToolStatus(status_text)
-                
-                filtered_tools = self.tool_manager.get_tool_registry(filters)
-                
-                # Apply sorting
-                sort_by = self.sort_var.get()
-                sort_order = self.sort_order_var.get()
-                reverse = sort_order == "desc"
-                
-                if sort_by == "name":
-                    filtered_tools.sort(key=lambda x: x.name, reverse=reverse)
-                elif sort_by == "category":
-                    filtered_tools.sort(key=lambda x: x.category.value, reverse=reverse)
-                elif sort_by == "usage_count":
-                    filtered_tools.sort(key=lambda x: x.usage_count, reverse=reverse)
-                elif sort_by == "success_rate":
-                    filtered_tools.sort(key=lambda x: x.success_rate, reverse=reverse)
-                elif sort_by == "created_at":
-                    filtered_tools.sort(key=lambda x: x.created_at, reverse=reverse)
-            
-            self._update_tool_list(filtered_tools)
-            
-        except Exception as e:
-            self.logger.error(f"Error applying filters: {e}")
+    def _apply_filters(self, delay: Optional[int] = None):
+        """Query the tool list with the current filters off the UI thread."""
+        query = ToolQuery(
+            search_text=self.search_var.get().strip(),
+            category=self.category_var.get(),
+            status=self.status_var.get(),
+            sort_by=self.sort_var.get(),
+            sort_order=self.sort_order_var.get()
+        )
+        self.tool_grid.request(query, delay)
     
     def _update_tool_list(self, tools: List[ToolRegistryEntry]):
         """Update the tool list display."""
-        # Clear existing items
-        for item in self.tools_tree.get_children():
-            self.tools_tree.delete(item)
-        
-        # Add tools
-        for tool in tools:
-            server_name = "Unknown"
-            try:
-                server = self.server_manager.get_server(tool.server_id)
-                if server:
-                    server_name = server.name
-            except:
-                pass
-            
-            self.tools_tree.insert("", "end", values=(
-                tool.name,
-                tool.category.value,
-                tool.status.value,
-                server_name,
-                tool.usage_count
-            ), tags=(tool.id,))
-        
+        self.tool_grid.set_tools(tools)
+    
+    def _on_tools_loaded(self, tools: List[ToolRegistryEntry]):
+        """Track the tools shown once a query or update lands."""
         self.current_tools = tools
         self._update_status_bar()
     
     def _on_tool_selected(self, event):
         """Handle tool selection."""
-        selection = self.tools_tree.selection()
+        selection = self.tool_grid.selected_ids()
         if not selection:
             self.selected_tool = None
             self._update_tool_details(None)
             return
         
-        # Get selected tool ID from tags
-        item = selection[0]
-        tool_id = self.tools_tree.item(item, "tags")[0]
-        
-        # Find tool in current list
-        selected_tool = None
-        for tool in self.current_tools:
-            if tool.id == tool_id:
-                selected_tool = tool
-                break
-        
-        self.selected_tool = selected_tool
-        self._update_tool_details(selected_tool)
+        self.selected_tool = self.tool_grid.get_tool(selection[0])
+        self._update_tool_details(self.selected_tool)
         self._update_status_bar()
     
     def _update_tool_details(self, tool: Optional[ToolRegistryEntry]):
@@ -1191,13 +1114,13 @@ class ToolsPage(tk.Frame):
             
             total_stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
             
+            results = self.tool_manager.sync_all_servers([server.id for server in servers])
             for server in servers:
-                try:
-                    stats = self.tool_manager.sync_tools_with_server(server.id)
-                    for key in total_stats:
-                        total_stats[key] += stats.get(key, 0)
-                except Exception as e:
-                    self.logger.error(f"Error syncing with server {server.name}: {e}")
+                stats = results.get(server.id, {})
+                for key in total_stats:
+                    total_stats[key] += stats.get(key, 0)
+                for error in stats.get("errors", []):
+                    self.logger.error(f"Error syncing with server {server.name}: {error}")
             
             message = f"""Tool synchronization complete:
             
@@ -1292,11 +1215,12 @@ Category Breakdown:"""
     def refresh(self):
         """Refresh the page."""
         try:
-            # Get all tools
-            tools = self.tool_manager.get_tool_registry()
-            self._update_tool_list(tools)
+            # Reload tools with the current filters; server names may have changed too
+            self.tool_grid.refresh_server_names()
+            self._apply_filters(delay=0)
             
             # Clear selection
+            self.tool_grid.select([])
             self.selected_tool = None
             self._update_tool_details(None)
             
@@ -1864,17 +1788,16 @@ Individual Results:
         """Delete multiple selected tools."""
         try:
             # Get selected tools from the tree
-            selected_items = self.tools_tree.selection()
+            selected_items = self.tool_grid.selected_ids()
             if not selected_items:
                 messagebox.showwarning("No Selection", "Please select one or more tools to delete.")
                 return
             
             # Get tool IDs and names
             tools_to_delete = []
-            for item in selected_items:
-                tool_id = self.tools_tree.item(item, "tags")[0]
-                tool_name = self.tools_tree.item(item, "values")[0]
-                tools_to_delete.append({"id": tool_id, "name": tool_name})
+            for tool_id in selected_items:
+                tool = self.tool_grid.get_tool(tool_id)
+                tools_to_delete.append({"id": tool_id, "name": tool.name if tool else tool_id})
             
             # Confirm deletion
             tool_names = [tool["name"] for tool in tools_to_delete]
@@ -1922,11 +1845,11 @@ Individual Results:
             # Select the item under cursor
             item = self.tools_tree.identify_row(event.y)
             if item:
-                self.tools_tree.selection_set(item)
+                self.tool_grid.select([item])
                 self.tools_tree.focus(item)
                 
                 # Update context menu state based on selection
-                selected_items = self.tools_tree.selection()
+                selected_items = self.tool_grid.selected_ids()
                 single_selected = len(selected_items) == 1
                 any_selected = len(selected_items) > 0
                 
@@ -1946,7 +1869,7 @@ Individual Results:
     def _on_delete_key(self, event):
         """Handle Delete key press."""
         try:
-            selected_items = self.tools_tree.selection()
+            selected_items = self.tool_grid.selected_ids()
             if not selected_items:
                 return
             
@@ -1963,14 +1886,14 @@ Individual Results:
     def _update_status_bar(self):
         """Update the status bar with selection information."""
         try:
-            selected_items = self.tools_tree.selection()
+            selected_items = self.tool_grid.selected_ids()
             selected_count = len(selected_items)
             total_count = len(self.current_tools)
             
             if selected_count == 0:
                 status_text = f"No tools selected ({total_count} total)"
             elif selected_count == 1:
-                tool_name = self.tools_tree.item(selected_items[0], "values")[0]
+                tool_name = self.tool_grid.get_tool(selected_items[0]).name
                 status_text = f"Selected: {tool_name} (1 of {total_count})"
             else:
                 status_text = f"Selected {selected_count} tools ({total_count} total) - Press Delete to remove"
@@ -12,6 +12,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import json
 
+from ui.dashboard_data import DashboardDataService, PanelSnapshot
+
+ALERTS_PANEL = "trends.alerts"
+ALERT_SOURCES = ("prompts", "prompt_versions", "evaluation_runs", "evaluation_results")
+
 
 class TrendMonitoringPage:
     """UI page for trend analysis and monitoring dashboard."""
@@ -28,8 +33,15 @@ class TrendMonitoringPage:
         self.selected_model_id = None
         self.auto_refresh_enabled = False
         self.refresh_interval = 30000  # 30 seconds
+        self.current_alerts: List[Dict[str, Any]] = []
+        
+        # Alerts are computed off the Tk thread and only when their inputs change
+        self.dashboard_data = DashboardDataService(db_manager)
+        self.dashboard_data.register_panel(ALERTS_PANEL, self._compute_alerts_panel, ALERT_SOURCES)
+        self.dashboard_data.subscribe(self._on_snapshot)
         
         self.setup_ui()
+        self.main_frame.bind("<Destroy>", self._on_destroy, add="+")
         self.load_initial_data()
     
     def setup_ui(self):
@@ -213,6 +225,7 @@ class TrendMonitoringPage:
             width=15
         )
         severity_combo.grid(row=0, column=1, padx=5, pady=5)
+        severity_combo.bind("<<ComboboxSelected>>", self._on_alert_filter_changed)
         
         ttk.Label(filter_frame, text="Type:").grid(row=0, column=2, sticky=tk.W, padx=5, pady=5)
         self.type_filter_var = tk.StringVar(value="All")
@@ -223,6 +236,7 @@ class TrendMonitoringPage:
             width=15
         )
         type_combo.grid(row=0, column=3, padx=5, pady=5)
+        type_combo.bind("<<ComboboxSelected>>", self._on_alert_filter_changed)
         
         # Refresh alerts button
         refresh_btn = ttk.Button(
@@ -579,56 +593,82 @@ class TrendMonitoringPage:
         messagebox.showinfo("Alert Details", f"Alert ID: {alert_id}\n\nDetailed information would be displayed here.")
     
     def refresh_alerts(self):
-        """Refresh the active alerts list."""
+        """Refresh the active alerts list in the background."""
+        # Re-filter what is already computed; a new snapshot follows if inputs changed
+        self._on_alert_filter_changed()
+        self.dashboard_data.refresh([ALERTS_PANEL])
+    
+    def _on_alert_filter_changed(self, event=None):
+        """Re-apply the alert filters to the latest computed alerts."""
+        snapshot = self.dashboard_data.latest(ALERTS_PANEL)
+        if snapshot is not None and snapshot.error is None:
+            self._render_alerts(snapshot.view_model["rows"])
+    
+    def _compute_alerts_panel(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the alert sweep and prepare tree rows (worker thread)."""
+        alerts = self.trend_service.monitor_performance_alerts()
+        
+        rows = []
+        for alert in alerts:
+            severity = alert.get('severity', 'low')
+            alert_type = alert.get('type', 'unknown')
+            
+            # Status indicator
+            if severity == 'critical':
+                status = "🔴 Critical"
+            elif severity == 'high':
+                status = "🟠 High"
+            elif severity == 'medium':
+                status = "🟡 Medium"
+            else:
+                status = "🔵 Low"
+            
+            rows.append((severity.title(), alert_type.replace('_', ' ').title(), (
+                alert.get('timestamp', '')[:19],  # Truncate timestamp
+                alert_type.replace('_', ' ').title(),
+                severity.title(),
+                alert.get('description', '')[:50] + "...",
+                alert.get('model_id', alert.get('prompt_id', 'Unknown')),
+                status
+            )))
+        
+        return {"alerts": alerts, "rows": rows}
+    
+    def _on_snapshot(self, snapshot: PanelSnapshot):
+        """Hand a new panel snapshot to the Tk thread."""
         try:
-            self.status_var.set("Refreshing alerts...")
-            
-            # Get active alerts
-            alerts = self.trend_service.monitor_performance_alerts()
-            
-            # Clear existing alerts
-            for item in self.alerts_tree.get_children():
-                self.alerts_tree.delete(item)
-            
-            # Display alerts
-            for alert in alerts:
-                severity = alert.get('severity', 'low')
-                alert_type = alert.get('type', 'unknown')
-                
-                # Apply filters
-                if (self.severity_filter_var.get() != "All" and 
-                    severity.title() != self.severity_filter_var.get()):
-                    continue
-                
-                if (self.type_filter_var.get() != "All" and 
-                    alert_type.replace('_', ' ').title() != self.type_filter_var.get()):
-                    continue
-                
-                # Status indicator
-                if severity == 'critical':
-                    status = "🔴 Critical"
-                elif severity == 'high':
-                    status = "🟠 High"
-                elif severity == 'medium':
-                    status = "🟡 Medium"
-                else:
-                    status = "🔵 Low"
-                
-                self.alerts_tree.insert('', 'end', values=(
-                    alert.get('timestamp', '')[:19],  # Truncate timestamp
-                    alert_type.replace('_', ' ').title(),
-                    severity.title(),
-                    alert.get('description', '')[:50] + "...",
-                    alert.get('model_id', alert.get('prompt_id', 'Unknown')),
-                    status
-                ))
-            
-            self.status_var.set(f"Alerts refreshed: {len(alerts)} total")
-            
-        except Exception as e:
-            self.logger.error(f"Error refreshing alerts: {e}")
+            self.parent.after(0, self._apply_snapshot, snapshot)
+        except (RuntimeError, tk.TclError):
+            pass
+    
+    def _apply_snapshot(self, snapshot: PanelSnapshot):
+        """Swap a prepared alerts view model into the tree."""
+        if snapshot.error is not None:
             self.status_var.set("Error refreshing alerts")
-            messagebox.showerror("Error", f"Failed to refresh alerts: {e}")
+            return
+        
+        self.current_alerts = snapshot.view_model["alerts"]
+        self._render_alerts(snapshot.view_model["rows"])
+        self.status_var.set(f"Alerts refreshed: {len(self.current_alerts)} total")
+    
+    def _render_alerts(self, rows):
+        """Show the prepared alert rows that pass the current filters."""
+        self.alerts_tree.delete(*self.alerts_tree.get_children())
+        
+        severity_filter = self.severity_filter_var.get()
+        type_filter = self.type_filter_var.get()
+        for severity, alert_type, values in rows:
+            # Apply filters
+            if severity_filter != "All" and severity != severity_filter:
+                continue
+            if type_filter != "All" and alert_type != type_filter:
+                continue
+            self.alerts_tree.insert('', 'end', values=values)
+    
+    def _on_destroy(self, event):
+        if event.widget is self.main_frame:
+            self.auto_refresh_enabled = False
+            self.dashboard_data.shutdown()
     
     def show_alert_details(self, event):
         """Show detailed information about an alert."""
@@ -681,7 +721,11 @@ class TrendMonitoringPage:
             )
             
             if filename:
-                alerts = self.trend_service.monitor_performance_alerts()
+                snapshot = self.dashboard_data.latest(ALERTS_PANEL)
+                if snapshot is not None and snapshot.error is None:
+                    alerts = snapshot.view_model["alerts"]
+                else:
+                    alerts = self.trend_service.monitor_performance_alerts()
                 with open(filename, 'w') as f:
                     json.dump(alerts, f, indent=2, default=str)
                 